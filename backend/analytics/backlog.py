@@ -0,0 +1,178 @@
+"""
+Daily backlog snapshots (`BacklogSnapshot`).
+
+`snapshot_backlog` (Celery beat, end of the day) stores the open tickets per
+status × priority × assignee with one GROUP BY over `Ticket`. Past days are
+rebuilt by `backfill_backlog`: one streaming pass over the status and
+assignment events ordered by `(ticket, created_at)` turns each ticket into
+spells of constant state; each spell adds +1 / -1 at its first / past-last
+day on a per-key difference array, and a prefix sum per key yields the
+daily counts (no per-ticket loop over days).
+
+Priority changes are not recorded as events: the backfill uses the current
+priority of each ticket. Archived tickets have no events left and are not
+part of the backfill. Assignees deleted since their ASSIGNED event count as
+unassigned, as in the snapshots written before the deletion.
+"""
+
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from core.models import User
+from tickets.models import Ticket, TicketEvent, TicketEventType, TicketStatus
+from tickets.services import invalidate_ticket_caches
+
+from .models import BacklogSnapshot
+from .status_flow import STATUS_EVENT_TYPES
+
+logger = logging.getLogger("helpdesk")
+
+BACKLOG_STATUSES = (TicketStatus.OPEN, TicketStatus.IN_PROGRESS, TicketStatus.WAITING_USER)
+ASSIGNMENT_EVENT_TYPES = (TicketEventType.ASSIGNED, TicketEventType.UNASSIGNED)
+
+_STATUS_EVENTS = frozenset(STATUS_EVENT_TYPES)
+_INSERT_BATCH_SIZE = 1000
+
+
+def _replace_days(start_day, end_day, rows):
+    with transaction.atomic():
+        BacklogSnapshot.objects.filter(day__range=(start_day, end_day)).delete()
+        BacklogSnapshot.objects.bulk_create(rows, batch_size=_INSERT_BATCH_SIZE)
+        invalidate_ticket_caches()
+
+
+def snapshot_backlog(day=None):
+    """Store the current backlog as the snapshot of `day` (default: today). Returns the rows written."""
+    day = day or timezone.localdate()
+    counts = (
+        Ticket.objects.filter(status__in=BACKLOG_STATUSES)
+        .values("status", "priority", "assigned_to_id")
+        .annotate(tickets=Count("id"))
+        .order_by()
+    )
+    rows = [BacklogSnapshot(day=day, **row) for row in counts]
+    _replace_days(day, day, rows)
+    logger.info(f"Backlog snapshot {day}: {sum(row.tickets for row in rows)} tickets")
+    return len(rows)
+
+
+def _assignee(value):
+    try:
+        return uuid.UUID(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class BacklogReplay:
+    """
+    Difference arrays of the backlog per `(status, priority, assignee)` key,
+    fed with the events of each ticket in order. A ticket is counted on the
+    days whose end (next local midnight) falls inside a spell.
+    """
+
+    def __init__(self, start_day, end_day):
+        self.start_day, self.end_day = start_day, end_day
+        self.deltas = defaultdict(lambda: defaultdict(int))
+
+    def add_spell(self, key, since, until):
+        """Ticket in state `key` from `since` to `until` (None: still is)."""
+        if key[0] not in BACKLOG_STATUSES:
+            return
+        first = max(timezone.localtime(since).date(), self.start_day)
+        last = self.end_day
+        if until is not None:
+            last = min(timezone.localtime(until).date() - timedelta(days=1), last)
+        if first > last:
+            return
+        deltas = self.deltas[key]
+        deltas[first] += 1
+        deltas[last + timedelta(days=1)] -= 1
+
+    def replay_ticket(self, created_at, priority, events):
+        """`events`: `(event_type, to_value, created_at)` of one ticket, in order."""
+        status, assignee, since = TicketStatus.OPEN, None, created_at
+        for event_type, value, at in events:
+            if event_type in _STATUS_EVENTS:
+                new_status, new_assignee = value, assignee
+            else:
+                new_status, new_assignee = status, _assignee(value)
+            if (new_status, new_assignee) == (status, assignee):
+                continue
+            self.add_spell((status, priority, assignee), since, at)
+            status, assignee, since = new_status, new_assignee, at
+        self.add_spell((status, priority, assignee), since, None)
+
+    def drop_assignees(self, assignees):
+        """Fold the keys of `assignees` (deleted users) into the unassigned ones."""
+        for key in [key for key in self.deltas if key[2] in assignees]:
+            unassigned = self.deltas[(key[0], key[1], None)]
+            for day, delta in self.deltas.pop(key).items():
+                unassigned[day] += delta
+
+    def snapshots(self):
+        """Prefix sums of the difference arrays, as `BacklogSnapshot` rows."""
+        rows = []
+        for (status, priority, assignee), deltas in self.deltas.items():
+            changes = sorted(deltas.items())
+            running = 0
+            for index, (day, delta) in enumerate(changes):
+                running += delta
+                next_change = changes[index + 1][0] if index + 1 < len(changes) else day
+                while running and day < next_change:
+                    rows.append(
+                        BacklogSnapshot(
+                            day=day, status=status, priority=priority, assigned_to_id=assignee, tickets=running
+                        )
+                    )
+                    day += timedelta(days=1)
+        return rows
+
+
+def backfill_backlog(start_day=None, end_day=None):
+    """
+    Rebuild the snapshots of `[start_day, end_day]` (default: first ticket
+    day to yesterday) from the events. Returns the rows written.
+    """
+    end_day = end_day or timezone.localdate() - timedelta(days=1)
+    if start_day is None:
+        first = Ticket.objects.aggregate(first=Min("created_at"))["first"]
+        if first is None:
+            return 0
+        start_day = timezone.localtime(first).date()
+
+    end_dt = timezone.make_aware(datetime.combine(end_day + timedelta(days=1), time.min))
+    events = (
+        TicketEvent.objects.filter(
+            event_type__in=(*STATUS_EVENT_TYPES, *ASSIGNMENT_EVENT_TYPES),
+            created_at__lt=end_dt,
+        )
+        .order_by("ticket_id", "created_at")
+        .values_list("ticket_id", "ticket__created_at", "ticket__priority", "event_type", "to_value", "created_at")
+    )
+
+    replay = BacklogReplay(start_day, end_day)
+    current, ticket_events = None, []
+    for ticket_id, created_at, priority, event_type, value, at in events.iterator(
+        chunk_size=settings.STATUS_FLOW_CHUNK_SIZE
+    ):
+        if current and ticket_id != current[0]:
+            replay.replay_ticket(current[1], current[2], ticket_events)
+            ticket_events = []
+        current = (ticket_id, created_at, priority)
+        ticket_events.append((event_type, value, at))
+    if current:
+        replay.replay_ticket(current[1], current[2], ticket_events)
+
+    assignees = {key[2] for key in replay.deltas} - {None}
+    replay.drop_assignees(assignees - set(User.objects.filter(id__in=assignees).values_list("id", flat=True)))
+    rows = replay.snapshots()
+    _replace_days(start_day, end_day, rows)
+    logger.info(f"Backlog reconstruido de {start_day} a {end_day}: {len(rows)} linhas")
+    return len(rows)
@@ -0,0 +1,44 @@
+"""
+Log-scale duration histograms shared by the analytics rollups.
+
+Durations are counted per bucket of `DURATION_BUCKETS`; sums of histograms
+are histograms, so rollup rows can be merged in any grouping and the
+percentiles estimated afterwards.
+"""
+
+from bisect import bisect_right
+
+# Upper bounds (seconds) of the histogram buckets: 1 minute to ~91 days in
+# steps of 2^(1/4) (~19%), plus one bucket below and one above.
+DURATION_BUCKETS = tuple(60 * 2 ** (step / 4) for step in range(69))
+HISTOGRAM_SIZE = len(DURATION_BUCKETS) + 1
+
+PERCENTILES = (50, 90, 95)
+
+
+def bucket_index(seconds):
+    return bisect_right(DURATION_BUCKETS, seconds)
+
+
+def add_sparse(histogram, sparse):
+    """Add a sparse histogram (`{"bucket": count}`, as stored in JSON) to a dense one, in place."""
+    for index, count in (sparse or {}).items():
+        histogram[int(index)] += count
+    return histogram
+
+
+def histogram_percentile(histogram, percentile):
+    """Estimate of a percentile (seconds), interpolated inside its bucket."""
+    total = sum(histogram)
+    if not total:
+        return None
+    rank = total * percentile / 100
+    seen = 0
+    for index, count in enumerate(histogram):
+        if count and seen + count >= rank:
+            if index == len(DURATION_BUCKETS):
+                return DURATION_BUCKETS[-1]
+            low = DURATION_BUCKETS[index - 1] if index else 0
+            return low + (DURATION_BUCKETS[index] - low) * (rank - seen) / count
+        seen += count
+    return DURATION_BUCKETS[-1]
@@ -0,0 +1,36 @@
+"""
+Store today's backlog snapshot (normally run by celery beat) or rebuild past
+days from the ticket events.
+
+Exemplo:
+    python manage.py backlog_snapshot
+    python manage.py backlog_snapshot --backfill
+    python manage.py backlog_snapshot --backfill --since 2025-01-01 --until 2025-12-31
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from analytics.backlog import backfill_backlog, snapshot_backlog
+
+
+class Command(BaseCommand):
+    help = "Grava o snapshot de backlog de hoje ou reconstroi dias passados a partir dos eventos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backfill", action="store_true", help="Reconstroi os dias passados.")
+        parser.add_argument("--since", help="Primeiro dia (YYYY-MM-DD); padrao: dia do primeiro ticket.")
+        parser.add_argument("--until", help="Ultimo dia (YYYY-MM-DD); padrao: ontem.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        if not options["backfill"]:
+            rows = snapshot_backlog()
+        else:
+            since, until = (parse_date(options[name]) if options[name] else None for name in ("since", "until"))
+            if (options["since"] and not since) or (options["until"] and not until):
+                raise CommandError("Datas invalidas. Use o formato YYYY-MM-DD.")
+            rows = backfill_backlog(since, until)
+        self.stdout.write(self.style.SUCCESS(f"{rows} linhas gravadas ({time.monotonic() - started:.1f}s)."))
@@ -0,0 +1,37 @@
+"""
+Update the memory-mapped analytics snapshot (normally run by celery beat).
+
+Exemplo:
+    python manage.py refresh_analytics_snapshot
+    python manage.py refresh_analytics_snapshot --rebuild
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics.snapshot import refresh_snapshot
+
+
+class Command(BaseCommand):
+    help = "Atualiza o snapshot colunar dos tickets usado pelos endpoints de analytics."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Exporta uma nova base em vez de gravar apenas o delta.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.ANALYTICS_SNAPSHOT_ENABLED:
+            raise CommandError("Snapshot analitico desabilitado (ANALYTICS_SNAPSHOT_ENABLED=False).")
+        started = time.monotonic()
+        rows = refresh_snapshot(rebuild=options["rebuild"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Snapshot atualizado em {settings.ANALYTICS_SNAPSHOT_ROOT} "
+                f"({rows} tickets gravados, {time.monotonic() - started:.1f}s)."
+            )
+        )
@@ -0,0 +1,33 @@
+"""
+Update the time-in-status / transition rollups (normally run by celery beat).
+
+Exemplo:
+    python manage.py refresh_status_flow
+    python manage.py refresh_status_flow --rebuild
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from analytics.status_flow import rebuild_status_rollups, refresh_status_rollups
+
+
+class Command(BaseCommand):
+    help = "Atualiza os rollups de tempo em status e transicoes a partir dos eventos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Apaga e recalcula os rollups (ex.: apos importar historico com datas passadas).",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        position = rebuild_status_rollups() if options["rebuild"] else refresh_status_rollups()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rollups atualizados ate {position.isoformat()} ({time.monotonic() - started:.1f}s)."
+            )
+        )
@@ -0,0 +1,49 @@
+"""
+Update the live ticket rollups read by the pivot endpoint (normally run by
+celery beat).
+
+Exemplo:
+    python manage.py refresh_ticket_rollups
+    python manage.py refresh_ticket_rollups --rebuild
+    python manage.py refresh_ticket_rollups --archived
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from analytics.rollups import rebuild_live_rollups, refresh_live_rollups
+from tickets.archive import rebuild_archived_rollups
+
+
+class Command(BaseCommand):
+    help = "Atualiza os rollups diarios dos tickets ativos (dias alterados desde o ultimo refresh)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recalcula todos os dias (ex.: apos importar tickets ou alterar o calendario util).",
+        )
+        parser.add_argument(
+            "--archived",
+            action="store_true",
+            help="Recalcula as linhas dos tickets arquivados a partir do arquivo (com o arquivamento parado).",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        if options["archived"]:
+            keys = rebuild_archived_rollups()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Rollups arquivados recalculados ({keys} chaves, {time.monotonic() - started:.1f}s)."
+                )
+            )
+            return
+        position = rebuild_live_rollups() if options["rebuild"] else refresh_live_rollups()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rollups atualizados ate {position.isoformat()} ({time.monotonic() - started:.1f}s)."
+            )
+        )
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.5 on 2026-10-19 08:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='dia')),
+                ('status', models.CharField(choices=[('OPEN', 'Aberto'), ('IN_PROGRESS', 'Em Andamento'), ('WAITING_USER', 'Aguardando Usuário'), ('RESOLVED', 'Resolvido'), ('CANCELED', 'Cancelado')], max_length=20, verbose_name='status')),
+                ('priority', models.CharField(choices=[('LOW', 'Baixa'), ('MEDIUM', 'Média'), ('HIGH', 'Alta'), ('CRITICAL', 'Crítica')], max_length=20, verbose_name='prioridade')),
+                ('category', models.CharField(choices=[('GENERAL', 'Geral'), ('TECHNICAL', 'Técnico'), ('BILLING', 'Financeiro'), ('ACCESS', 'Acesso'), ('BUG', 'Bug / Erro'), ('FEATURE', 'Solicitação de Feature'), ('OTHER', 'Outro')], max_length=20, verbose_name='categoria')),
+                ('tickets', models.PositiveIntegerField(default=0, verbose_name='tickets')),
+                ('resolution_count', models.PositiveIntegerField(default=0, verbose_name='tickets com resolução')),
+                ('resolution_seconds', models.FloatField(default=0, verbose_name='soma do tempo de resolução (s)')),
+                ('first_response_count', models.PositiveIntegerField(default=0, verbose_name='tickets com primeira resposta')),
+                ('first_response_seconds', models.FloatField(default=0, verbose_name='soma do tempo de primeira resposta (s)')),
+                ('assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='atribuído a')),
+            ],
+            options={
+                'verbose_name': 'Rollup Diário de Tickets',
+                'verbose_name_plural': 'Rollups Diários de Tickets',
+                'ordering': ['day'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'status', 'priority', 'category', 'assigned_to'), name='uniq_ticket_rollup_key')],
+            },
+        ),
+    ]
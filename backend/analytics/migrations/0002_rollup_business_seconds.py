@@ -0,0 +1,27 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:10
+
+from django.db import migrations, models
+
+
+# Business seconds of the already archived tickets are backfilled by
+# `manage.py refresh_ticket_rollups --archived`, not here: a migration must not
+# run live application code.
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('tickets', '0004_archivedticket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticketdailyrollup',
+            name='first_response_business_seconds',
+            field=models.FloatField(default=0, verbose_name='soma do tempo útil de primeira resposta (s)'),
+        ),
+        migrations.AddField(
+            model_name='ticketdailyrollup',
+            name='resolution_business_seconds',
+            field=models.FloatField(default=0, verbose_name='soma do tempo útil de resolução (s)'),
+        ),
+    ]
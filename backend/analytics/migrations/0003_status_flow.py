@@ -0,0 +1,58 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_rollup_business_seconds'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupCheckpoint',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False, verbose_name='nome')),
+                ('position', models.DateTimeField(verbose_name='processado até')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Checkpoint de Rollup',
+                'verbose_name_plural': 'Checkpoints de Rollup',
+            },
+        ),
+        migrations.CreateModel(
+            name='StatusTimeRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='dia')),
+                ('status', models.CharField(choices=[('OPEN', 'Aberto'), ('IN_PROGRESS', 'Em Andamento'), ('WAITING_USER', 'Aguardando Usuário'), ('RESOLVED', 'Resolvido'), ('CANCELED', 'Cancelado')], max_length=20, verbose_name='status')),
+                ('spells', models.PositiveIntegerField(default=0, verbose_name='permanências')),
+                ('total_seconds', models.FloatField(default=0, verbose_name='soma das durações (s)')),
+                ('histogram', models.JSONField(default=list, verbose_name='histograma')),
+            ],
+            options={
+                'verbose_name': 'Rollup de Tempo em Status',
+                'verbose_name_plural': 'Rollups de Tempo em Status',
+                'ordering': ['day'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'status'), name='uniq_status_time_rollup')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StatusTransitionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='dia')),
+                ('from_status', models.CharField(choices=[('OPEN', 'Aberto'), ('IN_PROGRESS', 'Em Andamento'), ('WAITING_USER', 'Aguardando Usuário'), ('RESOLVED', 'Resolvido'), ('CANCELED', 'Cancelado')], max_length=20, verbose_name='de')),
+                ('to_status', models.CharField(choices=[('OPEN', 'Aberto'), ('IN_PROGRESS', 'Em Andamento'), ('WAITING_USER', 'Aguardando Usuário'), ('RESOLVED', 'Resolvido'), ('CANCELED', 'Cancelado')], max_length=20, verbose_name='para')),
+                ('transitions', models.PositiveIntegerField(default=0, verbose_name='transições')),
+            ],
+            options={
+                'verbose_name': 'Rollup de Transições de Status',
+                'verbose_name_plural': 'Rollups de Transições de Status',
+                'ordering': ['day'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'from_status', 'to_status'), name='uniq_status_transition_rollup')],
+            },
+        ),
+    ]
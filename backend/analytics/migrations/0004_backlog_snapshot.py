@@ -0,0 +1,33 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_status_flow'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BacklogSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='dia')),
+                ('status', models.CharField(choices=[('OPEN', 'Aberto'), ('IN_PROGRESS', 'Em Andamento'), ('WAITING_USER', 'Aguardando Usuário'), ('RESOLVED', 'Resolvido'), ('CANCELED', 'Cancelado')], max_length=20, verbose_name='status')),
+                ('priority', models.CharField(choices=[('LOW', 'Baixa'), ('MEDIUM', 'Média'), ('HIGH', 'Alta'), ('CRITICAL', 'Crítica')], max_length=20, verbose_name='prioridade')),
+                ('tickets', models.PositiveIntegerField(default=0, verbose_name='tickets')),
+                ('assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='atribuído a')),
+            ],
+            options={
+                'verbose_name': 'Snapshot de Backlog',
+                'verbose_name_plural': 'Snapshots de Backlog',
+                'ordering': ['day'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'status', 'priority', 'assigned_to'), name='uniq_backlog_snapshot_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# The archived rows are recomputed per creator by
+# `manage.py refresh_ticket_rollups --archived`, not here: a migration must not
+# run live application code.
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_backlog_snapshot'),
+        ('tickets', '0004_archivedticket'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='ticketdailyrollup',
+            name='uniq_ticket_rollup_key',
+        ),
+        migrations.AddField(
+            model_name='ticketdailyrollup',
+            name='archived',
+            field=models.BooleanField(default=True, verbose_name='arquivados'),
+        ),
+        migrations.AddField(
+            model_name='ticketdailyrollup',
+            name='created_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='criado por'),
+        ),
+        migrations.AddField(
+            model_name='ticketdailyrollup',
+            name='first_response_histogram',
+            field=models.JSONField(default=dict, verbose_name='histograma de primeira resposta'),
+        ),
+        migrations.AddField(
+            model_name='ticketdailyrollup',
+            name='resolution_histogram',
+            field=models.JSONField(default=dict, verbose_name='histograma de resolução'),
+        ),
+        migrations.AddConstraint(
+            model_name='ticketdailyrollup',
+            constraint=models.UniqueConstraint(fields=('day', 'status', 'priority', 'category', 'assigned_to', 'created_by', 'archived'), name='uniq_ticket_rollup_key'),
+        ),
+    ]
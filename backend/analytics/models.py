@@ -0,0 +1,174 @@
+"""
+Pre-aggregated analytics data.
+
+Models:
+- TicketDailyRollup: métricas diárias dos tickets (ativos e arquivados)
+- StatusTimeRollup / StatusTransitionRollup: tempo em status e transições por dia
+- RollupCheckpoint: até onde cada rollup incremental foi processado
+- BacklogSnapshot: tickets em aberto no fim de cada dia
+"""
+
+from django.conf import settings
+from django.db import models
+
+from tickets.models import TicketCategory, TicketPriority, TicketStatus
+
+
+class TicketDailyRollup(models.Model):
+    """
+    Medidas agregadas dos tickets por dia de criação (TIME_ZONE) × status ×
+    prioridade × categoria × responsável × criador.
+
+    Linhas `archived` acumulam os tickets arquivados (`tickets.archive`); as
+    demais espelham os tickets ativos e são recalculadas por dia
+    (`analytics.rollups.refresh_live_rollups`). Os endpoints de analytics
+    somam as linhas arquivadas às agregações dos tickets ativos; o pivot lê
+    as duas. Somas de segundos (corridos e úteis) + contagens permitem
+    recompor médias; os histogramas (esparsos, `{"faixa": contagem}` de
+    `DURATION_BUCKETS`) permitem estimar percentis. Responsável e criador
+    removidos viram NULL; as medidas são mantidas.
+    """
+
+    day = models.DateField("dia")
+    status = models.CharField("status", max_length=20, choices=TicketStatus.choices)
+    priority = models.CharField("prioridade", max_length=20, choices=TicketPriority.choices)
+    category = models.CharField("categoria", max_length=20, choices=TicketCategory.choices)
+    assigned_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        verbose_name="atribuído a",
+        null=True,
+        blank=True,
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        verbose_name="criado por",
+        null=True,
+        blank=True,
+    )
+    archived = models.BooleanField("arquivados", default=True)
+    tickets = models.PositiveIntegerField("tickets", default=0)
+    resolution_count = models.PositiveIntegerField("tickets com resolução", default=0)
+    resolution_seconds = models.FloatField("soma do tempo de resolução (s)", default=0)
+    resolution_business_seconds = models.FloatField("soma do tempo útil de resolução (s)", default=0)
+    first_response_count = models.PositiveIntegerField("tickets com primeira resposta", default=0)
+    first_response_seconds = models.FloatField("soma do tempo de primeira resposta (s)", default=0)
+    first_response_business_seconds = models.FloatField("soma do tempo útil de primeira resposta (s)", default=0)
+    resolution_histogram = models.JSONField("histograma de resolução", default=dict)
+    first_response_histogram = models.JSONField("histograma de primeira resposta", default=dict)
+
+    class Meta:
+        verbose_name = "Rollup Diário de Tickets"
+        verbose_name_plural = "Rollups Diários de Tickets"
+        ordering = ["day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "status", "priority", "category", "assigned_to", "created_by", "archived"],
+                name="uniq_ticket_rollup_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.status} {self.priority} {self.category}: {self.tickets}"
+
+
+class StatusTimeRollup(models.Model):
+    """
+    Permanências em cada status encerradas no dia (TIME_ZONE), calculadas a
+    partir de `TicketEvent` (`analytics.status_flow`). `histogram` conta as
+    durações por faixa de `DURATION_BUCKETS` (`analytics.histograms`), para estimar percentis.
+    """
+
+    day = models.DateField("dia")
+    status = models.CharField("status", max_length=20, choices=TicketStatus.choices)
+    spells = models.PositiveIntegerField("permanências", default=0)
+    total_seconds = models.FloatField("soma das durações (s)", default=0)
+    histogram = models.JSONField("histograma", default=list)
+
+    class Meta:
+        verbose_name = "Rollup de Tempo em Status"
+        verbose_name_plural = "Rollups de Tempo em Status"
+        ordering = ["day"]
+        constraints = [
+            models.UniqueConstraint(fields=["day", "status"], name="uniq_status_time_rollup"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.status}: {self.spells}"
+
+
+class StatusTransitionRollup(models.Model):
+    """Transições de status (origem → destino) ocorridas no dia (TIME_ZONE)."""
+
+    day = models.DateField("dia")
+    from_status = models.CharField("de", max_length=20, choices=TicketStatus.choices)
+    to_status = models.CharField("para", max_length=20, choices=TicketStatus.choices)
+    transitions = models.PositiveIntegerField("transições", default=0)
+
+    class Meta:
+        verbose_name = "Rollup de Transições de Status"
+        verbose_name_plural = "Rollups de Transições de Status"
+        ordering = ["day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "from_status", "to_status"],
+                name="uniq_status_transition_rollup",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.from_status}->{self.to_status}: {self.transitions}"
+
+
+class RollupCheckpoint(models.Model):
+    """Posição (data dos eventos) até a qual um rollup incremental está completo."""
+
+    name = models.CharField("nome", max_length=50, primary_key=True)
+    position = models.DateTimeField("processado até")
+    updated_at = models.DateTimeField("atualizado em", auto_now=True)
+
+    class Meta:
+        verbose_name = "Checkpoint de Rollup"
+        verbose_name_plural = "Checkpoints de Rollup"
+
+    def __str__(self):
+        return f"{self.name}: {self.position}"
+
+
+class BacklogSnapshot(models.Model):
+    """
+    Tickets em aberto (OPEN, IN_PROGRESS, WAITING_USER) no fim do dia
+    (TIME_ZONE), por status × prioridade × responsável. Gravado todo dia por
+    `analytics.backlog` e reconstruído dos eventos para dias passados;
+    responsáveis removidos contam como sem responsável.
+    """
+
+    day = models.DateField("dia")
+    status = models.CharField("status", max_length=20, choices=TicketStatus.choices)
+    priority = models.CharField("prioridade", max_length=20, choices=TicketPriority.choices)
+    assigned_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        verbose_name="atribuído a",
+        null=True,
+        blank=True,
+    )
+    tickets = models.PositiveIntegerField("tickets", default=0)
+
+    class Meta:
+        verbose_name = "Snapshot de Backlog"
+        verbose_name_plural = "Snapshots de Backlog"
+        ordering = ["day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "status", "priority", "assigned_to"],
+                name="uniq_backlog_snapshot_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.status} {self.priority}: {self.tickets}"
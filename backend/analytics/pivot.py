@@ -0,0 +1,161 @@
+"""
+Pivot / group-by over `TicketDailyRollup` (live and archived rows).
+
+A request names whitelisted dimensions and measures, compiled to one grouped
+query on the rollup rows of the window: `values(*dimensions)` plus the sums
+the measures need. Percentiles merge the sparse histograms of the rows,
+collected in the same query as a JSON array per group (`JSONB_AGG` /
+`JSON_GROUP_ARRAY`). The number of dimensions and of groups is capped.
+"""
+
+from dataclasses import dataclass
+
+from django.db.models import Aggregate, F, JSONField, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+
+from .histograms import HISTOGRAM_SIZE, PERCENTILES, add_sparse, histogram_percentile
+from .models import TicketDailyRollup
+
+# Dimension -> grouped expression (plain field name or expression), plus a label column.
+DIMENSIONS = {
+    "day": "day",
+    "week": TruncWeek("day"),
+    "month": TruncMonth("day"),
+    "status": "status",
+    "priority": "priority",
+    "category": "category",
+    "assignee": F("assigned_to_id"),
+    "creator": F("created_by_id"),
+}
+TIME_DIMENSIONS = ("day", "week", "month")
+DIMENSION_LABELS = {
+    "assignee": ("assignee_email", F("assigned_to__email")),
+    "creator": ("creator_email", F("created_by__email")),
+}
+
+SUM_MEASURES = {
+    "count": "tickets",
+    "resolved": "resolution_count",
+    "responded": "first_response_count",
+}
+# Measure -> (sum column, count column).
+AVERAGE_MEASURES = {
+    "avg_resolution_seconds": ("resolution_seconds", "resolution_count"),
+    "avg_resolution_business_seconds": ("resolution_business_seconds", "resolution_count"),
+    "avg_first_response_seconds": ("first_response_seconds", "first_response_count"),
+    "avg_first_response_business_seconds": ("first_response_business_seconds", "first_response_count"),
+}
+# Measure -> (histogram column, percentile).
+PERCENTILE_MEASURES = {
+    f"p{percentile}_{name}_seconds": (f"{name}_histogram", percentile)
+    for name in ("resolution", "first_response")
+    for percentile in PERCENTILES
+}
+MEASURES = (*SUM_MEASURES, *AVERAGE_MEASURES, *PERCENTILE_MEASURES)
+
+
+class JSONArrayAgg(Aggregate):
+    """JSON array of the grouped JSON values."""
+
+    function = "JSONB_AGG"
+    output_field = JSONField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            function="JSON_GROUP_ARRAY",
+            template="%(function)s(JSON(%(expressions)s))",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, function="JSON_ARRAYAGG", **extra_context)
+
+
+def _names(raw):
+    return tuple(dict.fromkeys(name.strip() for name in (raw or "").split(",") if name.strip()))
+
+
+@dataclass(frozen=True)
+class PivotQuery:
+    dimensions: tuple
+    measures: tuple
+
+    @classmethod
+    def parse(cls, dimensions, measures, max_dimensions):
+        """Validate comma separated names; raises ValueError with the API message."""
+        dimensions, measures = _names(dimensions), _names(measures) or ("count",)
+        unknown = [name for name in dimensions if name not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Dimensoes invalidas: {', '.join(unknown)}. Use: {', '.join(DIMENSIONS)}.")
+        unknown = [name for name in measures if name not in MEASURES]
+        if unknown:
+            raise ValueError(f"Medidas invalidas: {', '.join(unknown)}. Use: {', '.join(MEASURES)}.")
+        if len(dimensions) > max_dimensions:
+            raise ValueError(f"Use no maximo {max_dimensions} dimensoes.")
+        if sum(name in TIME_DIMENSIONS for name in dimensions) > 1:
+            raise ValueError("Use apenas uma dimensao de tempo (day, week ou month).")
+        return cls(dimensions, measures)
+
+    def _aggregates(self):
+        columns, histograms = set(), set()
+        for name in self.measures:
+            if name in SUM_MEASURES:
+                columns.add(SUM_MEASURES[name])
+            elif name in AVERAGE_MEASURES:
+                columns.update(AVERAGE_MEASURES[name])
+            else:
+                histograms.add(PERCENTILE_MEASURES[name][0])
+        aggregates = {f"total_{column}": Sum(column, default=0) for column in columns}
+        aggregates.update({f"all_{column}": JSONArrayAgg(column) for column in histograms})
+        return aggregates
+
+    def _measures(self, row):
+        merged = {}
+        data = {}
+        for name in self.measures:
+            if name in SUM_MEASURES:
+                data[name] = row[f"total_{SUM_MEASURES[name]}"]
+            elif name in AVERAGE_MEASURES:
+                total, count = (row[f"total_{column}"] for column in AVERAGE_MEASURES[name])
+                data[name] = round(total / count, 2) if count else None
+            else:
+                column, percentile = PERCENTILE_MEASURES[name]
+                if column not in merged:
+                    merged[column] = [0] * HISTOGRAM_SIZE
+                    for sparse in row[f"all_{column}"] or ():
+                        add_sparse(merged[column], sparse)
+                value = histogram_percentile(merged[column], percentile)
+                data[name] = round(value, 2) if value is not None else None
+        return data
+
+    def _dimensions(self, row):
+        data = {}
+        for name in self.dimensions:
+            value = row[name]
+            data[name] = value.isoformat() if name in TIME_DIMENSIONS else value
+            if name in DIMENSION_LABELS:
+                label = DIMENSION_LABELS[name][0]
+                data[label] = row[label]
+        return data
+
+    def run(self, start_day, end_day, max_groups):
+        """
+        Rows `{dimension: value, ..., measure: value, ...}` of the days in
+        `[start_day, end_day]`, ordered by the dimensions. Raises ValueError
+        past `max_groups` groups.
+        """
+        rows = TicketDailyRollup.objects.filter(day__range=(start_day, end_day))
+        aggregates = self._aggregates()
+        if not self.dimensions:
+            return [self._measures(rows.aggregate(**aggregates))]
+
+        fields = [name for name in self.dimensions if isinstance(DIMENSIONS[name], str)]
+        expressions = {name: DIMENSIONS[name] for name in self.dimensions if name not in fields}
+        expressions.update(DIMENSION_LABELS[name] for name in self.dimensions if name in DIMENSION_LABELS)
+        grouped = rows.values(*fields, **expressions).annotate(**aggregates).order_by(*self.dimensions)
+        results = list(grouped[: max_groups + 1])
+        if len(results) > max_groups:
+            raise ValueError(f"Resultado com mais de {max_groups} grupos. Reduza as dimensoes ou o periodo.")
+        return [{**self._dimensions(row), **self._measures(row)} for row in results]
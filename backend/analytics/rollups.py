@@ -0,0 +1,246 @@
+"""
+Read / write helpers for `TicketDailyRollup`.
+
+Archived rows are incremented by `tickets.archive` as tickets leave the hot
+tables. Live rows mirror the current tickets: `refresh_live_rollups` (Celery
+beat) recomputes the creation days of the tickets saved or answered since
+its checkpoint, so the whole history can be grouped from this one table.
+"""
+
+import logging
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min, OuterRef, Q, Subquery
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core.business_calendar import get_calendar
+from core.cache_versions import bump_cache_version
+from core.models import UserRole
+from tickets.models import Ticket, TicketMessage, TicketStatus
+
+from .histograms import bucket_index
+from .models import RollupCheckpoint, TicketDailyRollup
+
+logger = logging.getLogger("helpdesk")
+
+CHECKPOINT_NAME = "ticket-rollups"
+# Bumped whenever rollup rows change; versions the pivot cache and ETags.
+ROLLUPS_CACHE_NAMESPACE = "ticket-rollups"
+
+ROLLUP_KEY = ("day", "status", "priority", "category", "assigned_to_id", "created_by_id")
+ROLLUP_MEASURES = (
+    "tickets",
+    "resolution_count",
+    "resolution_seconds",
+    "resolution_business_seconds",
+    "first_response_count",
+    "first_response_seconds",
+    "first_response_business_seconds",
+)
+ROLLUP_HISTOGRAMS = ("resolution_histogram", "first_response_histogram")
+# Ticket columns read by `rollup_increments`, followed by the first response instant.
+ROLLUP_SOURCE_FIELDS = ("created_at", "status", "priority", "category", "assigned_to_id", "created_by_id", "closed_at")
+
+_INSERT_BATCH_SIZE = 1000
+
+
+def _count(histogram, seconds):
+    bucket = str(bucket_index(seconds))
+    histogram[bucket] = histogram.get(bucket, 0) + 1
+
+
+def rollup_increments(rows):
+    """
+    `{rollup_key: measures}` of `rows`: tuples of `ROLLUP_SOURCE_FIELDS` plus
+    the first moderator/admin message instant (or None).
+    """
+    calendar = get_calendar()
+    increments = {}
+    for created_at, status, priority, category, assigned_to_id, created_by_id, closed_at, first_response_at in rows:
+        key = (timezone.localtime(created_at).date(), status, priority, category, assigned_to_id, created_by_id)
+        measures = increments.get(key)
+        if measures is None:
+            measures = increments[key] = dict.fromkeys(ROLLUP_MEASURES, 0)
+            measures.update((name, {}) for name in ROLLUP_HISTOGRAMS)
+        measures["tickets"] += 1
+        if status == TicketStatus.RESOLVED and closed_at:
+            seconds = (closed_at - created_at).total_seconds()
+            measures["resolution_count"] += 1
+            measures["resolution_seconds"] += seconds
+            measures["resolution_business_seconds"] += calendar.seconds_between(created_at, closed_at)
+            _count(measures["resolution_histogram"], seconds)
+        if first_response_at:
+            seconds = (first_response_at - created_at).total_seconds()
+            measures["first_response_count"] += 1
+            measures["first_response_seconds"] += seconds
+            measures["first_response_business_seconds"] += calendar.seconds_between(created_at, first_response_at)
+            _count(measures["first_response_histogram"], seconds)
+    return increments
+
+
+def add_to_rollups(increments):
+    """
+    Add `{rollup_key: measures}` to the archived rows. Must run inside the
+    caller's transaction; rows of the touched days are locked.
+    """
+    if not increments:
+        return
+    days = {key[0] for key in increments}
+    existing = {
+        tuple(getattr(row, field) for field in ROLLUP_KEY): row
+        for row in TicketDailyRollup.objects.select_for_update().filter(archived=True, day__in=days)
+    }
+    to_create, to_update = [], []
+    for key, measures in increments.items():
+        row = existing.get(key)
+        if row is None:
+            to_create.append(TicketDailyRollup(archived=True, **dict(zip(ROLLUP_KEY, key)), **measures))
+            continue
+        for measure in ROLLUP_MEASURES:
+            setattr(row, measure, getattr(row, measure) + measures[measure])
+        for name in ROLLUP_HISTOGRAMS:
+            histogram = getattr(row, name)
+            for bucket, count in measures[name].items():
+                histogram[bucket] = histogram.get(bucket, 0) + count
+        to_update.append(row)
+    TicketDailyRollup.objects.bulk_create(to_create)
+    TicketDailyRollup.objects.bulk_update(to_update, (*ROLLUP_MEASURES, *ROLLUP_HISTOGRAMS))
+    transaction.on_commit(lambda: bump_cache_version(ROLLUPS_CACHE_NAMESPACE))
+
+
+def replace_archived_rollups(increments):
+    """Replace every archived row with `{rollup_key: measures}`. Must run inside the caller's transaction."""
+    TicketDailyRollup.objects.filter(archived=True).delete()
+    TicketDailyRollup.objects.bulk_create(
+        (
+            TicketDailyRollup(archived=True, **dict(zip(ROLLUP_KEY, key)), **measures)
+            for key, measures in increments.items()
+        ),
+        batch_size=_INSERT_BATCH_SIZE,
+    )
+    transaction.on_commit(lambda: bump_cache_version(ROLLUPS_CACHE_NAMESPACE))
+    return len(increments)
+
+
+def rollups_in_window(start_dt, end_dt):
+    """Archived rollup rows whose day falls in the `[start_dt, end_dt]` analytics window."""
+    return TicketDailyRollup.objects.filter(
+        archived=True,
+        day__range=(timezone.localtime(start_dt).date(), timezone.localtime(end_dt).date()),
+    )
+
+
+def ticket_rows(tickets, *extra_fields):
+    """
+    `rollup_increments` rows of a `Ticket` queryset (first response from a
+    subquery), preceded by `extra_fields` when given.
+    """
+    first_response = (
+        TicketMessage.objects.filter(ticket_id=OuterRef("pk"), author__role__in=(UserRole.MODERATOR, UserRole.ADMIN))
+        .values("ticket_id")
+        .annotate(first=Min("created_at"))
+        .values("first")
+    )
+    return (
+        tickets.annotate(first_staff_message_at=Subquery(first_response))
+        .order_by()
+        .values_list(*extra_fields, *ROLLUP_SOURCE_FIELDS, "first_staff_message_at")
+    )
+
+
+def _created_on(days):
+    """Filter on `created_at` covering the local `days`, one range per run of consecutive days."""
+    runs = []
+    for day in sorted(days):
+        if runs and runs[-1][1] + timedelta(days=1) == day:
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    condition = Q(pk__in=[])
+    for first, last in runs:
+        condition |= Q(
+            created_at__gte=timezone.make_aware(datetime.combine(first, time.min)),
+            created_at__lt=timezone.make_aware(datetime.combine(last + timedelta(days=1), time.min)),
+        )
+    return condition
+
+
+def _replace_live(days=None):
+    """Recompute the live rows of `days` (None: every day) from `Ticket`."""
+    live = TicketDailyRollup.objects.filter(archived=False)
+    tickets = Ticket.objects.all()
+    if days is not None:
+        live = live.filter(day__in=days)
+        tickets = tickets.filter(_created_on(days))
+    live.delete()
+    increments = rollup_increments(ticket_rows(tickets).iterator(chunk_size=settings.STATUS_FLOW_CHUNK_SIZE))
+    TicketDailyRollup.objects.bulk_create(
+        (
+            TicketDailyRollup(archived=False, **dict(zip(ROLLUP_KEY, key)), **measures)
+            for key, measures in increments.items()
+        ),
+        batch_size=_INSERT_BATCH_SIZE,
+    )
+    transaction.on_commit(lambda: bump_cache_version(ROLLUPS_CACHE_NAMESPACE))
+    return len(increments)
+
+
+def _lock_checkpoint():
+    return RollupCheckpoint.objects.select_for_update().filter(name=CHECKPOINT_NAME).first()
+
+
+def rebuild_live_days(days):
+    """
+    Recompute the live rows of `days` (e.g. after their tickets were
+    archived). Runs inside the caller's transaction; a no-op until the first
+    refresh has built the live rows.
+    """
+    if not days or _lock_checkpoint() is None:
+        return 0
+    return _replace_live(days)
+
+
+def changed_days(after, until):
+    """Creation days of the tickets saved or with a new message in `(after, until]`."""
+    saved = Ticket.objects.filter(updated_at__gt=after, updated_at__lte=until)
+    answered = Ticket.objects.filter(
+        id__in=TicketMessage.objects.filter(created_at__gt=after, created_at__lte=until).values("ticket_id")
+    )
+    days = set()
+    for tickets in (saved, answered):
+        days.update(tickets.annotate(day=TruncDate("created_at")).values_list("day", flat=True).distinct())
+    return days
+
+
+def refresh_live_rollups(until=None):
+    """
+    Bring the live rows up to `until` (default: now minus
+    `TICKET_ROLLUP_LAG_SECONDS`, for transactions still in flight); the
+    first run builds every day. Returns the new checkpoint position.
+    """
+    until = until or timezone.now() - timedelta(seconds=settings.TICKET_ROLLUP_LAG_SECONDS)
+    with transaction.atomic():
+        checkpoint = _lock_checkpoint()
+        after = checkpoint.position if checkpoint else None
+        if after is not None and after >= until:
+            return after
+        if after is None:
+            days, keys = None, _replace_live()
+        else:
+            days = changed_days(after, until)
+            keys = _replace_live(days) if days else 0
+        RollupCheckpoint.objects.update_or_create(name=CHECKPOINT_NAME, defaults={"position": until})
+    logger.info(
+        f"Rollups de tickets atualizados ate {until.isoformat()} "
+        f"({'todos os dias' if days is None else f'{len(days)} dias'}, {keys} chaves)"
+    )
+    return until
+
+
+def rebuild_live_rollups():
+    """Drop the checkpoint and rebuild the live rows of every day."""
+    RollupCheckpoint.objects.filter(name=CHECKPOINT_NAME).delete()
+    return refresh_live_rollups()
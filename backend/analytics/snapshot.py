@@ -0,0 +1,387 @@
+"""
+Columnar, memory-mapped snapshot of the ticket analytic columns.
+
+A base export writes one flat binary file per column (`array` typecodes,
+native byte order) with the tickets sorted by `created_at`: ids, creation
+instant, status, assignee/status code and prefix sums of the resolution and
+first response measures. Readers `mmap` the files, so every process of the
+host shares the same pages through the page cache, and answer the analytics
+queries without the database: a window is two bisections on the creation
+column, measure sums are two prefix lookups, counts per status / assignee
+scan only the window slice.
+
+Between exports, `refresh_snapshot` (Celery beat) writes a delta: the current
+rows of the tickets saved, answered or archived since the base export and the
+base rows they supersede. The base is exported again once the delta passes
+ANALYTICS_SNAPSHOT_MAX_DELTA rows or is ANALYTICS_SNAPSHOT_REBUILD_SECONDS
+old. `state.json` names the current generation and delta and is swapped with
+`os.replace`; readers reload when it changes.
+
+Bulk imports and generated datasets keep their source timestamps, so the
+delta cannot see them: they call `invalidate_snapshot`, and every base
+exported before the call is ignored until the next export.
+"""
+
+import array
+import bisect
+import fcntl
+import json
+import logging
+import mmap
+import os
+import shutil
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from core.business_calendar import get_calendar
+from tickets.models import ArchivedTicket, Ticket, TicketMessage, TicketStatus
+
+from .rollups import ticket_rows
+
+logger = logging.getLogger("helpdesk")
+
+STATE_FILE = "state.json"
+INVALIDATED_FILE = "invalidated"
+ID_SIZE = 16
+STATUSES = tuple(TicketStatus.values)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+STATUS_BITS = 3
+STATUS_MASK = (1 << STATUS_BITS) - 1
+# Row aligned columns -> typecode; `assignee_status` is `assignee code << STATUS_BITS | status code`.
+COLUMNS = {"created": "d", "status": "B", "assignee_status": "I"}
+# Measures, stored as prefix sums (rows + 1 items).
+MEASURES = {
+    "resolution_count": "I",
+    "resolution_seconds": "d",
+    "resolution_business_seconds": "d",
+    "first_response_count": "I",
+    "first_response_seconds": "d",
+    "first_response_business_seconds": "d",
+}
+
+
+def _root():
+    return Path(settings.ANALYTICS_SNAPSHOT_ROOT)
+
+
+def _map(path, typecode):
+    """Read-only memoryview of a column file."""
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return memoryview(b"").cast(typecode)
+        return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)).cast(typecode)
+
+
+def _stop(end_dt):
+    """Exclusive end instant of an analytics window ending at `end_dt` (time.max)."""
+    return (end_dt + timedelta(microseconds=1)).timestamp()
+
+
+class Snapshot:
+    """
+    One generation of the snapshot plus its delta. Rows are tuples
+    `(id bytes, created timestamp, status code, assignee id or None, *MEASURES)`.
+    """
+
+    def __init__(self, root, state):
+        directory = root / state["generation"]
+        meta = json.loads((directory / "meta.json").read_text())
+        self.version = f"{state['generation']}:{state['delta']}"
+        self.position = datetime.fromisoformat(meta["position"])
+        self.built_at = datetime.fromisoformat(meta["built_at"])
+        self.refreshed_at = datetime.fromisoformat(state["refreshed_at"])
+        self.assignees = [None, *meta["assignees"]]
+        self.ids = _map(directory / "ids.bin", "B")
+        self.columns = {name: _map(directory / f"{name}.bin", typecode) for name, typecode in COLUMNS.items()}
+        self.sums = {name: _map(directory / f"{name}.bin", typecode) for name, typecode in MEASURES.items()}
+
+        delta = json.loads((directory / state["delta"]).read_text()) if state["delta"] else {}
+        self.delta_rows = [(bytes.fromhex(row[0]), *row[1:]) for row in delta.get("rows", ())]
+        self.superseded = delta.get("superseded", [])
+        self._delta_created = [row[1] for row in self.delta_rows]
+
+    def __len__(self):
+        return len(self.columns["created"])
+
+    def _row(self, index):
+        code = self.columns["assignee_status"][index]
+        return (
+            bytes(self.ids[index * ID_SIZE:(index + 1) * ID_SIZE]),
+            self.columns["created"][index],
+            self.columns["status"][index],
+            self.assignees[code >> STATUS_BITS],
+            *(column[index + 1] - column[index] for column in self.sums.values()),
+        )
+
+    def find(self, ticket_id, created_ts):
+        """Base index of a ticket (id bytes and creation timestamp), or None."""
+        created = self.columns["created"]
+        index = bisect.bisect_left(created, created_ts)
+        while index < len(created) and created[index] == created_ts:
+            if self.ids[index * ID_SIZE:(index + 1) * ID_SIZE] == ticket_id:
+                return index
+            index += 1
+        return None
+
+    def _window(self, start_ts, stop_ts):
+        created = self.columns["created"]
+        return bisect.bisect_left(created, start_ts), bisect.bisect_left(created, stop_ts)
+
+    def _corrections(self, low, high, start_ts, stop_ts):
+        """`(sign, row)` pairs turning the base rows `[low, high)` into the current ones."""
+        first, last = bisect.bisect_left(self.superseded, low), bisect.bisect_left(self.superseded, high)
+        for index in self.superseded[first:last]:
+            yield -1, self._row(index)
+        first = bisect.bisect_left(self._delta_created, start_ts)
+        last = bisect.bisect_left(self._delta_created, stop_ts)
+        for row in self.delta_rows[first:last]:
+            yield 1, row
+
+    def totals(self, start_dt, end_dt):
+        """Tickets per status and measure sums of the tickets created in `[start_dt, end_dt]`."""
+        start_ts, stop_ts = start_dt.timestamp(), _stop(end_dt)
+        low, high = self._window(start_ts, stop_ts)
+        statuses = bytes(self.columns["status"][low:high])
+        by_status = {status: statuses.count(code) for status, code in STATUS_CODES.items()}
+        measures = {name: column[high] - column[low] for name, column in self.sums.items()}
+        for sign, row in self._corrections(low, high, start_ts, stop_ts):
+            by_status[STATUSES[row[2]]] += sign
+            for name, value in zip(MEASURES, row[4:]):
+                measures[name] += sign * value
+        return {"tickets": sum(by_status.values()), "by_status": by_status, **measures}
+
+    def tickets_by_bucket(self, start_dt, end_dt, bucket_days):
+        """Tickets created per bucket (`bucket_starts` of the window), as a list."""
+        edges = [start_dt.timestamp()]
+        edges += [timezone.make_aware(datetime.combine(day, time.min)).timestamp() for day in bucket_days[1:]]
+        edges.append(_stop(end_dt))
+        created = self.columns["created"]
+        positions = [bisect.bisect_left(created, edge) for edge in edges]
+        counts = [high - low for low, high in zip(positions, positions[1:])]
+        for sign, row in self._corrections(positions[0], positions[-1], edges[0], edges[-1]):
+            counts[bisect.bisect_right(edges, row[1]) - 1] += sign
+        return counts
+
+    def by_assignee(self, start_dt, end_dt):
+        """`{assignee id: [assigned, resolved]}` of the tickets created in `[start_dt, end_dt]`."""
+        start_ts, stop_ts = start_dt.timestamp(), _stop(end_dt)
+        low, high = self._window(start_ts, stop_ts)
+        resolved_code = STATUS_CODES[TicketStatus.RESOLVED]
+        totals = {}
+        for code, count in Counter(self.columns["assignee_status"][low:high]).items():
+            assignee = self.assignees[code >> STATUS_BITS]
+            if assignee is not None:
+                current = totals.setdefault(assignee, [0, 0])
+                current[0] += count
+                current[1] += count if code & STATUS_MASK == resolved_code else 0
+        for sign, row in self._corrections(low, high, start_ts, stop_ts):
+            if row[3] is not None:
+                current = totals.setdefault(row[3], [0, 0])
+                current[0] += sign
+                current[1] += sign if row[2] == resolved_code else 0
+        return {assignee: counts for assignee, counts in totals.items() if counts[0]}
+
+
+_loaded = None
+_load_lock = threading.Lock()
+
+
+def _read_state(root):
+    try:
+        return json.loads((root / STATE_FILE).read_text())
+    except FileNotFoundError:
+        return None
+
+
+def _file_key(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def _invalidated(root, snapshot):
+    """Whether `invalidate_snapshot` ran after the base of `snapshot` was exported."""
+    try:
+        invalidated_at = datetime.fromisoformat((root / INVALIDATED_FILE).read_text())
+    except FileNotFoundError:
+        return False
+    return invalidated_at >= snapshot.built_at
+
+
+def invalidate_snapshot():
+    """
+    Mark the current base as stale after writes the delta cannot see (rows
+    with backdated `updated_at`): readers fall back to the database and the
+    next refresh exports a new base. No lock: an export already running is
+    invalidated too, since it started before this call.
+    """
+    root = _root()
+    if not root.is_dir():
+        return
+    path = root / f".{INVALIDATED_FILE}.{os.getpid()}.tmp"
+    path.write_text(timezone.now().isoformat())
+    os.replace(path, root / INVALIDATED_FILE)
+
+
+def current_snapshot():
+    """
+    Snapshot to answer the analytics queries with (loaded once per process
+    and state), or None: disabled, not exported yet, invalidated, unreadable
+    or not refreshed within ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS.
+    """
+    global _loaded
+    if not settings.ANALYTICS_SNAPSHOT_ENABLED:
+        return None
+    root = _root()
+    state_key = _file_key(root / STATE_FILE)
+    if state_key is None:
+        return None
+    key = (str(root), state_key, _file_key(root / INVALIDATED_FILE))
+    with _load_lock:
+        if _loaded is None or _loaded[0] != key:
+            try:
+                snapshot = Snapshot(root, _read_state(root))
+                _loaded = (key, None if _invalidated(root, snapshot) else snapshot)
+            except (OSError, ValueError, KeyError, TypeError) as exc:
+                # Swapped while loading (old generation removed) or damaged: use the database.
+                logger.warning(f"Snapshot analitico indisponivel: {exc}")
+                return None
+        snapshot = _loaded[1]
+    if snapshot is None:
+        return None
+    if snapshot.refreshed_at < timezone.now() - timedelta(seconds=settings.ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS):
+        return None
+    return snapshot
+
+
+def _rows(tickets):
+    """Snapshot rows of a `Ticket` queryset, by creation instant."""
+    calendar = get_calendar()
+    rows = ticket_rows(tickets, "id").order_by("created_at").iterator(chunk_size=settings.STATUS_FLOW_CHUNK_SIZE)
+    for ticket_id, created_at, status, _, _, assigned_to_id, _, closed_at, first_response_at in rows:
+        resolved = status == TicketStatus.RESOLVED and closed_at is not None
+        yield (
+            ticket_id.bytes,
+            created_at.timestamp(),
+            STATUS_CODES[status],
+            str(assigned_to_id) if assigned_to_id else None,
+            int(resolved),
+            (closed_at - created_at).total_seconds() if resolved else 0.0,
+            calendar.seconds_between(created_at, closed_at) if resolved else 0.0,
+            int(first_response_at is not None),
+            (first_response_at - created_at).total_seconds() if first_response_at else 0.0,
+            calendar.seconds_between(created_at, first_response_at) if first_response_at else 0.0,
+        )
+
+
+def _write_state(root, state):
+    path = root / f".{STATE_FILE}.tmp"
+    path.write_text(json.dumps(state))
+    os.replace(path, root / STATE_FILE)
+
+
+@contextmanager
+def _writer_lock(root):
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / ".lock", "w") as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        yield
+
+
+def _export(root, previous):
+    """Write a new base generation from `Ticket` and switch the readers to it."""
+    now = timezone.now()
+    generation = f"gen-{now:%Y%m%d%H%M%S%f}"
+    directory = root / generation
+    directory.mkdir()
+
+    ids, assignees = bytearray(), {}
+    columns = {name: array.array(typecode) for name, typecode in COLUMNS.items()}
+    sums = {name: array.array(typecode, [0]) for name, typecode in MEASURES.items()}
+    for ticket_id, created_ts, status, assignee, *measures in _rows(Ticket.objects.all()):
+        ids += ticket_id
+        code = assignees.setdefault(assignee, len(assignees) + 1) if assignee else 0
+        columns["created"].append(created_ts)
+        columns["status"].append(status)
+        columns["assignee_status"].append(code << STATUS_BITS | status)
+        for column, value in zip(sums.values(), measures):
+            column.append(column[-1] + value)
+
+    (directory / "ids.bin").write_bytes(ids)
+    for name, values in {**columns, **sums}.items():
+        with open(directory / f"{name}.bin", "wb") as file:
+            values.tofile(file)
+    meta = {
+        # Tickets saved after this instant are re-read by the deltas (transactions in flight).
+        "position": (now - timedelta(seconds=settings.TICKET_ROLLUP_LAG_SECONDS)).isoformat(),
+        "built_at": now.isoformat(),
+        "rows": len(columns["created"]),
+        "assignees": list(assignees),
+    }
+    (directory / "meta.json").write_text(json.dumps(meta))
+    _write_state(root, {"generation": generation, "delta": None, "refreshed_at": now.isoformat()})
+
+    # Keep the previous generation for the readers still loading it.
+    keep = {generation, previous["generation"] if previous else None}
+    for path in root.glob("gen-*"):
+        if path.name not in keep:
+            shutil.rmtree(path, ignore_errors=True)
+    logger.info(f"Snapshot analitico exportado: {generation} ({meta['rows']} tickets)")
+    return meta["rows"]
+
+
+def _delta(snapshot):
+    """Delta document of the tickets changed since the base export."""
+    answered = TicketMessage.objects.filter(created_at__gt=snapshot.position).values("ticket_id")
+    rows = list(_rows(Ticket.objects.filter(Q(updated_at__gt=snapshot.position) | Q(id__in=answered))))
+    gone = ArchivedTicket.objects.filter(archived_at__gt=snapshot.position).values_list("id", "created_at")
+    superseded = {snapshot.find(row[0], row[1]) for row in rows}
+    superseded.update(snapshot.find(ticket_id.bytes, created_at.timestamp()) for ticket_id, created_at in gone)
+    superseded.discard(None)
+    return {"rows": [(row[0].hex(), *row[1:]) for row in rows], "superseded": sorted(superseded)}
+
+
+def refresh_snapshot(rebuild=False):
+    """
+    Bring the snapshot up to date: a new delta over the current base, or a
+    new base export (first run, `rebuild`, delta past its limits). Returns
+    the number of delta rows / exported tickets, or None when disabled.
+    """
+    if not settings.ANALYTICS_SNAPSHOT_ENABLED:
+        return None
+    root = _root()
+    with _writer_lock(root):
+        state = _read_state(root)
+        if rebuild or state is None:
+            return _export(root, state)
+        now = timezone.now()
+        try:
+            snapshot = Snapshot(root, state)
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning(f"Snapshot analitico ilegivel, exportando novamente: {exc}")
+            return _export(root, None)
+        if snapshot.built_at < now - timedelta(seconds=settings.ANALYTICS_SNAPSHOT_REBUILD_SECONDS):
+            return _export(root, state)
+        if _invalidated(root, snapshot):
+            return _export(root, state)
+        delta = _delta(snapshot)
+        if len(delta["rows"]) + len(delta["superseded"]) > settings.ANALYTICS_SNAPSHOT_MAX_DELTA:
+            return _export(root, state)
+
+        directory = root / state["generation"]
+        name = f"delta-{now:%Y%m%d%H%M%S%f}.json"
+        (directory / name).write_text(json.dumps(delta))
+        _write_state(root, {**state, "delta": name, "refreshed_at": now.isoformat()})
+        if state["delta"]:
+            (directory / state["delta"]).unlink(missing_ok=True)
+    logger.info(f"Snapshot analitico atualizado: {len(delta['rows'])} tickets no delta")
+    return len(delta["rows"])
@@ -0,0 +1,245 @@
+"""
+Time-in-status and status transitions, derived from `TicketEvent`.
+
+Status events (creation, status change, resolution, reopening, cancellation)
+are read in one streaming pass ordered by `(ticket, created_at)`: each event
+closes the spell of the ticket in its previous status and is one transition.
+Spells are aggregated as count + sum + a log-scale histogram (percentiles
+are estimated from it), so the same `StatusFlow` accumulator serves the
+live pass and the daily rollups.
+
+`refresh_status_rollups` (Celery beat) adds the events committed since the
+last checkpoint to `StatusTimeRollup` / `StatusTransitionRollup`. The
+endpoints read the rollups up to the checkpoint and stream only the events
+after it.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from tickets.models import TicketEvent, TicketEventType, TicketStatus
+
+from .histograms import HISTOGRAM_SIZE, PERCENTILES, bucket_index, histogram_percentile
+from .models import RollupCheckpoint, StatusTimeRollup, StatusTransitionRollup
+
+logger = logging.getLogger("helpdesk")
+
+CHECKPOINT_NAME = "status-flow"
+
+STATUS_EVENT_TYPES = (
+    TicketEventType.CREATED,
+    TicketEventType.STATUS_CHANGED,
+    TicketEventType.RESOLVED,
+    TicketEventType.REOPENED,
+    TicketEventType.CANCELED,
+)
+
+
+def status_events(ticket_ids, until):
+    """Status events of the given tickets up to `until`, in replay order."""
+    return (
+        TicketEvent.objects.filter(
+            ticket_id__in=ticket_ids,
+            event_type__in=STATUS_EVENT_TYPES,
+            created_at__lte=until,
+        )
+        .order_by("ticket_id", "created_at")
+        .values_list("ticket_id", "to_value", "created_at")
+    )
+
+
+def touched_tickets(after, until):
+    """Subquery of tickets with status events in `(after, until]` (`after` None: from the start)."""
+    events = TicketEvent.objects.filter(event_type__in=STATUS_EVENT_TYPES, created_at__lte=until)
+    if after is not None:
+        events = events.filter(created_at__gt=after)
+    return events.values("ticket_id")
+
+
+class StatusFlow:
+    """
+    Accumulates spells and transitions per local day. Feed it the rows of
+    `status_events` in order; only events after `after` are counted, older
+    ones only set the status a ticket was in.
+    """
+
+    def __init__(self, after=None):
+        self.after = after
+        self.spells = defaultdict(lambda: [0, 0.0, [0] * HISTOGRAM_SIZE])
+        self.transitions = defaultdict(int)
+        self._ticket = self._status = self._since = None
+
+    def feed(self, ticket_id, status, at):
+        if ticket_id != self._ticket:
+            self._ticket, self._status, self._since = ticket_id, None, None
+        if self.after is None or at > self.after:
+            day = timezone.localtime(at).date()
+            if self._status is not None and self._status != status:
+                seconds = max((at - self._since).total_seconds(), 0)
+                current = self.spells[(day, self._status)]
+                current[0] += 1
+                current[1] += seconds
+                current[2][bucket_index(seconds)] += 1
+                self.transitions[(day, self._status, status)] += 1
+        if self._status != status:
+            self._status, self._since = status, at
+
+    def add_spell(self, day, status, spells, total_seconds, histogram):
+        current = self.spells[(day, status)]
+        current[0] += spells
+        current[1] += total_seconds
+        current[2] = [a + b for a, b in zip(current[2], histogram)]
+
+    def add_rollups(self, start_day, end_day):
+        """Add the stored rollups of `[start_day, end_day]`."""
+        for row in StatusTimeRollup.objects.filter(day__range=(start_day, end_day)):
+            self.add_spell(row.day, row.status, row.spells, row.total_seconds, row.histogram)
+        for row in StatusTransitionRollup.objects.filter(day__range=(start_day, end_day)):
+            self.transitions[(row.day, row.from_status, row.to_status)] += row.transitions
+
+    def time_in_status(self):
+        totals = defaultdict(lambda: [0, 0.0, [0] * HISTOGRAM_SIZE])
+        for (_, status), (spells, seconds, histogram) in self.spells.items():
+            current = totals[status]
+            current[0] += spells
+            current[1] += seconds
+            current[2] = [a + b for a, b in zip(current[2], histogram)]
+
+        results = []
+        for status, _ in TicketStatus.choices:
+            spells, seconds, histogram = totals[status]
+            avg_seconds = seconds / spells if spells else None
+            item = {
+                "status": status,
+                "spells": spells,
+                "average_seconds": round(avg_seconds, 2) if avg_seconds is not None else None,
+                "average_hours": round(avg_seconds / 3600, 2) if avg_seconds is not None else None,
+            }
+            for percentile in PERCENTILES:
+                value = histogram_percentile(histogram, percentile)
+                item[f"p{percentile}_seconds"] = round(value, 2) if value is not None else None
+            results.append(item)
+        return results
+
+    def transition_matrix(self):
+        statuses = [status for status, _ in TicketStatus.choices]
+        matrix = {source: dict.fromkeys(statuses, 0) for source in statuses}
+        for (_, source, target), count in self.transitions.items():
+            if source in matrix and target in matrix[source]:
+                matrix[source][target] += count
+        resolved = sum(row[TicketStatus.RESOLVED] for row in matrix.values())
+        reopened = sum(
+            count for target, count in matrix[TicketStatus.RESOLVED].items() if target != TicketStatus.RESOLVED
+        )
+        return {
+            "statuses": statuses,
+            "matrix": matrix,
+            "total_transitions": sum(sum(row.values()) for row in matrix.values()),
+            "resolved": resolved,
+            "reopened": reopened,
+            "reopen_rate": round(reopened / resolved, 4) if resolved else None,
+        }
+
+
+def stream_into(flow, after, until):
+    """One pass over the status events of the tickets touched in `(after, until]`."""
+    rows = status_events(touched_tickets(after, until), until)
+    for ticket_id, status, at in rows.iterator(chunk_size=settings.STATUS_FLOW_CHUNK_SIZE):
+        flow.feed(ticket_id, status, at)
+    return flow
+
+
+def checkpoint_position():
+    return RollupCheckpoint.objects.filter(name=CHECKPOINT_NAME).values_list("position", flat=True).first()
+
+
+def status_flow_in_window(start_dt, end_dt):
+    """
+    `StatusFlow` of the events in `[start_dt, end_dt]`: rollups up to the
+    checkpoint, then one live pass over the events after it.
+    """
+    after = start_dt - timedelta(microseconds=1)
+    position = checkpoint_position()
+    rollup_days = None
+    if position is not None and position >= start_dt:
+        rollup_days = (timezone.localtime(start_dt).date(), timezone.localtime(min(position, end_dt)).date())
+        after = position
+
+    flow = StatusFlow(after=after)
+    if rollup_days:
+        flow.add_rollups(*rollup_days)
+    if after < end_dt:
+        stream_into(flow, after, end_dt)
+    return flow
+
+
+def _save_rollups(flow):
+    days = {day for day, _ in flow.spells} | {day for day, _, _ in flow.transitions}
+    spells = {
+        (row.day, row.status): row for row in StatusTimeRollup.objects.select_for_update().filter(day__in=days)
+    }
+    transitions = {
+        (row.day, row.from_status, row.to_status): row
+        for row in StatusTransitionRollup.objects.select_for_update().filter(day__in=days)
+    }
+
+    new_spells, changed_spells = [], []
+    for (day, status), (count, seconds, histogram) in flow.spells.items():
+        row = spells.get((day, status))
+        if row is None:
+            new_spells.append(
+                StatusTimeRollup(day=day, status=status, spells=count, total_seconds=seconds, histogram=histogram)
+            )
+            continue
+        row.spells += count
+        row.total_seconds += seconds
+        row.histogram = [a + b for a, b in zip(row.histogram, histogram)]
+        changed_spells.append(row)
+    StatusTimeRollup.objects.bulk_create(new_spells)
+    StatusTimeRollup.objects.bulk_update(changed_spells, ["spells", "total_seconds", "histogram"])
+
+    new_transitions, changed_transitions = [], []
+    for (day, source, target), count in flow.transitions.items():
+        row = transitions.get((day, source, target))
+        if row is None:
+            new_transitions.append(
+                StatusTransitionRollup(day=day, from_status=source, to_status=target, transitions=count)
+            )
+            continue
+        row.transitions += count
+        changed_transitions.append(row)
+    StatusTransitionRollup.objects.bulk_create(new_transitions)
+    StatusTransitionRollup.objects.bulk_update(changed_transitions, ["transitions"])
+
+
+def refresh_status_rollups(until=None):
+    """
+    Add the status events up to `until` (default: now minus
+    `STATUS_FLOW_LAG_SECONDS`, for transactions still in flight) not yet in
+    the rollups. Returns the new checkpoint position.
+    """
+    until = until or timezone.now() - timedelta(seconds=settings.STATUS_FLOW_LAG_SECONDS)
+    with transaction.atomic():
+        checkpoint = RollupCheckpoint.objects.select_for_update().filter(name=CHECKPOINT_NAME).first()
+        after = checkpoint.position if checkpoint else None
+        if after is not None and after >= until:
+            return after
+        flow = stream_into(StatusFlow(after=after), after, until)
+        _save_rollups(flow)
+        RollupCheckpoint.objects.update_or_create(name=CHECKPOINT_NAME, defaults={"position": until})
+    logger.info(f"Status flow rollups atualizados ate {until.isoformat()} ({len(flow.transitions)} chaves)")
+    return until
+
+
+def rebuild_status_rollups():
+    """Drop the rollups and rebuild them from every stored event."""
+    with transaction.atomic():
+        StatusTimeRollup.objects.all().delete()
+        StatusTransitionRollup.objects.all().delete()
+        RollupCheckpoint.objects.filter(name=CHECKPOINT_NAME).delete()
+    return refresh_status_rollups()
@@ -0,0 +1,45 @@
+"""
+Asynchronous analytics tasks.
+"""
+
+from celery import shared_task
+
+from .backlog import snapshot_backlog
+from .rollups import refresh_live_rollups
+from .snapshot import refresh_snapshot
+from .status_flow import refresh_status_rollups
+
+
+@shared_task(ignore_result=True)
+def refresh_status_rollups_task():
+    """
+    Periodic (Celery beat): add the new status events to the time-in-status
+    and transition rollups.
+    """
+    refresh_status_rollups()
+
+
+@shared_task(ignore_result=True)
+def refresh_live_rollups_task():
+    """
+    Periodic (Celery beat): recompute the live ticket rollups of the days
+    changed since the last run.
+    """
+    refresh_live_rollups()
+
+
+@shared_task(ignore_result=True)
+def refresh_analytics_snapshot_task():
+    """
+    Periodic (Celery beat): update the memory-mapped analytics snapshot
+    (no-op unless ANALYTICS_SNAPSHOT_ENABLED).
+    """
+    refresh_snapshot()
+
+
+@shared_task(ignore_result=True)
+def snapshot_backlog_task():
+    """
+    Periodic (Celery beat, end of the day): store today's backlog snapshot.
+    """
+    snapshot_backlog()
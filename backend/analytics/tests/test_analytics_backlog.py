@@ -0,0 +1,84 @@
+from datetime import datetime, time, timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analytics.backlog import backfill_backlog, snapshot_backlog
+from analytics.models import BacklogSnapshot
+from core.models import User, UserRole
+from tickets.models import Ticket, TicketEvent, TicketStatus
+from tickets.services import assign_ticket, change_status, create_ticket
+
+
+class BacklogTests(APITestCase):
+    def setUp(self):
+        self.moderator = User.objects.create_user(
+            email="moderator@example.com",
+            password="StrongPass123!",
+            role=UserRole.MODERATOR,
+        )
+        self.ticket = create_ticket(
+            user=self.moderator, title="Chamado", description="Descricao", priority="HIGH", category="GENERAL"
+        )
+        assign_ticket(ticket=self.ticket, assigned_to=self.moderator, triggered_by=self.moderator)
+        change_status(ticket=self.ticket, new_status=TicketStatus.IN_PROGRESS, triggered_by=self.moderator)
+        change_status(ticket=self.ticket, new_status=TicketStatus.RESOLVED, triggered_by=self.moderator)
+        self.other = create_ticket(
+            user=self.moderator, title="Outro", description="Descricao", priority="LOW", category="GENERAL"
+        )
+
+        # Day 0 noon: created; day 1: assigned and in progress; day 3: resolved.
+        self.day0 = timezone.localdate() - timedelta(days=5)
+        noon = timezone.make_aware(datetime.combine(self.day0, time(12)))
+        Ticket.objects.filter(id=self.ticket.id).update(created_at=noon)
+        for event, days in zip(TicketEvent.objects.filter(ticket=self.ticket).order_by("created_at"), (0, 1, 1, 3)):
+            TicketEvent.objects.filter(id=event.id).update(created_at=noon + timedelta(days=days))
+        self.client.force_authenticate(user=self.moderator)
+
+    def counts(self, day):
+        return {
+            (row.status, row.priority, row.assigned_to_id): row.tickets
+            for row in BacklogSnapshot.objects.filter(day=day)
+        }
+
+    def test_backfill_replays_events(self):
+        backfill_backlog(start_day=self.day0)
+        self.assertEqual(self.counts(self.day0), {("OPEN", "HIGH", None): 1})
+        self.assertEqual(self.counts(self.day0 + timedelta(days=2)), {("IN_PROGRESS", "HIGH", self.moderator.id): 1})
+        self.assertEqual(self.counts(self.day0 + timedelta(days=3)), {})
+        # Created today: only in today's snapshot.
+        self.assertEqual(self.counts(self.day0 + timedelta(days=4)), {})
+
+        snapshot_backlog()
+        self.assertEqual(self.counts(timezone.localdate()), {("OPEN", "LOW", None): 1})
+
+    def test_deleted_assignees_count_as_unassigned(self):
+        assignee = User.objects.create_user(
+            email="assignee@example.com", password="StrongPass123!", role=UserRole.MODERATOR
+        )
+        assign_ticket(ticket=self.other, assigned_to=assignee, triggered_by=self.moderator)
+        snapshot_backlog()
+        backfill_backlog(start_day=self.day0, end_day=timezone.localdate())
+        self.assertEqual(self.counts(timezone.localdate()), {("OPEN", "LOW", assignee.id): 1})
+
+        assignee.delete()
+        self.assertEqual(self.counts(timezone.localdate()), {("OPEN", "LOW", None): 1})
+        # The ASSIGNED event still names the deleted user.
+        backfill_backlog(start_day=self.day0, end_day=timezone.localdate())
+        self.assertEqual(self.counts(timezone.localdate()), {("OPEN", "LOW", None): 1})
+
+    def test_trend_endpoint_reads_snapshots(self):
+        backfill_backlog(start_day=self.day0)
+        url = reverse("analytics:backlog-trend")
+        response = self.client.get(url, {"start_date": self.day0.isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual([row["total"] for row in results], [1, 1, 1])
+        self.assertEqual(results[1]["by_status"], {"OPEN": 0, "IN_PROGRESS": 1, "WAITING_USER": 0})
+
+        response = self.client.get(url, {"start_date": self.day0.isoformat(), "assigned_to": "none"})
+        self.assertEqual(len(response.data["results"]), 1)
+        response = self.client.get(url, {"priority": "URGENT"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,34 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import User, UserRole
+from tickets.services import create_ticket
+
+
+class AnalyticsConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.moderator = User.objects.create_user(
+            email="moderator@example.com",
+            password="StrongPass123!",
+            role=UserRole.MODERATOR,
+        )
+
+    def test_analytics_etag_invalidated_by_ticket_mutation(self):
+        self.client.force_authenticate(user=self.moderator)
+        url = reverse("analytics:tickets-by-status")
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_ticket(
+                user=self.moderator,
+                title="Novo chamado",
+                description="Descricao",
+                priority="LOW",
+                category="GENERAL",
+            )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
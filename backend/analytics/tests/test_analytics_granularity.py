@@ -0,0 +1,71 @@
+from datetime import date, datetime, time
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analytics.models import BacklogSnapshot
+from analytics.time_buckets import bucket_starts, resolve_granularity
+from core.models import User, UserRole
+from tickets.models import Ticket
+from tickets.services import create_ticket
+
+
+class GranularityTests(APITestCase):
+    def setUp(self):
+        self.moderator = User.objects.create_user(
+            email="moderator@example.com",
+            password="StrongPass123!",
+            role=UserRole.MODERATOR,
+        )
+        # Monday 2025-03-03, Sunday 2025-03-09 23:30 (local) and Monday 2025-03-24.
+        for day, hour in ((date(2025, 3, 3), 9), (date(2025, 3, 9), 23), (date(2025, 3, 24), 12)):
+            ticket = create_ticket(
+                user=self.moderator, title="Chamado", description="Descricao", priority="LOW", category="GENERAL"
+            )
+            created_at = timezone.make_aware(datetime.combine(day, time(hour, 30)))
+            Ticket.objects.filter(id=ticket.id).update(created_at=created_at)
+        self.client.force_authenticate(user=self.moderator)
+
+    def get(self, url_name, **params):
+        response = self.client.get(reverse(url_name), {"start_date": "2025-03-01", "end_date": "2025-03-31", **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_tickets_by_period_buckets_are_zero_filled(self):
+        data = self.get("analytics:tickets-by-period")
+        self.assertEqual((data["granularity"], len(data["results"])), ("day", 31))
+        self.assertEqual(sum(item["total"] for item in data["results"]), 3)
+
+        data = self.get("analytics:tickets-by-period", granularity="week")
+        self.assertEqual(
+            [(item["date"], item["total"]) for item in data["results"]],
+            [
+                ("2025-02-24", 0),
+                ("2025-03-03", 2),
+                ("2025-03-10", 0),
+                ("2025-03-17", 0),
+                ("2025-03-24", 1),
+                ("2025-03-31", 0),
+            ],
+        )
+        data = self.get("analytics:tickets-by-period", granularity="month")
+        self.assertEqual(data["results"], [{"date": "2025-03-01", "total": 3}])
+
+        response = self.client.get(reverse("analytics:tickets-by-period"), {"granularity": "year"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_auto_granularity(self):
+        self.assertEqual(resolve_granularity("auto", date(2025, 1, 1), date(2025, 3, 31)), "day")
+        self.assertEqual(resolve_granularity("auto", date(2025, 1, 1), date(2025, 12, 31)), "week")
+        self.assertEqual(resolve_granularity("auto", date(2023, 1, 1), date(2025, 12, 31)), "month")
+        self.assertEqual(len(bucket_starts(date(2023, 1, 15), date(2025, 12, 31), "month")), 36)
+
+    def test_backlog_trend_reports_last_snapshot_of_bucket(self):
+        for day, tickets in ((date(2025, 3, 3), 5), (date(2025, 3, 8), 7), (date(2025, 3, 12), 4)):
+            BacklogSnapshot.objects.create(day=day, status="OPEN", priority="LOW", tickets=tickets)
+        data = self.get("analytics:backlog-trend", granularity="week")
+        self.assertEqual(
+            [(item["date"], item["total"]) for item in data["results"]], [("2025-03-03", 7), ("2025-03-10", 4)]
+        )
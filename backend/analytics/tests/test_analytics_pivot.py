@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analytics.models import TicketDailyRollup
+from analytics.rollups import refresh_live_rollups
+from core.models import User, UserRole
+from tickets.archive import archive_batch
+from tickets.models import Ticket, TicketStatus
+from tickets.services import add_message, cancel_ticket, change_status, create_ticket
+
+
+class PivotTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@example.com", password="StrongPass123!")
+        self.moderator = User.objects.create_user(
+            email="moderator@example.com",
+            password="StrongPass123!",
+            role=UserRole.MODERATOR,
+        )
+        self.resolved = create_ticket(
+            user=self.user, title="Resolvido", description="Descricao", priority="HIGH", category="BILLING"
+        )
+        add_message(ticket=self.resolved, author=self.moderator, message="Resposta")
+        change_status(ticket=self.resolved, new_status=TicketStatus.RESOLVED, triggered_by=self.moderator)
+        self.open = create_ticket(
+            user=self.moderator, title="Aberto", description="Descricao", priority="HIGH", category="GENERAL"
+        )
+        create_ticket(user=self.user, title="Outro", description="Descricao", priority="LOW", category="GENERAL")
+        # Resolved two hours after creation.
+        created_at = timezone.now() - timedelta(hours=2)
+        Ticket.objects.filter(id=self.resolved.id).update(created_at=created_at)
+        self.refresh()
+        self.client.force_authenticate(user=self.moderator)
+        self.url = reverse("analytics:pivot")
+
+    def refresh(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            refresh_live_rollups(until=timezone.now())
+
+    def pivot(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["results"]
+
+    def test_groups_live_rollups(self):
+        results = self.pivot(dimensions="priority", measures="count,resolved,p50_resolution_seconds")
+        self.assertEqual([row["priority"] for row in results], ["HIGH", "LOW"])
+        self.assertEqual([(row["count"], row["resolved"]) for row in results], [(2, 1), (1, 0)])
+        self.assertAlmostEqual(results[0]["p50_resolution_seconds"], 7200, delta=7200 * 0.2)
+        self.assertIsNone(results[1]["p50_resolution_seconds"])
+
+        results = self.pivot(dimensions="creator,status")
+        self.assertEqual(
+            {(row["creator_email"], row["status"]): row["count"] for row in results},
+            {
+                ("user@example.com", "OPEN"): 1,
+                ("user@example.com", "RESOLVED"): 1,
+                ("moderator@example.com", "OPEN"): 1,
+            },
+        )
+        self.assertEqual(self.pivot(measures="count,avg_first_response_seconds")[0]["count"], 3)
+
+    def test_refresh_and_archive_keep_totals(self):
+        cancel_ticket(ticket=self.open, triggered_by=self.moderator)
+        self.assertEqual(len(self.pivot(dimensions="status")), 2)
+        self.refresh()
+        statuses = {row["status"]: row["count"] for row in self.pivot(dimensions="status")}
+        self.assertEqual(statuses, {"CANCELED": 1, "OPEN": 1, "RESOLVED": 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            archive_batch([self.resolved.id, self.open.id], timezone.now() + timedelta(days=1))
+        self.assertEqual(TicketDailyRollup.objects.filter(archived=True).count(), 2)
+        results = self.pivot(dimensions="status", measures="count,resolved,p50_resolution_seconds")
+        self.assertEqual({row["status"]: row["count"] for row in results}, statuses)
+        self.assertAlmostEqual(results[-1]["p50_resolution_seconds"], 7200, delta=7200 * 0.2)
+
+    @override_settings(PIVOT_MAX_GROUPS=2)
+    def test_rejects_invalid_and_unbounded_queries(self):
+        for params in (
+            {"dimensions": "title"},
+            {"measures": "sum"},
+            {"dimensions": "day,month"},
+            {"dimensions": "day,status,priority,category"},
+            {"dimensions": "creator,status"},
+        ):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
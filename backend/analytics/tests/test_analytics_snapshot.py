@@ -0,0 +1,116 @@
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analytics.snapshot import current_snapshot, refresh_snapshot
+from core.models import User, UserRole
+from tickets.archive import archive_batch
+from tickets.imports import run_import
+from tickets.models import ImportJob, Ticket, TicketStatus
+from tickets.services import add_message, assign_ticket, change_status, create_ticket
+
+ENDPOINTS = (
+    ("analytics:tickets-by-period", {"granularity": "week"}),
+    ("analytics:tickets-by-status", {}),
+    ("analytics:tickets-by-moderator", {}),
+    ("analytics:average-response-time", {}),
+    ("analytics:average-resolution-time", {}),
+)
+
+
+class AnalyticsSnapshotTests(APITestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        settings_override = override_settings(ANALYTICS_SNAPSHOT_ENABLED=True, ANALYTICS_SNAPSHOT_ROOT=self.root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(email="user@example.com", password="StrongPass123!")
+        self.moderator = User.objects.create_user(
+            email="moderator@example.com",
+            password="StrongPass123!",
+            role=UserRole.MODERATOR,
+        )
+        self.tickets = []
+        for days_ago in (0, 3, 3, 10):
+            ticket = create_ticket(
+                user=self.user, title="Chamado", description="Descricao", priority="LOW", category="GENERAL"
+            )
+            created_at = timezone.now() - timedelta(days=days_ago, hours=2)
+            Ticket.objects.filter(id=ticket.id).update(created_at=created_at)
+            self.tickets.append(Ticket.objects.get(id=ticket.id))
+        resolved = self.tickets[1]
+        assign_ticket(ticket=resolved, assigned_to=self.moderator, triggered_by=self.moderator)
+        add_message(ticket=resolved, author=self.moderator, message="Resposta")
+        change_status(ticket=resolved, new_status=TicketStatus.RESOLVED, triggered_by=self.moderator)
+        self.client.force_authenticate(user=self.moderator)
+
+    def responses(self):
+        results = []
+        for url_name, params in ENDPOINTS:
+            response = self.client.get(reverse(url_name), params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            results.append(response.data)
+        return results
+
+    def assert_matches_database(self):
+        self.assertIsNotNone(current_snapshot())
+        from_snapshot = self.responses()
+        with override_settings(ANALYTICS_SNAPSHOT_ENABLED=False):
+            self.assertEqual(from_snapshot, self.responses())
+
+    def test_export_and_delta_match_database(self):
+        self.assertIsNone(current_snapshot())
+        self.assertEqual(refresh_snapshot(), 4)
+        self.assert_matches_database()
+        self.assertEqual(self.responses()[1]["results"][3], {"status": "RESOLVED", "total": 1})
+
+        open_ticket = self.tickets[2]
+        assign_ticket(ticket=open_ticket, assigned_to=self.moderator, triggered_by=self.moderator)
+        add_message(ticket=open_ticket, author=self.moderator, message="Resposta")
+        create_ticket(user=self.user, title="Novo", description="Descricao", priority="HIGH", category="GENERAL")
+        with self.captureOnCommitCallbacks(execute=True):
+            archive_batch([self.tickets[3].id], timezone.now() + timedelta(days=1))
+        refresh_snapshot()
+        self.assertEqual(len(current_snapshot()), 4)
+        self.assert_matches_database()
+        self.assertEqual(self.responses()[2]["results"][0]["total_assigned"], 2)
+
+    def test_backdated_import_invalidates_the_base(self):
+        refresh_snapshot()
+        path = Path(self.root) / "tickets.ndjson"
+        created_at = (timezone.now() - timedelta(days=5)).isoformat()
+        record = {"title": "Legado", "created_by_email": self.user.email, "created_at": created_at}
+        path.write_text(json.dumps(record))
+        job = run_import(ImportJob.objects.create(resource="tickets", input_format="ndjson", file_path=str(path)))
+        self.assertEqual(job.rows_processed, 1)
+
+        # The delta cannot see the backdated row: readers use the database until a new export.
+        self.assertIsNone(current_snapshot())
+        self.assertEqual(self.responses()[1]["results"][0], {"status": "OPEN", "total": 4})
+        self.assertEqual(refresh_snapshot(), 5)
+        self.assert_matches_database()
+
+    def test_rebuild_and_staleness(self):
+        refresh_snapshot()
+        generation = current_snapshot().version
+        with override_settings(ANALYTICS_SNAPSHOT_MAX_DELTA=0):
+            change_status(ticket=self.tickets[0], new_status=TicketStatus.IN_PROGRESS, triggered_by=self.moderator)
+            refresh_snapshot()
+        self.assertNotEqual(current_snapshot().version, generation)
+        self.assertEqual(current_snapshot().delta_rows, [])
+        self.assert_matches_database()
+
+        with override_settings(ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS=-1):
+            self.assertIsNone(current_snapshot())
+        shutil.rmtree(self.root)
+        self.assertIsNone(current_snapshot())
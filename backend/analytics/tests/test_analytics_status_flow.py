@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from analytics.histograms import DURATION_BUCKETS, HISTOGRAM_SIZE, histogram_percentile
+from analytics.models import StatusTimeRollup
+from analytics.status_flow import refresh_status_rollups
+from core.models import User, UserRole
+from tickets.models import TicketEvent, TicketStatus
+from tickets.services import change_status, create_ticket
+
+
+class StatusFlowTests(APITestCase):
+    def setUp(self):
+        self.moderator = User.objects.create_user(
+            email="moderator@example.com",
+            password="StrongPass123!",
+            role=UserRole.MODERATOR,
+        )
+        ticket = create_ticket(
+            user=self.moderator, title="Chamado", description="Descricao", priority="LOW", category="GENERAL"
+        )
+        steps = (TicketStatus.IN_PROGRESS, TicketStatus.RESOLVED, TicketStatus.IN_PROGRESS, TicketStatus.RESOLVED)
+        for status in steps:
+            change_status(ticket=ticket, new_status=status, triggered_by=self.moderator)
+
+        # Replay times: created, +1h in progress, +3h resolved, +4h reopened, +5h resolved.
+        self.start = timezone.now() - timedelta(hours=6)
+        for event, hours in zip(TicketEvent.objects.order_by("created_at"), (0, 1, 3, 4, 5)):
+            TicketEvent.objects.filter(id=event.id).update(created_at=self.start + timedelta(hours=hours))
+        self.client.force_authenticate(user=self.moderator)
+
+    def get(self, name):
+        return self.client.get(reverse(f"analytics:{name}")).data
+
+    def test_time_in_status_and_transitions(self):
+        results = {row["status"]: row for row in self.get("time-in-status")["results"]}
+        self.assertEqual((results["OPEN"]["spells"], results["OPEN"]["average_seconds"]), (1, 3600))
+        self.assertEqual((results["IN_PROGRESS"]["spells"], results["IN_PROGRESS"]["average_seconds"]), (2, 5400))
+        self.assertEqual(results["RESOLVED"]["spells"], 1)
+        self.assertLessEqual(abs(results["RESOLVED"]["p50_seconds"] - 3600), 3600 * 0.2)
+
+        data = self.get("status-transitions")
+        self.assertEqual(data["matrix"]["OPEN"]["IN_PROGRESS"], 1)
+        self.assertEqual(data["matrix"]["IN_PROGRESS"]["RESOLVED"], 2)
+        self.assertEqual(data["matrix"]["RESOLVED"]["IN_PROGRESS"], 1)
+        self.assertEqual((data["total_transitions"], data["reopen_rate"]), (4, 0.5))
+
+    def test_rollups_plus_live_tail_match_live_pass(self):
+        live = [self.get("time-in-status"), self.get("status-transitions")]
+
+        refresh_status_rollups(until=self.start + timedelta(hours=3, minutes=30))
+        self.assertEqual(StatusTimeRollup.objects.filter(status=TicketStatus.IN_PROGRESS).get().spells, 1)
+        self.assertEqual([self.get("time-in-status"), self.get("status-transitions")], live)
+
+        refresh_status_rollups()
+        self.assertEqual(sum(StatusTimeRollup.objects.values_list("spells", flat=True)), 4)
+        self.assertEqual([self.get("time-in-status"), self.get("status-transitions")], live)
+
+    def test_histogram_percentile(self):
+        histogram = [0] * HISTOGRAM_SIZE
+        histogram[0] = 50
+        histogram[-1] = 50
+        self.assertLess(histogram_percentile(histogram, 40), 60)
+        self.assertEqual(histogram_percentile(histogram, 95), DURATION_BUCKETS[-1])
+        self.assertIsNone(histogram_percentile([0] * HISTOGRAM_SIZE, 50))
@@ -0,0 +1,60 @@
+"""
+Time buckets of the analytics time series (`granularity=day|week|month|auto`).
+
+Buckets are truncated in SQL (`DATE_TRUNC` in TIME_ZONE for datetimes); the
+series is then laid over every bucket of the window, so empty buckets show
+up as zeros. Weeks start on Monday; a bucket is named by its first day, even
+when the window starts later.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import DateField
+from django.db.models.functions import Trunc
+
+GRANULARITIES = ("day", "week", "month")
+AUTO = "auto"
+
+
+def resolve_granularity(value, start_day, end_day):
+    """
+    Granularity to use for a requested value (None: "day"); "auto" picks the
+    finest one with at most `ANALYTICS_AUTO_BUCKETS` buckets. Raises
+    ValueError for unknown values.
+    """
+    value = value or "day"
+    if value in GRANULARITIES:
+        return value
+    if value != AUTO:
+        raise ValueError("Granularidade invalida. Use day, week, month ou auto.")
+    for granularity in GRANULARITIES[:-1]:
+        if len(bucket_starts(start_day, end_day, granularity)) <= settings.ANALYTICS_AUTO_BUCKETS:
+            return granularity
+    return GRANULARITIES[-1]
+
+
+def truncate(field, granularity):
+    """Bucket expression (a date) of a date or datetime column."""
+    return Trunc(field, granularity, output_field=DateField())
+
+
+def bucket_of(day, granularity):
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def bucket_starts(start_day, end_day, granularity):
+    """First day of every bucket overlapping `[start_day, end_day]`, in order."""
+    starts = []
+    day = bucket_of(start_day, granularity)
+    while day <= end_day:
+        starts.append(day)
+        if granularity == "month":
+            day = (day + timedelta(days=32)).replace(day=1)
+        else:
+            day += timedelta(days=7 if granularity == "week" else 1)
+    return starts
@@ -2,9 +2,13 @@ from django.urls import path
 from .views import (
     AverageResolutionTimeView,
     AverageResponseTimeView,
+    BacklogTrendView,
+    PivotView,
+    StatusTransitionsView,
     TicketsByModeratorView,
     TicketsByPeriodView,
     TicketsByStatusView,
+    TimeInStatusView,
 )
 
 app_name = "analytics"
@@ -15,4 +19,8 @@ urlpatterns = [
     path("tickets-by-moderator/", TicketsByModeratorView.as_view(), name="tickets-by-moderator"),
     path("average-response-time/", AverageResponseTimeView.as_view(), name="average-response-time"),
     path("average-resolution-time/", AverageResolutionTimeView.as_view(), name="average-resolution-time"),
+    path("time-in-status/", TimeInStatusView.as_view(), name="time-in-status"),
+    path("status-transitions/", StatusTransitionsView.as_view(), name="status-transitions"),
+    path("backlog-trend/", BacklogTrendView.as_view(), name="backlog-trend"),
+    path("pivot/", PivotView.as_view(), name="pivot"),
 ]
@@ -1,25 +1,65 @@
 """
 Analytics endpoints for aggregated ticket metrics.
+
+Each endpoint aggregates the live `Ticket` rows and adds the daily rollups of
+archived tickets (`analytics.TicketDailyRollup`) for the same window. When
+the columnar snapshot is enabled and fresh (`analytics.snapshot`), the live
+part of the ticket counts and averages is read from it instead. The pivot
+endpoint reads only the rollups (live rows included).
 """
 
+import uuid
 from datetime import datetime, time, timedelta
 
-from django.db.models import Avg, Count, F, Min, Q
-from django.db.models.functions import TruncDate
+from django.conf import settings
+from django.db.models import Count, Max, Min, Q, Sum
 from django.utils import timezone
 from django.utils.dateparse import parse_date
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from core.models import UserRole
+from core.async_views import AsyncAPIViewMixin
+from core.business_calendar import get_calendar
+from core.cache_versions import get_cache_version
+from core.conditional import conditional_get, make_etag
+from core.db_router import ReplicaReadMixin
+from core.models import User, UserRole
 from core.permissions import IsModeratorOrAdmin
-from tickets.models import Ticket, TicketMessage, TicketStatus
+from core.tiered_cache import TieredCache
+from tickets.models import Ticket, TicketMessage, TicketPriority, TicketStatus
+from tickets.services import TICKETS_CACHE_NAMESPACE
+
+from .backlog import BACKLOG_STATUSES
+from .models import BacklogSnapshot
+from .pivot import PivotQuery
+from .rollups import ROLLUPS_CACHE_NAMESPACE, rollups_in_window
+from .snapshot import current_snapshot
+from .status_flow import status_flow_in_window
+from .time_buckets import bucket_of, bucket_starts, resolve_granularity, truncate
 
+pivot_cache = TieredCache("analytics-pivot", shared_ttl=settings.PIVOT_CACHE_SECONDS)
 
-class AnalyticsBaseView(APIView):
+
+class AnalyticsBaseView(ReplicaReadMixin, AsyncAPIViewMixin, APIView):
     permission_classes = [IsAuthenticated, IsModeratorOrAdmin]
 
+    def get_validators(self, request, *args, **kwargs):
+        """
+        Analytics are invalidated as a whole by the tickets cache version and
+        the snapshot refreshes; the local date is included because the
+        default window is relative.
+        """
+        snapshot = current_snapshot()
+        etag = make_etag(
+            type(self).__name__,
+            request.get_full_path(),
+            timezone.localdate().isoformat(),
+            get_cache_version(TICKETS_CACHE_NAMESPACE),
+            snapshot.version if snapshot else "",
+        )
+        return etag, None
+
     def _get_date_window(self, request):
         """
         Parse start_date/end_date from query params.
@@ -48,33 +88,61 @@ class AnalyticsBaseView(APIView):
         end_dt = timezone.make_aware(datetime.combine(end_date, time.max))
         return start_dt, end_dt, None
 
+    def _get_granularity(self, request, start_dt, end_dt):
+        """Parse granularity=day|week|month|auto (default: day) for the window."""
+        try:
+            granularity = resolve_granularity(request.query_params.get("granularity"), start_dt.date(), end_dt.date())
+        except ValueError as exc:
+            return None, Response({"detail": str(exc)}, status=400)
+        return granularity, None
+
 
 class TicketsByPeriodView(AnalyticsBaseView):
     """
-    GET /api/v1/analytics/tickets-by-period/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
+    GET /api/v1/analytics/tickets-by-period/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD&granularity=day|week|month|auto
+    Tickets created per bucket, every bucket of the window included.
     """
 
-    def get(self, request):
+    @conditional_get
+    async def get(self, request):
         start_dt, end_dt, error = self._get_date_window(request)
+        if error:
+            return error
+        granularity, error = self._get_granularity(request, start_dt, end_dt)
         if error:
             return error
 
         rows = (
             Ticket.objects.filter(created_at__range=(start_dt, end_dt))
-            .annotate(day=TruncDate("created_at"))
-            .values("day")
+            .annotate(bucket=truncate("created_at", granularity))
+            .values("bucket")
             .annotate(total=Count("id"))
-            .order_by("day")
+            .order_by()
         )
-
-        data = [
-            {"date": row["day"].isoformat(), "total": row["total"]}
-            for row in rows
-        ]
+        archived = (
+            rollups_in_window(start_dt, end_dt)
+            .annotate(bucket=truncate("day", granularity))
+            .values("bucket")
+            .annotate(total=Sum("tickets"))
+            .order_by()
+        )
+        totals = dict.fromkeys(bucket_starts(start_dt.date(), end_dt.date(), granularity), 0)
+        querysets = (rows, archived)
+        snapshot = current_snapshot()
+        if snapshot is not None:
+            for bucket, total in zip(totals, snapshot.tickets_by_bucket(start_dt, end_dt, list(totals))):
+                totals[bucket] += total
+            querysets = (archived,)
+        for queryset in querysets:
+            async for row in queryset:
+                totals[row["bucket"]] += row["total"]
+
+        data = [{"date": bucket.isoformat(), "total": total} for bucket, total in totals.items()]
         return Response(
             {
                 "start_date": start_dt.date().isoformat(),
                 "end_date": end_dt.date().isoformat(),
+                "granularity": granularity,
                 "total_tickets": sum(item["total"] for item in data),
                 "results": data,
             }
@@ -86,18 +154,26 @@ class TicketsByStatusView(AnalyticsBaseView):
     GET /api/v1/analytics/tickets-by-status/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
     """
 
-    def get(self, request):
+    @conditional_get
+    async def get(self, request):
         start_dt, end_dt, error = self._get_date_window(request)
         if error:
             return error
 
-        rows = (
-            Ticket.objects.filter(created_at__range=(start_dt, end_dt))
-            .values("status")
-            .annotate(total=Count("id"))
-            .order_by("status")
-        )
-        counts = {row["status"]: row["total"] for row in rows}
+        snapshot = current_snapshot()
+        if snapshot is not None:
+            counts = snapshot.totals(start_dt, end_dt)["by_status"]
+        else:
+            rows = (
+                Ticket.objects.filter(created_at__range=(start_dt, end_dt))
+                .values("status")
+                .annotate(total=Count("id"))
+                .order_by("status")
+            )
+            counts = {row["status"]: row["total"] async for row in rows}
+        archived = rollups_in_window(start_dt, end_dt).values("status").annotate(total=Sum("tickets")).order_by()
+        async for row in archived:
+            counts[row["status"]] = counts.get(row["status"], 0) + row["total"]
         data = [
             {"status": status, "total": counts.get(status, 0)}
             for status, _ in TicketStatus.choices
@@ -117,28 +193,60 @@ class TicketsByModeratorView(AnalyticsBaseView):
     GET /api/v1/analytics/tickets-by-moderator/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
     """
 
-    def get(self, request):
+    @conditional_get
+    async def get(self, request):
         start_dt, end_dt, error = self._get_date_window(request)
         if error:
             return error
 
+        moderator_fields = (
+            "assigned_to__id",
+            "assigned_to__email",
+            "assigned_to__first_name",
+            "assigned_to__last_name",
+        )
         rows = (
             Ticket.objects.filter(created_at__range=(start_dt, end_dt), assigned_to__isnull=False)
-            .values(
-                "assigned_to__id",
-                "assigned_to__email",
-                "assigned_to__first_name",
-                "assigned_to__last_name",
-            )
+            .values(*moderator_fields)
             .annotate(
                 total_assigned=Count("id"),
                 total_resolved=Count("id", filter=Q(status=TicketStatus.RESOLVED)),
             )
-            .order_by("-total_assigned", "assigned_to__email")
+            .order_by()
+        )
+        archived = (
+            rollups_in_window(start_dt, end_dt)
+            .filter(assigned_to__isnull=False)
+            .values(*moderator_fields)
+            .annotate(
+                total_assigned=Sum("tickets"),
+                total_resolved=Sum("tickets", filter=Q(status=TicketStatus.RESOLVED), default=0),
+            )
+            .order_by()
         )
 
+        moderators = {}
+        querysets = (rows, archived)
+        snapshot = current_snapshot()
+        if snapshot is not None:
+            live = snapshot.by_assignee(start_dt, end_dt)
+            users = User.objects.filter(id__in=list(live)).values("id", "email", "first_name", "last_name")
+            async for user in users:
+                assigned, resolved = live[str(user["id"])]
+                moderators[user["id"]] = {
+                    **{f"assigned_to__{name}": value for name, value in user.items()},
+                    "total_assigned": assigned,
+                    "total_resolved": resolved,
+                }
+            querysets = (archived,)
+        for queryset in querysets:
+            async for row in queryset:
+                current = moderators.setdefault(row["assigned_to__id"], {**row, "total_assigned": 0, "total_resolved": 0})
+                current["total_assigned"] += row["total_assigned"]
+                current["total_resolved"] += row["total_resolved"]
+
         data = []
-        for row in rows:
+        for row in sorted(moderators.values(), key=lambda item: (-item["total_assigned"], item["assigned_to__email"])):
             first_name = row.get("assigned_to__first_name") or ""
             last_name = row.get("assigned_to__last_name") or ""
             full_name = f"{first_name} {last_name}".strip() or row["assigned_to__email"]
@@ -161,101 +269,279 @@ class TicketsByModeratorView(AnalyticsBaseView):
         )
 
 
+def _averages(prefix, total_seconds, business_seconds, count):
+    """Average wall-clock and business durations, in seconds and hours."""
+    data = {}
+    for name, total in (("", total_seconds), ("business_", business_seconds)):
+        avg_seconds = total / count if count else None
+        data[f"average_{prefix}_{name}seconds"] = round(avg_seconds, 2) if avg_seconds is not None else None
+        data[f"average_{prefix}_{name}hours"] = round(avg_seconds / 3600, 2) if avg_seconds is not None else None
+    return data
+
+
 class AverageResponseTimeView(AnalyticsBaseView):
     """
     GET /api/v1/analytics/average-response-time/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
-    Response time = first moderator/admin message after ticket creation.
+    Response time = first moderator/admin message after ticket creation, in
+    wall-clock and business time (`core.business_calendar`).
     """
 
-    def get(self, request):
+    @conditional_get
+    async def get(self, request):
         start_dt, end_dt, error = self._get_date_window(request)
         if error:
             return error
 
-        ticket_ids = list(
-            Ticket.objects.filter(created_at__range=(start_dt, end_dt))
-            .values_list("id", flat=True)
+        archived = await rollups_in_window(start_dt, end_dt).aaggregate(
+            tickets=Sum("tickets", default=0),
+            responded=Sum("first_response_count", default=0),
+            seconds=Sum("first_response_seconds", default=0),
+            business_seconds=Sum("first_response_business_seconds", default=0),
         )
-        if not ticket_ids:
-            return Response(
-                {
-                    "start_date": start_dt.date().isoformat(),
-                    "end_date": end_dt.date().isoformat(),
-                    "tickets_considered": 0,
-                    "tickets_with_first_response": 0,
-                    "average_response_seconds": None,
-                    "average_response_hours": None,
-                }
+        snapshot = current_snapshot()
+        if snapshot is not None:
+            live = snapshot.totals(start_dt, end_dt)
+            tickets_considered = live["tickets"]
+            responded = live["first_response_count"]
+            total_seconds = live["first_response_seconds"]
+            business_seconds = live["first_response_business_seconds"]
+        else:
+            tickets_considered = await Ticket.objects.filter(created_at__range=(start_dt, end_dt)).acount()
+            first_responses = (
+                TicketMessage.objects.filter(
+                    ticket__created_at__range=(start_dt, end_dt),
+                    author__role__in=(UserRole.MODERATOR, UserRole.ADMIN),
+                )
+                .values("ticket_id", "ticket__created_at")
+                .annotate(first_response_at=Min("created_at"))
+                .order_by()
             )
+            intervals = [(row["ticket__created_at"], row["first_response_at"]) async for row in first_responses]
+            responded = len(intervals)
+            total_seconds = sum((end - start).total_seconds() for start, end in intervals)
+            business_seconds = sum(get_calendar().durations(intervals))
+
+        responded += archived["responded"]
+        total_seconds += archived["seconds"]
+        business_seconds += archived["business_seconds"]
 
-        tickets = {
-            ticket.id: ticket
-            for ticket in Ticket.objects.filter(id__in=ticket_ids)
-        }
-        first_responses = (
-            TicketMessage.objects.filter(
-                ticket_id__in=ticket_ids,
-                author__role__in=(UserRole.MODERATOR, UserRole.ADMIN),
+        return Response(
+            {
+                "start_date": start_dt.date().isoformat(),
+                "end_date": end_dt.date().isoformat(),
+                "tickets_considered": tickets_considered + archived["tickets"],
+                "tickets_with_first_response": responded,
+                **_averages("response", total_seconds, business_seconds, responded),
+            }
+        )
+
+
+class AverageResolutionTimeView(AnalyticsBaseView):
+    """
+    GET /api/v1/analytics/average-resolution-time/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
+    Resolution time = closed_at - created_at for resolved tickets, in
+    wall-clock and business time (`core.business_calendar`).
+    """
+
+    @conditional_get
+    async def get(self, request):
+        start_dt, end_dt, error = self._get_date_window(request)
+        if error:
+            return error
+
+        snapshot = current_snapshot()
+        if snapshot is not None:
+            live = snapshot.totals(start_dt, end_dt)
+            resolved = live["resolution_count"]
+            total_seconds = live["resolution_seconds"]
+            business_seconds = live["resolution_business_seconds"]
+        else:
+            resolved_qs = Ticket.objects.filter(
+                created_at__range=(start_dt, end_dt),
+                status=TicketStatus.RESOLVED,
+                closed_at__isnull=False,
             )
-            .values("ticket_id")
-            .annotate(first_response_at=Min("created_at"))
+            intervals = [pair async for pair in resolved_qs.values_list("created_at", "closed_at").order_by()]
+            resolved = len(intervals)
+            total_seconds = sum((end - start).total_seconds() for start, end in intervals)
+            business_seconds = sum(get_calendar().durations(intervals))
+        archived = await rollups_in_window(start_dt, end_dt).aaggregate(
+            count=Sum("resolution_count", default=0),
+            seconds=Sum("resolution_seconds", default=0),
+            business_seconds=Sum("resolution_business_seconds", default=0),
         )
+        resolved += archived["count"]
+        total_seconds += archived["seconds"]
+        business_seconds += archived["business_seconds"]
 
-        response_seconds = []
-        for row in first_responses:
-            ticket = tickets.get(row["ticket_id"])
-            first_response_at = row["first_response_at"]
-            if not ticket or not first_response_at:
-                continue
-            delta = first_response_at - ticket.created_at
-            response_seconds.append(delta.total_seconds())
-
-        avg_seconds = (
-            sum(response_seconds) / len(response_seconds)
-            if response_seconds
-            else None
+        return Response(
+            {
+                "start_date": start_dt.date().isoformat(),
+                "end_date": end_dt.date().isoformat(),
+                "tickets_resolved": resolved,
+                **_averages("resolution", total_seconds, business_seconds, resolved),
+            }
         )
-        avg_hours = (avg_seconds / 3600) if avg_seconds is not None else None
 
+
+class TimeInStatusView(AnalyticsBaseView):
+    """
+    GET /api/v1/analytics/time-in-status/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
+    Time spent in each status, for the spells ended in the window (average
+    and estimated p50/p90/p95), from the status events.
+    """
+
+    @conditional_get
+    def get(self, request):
+        start_dt, end_dt, error = self._get_date_window(request)
+        if error:
+            return error
+
+        flow = status_flow_in_window(start_dt, end_dt)
         return Response(
             {
                 "start_date": start_dt.date().isoformat(),
                 "end_date": end_dt.date().isoformat(),
-                "tickets_considered": len(ticket_ids),
-                "tickets_with_first_response": len(response_seconds),
-                "average_response_seconds": round(avg_seconds, 2) if avg_seconds is not None else None,
-                "average_response_hours": round(avg_hours, 2) if avg_hours is not None else None,
+                "results": flow.time_in_status(),
             }
         )
 
 
-class AverageResolutionTimeView(AnalyticsBaseView):
+class StatusTransitionsView(AnalyticsBaseView):
     """
-    GET /api/v1/analytics/average-resolution-time/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
-    Resolution time = closed_at - created_at for resolved tickets.
+    GET /api/v1/analytics/status-transitions/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
+    Status transition counts (matrix[from][to]) in the window and reopen
+    rate (transitions out of RESOLVED / transitions into RESOLVED).
     """
 
+    @conditional_get
     def get(self, request):
         start_dt, end_dt, error = self._get_date_window(request)
         if error:
             return error
 
-        resolved_qs = Ticket.objects.filter(
-            created_at__range=(start_dt, end_dt),
-            status=TicketStatus.RESOLVED,
-            closed_at__isnull=False,
-        ).annotate(resolution_time=F("closed_at") - F("created_at"))
+        flow = status_flow_in_window(start_dt, end_dt)
+        return Response(
+            {
+                "start_date": start_dt.date().isoformat(),
+                "end_date": end_dt.date().isoformat(),
+                **flow.transition_matrix(),
+            }
+        )
+
+
+class BacklogTrendView(AnalyticsBaseView):
+    """
+    GET /api/v1/analytics/backlog-trend/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD&granularity=day|week|month|auto
+    Open tickets at the end of each bucket (its last snapshot), per status,
+    from the daily snapshots only. Optional filters: priority, assigned_to
+    (id or "none"). Buckets without a snapshot are omitted: the backlog is a
+    stock, zero would be a wrong value.
+    """
+
+    @conditional_get
+    async def get(self, request):
+        start_dt, end_dt, error = self._get_date_window(request)
+        if error:
+            return error
+        granularity, error = self._get_granularity(request, start_dt, end_dt)
+        if error:
+            return error
 
-        avg_delta = resolved_qs.aggregate(avg_resolution=Avg("resolution_time"))["avg_resolution"]
-        avg_seconds = avg_delta.total_seconds() if avg_delta is not None else None
-        avg_hours = (avg_seconds / 3600) if avg_seconds is not None else None
+        window = BacklogSnapshot.objects.filter(day__range=(start_dt.date(), end_dt.date()))
+        snapshots = window
+        priority = request.query_params.get("priority")
+        if priority:
+            if priority not in TicketPriority.values:
+                return Response({"detail": "Prioridade invalida."}, status=400)
+            snapshots = snapshots.filter(priority=priority)
+        assigned_to = request.query_params.get("assigned_to")
+        if assigned_to == "none":
+            snapshots = snapshots.filter(assigned_to__isnull=True)
+        elif assigned_to:
+            try:
+                snapshots = snapshots.filter(assigned_to_id=uuid.UUID(assigned_to))
+            except ValueError:
+                return Response({"detail": "Responsavel invalido."}, status=400)
+
+        if granularity != "day":
+            # Counts of the last snapshot day of each bucket.
+            last_days = window.annotate(bucket=truncate("day", granularity)).values("bucket").annotate(last=Max("day"))
+            snapshots = snapshots.filter(day__in=last_days.values("last"))
+        buckets = {}
+        rows = snapshots.values("day", "status").annotate(total=Sum("tickets")).order_by("day")
+        async for row in rows:
+            bucket = bucket_of(row["day"], granularity)
+            buckets.setdefault(bucket, dict.fromkeys(BACKLOG_STATUSES, 0))[row["status"]] = row["total"]
 
+        data = [
+            {"date": bucket.isoformat(), "total": sum(by_status.values()), "by_status": by_status}
+            for bucket, by_status in buckets.items()
+        ]
         return Response(
             {
                 "start_date": start_dt.date().isoformat(),
                 "end_date": end_dt.date().isoformat(),
-                "tickets_resolved": resolved_qs.count(),
-                "average_resolution_seconds": round(avg_seconds, 2) if avg_seconds is not None else None,
-                "average_resolution_hours": round(avg_hours, 2) if avg_hours is not None else None,
+                "granularity": granularity,
+                "results": data,
+            }
+        )
+
+
+class PivotView(AnalyticsBaseView):
+    """
+    GET /api/v1/analytics/pivot/?dimensions=month,priority&measures=count,p90_resolution_seconds
+        &start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
+    Group-by over the ticket rollups (`analytics.pivot`), by creation day of
+    the tickets. Live tickets are counted as of the last rollup refresh.
+    Results are cached per rollup version.
+    """
+
+    def get_validators(self, request, *args, **kwargs):
+        etag = make_etag(
+            type(self).__name__,
+            request.get_full_path(),
+            timezone.localdate().isoformat(),
+            get_cache_version(ROLLUPS_CACHE_NAMESPACE),
+        )
+        return etag, None
+
+    @conditional_get
+    def get(self, request):
+        start_dt, end_dt, error = self._get_date_window(request)
+        if error:
+            return error
+
+        try:
+            query = PivotQuery.parse(
+                request.query_params.get("dimensions"),
+                request.query_params.get("measures"),
+                settings.PIVOT_MAX_DIMENSIONS,
+            )
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=400)
+
+        start_day, end_day = start_dt.date(), end_dt.date()
+        key = ":".join(
+            (
+                str(get_cache_version(ROLLUPS_CACHE_NAMESPACE)),
+                start_day.isoformat(),
+                end_day.isoformat(),
+                ",".join(query.dimensions),
+                ",".join(query.measures),
+            )
+        )
+        try:
+            results = pivot_cache.get_or_load(key, lambda: query.run(start_day, end_day, settings.PIVOT_MAX_GROUPS))
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=400)
+
+        return Response(
+            {
+                "start_date": start_day.isoformat(),
+                "end_date": end_day.isoformat(),
+                "dimensions": query.dimensions,
+                "measures": query.measures,
+                "results": results,
             }
         )
@@ -0,0 +1,5 @@
+"""
+Endpoint benchmark harness (query counts, latency, response size).
+
+Run with `python manage.py benchmark_endpoints`.
+"""
@@ -0,0 +1,122 @@
+"""
+Concurrent HTTP load against a running server.
+
+Unlike `runner` (in-process, one request at a time), this opens `clients`
+keep-alive connections in parallel and measures per-request latency as seen
+by the client, so it captures connection setup, pool waits and worker
+saturation. Typical use: run it once per `DB_CONN_MODE` and compare.
+"""
+
+import http.client
+import json
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.utils import timezone
+
+from .runner import _percentile, current_commit
+
+
+class LoadTarget:
+    def __init__(self, base_url, path, token=None):
+        parts = urlsplit(base_url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.https else 80)
+        self.path = path
+        self.headers = {"Accept": "application/json"}
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+
+    def connect(self, timeout):
+        connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=timeout)
+
+
+def login(base_url, email, password, path="/api/v1/auth/login/"):
+    target = LoadTarget(base_url, path)
+    connection = target.connect(timeout=30)
+    try:
+        body = json.dumps({"email": email, "password": password})
+        connection.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        payload = json.loads(response.read() or b"{}")
+    finally:
+        connection.close()
+    if response.status != 200 or "access" not in payload:
+        raise RuntimeError(f"Login falhou ({response.status}): {payload}")
+    return payload["access"]
+
+
+def _client(target, requests, timeout, barrier, timings, statuses, lock):
+    connection = target.connect(timeout)
+    local_timings, local_statuses = [], {}
+    barrier.wait()
+    try:
+        for _ in range(requests):
+            started = time.perf_counter()
+            try:
+                connection.request("GET", target.path, headers=target.headers)
+                response = connection.getresponse()
+                response.read()
+                status = str(response.status)
+            except (OSError, http.client.HTTPException) as exc:
+                status = type(exc).__name__
+                connection.close()
+                connection = target.connect(timeout)
+            local_timings.append((time.perf_counter() - started) * 1000)
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+    finally:
+        connection.close()
+        with lock:
+            timings.extend(local_timings)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+
+def run_load(target, clients=200, requests=20, timeout=30):
+    """Run `clients` threads doing `requests` sequential GETs each."""
+    timings, statuses, lock = [], {}, threading.Lock()
+    barrier = threading.Barrier(clients + 1)
+    threads = [
+        threading.Thread(
+            target=_client,
+            args=(target, requests, timeout, barrier, timings, statuses, lock),
+            daemon=True,
+        )
+        for _ in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "generated_at": timezone.now().isoformat(),
+        "commit": current_commit(),
+        "path": target.path,
+        "clients": clients,
+        "requests": len(timings),
+        "statuses": dict(sorted(statuses.items())),
+        "throughput_rps": round(len(timings) / elapsed, 1) if elapsed else None,
+        "mean_ms": round(statistics.fmean(timings), 2),
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(_percentile(timings, 0.95), 2),
+        "p99_ms": round(_percentile(timings, 0.99), 2),
+        "max_ms": round(max(timings), 2),
+    }
+
+
+def compare_load(current, baseline):
+    """Lines with the relative change of each latency figure."""
+    lines = []
+    for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+        old, new = baseline.get(key), current.get(key)
+        if old and new is not None:
+            lines.append(f"{key}: {old} -> {new} ({(new - old) / old:+.0%})")
+    return lines
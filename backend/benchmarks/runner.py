@@ -0,0 +1,209 @@
+"""
+Benchmark runner: executes scenarios, checks budgets, builds the report.
+"""
+
+import copy
+import json
+import statistics
+import subprocess
+import time
+from importlib import import_module
+from pathlib import Path
+from unittest import mock
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework.throttling import SimpleRateThrottle
+
+from .scenarios import BENCHMARK_URLCONFS, SCENARIOS, BenchmarkContext
+
+DEFAULT_BUDGETS_PATH = Path(__file__).resolve().parent / "budgets.json"
+
+
+def load_budgets(path=DEFAULT_BUDGETS_PATH):
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def benchmarked_url_names():
+    names = set()
+    for namespace, module in BENCHMARK_URLCONFS.items():
+        patterns = import_module(module).urlpatterns
+        for pattern in patterns:
+            if isinstance(pattern, URLPattern) and pattern.name:
+                names.add(f"{namespace}:{pattern.name}")
+            elif isinstance(pattern, URLResolver):
+                raise ValueError(f"Include aninhado nao suportado em {module}.")
+    return names
+
+
+def missing_scenarios():
+    covered = {scenario.url_name for scenario in SCENARIOS}
+    return sorted(benchmarked_url_names() - covered)
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))
+    return ordered[index]
+
+
+class BenchmarkRunner:
+    """
+    Runs every scenario `warmup + repeat` times against the current database.
+
+    Write scenarios run inside a transaction that is rolled back, so the
+    dataset stays identical between iterations and sizes. Throttling is
+    disabled while measuring.
+    """
+
+    def __init__(self, budgets, repeat=5, warmup=1):
+        self.budgets = budgets
+        self.repeat = repeat
+        self.warmup = warmup
+
+    def _budget(self, scenario):
+        budget = dict(self.budgets.get("defaults", {}))
+        budget.update(self.budgets.get("endpoints", {}).get(scenario.url_name, {}))
+        budget.update(self.budgets.get("endpoints", {}).get(scenario.name, {}))
+        return budget
+
+    def _client(self, scenario, ctx):
+        client = APIClient()
+        if scenario.authenticate:
+            # Copy: views may mutate the user in memory (e.g. set_password).
+            client.force_authenticate(user=copy.copy(getattr(ctx, scenario.role)))
+        return client
+
+    def _request(self, scenario, ctx):
+        client = self._client(scenario, ctx)
+        url = reverse(scenario.url_name, kwargs=scenario.kwargs(ctx) if scenario.kwargs else None)
+        params = scenario.params(ctx) if callable(scenario.params) else scenario.params
+        if params:
+            url = f"{url}?{urlencode(params)}"
+        data = scenario.data(ctx) if scenario.data else None
+
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            if scenario.is_write:
+                with transaction.atomic():
+                    response = getattr(client, scenario.method)(url, data, format="json")
+                    transaction.set_rollback(True)
+            else:
+                response = client.get(url)
+            if response.streaming:
+                size = sum(len(chunk) for chunk in response.streaming_content)
+            else:
+                size = len(response.content)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        return response.status_code, len(queries), elapsed_ms, size
+
+    def run_scenarios(self, ctx):
+        results = []
+        with mock.patch.object(SimpleRateThrottle, "allow_request", return_value=True):
+            for scenario in SCENARIOS:
+                if scenario.skip:
+                    results.append({"name": scenario.name, "skipped": scenario.skip})
+                    continue
+                for _ in range(self.warmup):
+                    self._request(scenario, ctx)
+                samples = [self._request(scenario, ctx) for _ in range(self.repeat)]
+                timings = [sample[2] for sample in samples]
+                results.append(
+                    {
+                        "name": scenario.name,
+                        "url_name": scenario.url_name,
+                        "method": scenario.method.upper(),
+                        "status": samples[-1][0],
+                        "queries": max(sample[1] for sample in samples),
+                        "p50_ms": round(statistics.median(timings), 2),
+                        "p95_ms": round(_percentile(timings, 0.95), 2),
+                        "max_ms": round(max(timings), 2),
+                        "bytes": samples[-1][3],
+                    }
+                )
+        return results
+
+    def check_budgets(self, results, size):
+        violations = []
+        for result in results:
+            if "skipped" in result:
+                continue
+            scenario = next(s for s in SCENARIOS if s.name == result["name"])
+            budget = self._budget(scenario)
+            if result["status"] >= 400:
+                violations.append(f"{result['name']} ({size}): status {result['status']}")
+            max_queries = budget.get("max_queries")
+            if max_queries is not None and result["queries"] > max_queries:
+                violations.append(
+                    f"{result['name']} ({size}): {result['queries']} queries > {max_queries}"
+                )
+            max_p50 = (budget.get("max_p50_ms") or {}).get(str(size))
+            if max_p50 is not None and result["p50_ms"] > max_p50:
+                violations.append(f"{result['name']} ({size}): p50 {result['p50_ms']}ms > {max_p50}ms")
+        return violations
+
+    def run_size(self, size, dataset=None):
+        """Benchmark the dataset currently loaded. Returns (size_report, violations)."""
+        cache.clear()
+        ctx = BenchmarkContext.build()
+        results = self.run_scenarios(ctx)
+        return {"dataset": dataset, "results": results}, self.check_budgets(results, size)
+
+
+def compare_reports(current, baseline, tolerance=0.2, min_delta_ms=5.0):
+    """
+    List regressions of `current` against `baseline`: more queries, or a
+    p50 slower by more than `tolerance` (and `min_delta_ms` in absolute terms).
+    """
+    regressions = []
+    for size, size_report in current["sizes"].items():
+        previous = {
+            result["name"]: result
+            for result in baseline.get("sizes", {}).get(size, {}).get("results", [])
+            if "skipped" not in result
+        }
+        for result in size_report["results"]:
+            old = previous.get(result["name"])
+            if not old or "skipped" in result:
+                continue
+            if result["queries"] > old["queries"]:
+                regressions.append(
+                    f"{result['name']} ({size}): queries {old['queries']} -> {result['queries']}"
+                )
+            delta = result["p50_ms"] - old["p50_ms"]
+            if delta > min_delta_ms and delta > old["p50_ms"] * tolerance:
+                regressions.append(
+                    f"{result['name']} ({size}): p50 {old['p50_ms']}ms -> {result['p50_ms']}ms"
+                )
+    return regressions
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def new_report(repeat):
+    return {
+        "generated_at": timezone.now().isoformat(),
+        "commit": current_commit(),
+        "database": connection.vendor,
+        "repeat": repeat,
+        "sizes": {},
+        "violations": [],
+        "regressions": [],
+    }
@@ -0,0 +1,183 @@
+"""
+Benchmark scenarios: one or more requests per URL name.
+
+Every URL name in the benchmarked urlconfs must appear here (possibly with
+`skip` and a reason), so a new endpoint cannot ship without a budget.
+"""
+
+import itertools
+from dataclasses import dataclass, field
+from typing import Callable
+
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import User, UserRole
+from tickets.models import ImportJob, ImportJobStatus, Ticket, TicketMessage, TicketStatus
+
+BENCHMARK_URLCONFS = {
+    "core": "core.urls",
+    "tickets": "tickets.urls",
+    "analytics": "analytics.urls",
+}
+
+BENCH_PASSWORD = "BenchPass123!"
+
+
+@dataclass
+class BenchmarkContext:
+    """Users and sample object ids the scenarios run against."""
+
+    admin: User
+    moderator: User
+    user: User
+    ticket_id: str
+    open_ticket_id: str
+    message_id: str
+    import_job_id: str
+    counter: itertools.count = field(default_factory=itertools.count)
+
+    @classmethod
+    def build(cls):
+        admin = User.objects.filter(email="bench-admin@helpdesk.local").first()
+        if not admin:
+            admin = User.objects.create_user(
+                email="bench-admin@helpdesk.local",
+                password=BENCH_PASSWORD,
+                role=UserRole.ADMIN,
+            )
+        moderator = User.objects.filter(role=UserRole.MODERATOR, is_active=True).first()
+        message = (
+            TicketMessage.objects.filter(is_internal=False)
+            .select_related("ticket__created_by")
+            .order_by()
+            .first()
+        )
+        if not moderator or not message:
+            raise ValueError("Dataset sem moderadores ou mensagens. Gere um dataset antes.")
+        open_ticket = Ticket.objects.filter(status=TicketStatus.OPEN).order_by().first() or message.ticket
+        job = ImportJob.objects.create(
+            resource="tickets",
+            input_format="ndjson",
+            file_path="/dev/null",
+            status=ImportJobStatus.FAILED,
+        )
+        return cls(
+            admin=admin,
+            moderator=moderator,
+            user=message.ticket.created_by,
+            ticket_id=str(message.ticket_id),
+            open_ticket_id=str(open_ticket.id),
+            message_id=str(message.id),
+            import_job_id=str(job.id),
+        )
+
+
+@dataclass
+class Scenario:
+    url_name: str
+    method: str = "get"
+    role: str = "moderator"
+    label: str = ""
+    kwargs: Callable[[BenchmarkContext], dict] | None = None
+    params: Callable[[BenchmarkContext], dict] | dict | None = None
+    data: Callable[[BenchmarkContext], dict] | None = None
+    authenticate: bool = True
+    skip: str = ""
+
+    @property
+    def name(self):
+        return f"{self.url_name}[{self.label}]" if self.label else self.url_name
+
+    @property
+    def is_write(self):
+        return self.method != "get"
+
+
+def _ticket(ctx):
+    return {"id": ctx.ticket_id}
+
+
+def _password_reset_confirm(ctx):
+    return {
+        "uid": urlsafe_base64_encode(force_bytes(ctx.admin.pk)),
+        "token": default_token_generator.make_token(ctx.admin),
+        "new_password": "OutraSenha123!",
+        "new_password_confirm": "OutraSenha123!",
+    }
+
+
+SCENARIOS = [
+    # core
+    Scenario("core:login", "post", authenticate=False,
+             data=lambda ctx: {"email": ctx.admin.email, "password": BENCH_PASSWORD}),
+    Scenario("core:register", "post", authenticate=False,
+             data=lambda ctx: {
+                 "email": f"bench-register{next(ctx.counter)}@helpdesk.local",
+                 "password": BENCH_PASSWORD,
+                 "password_confirm": BENCH_PASSWORD,
+             }),
+    Scenario("core:logout", "post", role="admin",
+             data=lambda ctx: {"refresh": str(RefreshToken.for_user(ctx.admin))}),
+    Scenario("core:password-reset-request", "post", authenticate=False,
+             data=lambda ctx: {"email": ctx.admin.email}),
+    Scenario("core:password-reset-confirm", "post", authenticate=False, data=_password_reset_confirm),
+    Scenario("core:token-refresh", "post", authenticate=False,
+             data=lambda ctx: {"refresh": str(RefreshToken.for_user(ctx.admin))}),
+    Scenario("core:me", role="user"),
+    Scenario("core:change-password", "post", role="admin",
+             data=lambda ctx: {
+                 "current_password": BENCH_PASSWORD,
+                 "new_password": "OutraSenha123!",
+                 "new_password_confirm": "OutraSenha123!",
+             }),
+    Scenario("core:user-list", role="admin"),
+    Scenario("core:user-detail", role="admin", kwargs=lambda ctx: {"id": ctx.user.id}),
+    Scenario("core:slow-queries", role="admin"),
+    Scenario("core:profile-list", role="admin"),
+    Scenario("core:profile-detail", skip="depende de um perfil gravado em PROFILE_ROOT"),
+    # tickets
+    Scenario("tickets:ticket-list-create", label="moderator"),
+    Scenario("tickets:ticket-list-create", label="user", role="user"),
+    Scenario("tickets:ticket-list-create", label="filtered",
+             params={"status": TicketStatus.OPEN, "ordering": "-created_at"}),
+    Scenario("tickets:ticket-list-create", "post", label="create", role="user",
+             data=lambda ctx: {"title": "Benchmark", "description": "Benchmark", "priority": "HIGH"}),
+    Scenario("tickets:ticket-export", kwargs=lambda ctx: {"resource": "tickets"},
+             params={"status": TicketStatus.OPEN}),
+    Scenario("tickets:ticket-import", skip="upload grava arquivo e dispara job assincrono"),
+    Scenario("tickets:ticket-import-detail", role="admin", kwargs=lambda ctx: {"id": ctx.import_job_id}),
+    Scenario("tickets:ticket-import-resume", "post", role="admin",
+             kwargs=lambda ctx: {"id": ctx.import_job_id}),
+    Scenario("tickets:ticket-detail", kwargs=_ticket),
+    Scenario("tickets:ticket-detail", "patch", label="update", kwargs=_ticket,
+             data=lambda ctx: {"title": "Benchmark atualizado"}),
+    Scenario("tickets:ticket-assign", "post", kwargs=_ticket,
+             data=lambda ctx: {"assigned_to": str(ctx.moderator.id)}),
+    Scenario("tickets:ticket-change-status", "post", kwargs=_ticket,
+             data=lambda ctx: {"status": TicketStatus.WAITING_USER}),
+    Scenario("tickets:ticket-cancel", "post", kwargs=lambda ctx: {"id": ctx.open_ticket_id}),
+    Scenario("tickets:ticket-events", kwargs=_ticket),
+    Scenario("tickets:ticket-message-list-create", label="all"),
+    Scenario("tickets:ticket-message-list-create", label="ticket", role="user",
+             params=lambda ctx: {"ticket": ctx.ticket_id}),
+    Scenario("tickets:ticket-message-list-create", "post", label="create", role="user",
+             data=lambda ctx: {"ticket": ctx.ticket_id, "message": "Benchmark"}),
+    Scenario("tickets:ticket-message-detail", kwargs=lambda ctx: {"id": ctx.message_id}),
+    # analytics
+    Scenario("analytics:tickets-by-period"),
+    Scenario("analytics:tickets-by-period", label="auto",
+             params={"start_date": "2020-01-01", "granularity": "auto"}),
+    Scenario("analytics:tickets-by-status"),
+    Scenario("analytics:tickets-by-moderator"),
+    Scenario("analytics:average-response-time"),
+    Scenario("analytics:average-resolution-time"),
+    Scenario("analytics:time-in-status"),
+    Scenario("analytics:status-transitions"),
+    Scenario("analytics:backlog-trend"),
+    Scenario("analytics:pivot", params={"dimensions": "month,priority", "measures": "count,resolved"}),
+    Scenario("analytics:pivot", label="percentiles",
+             params={"dimensions": "assignee", "measures": "avg_resolution_seconds,p90_resolution_seconds"}),
+]
@@ -1,5 +1,7 @@
 """
 ASGI config for HelpDesk project.
+
+Served by gunicorn with uvicorn workers (see `config/gunicorn.conf.py`).
 """
 
 import os
@@ -9,3 +11,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_asgi_application()
+
+from core.warmup import warm_up  # noqa: E402  (needs the app registry loaded)
+
+warm_up()
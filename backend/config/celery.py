@@ -5,6 +5,7 @@ Celery configuration for HelpDesk project.
 import os
 
 from celery import Celery
+from celery.signals import worker_process_init
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
@@ -13,6 +14,14 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
 
 
+@worker_process_init.connect
+def reset_db_connections(**kwargs):
+    """Prefork children must not reuse connections/pools from the parent."""
+    from core.db import reset_connections_after_fork
+
+    reset_connections_after_fork()
+
+
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
     """Debug task to verify Celery is working."""
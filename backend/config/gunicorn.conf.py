@@ -0,0 +1,51 @@
+"""
+Gunicorn configuration: ASGI workers (uvicorn) serving `config.asgi`.
+
+    gunicorn config.asgi:application -c config/gunicorn.conf.py
+
+The app is loaded and warmed up in the master before forking
+(`preload_app`), so workers accept traffic with URLconf, views and
+serializers already imported. With `GUNICORN_RELOAD` (development) the app
+is loaded per worker instead, so code changes are picked up.
+"""
+
+import multiprocessing
+import os
+
+# Aliased: gunicorn reads every module-level name, and `config` is a setting.
+from decouple import config as env
+
+bind = env("GUNICORN_BIND", default="0.0.0.0:8000")
+workers = env("WEB_CONCURRENCY", default=multiprocessing.cpu_count() * 2 + 1, cast=int)
+worker_class = "config.workers.UvicornWorker"
+
+reload = env("GUNICORN_RELOAD", default=False, cast=bool)
+preload_app = not reload
+
+# Event-loop workers hold many idle / slow connections at once; the timeout
+# only kills a worker whose loop stopped responding.
+timeout = env("GUNICORN_TIMEOUT", default=60, cast=int)
+graceful_timeout = 30
+keepalive = env("GUNICORN_KEEPALIVE", default=5, cast=int)
+
+# Recycle workers periodically (jittered so they do not restart together).
+max_requests = env("GUNICORN_MAX_REQUESTS", default=5000, cast=int)
+max_requests_jitter = max_requests // 10
+
+accesslog = None
+errorlog = "-"
+loglevel = env("GUNICORN_LOG_LEVEL", default="info")
+
+
+def post_fork(server, worker):
+    # Never share DB sockets or pools opened in the master with the workers.
+    from core.db import reset_connections_after_fork
+
+    reset_connections_after_fork()
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
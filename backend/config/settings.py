@@ -2,10 +2,13 @@
 Django settings for HelpDesk project.
 """
 
+import copy
 from datetime import timedelta
 from pathlib import Path
 
+from celery.schedules import crontab
 from decouple import Csv, config
+from django.core.exceptions import ImproperlyConfigured
 
 # =============================================================================
 # PATHS
@@ -56,11 +59,14 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "core.middleware.RequestIDMiddleware",
+    "core.middleware.RequestMetricsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.ProfilingMiddleware",
+    "core.middleware.ReplicaStickyMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -88,6 +94,18 @@ WSGI_APPLICATION = "config.wsgi.application"
 # =============================================================================
 # DATABASE (PostgreSQL)
 # =============================================================================
+# Connection handling (DB_CONN_MODE):
+#   pool       psycopg3 pool per process (Django native pool)
+#   none       new connection per request (old behavior)
+# There is no CONN_MAX_AGE mode: under ASGI each request runs its sync code
+# in its own thread, so persistent connections are per thread and pile up
+# past max_connections under load (measured at 200 clients, see docs 11.2).
+# Web and Celery processes are sized separately (PROCESS_ROLE=web|celery).
+# Keep WEB_CONCURRENCY * DB_POOL_MAX_SIZE + Celery concurrency *
+# CELERY_DB_POOL_MAX_SIZE below the Postgres max_connections.
+PROCESS_ROLE = config("PROCESS_ROLE", default="web")
+DB_CONN_MODE = config("DB_CONN_MODE", default="pool")
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -96,15 +114,118 @@ DATABASES = {
         "PASSWORD": config("DB_PASSWORD", default="helpdesk_pass"),
         "HOST": config("DB_HOST", default="db"),
         "PORT": config("DB_PORT", default="5432"),
+        # Pool: check each connection before handing it out.
+        "CONN_HEALTH_CHECKS": DB_CONN_MODE == "pool",
+        "OPTIONS": {},
     }
 }
 
+if DB_CONN_MODE == "pool":
+    _pool_prefix = "CELERY_DB_POOL" if PROCESS_ROLE == "celery" else "DB_POOL"
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": config(f"{_pool_prefix}_MIN_SIZE", default=1 if PROCESS_ROLE == "celery" else 2, cast=int),
+        "max_size": config(f"{_pool_prefix}_MAX_SIZE", default=2 if PROCESS_ROLE == "celery" else 10, cast=int),
+        # Seconds to wait for a free connection before failing the request.
+        "timeout": config("DB_POOL_TIMEOUT", default=10, cast=float),
+        "max_idle": config("DB_POOL_MAX_IDLE", default=300, cast=float),
+        "max_lifetime": config("DB_POOL_MAX_LIFETIME", default=1800, cast=float),
+    }
+elif DB_CONN_MODE != "none":
+    raise ImproperlyConfigured(f"DB_CONN_MODE invalido: {DB_CONN_MODE} (use pool ou none).")
+
+# Read replica (optional): analytics, ticket list and export reads go to the
+# `replica` alias while it lags less than REPLICA_MAX_LAG_SECONDS. After a
+# write, the user's reads stick to the primary for REPLICA_STICKY_SECONDS.
+DB_REPLICA_HOST = config("DB_REPLICA_HOST", default="")
+if DB_REPLICA_HOST:
+    DATABASES["replica"] = {
+        **copy.deepcopy(DATABASES["default"]),
+        "HOST": DB_REPLICA_HOST,
+        "PORT": config("DB_REPLICA_PORT", default=DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+REPLICA_MAX_LAG_SECONDS = config("REPLICA_MAX_LAG_SECONDS", default=5.0, cast=float)
+REPLICA_LAG_CHECK_SECONDS = config("REPLICA_LAG_CHECK_SECONDS", default=5.0, cast=float)
+REPLICA_STICKY_SECONDS = config("REPLICA_STICKY_SECONDS", default=15, cast=int)
+
+# Monthly partitions of ticket events / messages (tickets.partitions, Postgres
+# only): `manage_partitions` keeps PARTITION_MONTHS_AHEAD months created and
+# detaches months older than PARTITION_RETENTION_MONTHS (0 keeps every month).
+PARTITION_MONTHS_AHEAD = config("PARTITION_MONTHS_AHEAD", default=3, cast=int)
+PARTITION_RETENTION_MONTHS = config("PARTITION_RETENTION_MONTHS", default=0, cast=int)
+
+# Cold storage (tickets.archive): `archive_tickets` moves resolved/canceled
+# tickets not updated for ARCHIVE_AFTER_DAYS to ArchivedTicket + rollups.
+ARCHIVE_AFTER_DAYS = config("ARCHIVE_AFTER_DAYS", default=365, cast=int)
+ARCHIVE_BATCH_SIZE = config("ARCHIVE_BATCH_SIZE", default=500, cast=int)
+
+# SLA (tickets.sla): deadlines come from SlaPolicy rows; the beat task scans
+# missed deadlines every SLA_SCAN_INTERVAL_SECONDS. Unassigned breaches are
+# mailed to SLA_ALERT_EMAILS.
+SLA_SCAN_INTERVAL_SECONDS = config("SLA_SCAN_INTERVAL_SECONDS", default=60, cast=int)
+SLA_SCAN_BATCH_SIZE = config("SLA_SCAN_BATCH_SIZE", default=1000, cast=int)
+SLA_ALERT_EMAILS = config("SLA_ALERT_EMAILS", default="", cast=Csv())
+# Count SLA time in business hours (core.business_calendar) instead of wall clock.
+SLA_BUSINESS_HOURS = config("SLA_BUSINESS_HOURS", default=True, cast=bool)
+
+# Time-in-status / transition rollups (analytics.status_flow): the beat task
+# adds the status events older than STATUS_FLOW_LAG_SECONDS (transactions
+# still in flight) every STATUS_FLOW_REFRESH_SECONDS.
+STATUS_FLOW_REFRESH_SECONDS = config("STATUS_FLOW_REFRESH_SECONDS", default=300, cast=int)
+STATUS_FLOW_LAG_SECONDS = config("STATUS_FLOW_LAG_SECONDS", default=60, cast=int)
+STATUS_FLOW_CHUNK_SIZE = config("STATUS_FLOW_CHUNK_SIZE", default=5000, cast=int)
+
+# granularity=auto of the analytics time series: finest of day/week/month
+# giving at most ANALYTICS_AUTO_BUCKETS buckets.
+ANALYTICS_AUTO_BUCKETS = config("ANALYTICS_AUTO_BUCKETS", default=100, cast=int)
+
+# Live ticket rollups (analytics.rollups): the beat task recomputes, every
+# TICKET_ROLLUP_REFRESH_SECONDS, the days of the tickets changed before
+# TICKET_ROLLUP_LAG_SECONDS ago. The pivot endpoint reads only the rollups:
+# at most PIVOT_MAX_DIMENSIONS dimensions and PIVOT_MAX_GROUPS groups, results
+# cached for PIVOT_CACHE_SECONDS (keys versioned by the rollup refreshes).
+TICKET_ROLLUP_REFRESH_SECONDS = config("TICKET_ROLLUP_REFRESH_SECONDS", default=60, cast=int)
+TICKET_ROLLUP_LAG_SECONDS = config("TICKET_ROLLUP_LAG_SECONDS", default=30, cast=int)
+PIVOT_MAX_DIMENSIONS = config("PIVOT_MAX_DIMENSIONS", default=3, cast=int)
+PIVOT_MAX_GROUPS = config("PIVOT_MAX_GROUPS", default=1000, cast=int)
+PIVOT_CACHE_SECONDS = config("PIVOT_CACHE_SECONDS", default=300, cast=int)
+
+# Columnar analytics snapshot (analytics.snapshot), disabled by default: column
+# files memory-mapped by the analytics endpoints in ANALYTICS_SNAPSHOT_ROOT
+# (shared by the web and Celery worker containers). Beat writes a delta every
+# ANALYTICS_SNAPSHOT_REFRESH_SECONDS and exports a new base past
+# ANALYTICS_SNAPSHOT_MAX_DELTA delta rows or ANALYTICS_SNAPSHOT_REBUILD_SECONDS;
+# a snapshot not refreshed for ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS is ignored.
+ANALYTICS_SNAPSHOT_ENABLED = config("ANALYTICS_SNAPSHOT_ENABLED", default=False, cast=bool)
+ANALYTICS_SNAPSHOT_ROOT = Path(config("ANALYTICS_SNAPSHOT_ROOT", default=str(BASE_DIR / "analytics_snapshot")))
+ANALYTICS_SNAPSHOT_REFRESH_SECONDS = config("ANALYTICS_SNAPSHOT_REFRESH_SECONDS", default=60, cast=int)
+ANALYTICS_SNAPSHOT_MAX_DELTA = config("ANALYTICS_SNAPSHOT_MAX_DELTA", default=50000, cast=int)
+ANALYTICS_SNAPSHOT_REBUILD_SECONDS = config("ANALYTICS_SNAPSHOT_REBUILD_SECONDS", default=86400, cast=int)
+ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS = config("ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS", default=600, cast=int)
+
+# Daily backlog snapshot (analytics.backlog), taken by celery beat at
+# BACKLOG_SNAPSHOT_TIME (HH:MM, CELERY_TIMEZONE) as the state at the end of the day.
+BACKLOG_SNAPSHOT_TIME = config("BACKLOG_SNAPSHOT_TIME", default="23:55")
+
+# Business calendar (core.business_calendar), in TIME_ZONE: weekdays 0=Monday.
+# Holidays are MM-DD (every year) or YYYY-MM-DD; defaults are the fixed
+# national holidays, movable ones must be listed per year.
+BUSINESS_HOURS_START = config("BUSINESS_HOURS_START", default="08:00")
+BUSINESS_HOURS_END = config("BUSINESS_HOURS_END", default="18:00")
+BUSINESS_DAYS = config("BUSINESS_DAYS", default="0,1,2,3,4", cast=Csv(int))
+BUSINESS_HOLIDAYS = config(
+    "BUSINESS_HOLIDAYS",
+    default="01-01,04-21,05-01,09-07,10-12,11-02,11-15,11-20,12-25",
+    cast=Csv(),
+)
+
 # =============================================================================
 # CACHE (Redis)
 # =============================================================================
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
+        "BACKEND": "core.cache_backends.InstrumentedRedisCache",
         "LOCATION": config("REDIS_URL", default="redis://redis:6379/0"),
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
@@ -112,6 +233,12 @@ CACHES = {
     }
 }
 
+# Two-tier cache (core.tiered_cache): per-process LRU in front of Redis, with
+# pub/sub invalidation. LOCAL_TTL bounds staleness if an invalidation is lost.
+TIERED_CACHE_LOCAL_TTL = config("TIERED_CACHE_LOCAL_TTL", default=30, cast=int)
+TIERED_CACHE_SHARED_TTL = config("TIERED_CACHE_SHARED_TTL", default=600, cast=int)
+TIERED_CACHE_MAX_ENTRIES = config("TIERED_CACHE_MAX_ENTRIES", default=2000, cast=int)
+
 # =============================================================================
 # AUTH
 # =============================================================================
@@ -129,7 +256,7 @@ AUTH_PASSWORD_VALIDATORS = [
 # =============================================================================
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -137,7 +264,7 @@ REST_FRAMEWORK = {
     "DEFAULT_FILTER_BACKENDS": (
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
-        "rest_framework.filters.OrderingFilter",
+        "core.filters.RankedOrderingFilter",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
@@ -210,6 +337,35 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "America/Sao_Paulo"
+CELERY_BEAT_SCHEDULE = {
+    "scan-sla-breaches": {
+        "task": "tickets.tasks.scan_sla_breaches_task",
+        "schedule": SLA_SCAN_INTERVAL_SECONDS,
+        "options": {"expires": SLA_SCAN_INTERVAL_SECONDS},
+    },
+    "refresh-status-rollups": {
+        "task": "analytics.tasks.refresh_status_rollups_task",
+        "schedule": STATUS_FLOW_REFRESH_SECONDS,
+        "options": {"expires": STATUS_FLOW_REFRESH_SECONDS},
+    },
+    "refresh-ticket-rollups": {
+        "task": "analytics.tasks.refresh_live_rollups_task",
+        "schedule": TICKET_ROLLUP_REFRESH_SECONDS,
+        "options": {"expires": TICKET_ROLLUP_REFRESH_SECONDS},
+    },
+    "refresh-analytics-snapshot": {
+        "task": "analytics.tasks.refresh_analytics_snapshot_task",
+        "schedule": ANALYTICS_SNAPSHOT_REFRESH_SECONDS,
+        "options": {"expires": ANALYTICS_SNAPSHOT_REFRESH_SECONDS},
+    },
+    "snapshot-backlog": {
+        "task": "analytics.tasks.snapshot_backlog_task",
+        "schedule": crontab(
+            hour=BACKLOG_SNAPSHOT_TIME.split(":")[0],
+            minute=BACKLOG_SNAPSHOT_TIME.split(":")[1],
+        ),
+    },
+}
 
 # =============================================================================
 # EMAIL (SMTP Gmail)
@@ -236,6 +392,34 @@ USE_TZ = True
 STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# =============================================================================
+# PERFORMANCE INSTRUMENTATION
+# =============================================================================
+SLOW_REQUEST_MS = config("SLOW_REQUEST_MS", default=1000, cast=int)
+SERVER_TIMING_HEADER = config("SERVER_TIMING_HEADER", default=True, cast=bool)
+# Prometheus multiprocess mode is enabled by the PROMETHEUS_MULTIPROC_DIR
+# environment variable itself (read by prometheus_client at import time); each
+# service uses its own directory. /metrics merges METRICS_MULTIPROC_DIRS
+# (default: this process' directory) and, with DEBUG=False, only answers when
+# METRICS_TOKEN is set and sent as a Bearer token.
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+METRICS_MULTIPROC_DIRS = config("METRICS_MULTIPROC_DIRS", default="", cast=Csv())
+SLOW_QUERY_MS = config("SLOW_QUERY_MS", default=200, cast=int)
+# Fraction of slow SELECTs re-run under EXPLAIN (ANALYZE, BUFFERS); PostgreSQL only.
+SLOW_QUERY_EXPLAIN_RATE = config("SLOW_QUERY_EXPLAIN_RATE", default=0.0, cast=float)
+QUERY_STATS_PUBLISH_SECONDS = config("QUERY_STATS_PUBLISH_SECONDS", default=30, cast=int)
+QUERY_STATS_MAX_FINGERPRINTS = config("QUERY_STATS_MAX_FINGERPRINTS", default=1000, cast=int)
+# On-demand profiling (X-Profile header, ADMIN only). Shared between web processes.
+PROFILING_ENABLED = config("PROFILING_ENABLED", default=True, cast=bool)
+PROFILE_ROOT = Path(config("PROFILE_ROOT", default=str(BASE_DIR / "profiles")))
+PROFILE_KEEP = config("PROFILE_KEEP", default=50, cast=int)
+
+# =============================================================================
+# BULK IMPORT
+# =============================================================================
+# Must be shared between the web and Celery worker containers.
+IMPORT_ROOT = Path(config("IMPORT_ROOT", default=str(BASE_DIR / "imports")))
+
 if not DEBUG:
     SESSION_COOKIE_SECURE = True
     CSRF_COOKIE_SECURE = True
@@ -251,25 +435,48 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # =============================================================================
 # LOGGING
 # =============================================================================
+LOG_FORMAT = config("LOG_FORMAT", default="text")  # text | json
+LOG_ASYNC = config("LOG_ASYNC", default=True, cast=bool)
+LOG_QUEUE_SIZE = config("LOG_QUEUE_SIZE", default=10000, cast=int)
+# Fraction of INFO/DEBUG records kept per logger, e.g. "helpdesk:0.1,django:0.5".
+LOG_SAMPLE_RATES = {
+    name.strip(): float(rate)
+    for name, rate in (
+        item.split(":", 1) for item in config("LOG_SAMPLE_RATES", default="", cast=Csv())
+    )
+}
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
     "filters": {
         "request_id": {
             "()": "core.logging_filters.RequestIDLogFilter",
-        }
+        },
+        "sampling": {
+            "()": "core.logging_filters.SamplingFilter",
+            "rates": LOG_SAMPLE_RATES,
+        },
     },
     "formatters": {
         "verbose": {
             "format": "[{asctime}] {levelname} {name} [{request_id}] {message}",
             "style": "{",
         },
+        "json": {
+            "()": "core.logging_handlers.JSONFormatter",
+        },
     },
     "handlers": {
         "console": {
-            "class": "logging.StreamHandler",
-            "formatter": "verbose",
-            "filters": ["request_id"],
+            **(
+                {"class": "core.logging_handlers.AsyncStreamHandler", "queue_size": LOG_QUEUE_SIZE}
+                if LOG_ASYNC
+                else {"class": "logging.StreamHandler"}
+            ),
+            "formatter": "json" if LOG_FORMAT == "json" else "verbose",
+            # request_id first: sampling is decided per request.
+            "filters": ["request_id", "sampling"],
         },
     },
     "root": {
@@ -2,7 +2,9 @@
 URL configuration for HelpDesk project.
 """
 
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.urls import include, path
 from drf_spectacular.views import (
     SpectacularAPIView,
@@ -10,6 +12,8 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from core.views import metrics_view
+
 urlpatterns = [
     # Admin
     path("admin/", admin.site.urls),
@@ -18,6 +22,8 @@ urlpatterns = [
     path("api/v1/tickets/", include("tickets.urls")),
     path("api/v1/analytics/", include("analytics.urls")),
     path("api/v1/notifications/", include("notifications.urls")),
+    # Observability
+    path("metrics", metrics_view, name="metrics"),
     # API Docs
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
@@ -31,3 +37,7 @@ urlpatterns = [
         name="redoc",
     ),
 ]
+
+if settings.DEBUG:
+    # runserver served these implicitly; gunicorn does not.
+    urlpatterns += staticfiles_urlpatterns()
@@ -0,0 +1,11 @@
+"""
+Gunicorn worker classes.
+"""
+
+from uvicorn_worker import UvicornWorker as BaseUvicornWorker
+
+
+class UvicornWorker(BaseUvicornWorker):
+    """Django has no ASGI lifespan support: skip the lifespan handshake."""
+
+    CONFIG_KWARGS = {**BaseUvicornWorker.CONFIG_KWARGS, "lifespan": "off"}
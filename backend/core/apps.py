@@ -5,3 +5,20 @@ class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
     verbose_name = "Core (Auth & Users)"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_delete, post_save
+
+        from .metrics import connect_celery_signals
+        from .models import User
+        from .query_log import connect_query_stats_signals, install_query_log
+        from .task_context import connect_task_context_signals
+        from .user_cache import on_user_changed
+
+        connect_celery_signals()
+        connect_task_context_signals()
+        connect_query_stats_signals()
+        connection_created.connect(install_query_log, dispatch_uid="helpdesk-query-log")
+        post_save.connect(on_user_changed, sender=User, dispatch_uid="helpdesk-user-cache-save")
+        post_delete.connect(on_user_changed, sender=User, dispatch_uid="helpdesk-user-cache-delete")
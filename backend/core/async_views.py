@@ -0,0 +1,105 @@
+"""
+Async dispatch for DRF views.
+
+DRF's `APIView` is sync-only: under ASGI, Django runs every sync view on a
+single shared thread per worker. `AsyncAPIViewMixin` makes `dispatch` a
+coroutine so `async def` handlers run on the event loop (with the async ORM),
+while authentication, permissions, throttling and any remaining sync
+handlers (e.g. PATCH) run through `sync_to_async`.
+
+`streaming_body` adapts sync streaming bodies (exports, file downloads) to
+the server: under ASGI, Django buffers a sync iterator whole with
+`sync_to_async(list)` before sending the first byte.
+"""
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404
+from django.utils.functional import classproperty
+from rest_framework.response import Response
+
+from .profiling import profile_async_work
+
+
+class AsyncAPIViewMixin:
+    """Mix in before `APIView` / DRF generic views."""
+
+    @classproperty
+    def view_is_async(cls):
+        return True
+
+    async def dispatch(self, request, *args, **kwargs):
+        async with profile_async_work():
+            return await self._adispatch(request, *args, **kwargs)
+
+    async def _adispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def aget_object(self):
+        """Async counterpart of `GenericAPIView.get_object`."""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        obj = await queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]}).afirst()
+        if obj is None:
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def alist(self, request, *args, **kwargs):
+        """
+        Async counterpart of `ListModelMixin.list`. Pagination (count +
+        page slice) goes through `sync_to_async`: DRF paginators are sync.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await sync_to_async(self.paginate_queryset)(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        objects = [obj async for obj in queryset]
+        return Response(self.get_serializer(objects, many=True).data)
+
+
+async def aiterate(iterator):
+    """Async iterator over a sync one; each `next()` runs through `sync_to_async` (ORM reads included)."""
+    iterator = iter(iterator)
+    done = object()
+    next_chunk = sync_to_async(next)
+    while (chunk := await next_chunk(iterator, done)) is not done:
+        yield chunk
+
+
+def is_asgi(request):
+    """Whether `request` (HttpRequest or DRF Request) is served through ASGI."""
+    return isinstance(getattr(request, "_request", request), ASGIRequest)
+
+
+def streaming_body(request, iterator):
+    """
+    Body for a `StreamingHttpResponse` of `request` (HttpRequest or DRF
+    Request): an async iterator under ASGI, so chunks are sent as they are
+    produced; the sync iterator itself under WSGI.
+    """
+    if is_asgi(request):
+        return aiterate(iterator)
+    return iterator
@@ -0,0 +1,183 @@
+"""
+Business-hours calendar (TIME_ZONE aware).
+
+Working time is the `BUSINESS_HOURS_START`-`BUSINESS_HOURS_END` window of the
+`BUSINESS_DAYS` weekdays, minus `BUSINESS_HOLIDAYS` ("MM-DD" every year or
+"YYYY-MM-DD"). The calendar precomputes the working interval of every day of
+a range of years as epoch seconds, plus the prefix sum of their lengths: the
+working time elapsed before an instant is one binary search, so a duration
+costs O(log days) however long it is, and adding working time to an instant
+is a binary search on the prefix sums. The range grows on demand.
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+# Years precomputed around the current one when the calendar is built.
+_YEARS_BEFORE = 5
+_YEARS_AFTER = 2
+
+
+def _parse_time(value):
+    try:
+        return time.fromisoformat(value)
+    except ValueError:
+        raise ImproperlyConfigured(f"Horario invalido: {value!r} (use HH:MM).")
+
+
+def _parse_holidays(values):
+    recurring, dated = set(), set()
+    for value in values:
+        value = value.strip()
+        try:
+            if len(value) == 5:
+                month, day = (int(part) for part in value.split("-"))
+                date(2000, month, day)
+                recurring.add((month, day))
+            else:
+                dated.add(date.fromisoformat(value))
+        except ValueError:
+            raise ImproperlyConfigured(f"Feriado invalido: {value!r} (use MM-DD ou YYYY-MM-DD).")
+    return frozenset(recurring), frozenset(dated)
+
+
+class BusinessCalendar:
+    def __init__(self, start, end, weekdays, holidays=(), tz=None):
+        self.start = _parse_time(start) if isinstance(start, str) else start
+        self.end = _parse_time(end) if isinstance(end, str) else end
+        self.weekdays = frozenset(int(day) for day in weekdays)
+        if self.end <= self.start or not self.weekdays or not self.weekdays <= set(range(7)):
+            raise ImproperlyConfigured("Calendario sem horario util: confira BUSINESS_HOURS_* e BUSINESS_DAYS.")
+        self.recurring_holidays, self.holidays = _parse_holidays(holidays)
+        self.tz = ZoneInfo(tz or settings.TIME_ZONE)
+        self._lock = threading.Lock()
+        # (first_year, last_year, low, high, starts, ends, prefix); swapped as a whole.
+        self._table = None
+        today = datetime.now(self.tz).date()
+        self._build(today.year - _YEARS_BEFORE, today.year + _YEARS_AFTER)
+
+    def is_business_day(self, day):
+        return (
+            day.weekday() in self.weekdays
+            and (day.month, day.day) not in self.recurring_holidays
+            and day not in self.holidays
+        )
+
+    def _build(self, first_year, last_year):
+        starts, ends, prefix = [], [], [0.0]
+        day, last = date(first_year, 1, 1), date(last_year, 12, 31)
+        while day <= last:
+            if self.is_business_day(day):
+                start = datetime.combine(day, self.start, self.tz).timestamp()
+                end = datetime.combine(day, self.end, self.tz).timestamp()
+                starts.append(start)
+                ends.append(end)
+                prefix.append(prefix[-1] + end - start)
+            day += timedelta(days=1)
+        # Instants in [low, high) keep a spare year on each side: the working
+        # time after them may fall in the next year.
+        low = datetime(first_year + 1, 1, 1, tzinfo=self.tz).timestamp()
+        high = datetime(last_year, 1, 1, tzinfo=self.tz).timestamp()
+        self._table = (first_year, last_year, low, high, starts, ends, prefix)
+
+    def _covering(self, low, high):
+        """Interval table covering the epoch range `[low, high]`, extended when needed."""
+        table = self._table
+        if table[2] <= low and high < table[3]:
+            return table
+        with self._lock:
+            first_year, last_year = self._table[:2]
+            first = datetime.fromtimestamp(low, self.tz).year - 1
+            last = datetime.fromtimestamp(high, self.tz).year + 1
+            if first < first_year or last > last_year:
+                self._build(min(first_year, first), max(last_year, last))
+            return self._table
+
+    @staticmethod
+    def _elapsed(table, timestamp):
+        """Working seconds from the start of `table` to `timestamp` (epoch)."""
+        starts, ends, prefix = table[4:]
+        index = bisect_right(starts, timestamp) - 1
+        if index < 0:
+            return 0.0
+        return prefix[index] + min(timestamp, ends[index]) - starts[index]
+
+    def seconds_between(self, start, end):
+        """Working seconds between two aware datetimes (0 when end <= start)."""
+        if end <= start:
+            return 0.0
+        low, high = start.timestamp(), end.timestamp()
+        table = self._covering(low, high)
+        return self._elapsed(table, high) - self._elapsed(table, low)
+
+    def durations(self, intervals):
+        """
+        `seconds_between` of each `(start, end)` pair, as a list. The table is
+        looked up once for the whole batch.
+        """
+        pairs = [(start.timestamp(), end.timestamp()) for start, end in intervals]
+        if not pairs:
+            return []
+        table = self._covering(min(low for low, _ in pairs), max(high for _, high in pairs))
+        starts, ends, prefix = table[4:]
+
+        def elapsed(timestamp):
+            index = bisect_right(starts, timestamp) - 1
+            return prefix[index] + min(timestamp, ends[index]) - starts[index] if index >= 0 else 0.0
+
+        return [elapsed(high) - elapsed(low) if high > low else 0.0 for low, high in pairs]
+
+    def add(self, start, seconds):
+        """Instant `seconds` of working time after `start` (aware datetime)."""
+        if seconds <= 0:
+            return start
+        timestamp = start.timestamp()
+        first_year, last_year, _, _, starts, _, prefix = self._table
+        # Wall-clock span holding `seconds` of working time at the table's
+        # average yearly rate (plus the spare years of `_covering`).
+        per_year = prefix[-1] / (last_year - first_year + 1)
+        table = self._covering(timestamp, timestamp + seconds / per_year * 366 * 86400)
+        starts, prefix = table[4], table[6]
+        target = self._elapsed(table, timestamp) + seconds
+        # prefix[i + 1] is the working time up to the end of interval i.
+        index = bisect_left(prefix, target, 1) - 1
+        if index >= len(starts):
+            raise ValueError("Calendario sem horario util suficiente para o prazo.")
+        return datetime.fromtimestamp(starts[index] + target - prefix[index], start.tzinfo or self.tz)
+
+
+_calendar = None
+_calendar_key = None
+
+
+def calendar_settings():
+    return (
+        settings.BUSINESS_HOURS_START,
+        settings.BUSINESS_HOURS_END,
+        tuple(settings.BUSINESS_DAYS),
+        tuple(settings.BUSINESS_HOLIDAYS),
+        settings.TIME_ZONE,
+    )
+
+
+def get_calendar():
+    """Calendar of the current settings (rebuilt if they change, e.g. in tests)."""
+    global _calendar, _calendar_key
+    key = calendar_settings()
+    if key != _calendar_key:
+        start, end, weekdays, holidays, tz = key
+        _calendar, _calendar_key = BusinessCalendar(start, end, weekdays, holidays, tz), key
+    return _calendar
+
+
+def business_seconds(start, end):
+    return get_calendar().seconds_between(start, end)
+
+
+def add_business_seconds(start, seconds):
+    return get_calendar().add(start, seconds)
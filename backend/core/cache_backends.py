@@ -0,0 +1,40 @@
+"""
+Cache backends that count hits and misses for the current request.
+"""
+
+from django_redis.cache import RedisCache
+
+from .request_context import get_request_metrics
+
+_MISSING = object()
+
+
+class InstrumentedCacheMixin:
+    """
+    Records `get` / `get_many` hits and misses on the request metrics.
+    Outside a request (no metrics in context) it only adds a context lookup.
+    """
+
+    def get(self, key, default=None, version=None, **kwargs):
+        value = super().get(key, _MISSING, version=version, **kwargs)
+        metrics = get_request_metrics()
+        if value is _MISSING:
+            if metrics is not None:
+                metrics.cache_misses += 1
+            return default
+        if metrics is not None:
+            metrics.cache_hits += 1
+        return value
+
+    def get_many(self, keys, version=None, **kwargs):
+        keys = list(keys)
+        values = super().get_many(keys, version=version, **kwargs)
+        metrics = get_request_metrics()
+        if metrics is not None:
+            metrics.cache_hits += len(values)
+            metrics.cache_misses += len(keys) - len(values)
+        return values
+
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+    pass
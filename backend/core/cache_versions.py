@@ -0,0 +1,45 @@
+"""
+Versioned cache namespaces.
+
+A namespace version is a counter stored in the cache. Writers bump it and
+readers embed it in cache keys / ETags, so every derived entry is
+invalidated at once without scanning keys.
+"""
+
+import logging
+import time
+
+from django.core.cache import cache
+
+logger = logging.getLogger("helpdesk")
+
+_KEY_PREFIX = "cache-version"
+
+
+def _version_key(namespace: str) -> str:
+    return f"{_KEY_PREFIX}:{namespace}"
+
+
+def get_cache_version(namespace: str) -> int:
+    """
+    Return the current version of a namespace, initializing it if needed.
+
+    Initial values are seeded from the clock so a cache flush never brings
+    an older version number back.
+    """
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(namespace: str) -> None:
+    key = _version_key(namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+    except Exception as exc:
+        logger.warning(f"Failed to bump cache version {namespace}: {exc}")
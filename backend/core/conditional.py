@@ -0,0 +1,83 @@
+"""
+Conditional GET support (ETag / Last-Modified) for DRF views.
+"""
+
+import hashlib
+from calendar import timegm
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts) -> str:
+    """Hash arbitrary validator parts into an opaque ETag value."""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def _not_modified(request, etag, last_modified):
+    etag = quote_etag(etag) if etag else None
+    last_modified_ts = timegm(last_modified.utctimetuple()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+    return response, etag, last_modified_ts
+
+
+def _set_validators(response, etag, last_modified_ts):
+    if etag:
+        response["ETag"] = etag
+    if last_modified_ts is not None:
+        response["Last-Modified"] = http_date(last_modified_ts)
+    # Responses depend on the authenticated user: never share, always revalidate.
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_get(method):
+    """
+    Answers GET/HEAD with 304 Not Modified before any serialization.
+
+    The decorated view must implement `get_validators(request, *args, **kwargs)`
+    returning `(etag, last_modified)` computed with cheap queries. Returning
+    `(None, None)` disables the check for that request (e.g. unknown object
+    or missing permission), so the regular view flow produces the 404/403.
+
+    `async def` handlers are supported: the view may define an async
+    `aget_validators`, otherwise `get_validators` runs via `sync_to_async`.
+    """
+
+    if iscoroutinefunction(method):
+
+        @wraps(method)
+        async def async_wrapper(self, request, *args, **kwargs):
+            if hasattr(self, "aget_validators"):
+                etag, last_modified = await self.aget_validators(request, *args, **kwargs)
+            else:
+                etag, last_modified = await sync_to_async(self.get_validators)(request, *args, **kwargs)
+            if etag is None and last_modified is None:
+                return await method(self, request, *args, **kwargs)
+
+            response, etag, last_modified_ts = _not_modified(request, etag, last_modified)
+            if response is None:
+                response = await method(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            return _set_validators(response, etag, last_modified_ts)
+
+        return async_wrapper
+
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request, *args, **kwargs)
+        if etag is None and last_modified is None:
+            return method(self, request, *args, **kwargs)
+
+        response, etag, last_modified_ts = _not_modified(request, etag, last_modified)
+        if response is None:
+            response = method(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        return _set_validators(response, etag, last_modified_ts)
+
+    return wrapper
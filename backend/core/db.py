@@ -0,0 +1,19 @@
+"""
+Database connection helpers.
+"""
+
+from django.db import connections
+
+
+def reset_connections_after_fork():
+    """
+    Drop connections and connection pools inherited from a parent process
+    (gunicorn preload, Celery prefork): sockets cannot be shared between
+    processes and pool worker threads do not survive a fork. The next query
+    opens a fresh pool in this process.
+    """
+    for connection in connections.all():
+        connection.close()
+        close_pool = getattr(connection, "close_pool", None)
+        if close_pool is not None:
+            close_pool()
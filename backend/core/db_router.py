@@ -0,0 +1,162 @@
+"""
+Primary / read-replica routing.
+
+Writes, and reads by default, go to `default`. Views opting in with
+`ReplicaReadMixin` send the ORM reads of their GET/HEAD requests to the
+`replica` alias (after authentication and permission checks, which stay on
+the primary), unless:
+
+- no replica is configured (`DB_REPLICA_HOST` empty);
+- the replica lags more than `REPLICA_MAX_LAG_SECONDS` or cannot be reached
+  (checked at most every `REPLICA_LAG_CHECK_SECONDS` per process);
+- the user wrote something in the last `REPLICA_STICKY_SECONDS`
+  (read-your-writes, marked by `ReplicaStickyMiddleware`).
+"""
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+from .metrics import REPLICA_LAG
+from .request_context import get_authenticated_user_id
+
+logger = logging.getLogger("helpdesk")
+
+PRIMARY_ALIAS = "default"
+REPLICA_ALIAS = "replica"
+
+_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+_read_alias: ContextVar[str | None] = ContextVar("db_read_alias", default=None)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def replica_lag_seconds():
+    connection = connections[REPLICA_ALIAS]
+    if connection.vendor != "postgresql":
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(_LAG_SQL)
+        return float(cursor.fetchone()[0] or 0.0)
+
+
+class ReplicaLagMonitor:
+    """Per-process replica health, refreshed at most every `interval` seconds."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at = float("-inf")
+        self._healthy = None
+        self.lag = None
+
+    def healthy(self):
+        interval = settings.REPLICA_LAG_CHECK_SECONDS
+        if time.monotonic() - self._checked_at >= interval:
+            with self._lock:
+                if time.monotonic() - self._checked_at >= interval:
+                    self._refresh()
+                    self._checked_at = time.monotonic()
+        return bool(self._healthy)
+
+    def _refresh(self):
+        try:
+            self.lag = replica_lag_seconds()
+        except DatabaseError as exc:
+            if self._healthy is not False:
+                logger.warning(f"Replica indisponivel, leituras no primario: {exc}")
+            self._healthy, self.lag = False, None
+            return
+
+        REPLICA_LAG.set(self.lag)
+        healthy = self.lag <= settings.REPLICA_MAX_LAG_SECONDS
+        if not healthy and self._healthy is not False:
+            logger.warning(f"Replica atrasada {self.lag:.1f}s, leituras no primario")
+        self._healthy = healthy
+
+    def reset(self):
+        with self._lock:
+            self._checked_at = float("-inf")
+            self._healthy, self.lag = None, None
+
+
+replica_monitor = ReplicaLagMonitor()
+
+
+def _sticky_key(user_id):
+    return f"db:sticky:{user_id}"
+
+
+def mark_sticky(user_id):
+    cache.set(_sticky_key(user_id), 1, settings.REPLICA_STICKY_SECONDS)
+
+
+def is_sticky(user_id):
+    return user_id is not None and cache.get(_sticky_key(user_id)) is not None
+
+
+def use_replica(request):
+    """Route the following reads of this request to the replica, if allowed."""
+    if (
+        replica_configured()
+        and request.method in SAFE_METHODS
+        and not is_sticky(get_authenticated_user_id(request))
+        and replica_monitor.healthy()
+    ):
+        _read_alias.set(REPLICA_ALIAS)
+
+
+def release_replica():
+    _read_alias.set(None)
+
+
+def read_alias():
+    """Alias the current request reads from."""
+    return _read_alias.get() or PRIMARY_ALIAS
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get() or PRIMARY_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same data on both aliases.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives the schema through replication.
+        return db != REPLICA_ALIAS
+
+
+class ReplicaReadMixin:
+    """
+    Mix in before a DRF view: its GET/HEAD reads go to the replica. Works
+    with sync views and `AsyncAPIViewMixin` (context vars set in `initial`
+    propagate back from `sync_to_async`). Streaming responses must pin the
+    alias (`read_alias()`) before returning, since they run after the view.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        use_replica(request)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        release_replica()
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -4,10 +4,13 @@ Global DRF exception handler.
 
 import logging
 
+from psycopg_pool import PoolTimeout
 from rest_framework import status
+from rest_framework.exceptions import Throttled
 from rest_framework.response import Response
 from rest_framework.views import exception_handler as drf_exception_handler
 
+from .metrics import record_throttle_rejection
 from .request_context import get_request_id
 
 logger = logging.getLogger("helpdesk")
@@ -17,6 +20,21 @@ def custom_exception_handler(exc, context):
     response = drf_exception_handler(exc, context)
     request_id = get_request_id()
 
+    if isinstance(exc, Throttled):
+        record_throttle_rejection(context["request"])
+
+    if response is None and isinstance(exc.__cause__ or exc, PoolTimeout):
+        # Every pooled connection stayed busy for DB_POOL_TIMEOUT: shed load.
+        logger.warning(f"Database pool exhausted: {exc}")
+        return Response(
+            {
+                "detail": "Servico temporariamente indisponivel. Tente novamente.",
+                "request_id": request_id,
+            },
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "1"},
+        )
+
     if response is None:
         logger.exception("Unhandled API exception", exc_info=exc)
         return Response(
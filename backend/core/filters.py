@@ -0,0 +1,32 @@
+"""
+DRF filter backends shared by the API.
+"""
+
+from rest_framework.filters import OrderingFilter
+
+
+class RankedOrderingFilter(OrderingFilter):
+    """
+    `OrderingFilter` with two view options:
+
+    - `ordering_aliases`: public ordering name -> column, e.g. `priority`
+      sorted by a numeric rank column instead of its text value;
+    - `ordering_tiebreak`: fields appended (unless already present) so the
+      order is total and page boundaries stay stable.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+
+        aliases = getattr(view, "ordering_aliases", {})
+        resolved = []
+        for term in ordering:
+            descending = term.startswith("-")
+            field = aliases.get(term.lstrip("-"), term.lstrip("-"))
+            resolved.append(f"-{field}" if descending else field)
+
+        present = {term.lstrip("-") for term in resolved}
+        resolved += [field for field in getattr(view, "ordering_tiebreak", ()) if field.lstrip("-") not in present]
+        return resolved
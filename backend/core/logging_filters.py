@@ -2,14 +2,66 @@
 Logging filters used by project logger configuration.
 """
 
-from .request_context import get_request_id
+import logging
+import random
+import zlib
+
+from .request_context import get_authenticated_user_id, get_request_id, get_request_metrics
 
 
 class RequestIDLogFilter:
     """
-    Adds request_id field to every log record.
+    Adds request_id, user_id, route and the current request metrics to every
+    log record. Runs in the emitting thread, where the context vars are set.
     """
 
     def filter(self, record):
         record.request_id = get_request_id()
+        metrics = get_request_metrics()
+        if metrics is None:
+            record.user_id = None
+            record.route = None
+            record.duration_ms = None
+            record.db_queries = None
+            record.db_time_ms = None
+            record.cache_hits = None
+            record.cache_misses = None
+        else:
+            record.user_id = get_authenticated_user_id(metrics.request)
+            record.route = metrics.route
+            record.duration_ms = round(metrics.elapsed_ms, 2)
+            record.db_queries = metrics.db_queries
+            record.db_time_ms = round(metrics.db_time_ms, 2)
+            record.cache_hits = metrics.cache_hits
+            record.cache_misses = metrics.cache_misses
         return True
+
+
+class SamplingFilter:
+    """
+    Keeps only a fraction of INFO/DEBUG records per logger (longest matching
+    prefix in `rates`, e.g. {"helpdesk": 0.1}). WARNING and above always pass.
+
+    Sampling is decided per request id, so a sampled request keeps all of its
+    lines; records outside a request are sampled at random.
+    """
+
+    def __init__(self, rates=None):
+        self.rates = sorted((rates or {}).items(), key=lambda item: len(item[0]), reverse=True)
+
+    def _rate(self, name):
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(f"{prefix}."):
+                return rate
+        return 1.0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self._rate(record.name)
+        if rate >= 1:
+            return True
+        request_id = getattr(record, "request_id", None) or get_request_id()
+        if request_id and request_id != "-":
+            return zlib.crc32(request_id.encode("utf-8")) / 0xFFFFFFFF < rate
+        return random.random() < rate
@@ -0,0 +1,103 @@
+"""
+Non-blocking log handler and JSON formatter.
+
+`AsyncStreamHandler` only enqueues records in the emitting thread (after its
+filters ran, so context vars are captured); a `QueueListener` thread formats
+and writes them. Log I/O never sits on the request path.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+_CONTEXT_FIELDS = (
+    "request_id",
+    "user_id",
+    "route",
+    "duration_ms",
+    "db_queries",
+    "db_time_ms",
+    "cache_hits",
+    "cache_misses",
+)
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line with the request context fields."""
+
+    def format(self, record):
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name in _CONTEXT_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None and value != "-":
+                payload[name] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class AsyncStreamHandler(QueueHandler):
+    """
+    QueueHandler feeding a StreamHandler through a QueueListener thread.
+
+    The queue is bounded (`queue_size`): when the writer cannot keep up,
+    records are dropped and counted instead of blocking the caller. The
+    listener is restarted after a fork (Celery prefork, gunicorn preload).
+    """
+
+    def __init__(self, stream=None, queue_size=10000):
+        self._stream_handler = logging.StreamHandler(stream or sys.stderr)
+        self._queue_size = queue_size
+        self.dropped = 0
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self._start_listener()
+        atexit.register(self.stop)
+
+    def _start_listener(self):
+        self._pid = os.getpid()
+        self.listener = QueueListener(self.queue, self._stream_handler, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self):
+        listener = getattr(self, "listener", None)
+        if listener is not None and listener._thread is not None and self._pid == os.getpid():
+            listener.stop()
+
+    def setFormatter(self, fmt):
+        # Formatting happens in the listener thread.
+        self._stream_handler.setFormatter(fmt)
+
+    def setLevel(self, level):
+        super().setLevel(level)
+        self._stream_handler.setLevel(level)
+
+    def prepare(self, record):
+        # Same process: no need to pre-format or strip the record. Resolve
+        # the message now in case args are mutated after the call returns.
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record):
+        if self._pid != os.getpid():
+            self.queue = queue.Queue(maxsize=self._queue_size)
+            self._start_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                sys.stderr.write(f"Log queue full: {self.dropped} records dropped so far\n")
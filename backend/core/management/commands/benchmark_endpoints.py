@@ -0,0 +1,86 @@
+"""
+Benchmark every core/tickets/analytics endpoint against generated datasets.
+
+Roda em um banco de teste descartavel (como `manage.py test`). Exemplo:
+    python manage.py benchmark_endpoints --sizes 1000,10000 --report bench.json
+    python manage.py benchmark_endpoints --sizes 10000 --baseline bench-main.json
+"""
+
+import json
+from datetime import date
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from analytics.rollups import rebuild_live_rollups
+from benchmarks.runner import (
+    DEFAULT_BUDGETS_PATH,
+    BenchmarkRunner,
+    compare_reports,
+    load_budgets,
+    missing_scenarios,
+    new_report,
+)
+from tickets.datagen import DatasetConfig, generate_dataset
+
+
+class Command(BaseCommand):
+    help = "Mede queries, latencia e bytes por endpoint e falha se os budgets regredirem."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1000,10000", help="Tamanhos de dataset (tickets).")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--workers", type=int, default=1, help="Processos do gerador de dataset.")
+        parser.add_argument("--budgets", default=str(DEFAULT_BUDGETS_PATH))
+        parser.add_argument("--report", help="Grava o relatorio JSON neste arquivo (padrao: stdout).")
+        parser.add_argument("--baseline", help="Relatorio JSON anterior para comparacao.")
+        parser.add_argument("--tolerance", type=float, default=0.2, help="Regressao de p50 tolerada.")
+        parser.add_argument("--keepdb", action="store_true", help="Reaproveita o banco de teste.")
+
+    def handle(self, *args, **options):
+        missing = missing_scenarios()
+        if missing:
+            raise CommandError(f"Endpoints sem cenario de benchmark: {', '.join(missing)}")
+
+        sizes = [int(size) for size in options["sizes"].split(",") if size.strip()]
+        runner = BenchmarkRunner(load_budgets(options["budgets"]), repeat=options["repeat"])
+        report = new_report(options["repeat"])
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options["keepdb"])
+        try:
+            for size in sizes:
+                call_command("flush", interactive=False, verbosity=0)
+                self.stderr.write(f"Gerando dataset com {size} tickets...")
+                dataset = generate_dataset(
+                    DatasetConfig(tickets=size, seed=options["seed"], end_date=date.today()),
+                    workers=options["workers"],
+                )
+                # The pivot endpoint reads the live rollups, built by celery beat in production.
+                rebuild_live_rollups()
+                self.stderr.write(f"Executando cenarios ({size})...")
+                size_report, violations = runner.run_size(size, dataset)
+                report["sizes"][str(size)] = size_report
+                report["violations"].extend(violations)
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=options["keepdb"])
+            teardown_test_environment()
+
+        if options["baseline"]:
+            with open(options["baseline"], encoding="utf-8") as fh:
+                baseline = json.load(fh)
+            report["regressions"] = compare_reports(report, baseline, tolerance=options["tolerance"])
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options["report"]:
+            with open(options["report"], "w", encoding="utf-8") as fh:
+                fh.write(output)
+        else:
+            self.stdout.write(output)
+
+        problems = report["violations"] + report["regressions"]
+        if problems:
+            raise CommandError("Budgets de performance violados:\n" + "\n".join(problems))
+        self.stderr.write(self.style.SUCCESS("Todos os budgets respeitados."))
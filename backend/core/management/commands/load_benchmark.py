@@ -0,0 +1,60 @@
+"""
+Measure per-request latency under concurrent clients against a running server.
+
+Exemplo (comparando modos de conexao com o banco):
+    DB_CONN_MODE=none -> python manage.py load_benchmark --email admin@x.com --password ... --report none.json
+    DB_CONN_MODE=pool -> python manage.py load_benchmark --email admin@x.com --password ... --baseline none.json
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.load import LoadTarget, compare_load, login, run_load
+
+
+class Command(BaseCommand):
+    help = "Dispara clientes concorrentes contra um endpoint e reporta a latencia por request."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://localhost:8000")
+        parser.add_argument("--path", default="/api/v1/auth/me/")
+        parser.add_argument("--clients", type=int, default=200)
+        parser.add_argument("--requests", type=int, default=20, help="Requests por cliente.")
+        parser.add_argument("--timeout", type=float, default=30)
+        parser.add_argument("--token", help="Access token JWT (ou use --email/--password).")
+        parser.add_argument("--email")
+        parser.add_argument("--password")
+        parser.add_argument("--report", help="Grava o resultado JSON neste arquivo (padrao: stdout).")
+        parser.add_argument("--baseline", help="Resultado JSON anterior para comparacao.")
+
+    def handle(self, *args, **options):
+        token = options["token"]
+        if not token and options["email"]:
+            try:
+                token = login(options["base_url"], options["email"], options["password"] or "")
+            except (OSError, RuntimeError) as exc:
+                raise CommandError(str(exc)) from exc
+
+        target = LoadTarget(options["base_url"], options["path"], token=token)
+        self.stderr.write(
+            f"{options['clients']} clientes x {options['requests']} requests em {options['path']}..."
+        )
+        report = run_load(target, clients=options["clients"], requests=options["requests"], timeout=options["timeout"])
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options["report"]:
+            with open(options["report"], "w", encoding="utf-8") as fh:
+                fh.write(output)
+        else:
+            self.stdout.write(output)
+
+        if options["baseline"]:
+            with open(options["baseline"], encoding="utf-8") as fh:
+                baseline = json.load(fh)
+            for line in compare_load(report, baseline):
+                self.stderr.write(line)
+
+        failed = {status: count for status, count in report["statuses"].items() if status != "200"}
+        if failed:
+            self.stderr.write(self.style.WARNING(f"Respostas nao-200: {failed}"))
@@ -0,0 +1,37 @@
+"""
+List the statements with the highest aggregated cost across all processes.
+
+Exemplo:
+    python manage.py slow_queries --order-by max_ms --limit 10
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.query_log import TOP_ORDERINGS, reset_query_stats, top_queries
+
+
+class Command(BaseCommand):
+    help = "Mostra as queries mais custosas (count, total, max) agregadas por fingerprint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--order-by", choices=TOP_ORDERINGS, default="total_ms")
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument("--reset", action="store_true", help="Zera as estatisticas publicadas.")
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            reset_query_stats()
+            self.stdout.write(self.style.SUCCESS("Estatisticas zeradas."))
+            return
+
+        rows = top_queries(limit=options["limit"], order_by=options["order_by"])
+        if not rows:
+            self.stdout.write("Nenhuma estatistica publicada ainda.")
+            return
+        for row in rows:
+            self.stdout.write(
+                f"[{row['fingerprint_id']}] count={row['count']} total={row['total_ms']}ms "
+                f"avg={row['avg_ms']}ms max={row['max_ms']}ms slow={row['slow']} "
+                f"request={row['last_slow_request_id'] or '-'}"
+            )
+            self.stdout.write(f"    {row['fingerprint'][:500]}")
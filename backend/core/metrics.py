@@ -0,0 +1,191 @@
+"""
+Prometheus metrics: request latency, DB usage, throttling, Celery tasks and
+business gauges.
+
+With `PROMETHEUS_MULTIPROC_DIR` set in the environment (before the process
+starts), prometheus_client stores samples in per-process mmap files. Each
+service (web, Celery) writes to its own directory, wiped by
+`scripts/entrypoint.sh` before the service starts, so PIDs from different
+containers never share a file; the exporter merges every directory listed in
+`METRICS_MULTIPROC_DIRS`.
+"""
+
+import glob
+import os
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+from .cache_versions import get_cache_version
+
+REQUEST_LATENCY = Histogram(
+    "helpdesk_http_request_duration_seconds",
+    "Tempo de resposta por rota.",
+    ["route", "method", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_DB_QUERIES = Histogram(
+    "helpdesk_http_request_db_queries",
+    "Queries SQL por request.",
+    ["route"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+REQUEST_DB_TIME = Histogram(
+    "helpdesk_http_request_db_duration_seconds",
+    "Tempo de banco por request.",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+THROTTLE_REJECTIONS = Counter(
+    "helpdesk_throttle_rejections_total",
+    "Requests rejeitados por throttle.",
+    ["route"],
+)
+TASK_DURATION = Histogram(
+    "helpdesk_celery_task_duration_seconds",
+    "Duracao das tasks Celery.",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+TASK_QUEUE_WAIT = Histogram(
+    "helpdesk_celery_task_queue_wait_seconds",
+    "Tempo entre a publicacao (ou ETA) e o inicio da task.",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900),
+)
+TASK_RESULTS = Counter(
+    "helpdesk_celery_task_results_total",
+    "Execucoes de tasks Celery por resultado (success, failure, retry).",
+    ["task", "outcome"],
+)
+TIERED_CACHE_REQUESTS = Counter(
+    "helpdesk_tiered_cache_requests_total",
+    "Leituras do cache em dois niveis por nivel que respondeu (local, shared, miss).",
+    ["cache", "tier"],
+)
+REPLICA_LAG = Gauge(
+    "helpdesk_db_replica_lag_seconds",
+    "Atraso da replica de leitura na ultima verificacao.",
+    multiprocess_mode="livemax",
+)
+SLA_BREACHES = Counter(
+    "helpdesk_sla_breaches_total",
+    "Violacoes de SLA registradas pelo scanner.",
+    ["kind"],
+)
+
+UNMATCHED_ROUTE = "unmatched"
+BUSINESS_GAUGE_TIMEOUT = 60
+
+
+def route_name(request):
+    match = getattr(request, "resolver_match", None)
+    return (match.view_name if match else None) or UNMATCHED_ROUTE
+
+
+def observe_request(request, response, metrics):
+    route = route_name(request)
+    REQUEST_LATENCY.labels(route, request.method, response.status_code).observe(
+        time.perf_counter() - metrics.started
+    )
+    REQUEST_DB_QUERIES.labels(route).observe(metrics.db_queries)
+    REQUEST_DB_TIME.labels(route).observe(metrics.db_time)
+
+
+def record_throttle_rejection(request):
+    THROTTLE_REJECTIONS.labels(route_name(request)).inc()
+
+
+# =============================================================================
+# Celery
+# =============================================================================
+_task_started = {}
+
+
+def _task_prerun(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        TASK_DURATION.labels(task.name).observe(time.perf_counter() - started)
+    TASK_RESULTS.labels(task.name, (state or "unknown").lower()).inc()
+
+
+def connect_celery_signals():
+    from celery.signals import task_postrun, task_prerun
+
+    task_prerun.connect(_task_prerun, weak=False, dispatch_uid="helpdesk-metrics-prerun")
+    task_postrun.connect(_task_postrun, weak=False, dispatch_uid="helpdesk-metrics-postrun")
+
+
+# =============================================================================
+# Business gauges
+# =============================================================================
+class TicketStatusCollector:
+    """
+    Tickets per status, computed at scrape time and cached under the tickets
+    cache version, so scrapes between mutations never hit the database.
+    """
+
+    def collect(self):
+        from tickets.models import Ticket
+        from tickets.services import TICKETS_CACHE_NAMESPACE
+
+        key = f"metrics:tickets-by-status:{get_cache_version(TICKETS_CACHE_NAMESPACE)}"
+        counts = cache.get(key)
+        if counts is None:
+            counts = dict(
+                Ticket.objects.order_by().values_list("status").annotate(total=Count("id"))
+            )
+            cache.set(key, counts, BUSINESS_GAUGE_TIMEOUT)
+
+        gauge = GaugeMetricFamily("helpdesk_tickets", "Tickets por status.", labels=["status"])
+        for status, total in sorted(counts.items()):
+            gauge.add_metric([status], total)
+        yield gauge
+
+
+_business_registry = CollectorRegistry(auto_describe=False)
+_business_registry.register(TicketStatusCollector())
+
+
+class MultiProcessDirsCollector:
+    """`MultiProcessCollector` over several services' multiprocess directories."""
+
+    def __init__(self, paths):
+        self.paths = paths
+
+    def collect(self):
+        files = [file for path in self.paths for file in glob.glob(os.path.join(path, "*.db"))]
+        return multiprocess.MultiProcessCollector.merge(files, accumulate=True)
+
+
+def multiproc_dirs():
+    own_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    return settings.METRICS_MULTIPROC_DIRS or ([own_dir] if own_dir else [])
+
+
+def render_metrics():
+    """Return (payload, content_type) in the Prometheus text format."""
+    paths = multiproc_dirs()
+    if paths:
+        registry = CollectorRegistry(auto_describe=False)
+        registry.register(MultiProcessDirsCollector(paths))
+    else:
+        registry = REGISTRY
+    return generate_latest(registry) + generate_latest(_business_registry), CONTENT_TYPE_LATEST
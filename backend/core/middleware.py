@@ -1,13 +1,48 @@
 """
 Middleware utilities for request lifecycle.
+
+The middleware here is both sync and async capable (same pattern as Django's
+`MiddlewareMixin`), so under ASGI the chain stays async end to end and async
+views never pay a thread hop.
 """
 
+import logging
 import uuid
 
-from .request_context import set_request_id
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .db_router import mark_sticky, replica_configured
+from .metrics import observe_request
+from .profiling import PROFILE_HEADER, PROFILE_MODES, profile_block, safe_profile_id
+from .request_context import (
+    RequestMetrics,
+    get_authenticated_user_id,
+    reset_request_id,
+    set_request_id,
+    set_request_metrics,
+)
+
+logger = logging.getLogger("helpdesk")
+
 
+class SyncAsyncMiddleware:
+    """Base for middleware that runs natively in both sync and async chains."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self._is_coroutine = iscoroutinefunction(get_response)
+        if self._is_coroutine:
+            markcoroutinefunction(self)
 
-class RequestIDMiddleware:
+
+class RequestIDMiddleware(SyncAsyncMiddleware):
     """
     Injects a request id into context and response headers.
     """
@@ -15,17 +50,190 @@ class RequestIDMiddleware:
     header_name = "HTTP_X_REQUEST_ID"
     response_header_name = "X-Request-ID"
 
+    def __call__(self, request):
+        if self._is_coroutine:
+            return self.__acall__(request)
+        token = self._start(request)
+        try:
+            response = self.get_response(request)
+            response[self.response_header_name] = request.request_id
+            return response
+        finally:
+            reset_request_id(token)
+
+    async def __acall__(self, request):
+        token = self._start(request)
+        try:
+            response = await self.get_response(request)
+            response[self.response_header_name] = request.request_id
+            return response
+        finally:
+            reset_request_id(token)
+
+    def _start(self, request):
+        request.request_id = request.META.get(self.header_name) or str(uuid.uuid4())
+        return set_request_id(request.request_id)
+
+
+class RequestMetricsMiddleware(SyncAsyncMiddleware):
+    """
+    Measures wall time, DB queries / DB time and cache hits per request.
+
+    Results are exposed in a `Server-Timing` header, recorded in the
+    Prometheus histograms (`core.metrics`), attached to log records
+    by `RequestIDLogFilter` and summarized in one `helpdesk` log line per
+    request (WARNING above `SLOW_REQUEST_MS`). Must run after
+    `RequestIDMiddleware` so the summary carries the request id. DB usage
+    is counted by `core.query_log.query_log_wrapper`. The route is read from
+    `request.resolver_match` once the view returned: a sync `process_view`
+    would cost a thread hop per request under ASGI.
+    """
+
     def __init__(self, get_response):
-        self.get_response = get_response
+        super().__init__(get_response)
+        self.slow_request_ms = getattr(settings, "SLOW_REQUEST_MS", 1000)
+        self.server_timing = getattr(settings, "SERVER_TIMING_HEADER", True)
 
     def __call__(self, request):
-        request_id = request.META.get(self.header_name) or str(uuid.uuid4())
-        request.request_id = request_id
-        set_request_id(request_id)
+        if self._is_coroutine:
+            return self.__acall__(request)
+        metrics = RequestMetrics(request=request)
+        set_request_metrics(metrics)
+        try:
+            return self._finish(request, self.get_response(request), metrics)
+        finally:
+            set_request_metrics(None)
 
+    async def __acall__(self, request):
+        metrics = RequestMetrics(request=request)
+        set_request_metrics(metrics)
         try:
-            response = self.get_response(request)
-            response[self.response_header_name] = request_id
-            return response
+            return self._finish(request, await self.get_response(request), metrics)
         finally:
-            set_request_id("-")
+            set_request_metrics(None)
+
+    def _finish(self, request, response, metrics):
+        elapsed_ms = metrics.elapsed_ms
+        if request.resolver_match:
+            metrics.route = request.resolver_match.view_name
+        observe_request(request, response, metrics)
+        if self.server_timing:
+            response["Server-Timing"] = (
+                f"app;dur={elapsed_ms:.1f}, "
+                f'db;dur={metrics.db_time_ms:.1f};desc="{metrics.db_queries} queries", '
+                f'cache;desc="{metrics.cache_hits} hits {metrics.cache_misses} misses"'
+            )
+        self._log(request, response, metrics, elapsed_ms)
+        return response
+
+    def _log(self, request, response, metrics, elapsed_ms):
+        size = "-" if response.streaming else len(response.content)
+        message = (
+            f"{request.method} {request.path} {response.status_code} "
+            f"{elapsed_ms:.1f}ms db={metrics.db_queries}/{metrics.db_time_ms:.1f}ms "
+            f"cache={metrics.cache_hits}/{metrics.cache_misses} bytes={size}"
+        )
+        if elapsed_ms >= self.slow_request_ms:
+            logger.warning(f"Slow request: {message}")
+        else:
+            logger.debug(message)
+
+
+class ProfilingMiddleware(SyncAsyncMiddleware):
+    """
+    Profiles requests sent with `X-Profile: cpu|memory|all` by an ADMIN.
+
+    Requests without the header only pay a dict lookup. With it, the user is
+    authenticated with the DRF authenticators (JWT / session) before the
+    view runs, and the response gets an `X-Profile-ID` header pointing to
+    the stored profile (`GET /api/v1/auth/profiles/<id>/`). Async views
+    extend the profile to their own threads (`core.profiling.profile_async_work`).
+    """
+
+    response_header_name = "X-Profile-ID"
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.enabled = getattr(settings, "PROFILING_ENABLED", True)
+
+    def __call__(self, request):
+        if self._is_coroutine:
+            return self.__acall__(request)
+        modes = self._modes(request)
+        user = self._authenticate(request) if modes else None
+        if not self._is_admin(user):
+            return self.get_response(request)
+
+        profile_id, metadata = self._start(request, user)
+        with profile_block(profile_id, modes, metadata):
+            response = self.get_response(request)
+            metadata["status"] = response.status_code
+        response[self.response_header_name] = profile_id
+        return response
+
+    async def __acall__(self, request):
+        modes = self._modes(request)
+        user = await sync_to_async(self._authenticate)(request) if modes else None
+        if not self._is_admin(user):
+            return await self.get_response(request)
+
+        profile_id, metadata = self._start(request, user)
+        with profile_block(profile_id, modes, metadata):
+            response = await self.get_response(request)
+            metadata["status"] = response.status_code
+        response[self.response_header_name] = profile_id
+        return response
+
+    def _modes(self, request):
+        mode = request.META.get(PROFILE_HEADER) if self.enabled else None
+        return PROFILE_MODES.get(mode.strip().lower()) if mode else None
+
+    @staticmethod
+    def _is_admin(user):
+        return bool(user and user.is_authenticated and user.is_admin)
+
+    @staticmethod
+    def _start(request, user):
+        profile_id = safe_profile_id(getattr(request, "request_id", None))
+        metadata = {"method": request.method, "path": request.get_full_path(), "user": user.email}
+        return profile_id, metadata
+
+    @staticmethod
+    def _authenticate(request):
+        drf_request = Request(
+            request,
+            authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES],
+        )
+        try:
+            return drf_request.user
+        except APIException:
+            return None
+
+
+class ReplicaStickyMiddleware(SyncAsyncMiddleware):
+    """
+    Read-your-writes: after a successful write (non-safe method, status below
+    400) by an authenticated user, that user's reads stay on the primary for
+    `REPLICA_STICKY_SECONDS`. DRF sets `request.user` on the Django request
+    once it authenticates, so this sees JWT users too.
+    """
+
+    def __call__(self, request):
+        if self._is_coroutine:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self._mark(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        self._mark(request, response)
+        return response
+
+    @staticmethod
+    def _mark(request, response):
+        if request.method in ("GET", "HEAD", "OPTIONS", "TRACE") or response.status_code >= 400:
+            return
+        user_id = get_authenticated_user_id(request) if replica_configured() else None
+        if user_id is not None:
+            mark_sticky(user_id)
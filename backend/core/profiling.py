@@ -0,0 +1,312 @@
+"""
+On-demand request profiling (cProfile + tracemalloc) for admins.
+
+A request carrying `X-Profile: cpu|memory|all` from an ADMIN is run under
+the requested profilers. Results are written to `PROFILE_ROOT`, keyed by the
+request id:
+
+- `<id>.prof`: cProfile stats, loadable with `pstats` / snakeviz
+- `<id>.collapsed`: folded stacks for flamegraph.pl / speedscope
+- `<id>.allocations.txt`: top tracemalloc allocation sites
+- `<id>.json`: request metadata
+
+cProfile only records the thread it is enabled in (before Python 3.12).
+Async views run on an event loop thread and hand sync work (ORM, DRF auth)
+to a `sync_to_async` thread: `profile_async_work` extends the active
+request profile to both, and the per-thread stats are merged on save.
+"""
+
+import cProfile
+import json
+import logging
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger("helpdesk")
+
+PROFILE_HEADER = "HTTP_X_PROFILE"
+PROFILE_MODES = {
+    "1": ("cpu", "memory"),
+    "true": ("cpu", "memory"),
+    "all": ("cpu", "memory"),
+    "cpu": ("cpu",),
+    "memory": ("memory",),
+}
+PROFILE_OUTPUTS = {
+    "pstats": (".prof", "application/octet-stream"),
+    "collapsed": (".collapsed", "text/plain; charset=utf-8"),
+    "allocations": (".allocations.txt", "text/plain; charset=utf-8"),
+}
+
+_PROFILE_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+_MAX_STACK_DEPTH = 128
+_TRACEMALLOC_FRAMES = 10
+_TOP_ALLOCATIONS = 50
+# Python 3.12+ profiles through sys.monitoring: one profiler sees every thread.
+_PER_THREAD_PROFILERS = sys.version_info < (3, 12)
+
+_active_profile: ContextVar["ThreadProfilers | None"] = ContextVar("active_profile", default=None)
+
+# tracemalloc is process-wide: overlapping requests share one tracing session,
+# stopped by the last one that leaves (and never if it was started elsewhere).
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+
+
+def profile_root():
+    return Path(settings.PROFILE_ROOT)
+
+
+def safe_profile_id(request_id):
+    """Request ids come from a client header: only use them when file-safe."""
+    if request_id and _PROFILE_ID_RE.match(request_id) and not request_id.startswith("."):
+        return request_id
+    return str(uuid.uuid4())
+
+
+def profile_path(profile_id, output):
+    suffix, _ = PROFILE_OUTPUTS[output]
+    return profile_root() / f"{profile_id}{suffix}"
+
+
+def _func_label(func):
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{name} ({Path(filename).name}:{line})"
+
+
+def _roots(stats, callees):
+    """
+    Entry points of the call graph. Frames entered before the profiler
+    started only appear as callers, and recursion (e.g. the middleware
+    chain) can leave a cycle with no caller-less node, so unreached nodes
+    are promoted to roots by cumulative time.
+    """
+    roots = [
+        func
+        for func, entry in stats.stats.items()
+        if not any(caller in stats.stats for caller in entry[4])
+    ]
+    reached = set()
+    pending = list(roots)
+    by_cumulative = sorted(stats.stats, key=lambda func: stats.stats[func][3], reverse=True)
+    while True:
+        while pending:
+            func = pending.pop()
+            if func not in reached:
+                reached.add(func)
+                pending.extend(callees.get(func, ()))
+        unreached = next((func for func in by_cumulative if func not in reached), None)
+        if unreached is None:
+            return roots
+        roots.append(unreached)
+        pending.append(unreached)
+
+
+def collapsed_stacks(stats):
+    """
+    Convert cProfile stats into folded stacks ("a;b;c <microseconds>").
+
+    cProfile only records caller -> callee edges, so deep stacks are
+    reconstructed by splitting each node's time proportionally between the
+    edges that reach it (same approach as flameprof).
+    """
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[func] = edge[3]
+
+    folded = {}
+
+    def walk(func, path, scale):
+        _, _, tt, ct, _ = stats.stats[func]
+        path = path + (func,)
+        self_us = int(tt * scale * 1_000_000)
+        if self_us:
+            key = ";".join(_func_label(item) for item in path)
+            folded[key] = folded.get(key, 0) + self_us
+        if len(path) >= _MAX_STACK_DEPTH:
+            return
+        for callee, edge_ct in callees.get(func, {}).items():
+            if callee in path or callee not in stats.stats:
+                continue
+            callee_ct = stats.stats[callee][3]
+            # Skip sub-microsecond branches: keeps the walk bounded.
+            if callee_ct > 0 and edge_ct * scale >= 1e-6:
+                walk(callee, path, scale * edge_ct / callee_ct)
+
+    for root in _roots(stats, callees):
+        walk(root, (), 1.0)
+    return "\n".join(f"{stack} {value}" for stack, value in sorted(folded.items())) + "\n"
+
+
+def _allocation_report(snapshot, peak):
+    snapshot = snapshot.filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        )
+    )
+    lines = [f"Pico de memoria rastreada: {peak / 1024:.1f} KiB", ""]
+    for stat in snapshot.statistics("traceback")[:_TOP_ALLOCATIONS]:
+        lines.append(f"{stat.size / 1024:.1f} KiB em {stat.count} blocos")
+        lines.extend(f"    {line}" for line in stat.traceback.format())
+    return "\n".join(lines) + "\n"
+
+
+class ThreadProfilers:
+    """One cProfile per thread that runs the request, merged into one `pstats.Stats`."""
+
+    def __init__(self):
+        self.profilers = {}
+
+    def enable(self):
+        """Profile the current thread; returns False if it already is (the caller must not disable it)."""
+        thread_id = threading.get_ident()
+        if thread_id in self.profilers or (self.profilers and not _PER_THREAD_PROFILERS):
+            return False
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # 3.12+: another request's profiler is active and already sees this thread.
+            return False
+        self.profilers[thread_id] = profiler
+        return True
+
+    def disable(self):
+        self.profilers[threading.get_ident()].disable()
+
+    def stats(self):
+        return pstats.Stats(*self.profilers.values()) if self.profilers else None
+
+
+@asynccontextmanager
+async def profile_async_work():
+    """
+    Extend the active request profile (if any) to the event loop thread and
+    to the thread-sensitive `sync_to_async` thread of an async view.
+    Profilers are disabled in the thread that enabled them.
+    """
+    profilers = _active_profile.get()
+    if profilers is None:
+        yield
+        return
+    loop_started = profilers.enable()
+    worker_started = await sync_to_async(profilers.enable)()
+    try:
+        yield
+    finally:
+        if worker_started:
+            await sync_to_async(profilers.disable)()
+        if loop_started:
+            profilers.disable()
+
+
+def _acquire_tracemalloc():
+    global _tracemalloc_owned, _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0:
+            _tracemalloc_owned = not tracemalloc.is_tracing()
+            if _tracemalloc_owned:
+                tracemalloc.start(_TRACEMALLOC_FRAMES)
+            else:
+                tracemalloc.reset_peak()
+        _tracemalloc_users += 1
+
+
+def _release_tracemalloc():
+    """Snapshot and peak for the caller; stops tracing if it is the last user."""
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+    return snapshot, peak
+
+
+@contextmanager
+def profile_block(profile_id, modes, metadata):
+    """Run the enclosed block under the requested profilers and save results."""
+    profilers = ThreadProfilers() if "cpu" in modes else None
+    trace_memory = "memory" in modes
+    if trace_memory:
+        _acquire_tracemalloc()
+
+    started = time.perf_counter()
+    if profilers:
+        token = _active_profile.set(profilers)
+        profiler_started = profilers.enable()
+    try:
+        yield
+    finally:
+        if profilers:
+            if profiler_started:
+                profilers.disable()
+            _active_profile.reset(token)
+        duration_ms = (time.perf_counter() - started) * 1000
+        snapshot, peak = None, 0
+        if trace_memory:
+            snapshot, peak = _release_tracemalloc()
+
+        metadata = {**metadata, "duration_ms": round(duration_ms, 2)}
+        try:
+            _save(profile_id, profilers and profilers.stats(), snapshot, peak, metadata)
+        except OSError as exc:
+            logger.warning(f"Failed to save profile {profile_id}: {exc}")
+
+
+def _save(profile_id, stats, snapshot, peak, metadata):
+    root = profile_root()
+    root.mkdir(parents=True, exist_ok=True)
+    outputs = []
+    if stats:
+        stats.dump_stats(profile_path(profile_id, "pstats"))
+        profile_path(profile_id, "collapsed").write_text(collapsed_stacks(stats), encoding="utf-8")
+        outputs += ["pstats", "collapsed"]
+    if snapshot:
+        profile_path(profile_id, "allocations").write_text(_allocation_report(snapshot, peak), encoding="utf-8")
+        outputs.append("allocations")
+        metadata["peak_memory_kib"] = round(peak / 1024, 1)
+
+    metadata.update(id=profile_id, outputs=outputs, created_at=timezone.now().isoformat())
+    (root / f"{profile_id}.json").write_text(json.dumps(metadata), encoding="utf-8")
+    logger.info(f"Profile {profile_id} salvo: {metadata['method']} {metadata['path']} {metadata['duration_ms']}ms")
+    _prune(root)
+
+
+def _prune(root):
+    keep = settings.PROFILE_KEEP
+    metadata_files = sorted(root.glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True)
+    for stale in metadata_files[keep:]:
+        for path in root.glob(f"{stale.stem}.*"):
+            path.unlink(missing_ok=True)
+
+
+def list_profiles():
+    root = profile_root()
+    if not root.is_dir():
+        return []
+    profiles = []
+    for path in sorted(root.glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True):
+        try:
+            profiles.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            continue
+    return profiles
@@ -0,0 +1,281 @@
+"""
+Per-statement query statistics and slow query log.
+
+Every SQL statement goes through `query_log_wrapper` (installed on each new
+connection), which also feeds the per-request DB counters. Statements are fingerprinted (literals and placeholders
+normalized) and aggregated in memory per process. Statements slower than
+`SLOW_QUERY_MS` are logged with the request id, and a sample of slow SELECTs
+can be re-run under `EXPLAIN (ANALYZE, BUFFERS)` on PostgreSQL.
+
+Each process publishes its snapshot to the cache at most every
+`QUERY_STATS_PUBLISH_SECONDS`, when a request or Celery task finishes (never
+inside the wrapper, so cache latency is not counted as query time). The
+publishing processes are indexed in a Redis sorted set scored by their last
+publish; entries older than the snapshot timeout are pruned on each publish,
+so the admin view and the `slow_queries` command see the live web and worker
+processes only.
+"""
+
+import hashlib
+import logging
+import os
+import random
+import re
+import socket
+import threading
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+
+from .request_context import get_request_id, get_request_metrics
+
+logger = logging.getLogger("helpdesk")
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%s|\$\d+")
+_IN_LIST_RE = re.compile(r"\bIN \(\?(?:, ?\?)*\)", re.IGNORECASE)
+_VALUES_RE = re.compile(r"\bVALUES (\(\?(?:, ?\?)*\))(?:, ?\(\?(?:, ?\?)*\))*", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+_INDEX_KEY = "query-stats:processes"
+_PROCESS_KEY = f"query-stats:{socket.gethostname()}:{os.getpid()}"
+
+# Snapshots (and index entries) outlive this many publish intervals.
+_PUBLISH_TTL_INTERVALS = 10
+
+# Set while the wrapper runs its own EXPLAIN, so it is not recorded.
+_explaining: ContextVar[bool] = ContextVar("query_log_explaining", default=False)
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql):
+    """Normalize `sql` so statements differing only in literals match."""
+    normalized = _STRING_RE.sub("?", sql)
+    normalized = _PLACEHOLDER_RE.sub("?", normalized)
+    normalized = _NUMBER_RE.sub("?", normalized)
+    normalized = _SPACE_RE.sub(" ", normalized).strip()
+    normalized = _IN_LIST_RE.sub("IN (...)", normalized)
+    return _VALUES_RE.sub(r"VALUES \1", normalized)
+
+
+def fingerprint_id(normalized):
+    return hashlib.md5(normalized.encode("utf-8")).hexdigest()[:12]
+
+
+class QueryStats:
+    """Thread-safe count / total / max time per fingerprint."""
+
+    def __init__(self, max_fingerprints=1000):
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._published_at = 0.0
+
+    def record(self, normalized, duration, slow_request_id=None):
+        with self._lock:
+            entry = self._entries.get(normalized)
+            if entry is None:
+                if len(self._entries) >= self.max_fingerprints:
+                    normalized = "<outros>"
+                    entry = self._entries.get(normalized)
+                if entry is None:
+                    entry = self._entries[normalized] = {
+                        "count": 0,
+                        "total_ms": 0.0,
+                        "max_ms": 0.0,
+                        "slow": 0,
+                        "last_slow_request_id": None,
+                    }
+            duration_ms = duration * 1000
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            if slow_request_id is not None:
+                entry["slow"] += 1
+                entry["last_slow_request_id"] = slow_request_id
+
+    def snapshot(self):
+        with self._lock:
+            return {normalized: dict(entry) for normalized, entry in self._entries.items()}
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+
+    def publish_if_due(self, interval):
+        now = time.monotonic()
+        if now - self._published_at < interval:
+            return
+        self._published_at = now
+        self.publish(timeout=interval * _PUBLISH_TTL_INTERVALS)
+
+    def publish(self, timeout=300):
+        try:
+            cache.set(_PROCESS_KEY, self.snapshot(), timeout)
+            redis = _redis()
+            if redis is None:
+                return
+            now = time.time()
+            index = cache.make_key(_INDEX_KEY)
+            with redis.pipeline() as pipe:
+                pipe.zadd(index, {_PROCESS_KEY: now})
+                pipe.zremrangebyscore(index, "-inf", now - timeout)
+                pipe.expire(index, timeout)
+                pipe.execute()
+        except Exception as exc:
+            logger.warning(f"Failed to publish query stats: {exc}")
+
+
+def _redis():
+    """django-redis client holding the process index; None with other backends (single process)."""
+    if not hasattr(cache, "client"):
+        return None
+    from django_redis import get_redis_connection
+
+    return get_redis_connection("default")
+
+
+def _published_keys():
+    redis = _redis()
+    if redis is None:
+        return []
+    return [key.decode() for key in redis.zrange(cache.make_key(_INDEX_KEY), 0, -1)]
+
+
+query_stats = QueryStats(max_fingerprints=getattr(settings, "QUERY_STATS_MAX_FINGERPRINTS", 1000))
+
+
+def merged_stats(include_published=True):
+    """Merge this process' stats with the snapshots published by the others."""
+    snapshots = [query_stats.snapshot()]
+    if include_published:
+        keys = [key for key in _published_keys() if key != _PROCESS_KEY]
+        published = cache.get_many(keys) if keys else {}
+        snapshots.extend(published.values())
+
+    merged = {}
+    for snapshot in snapshots:
+        for normalized, entry in snapshot.items():
+            current = merged.setdefault(
+                normalized,
+                {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "slow": 0, "last_slow_request_id": None},
+            )
+            current["count"] += entry["count"]
+            current["total_ms"] += entry["total_ms"]
+            current["max_ms"] = max(current["max_ms"], entry["max_ms"])
+            current["slow"] += entry["slow"]
+            current["last_slow_request_id"] = entry["last_slow_request_id"] or current["last_slow_request_id"]
+    return merged
+
+
+TOP_ORDERINGS = ("total_ms", "max_ms", "count", "slow")
+
+
+def top_queries(limit=20, order_by="total_ms", include_published=True):
+    if order_by not in TOP_ORDERINGS:
+        raise ValueError(f"Ordenacao invalida: {order_by}.")
+    rows = [
+        {
+            "fingerprint_id": fingerprint_id(normalized),
+            "fingerprint": normalized,
+            **entry,
+            "total_ms": round(entry["total_ms"], 2),
+            "max_ms": round(entry["max_ms"], 2),
+            "avg_ms": round(entry["total_ms"] / entry["count"], 2) if entry["count"] else 0.0,
+        }
+        for normalized, entry in merged_stats(include_published).items()
+    ]
+    rows.sort(key=lambda row: row[order_by], reverse=True)
+    return rows[:limit]
+
+
+def reset_query_stats():
+    query_stats.reset()
+    cache.delete_many([*_published_keys(), _PROCESS_KEY])
+    redis = _redis()
+    if redis is not None:
+        redis.delete(cache.make_key(_INDEX_KEY))
+
+
+def _explain(connection, sql, params):
+    token = _explaining.set(True)
+    try:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+            # Discard side effects of the re-executed statement, if any.
+            transaction.set_rollback(True, using=connection.alias)
+        return plan
+    except DatabaseError as exc:
+        logger.warning(f"EXPLAIN failed: {exc}")
+        return None
+    finally:
+        _explaining.reset(token)
+
+
+def _should_explain(connection, sql, many):
+    rate = settings.SLOW_QUERY_EXPLAIN_RATE
+    return (
+        rate > 0
+        and not many
+        and connection.vendor == "postgresql"
+        and sql.lstrip()[:6].upper() == "SELECT"
+        and random.random() < rate
+    )
+
+
+def query_log_wrapper(execute, sql, params, many, context):
+    if _explaining.get():
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    succeeded = False
+    try:
+        result = execute(sql, params, many, context)
+        succeeded = True
+        return result
+    finally:
+        duration = time.perf_counter() - started
+        metrics = get_request_metrics()
+        if metrics is not None:
+            metrics.db_queries += 1
+            metrics.db_time += duration
+        normalized = fingerprint(sql)
+        slow = duration * 1000 >= settings.SLOW_QUERY_MS
+        request_id = get_request_id() if slow else None
+        query_stats.record(normalized, duration, slow_request_id=request_id)
+
+        if slow:
+            logger.warning(
+                f"Slow query {duration * 1000:.1f}ms [{fingerprint_id(normalized)}] "
+                f"request={request_id}: {sql[:2000]}"
+            )
+            connection = context["connection"]
+            if succeeded and _should_explain(connection, sql, many):
+                plan = _explain(connection, sql, params)
+                if plan:
+                    logger.warning(f"EXPLAIN [{fingerprint_id(normalized)}] request={request_id}:\n{plan}")
+
+
+def publish_query_stats(sender=None, **kwargs):
+    """`request_finished` / Celery `task_postrun` receiver: publish this process' snapshot when due."""
+    query_stats.publish_if_due(settings.QUERY_STATS_PUBLISH_SECONDS)
+
+
+def connect_query_stats_signals():
+    from celery.signals import task_postrun
+    from django.core.signals import request_finished
+
+    request_finished.connect(publish_query_stats, dispatch_uid="helpdesk-query-stats-request")
+    task_postrun.connect(publish_query_stats, weak=False, dispatch_uid="helpdesk-query-stats-task")
+
+
+def install_query_log(sender, connection, **kwargs):
+    """`connection_created` receiver: add the wrapper once per connection."""
+    if query_log_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_log_wrapper)
@@ -2,14 +2,66 @@
 Request-scoped context helpers.
 """
 
-from contextvars import ContextVar
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any
+
+from django.utils.functional import SimpleLazyObject, empty
 
 _request_id_ctx_var: ContextVar[str] = ContextVar("request_id", default="-")
 
 
-def set_request_id(request_id: str) -> None:
-    _request_id_ctx_var.set(request_id)
+@dataclass
+class RequestMetrics:
+    """Per-request counters filled by the instrumentation hooks."""
+
+    started: float = field(default_factory=perf_counter)
+    route: str | None = None
+    request: Any = None
+    db_queries: int = 0
+    db_time: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (perf_counter() - self.started) * 1000
+
+    @property
+    def db_time_ms(self) -> float:
+        return self.db_time * 1000
+
+
+_request_metrics_ctx_var: ContextVar[RequestMetrics | None] = ContextVar("request_metrics", default=None)
+
+
+def set_request_id(request_id: str) -> Token:
+    return _request_id_ctx_var.set(request_id)
+
+
+def reset_request_id(token: Token) -> None:
+    _request_id_ctx_var.reset(token)
 
 
 def get_request_id() -> str:
     return _request_id_ctx_var.get()
+
+
+def set_request_metrics(metrics: RequestMetrics | None) -> None:
+    _request_metrics_ctx_var.set(metrics)
+
+
+def get_request_metrics() -> RequestMetrics | None:
+    return _request_metrics_ctx_var.get()
+
+
+def get_authenticated_user_id(request: Any) -> str | None:
+    """
+    Id of the request user, only if authentication already happened: the
+    session user is lazy and must not be evaluated as a side effect.
+    """
+    user = getattr(request, "user", None)
+    if user is None or (isinstance(user, SimpleLazyObject) and user._wrapped is empty):
+        return None
+    return str(user.pk) if getattr(user, "is_authenticated", False) else None
@@ -10,6 +10,7 @@ from django.utils.http import urlsafe_base64_decode
 from rest_framework import serializers
 
 from .models import User
+from .user_cache import minimal_user_payload
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -42,6 +43,10 @@ class UserMinimalSerializer(serializers.ModelSerializer):
         fields = ("id", "email", "full_name", "role")
         read_only_fields = fields
 
+    def to_representation(self, instance):
+        # Same payload for every ticket/message the user appears in.
+        return minimal_user_payload(instance, super().to_representation)
+
 
 class LoginSerializer(serializers.Serializer):
     """Serializer de login com email + senha."""
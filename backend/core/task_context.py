@@ -0,0 +1,81 @@
+"""
+Request context propagation into Celery tasks.
+
+The publisher stamps each task message with the current request id and the
+enqueue time. In the worker, the request id is restored into the
+`core.request_context` ContextVar for the duration of the task, so task logs
+carry the id of the request that enqueued them. Queue wait (broker backlog)
+and execution time are logged and observed separately.
+"""
+
+import logging
+import time
+
+from django.utils.dateparse import parse_datetime
+
+from .metrics import TASK_QUEUE_WAIT
+from .request_context import get_request_id, reset_request_id, set_request_id
+
+logger = logging.getLogger("helpdesk")
+
+REQUEST_ID_HEADER = "helpdesk_request_id"
+ENQUEUED_AT_HEADER = "helpdesk_enqueued_at"
+
+_running = {}
+
+
+def _before_task_publish(headers=None, **kwargs):
+    if headers is None:
+        return
+    headers.setdefault(REQUEST_ID_HEADER, get_request_id())
+    headers[ENQUEUED_AT_HEADER] = time.time()
+
+
+def _header(request, name):
+    # Worker requests expose custom headers as attributes; eager ones only in `headers`.
+    value = getattr(request, name, None)
+    if value is None and request.headers:
+        value = request.headers.get(name)
+    return value
+
+
+def _queue_wait(request):
+    enqueued_at = _header(request, ENQUEUED_AT_HEADER)
+    if enqueued_at is None:
+        return None
+    # Countdown / retry backoff is not broker backlog: measure from the ETA.
+    eta = parse_datetime(request.eta) if isinstance(request.eta, str) else request.eta
+    if eta is not None:
+        enqueued_at = max(enqueued_at, eta.timestamp())
+    return max(time.time() - enqueued_at, 0.0)
+
+
+def _task_prerun(task_id=None, task=None, **kwargs):
+    request_id = _header(task.request, REQUEST_ID_HEADER)
+    token = set_request_id(request_id) if request_id else None
+    wait = _queue_wait(task.request)
+    if wait is not None:
+        TASK_QUEUE_WAIT.labels(task.name).observe(wait)
+    _running[task_id] = (token, wait, time.perf_counter())
+
+
+def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+    entry = _running.pop(task_id, None)
+    if entry is None:
+        return
+    token, wait, started = entry
+    wait_text = "-" if wait is None else f"{wait * 1000:.1f}ms"
+    logger.info(
+        f"Task {task.name} [{task_id}] {state}: "
+        f"fila {wait_text}, execucao {(time.perf_counter() - started) * 1000:.1f}ms"
+    )
+    if token is not None:
+        reset_request_id(token)
+
+
+def connect_task_context_signals():
+    from celery.signals import before_task_publish, task_postrun, task_prerun
+
+    before_task_publish.connect(_before_task_publish, weak=False, dispatch_uid="helpdesk-task-context-publish")
+    task_prerun.connect(_task_prerun, weak=False, dispatch_uid="helpdesk-task-context-prerun")
+    task_postrun.connect(_task_postrun, weak=False, dispatch_uid="helpdesk-task-context-postrun")
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+from core.business_calendar import BusinessCalendar
+
+TZ = ZoneInfo("America/Sao_Paulo")
+
+
+def local(*args):
+    return datetime(*args, tzinfo=TZ)
+
+
+class BusinessCalendarTests(SimpleTestCase):
+    def setUp(self):
+        self.calendar = BusinessCalendar(
+            "09:00", "18:00", [0, 1, 2, 3, 4], ["12-25", "2026-10-19"], "America/Sao_Paulo"
+        )
+
+    def brute_force(self, start, end):
+        total, day = 0.0, start.date()
+        while day <= end.date():
+            if self.calendar.is_business_day(day):
+                low = max(start, datetime.combine(day, self.calendar.start, TZ))
+                high = min(end, datetime.combine(day, self.calendar.end, TZ))
+                total += max((high - low).total_seconds(), 0)
+            day += timedelta(days=1)
+        return total
+
+    def test_weekends_holidays_and_off_hours_are_skipped(self):
+        friday = local(2026, 10, 16, 17, 0)
+        # Friday 17h -> Tuesday 10h (Monday is a holiday): 1h + 1h.
+        self.assertEqual(self.calendar.seconds_between(friday, local(2026, 10, 20, 10, 0)), 7200)
+        self.assertEqual(self.calendar.seconds_between(local(2026, 10, 17), local(2026, 10, 18)), 0)
+        self.assertEqual(self.calendar.seconds_between(local(2026, 10, 20, 10), friday), 0)
+
+        self.assertEqual(self.calendar.add(friday, 3600), local(2026, 10, 16, 18, 0))
+        self.assertEqual(self.calendar.add(friday, 3 * 3600), local(2026, 10, 20, 11, 0))
+        self.assertEqual(self.calendar.add(local(2026, 12, 24, 20, 0), 60), local(2026, 12, 28, 9, 1))
+
+    def test_durations_match_day_by_day_sum_across_years(self):
+        intervals = [
+            (local(2019, 12, 31, 12, 0), local(2020, 1, 2, 10, 0)),
+            (local(2026, 2, 27, 8, 0), local(2026, 3, 9, 20, 0)),
+            # Outside the precomputed years: the table is extended.
+            (local(2012, 6, 1, 15, 0), local(2036, 6, 1, 10, 0)),
+        ]
+        durations = self.calendar.durations(intervals)
+        for (start, end), seconds in zip(intervals, durations):
+            self.assertAlmostEqual(seconds, self.brute_force(start, end))
+            self.assertAlmostEqual(self.calendar.seconds_between(start, self.calendar.add(start, seconds)), seconds)
+
+    def test_rejects_calendar_without_working_time(self):
+        with self.assertRaises(ImproperlyConfigured):
+            BusinessCalendar("18:00", "09:00", [0])
+        with self.assertRaises(ImproperlyConfigured):
+            BusinessCalendar("09:00", "18:00", [0], ["31-12"])
@@ -0,0 +1,32 @@
+from unittest import mock
+
+from django.db import OperationalError
+from django.urls import reverse
+from psycopg_pool import PoolTimeout
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import User
+from core.views import MeView
+
+
+class PoolExhaustionTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@example.com", password="StrongPass123!")
+        self.client.force_authenticate(user=self.user)
+
+    def test_pool_timeout_returns_503_with_retry_after(self):
+        # Django wraps driver errors: the PoolTimeout arrives as the cause.
+        error = OperationalError("couldn't get a connection after 10.00 sec")
+        error.__cause__ = PoolTimeout("couldn't get a connection after 10.00 sec")
+        with mock.patch.object(MeView, "get", side_effect=error):
+            response = self.client.get(reverse("core:me"))
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertIn("request_id", response.data)
+
+    def test_other_database_errors_stay_500(self):
+        with mock.patch.object(MeView, "get", side_effect=OperationalError("boom")):
+            response = self.client.get(reverse("core:me"))
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,74 @@
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core import db_router
+from core.db_router import PRIMARY_ALIAS, REPLICA_ALIAS, ReplicaLagMonitor, ReplicaRouter
+from core.models import User, UserRole
+
+
+class ReplicaRoutingTests(APITestCase):
+    def setUp(self):
+        self.moderator = User.objects.create_user(
+            email="mod@example.com", password="StrongPass123!", role=UserRole.MODERATOR
+        )
+        self.client.force_authenticate(user=self.moderator)
+
+        # No replica in the test database: record the routing decision but
+        # always execute on the primary.
+        self.read_aliases = []
+        route = ReplicaRouter.db_for_read
+
+        def spy(router, model, **hints):
+            self.read_aliases.append(route(router, model, **hints))
+            return PRIMARY_ALIAS
+
+        for patcher in (
+            mock.patch.object(ReplicaRouter, "db_for_read", spy),
+            mock.patch("core.db_router.replica_configured", return_value=True),
+            mock.patch("core.middleware.replica_configured", return_value=True),
+            mock.patch.object(db_router.replica_monitor, "healthy", return_value=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_opted_in_reads_go_to_replica(self):
+        response = self.client.get(reverse("analytics:tickets-by-status"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(REPLICA_ALIAS, self.read_aliases)
+        self.assertEqual(db_router.read_alias(), PRIMARY_ALIAS)
+
+        self.read_aliases.clear()
+        self.client.get(reverse("core:me"))
+        self.assertNotIn(REPLICA_ALIAS, self.read_aliases)
+
+    def test_reads_stick_to_primary_after_own_write(self):
+        response = self.client.post(
+            reverse("tickets:ticket-list-create"),
+            {"title": "Novo", "description": "Descricao", "priority": "LOW", "category": "GENERAL"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.read_aliases.clear()
+        response = self.client.get(reverse("tickets:ticket-list-create"))
+        self.assertEqual(response.data["count"], 1)
+        self.assertNotIn(REPLICA_ALIAS, self.read_aliases)
+
+
+@override_settings(REPLICA_LAG_CHECK_SECONDS=0, REPLICA_MAX_LAG_SECONDS=5)
+class ReplicaLagMonitorTests(SimpleTestCase):
+    def test_health_follows_lag_threshold(self):
+        monitor = ReplicaLagMonitor()
+        with mock.patch("core.db_router.replica_lag_seconds", return_value=1.5):
+            self.assertTrue(monitor.healthy())
+        with mock.patch("core.db_router.replica_lag_seconds", return_value=30.0):
+            with self.assertLogs("helpdesk", level="WARNING"):
+                self.assertFalse(monitor.healthy())
+        with mock.patch("core.db_router.replica_lag_seconds", side_effect=OperationalError("down")):
+            self.assertFalse(monitor.healthy())
+        self.assertIsNone(monitor.lag)
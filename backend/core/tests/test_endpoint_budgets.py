@@ -0,0 +1,27 @@
+from datetime import date
+
+from django.test import TestCase
+
+from benchmarks.runner import BenchmarkRunner, load_budgets, missing_scenarios
+from tickets.datagen import DatasetConfig, generate_dataset
+
+
+class EndpointBudgetTests(TestCase):
+    """Query-count budgets for every endpoint (catches N+1 regressions)."""
+
+    def test_every_endpoint_has_a_benchmark_scenario(self):
+        self.assertEqual(missing_scenarios(), [])
+
+    def test_endpoints_stay_within_query_budgets(self):
+        generate_dataset(DatasetConfig(tickets=60, seed=1, end_date=date.today(), batch_size=30))
+        budgets = load_budgets()
+        budgets["endpoints"] = {
+            name: {"max_queries": budget["max_queries"]}
+            for name, budget in budgets["endpoints"].items()
+        }
+        runner = BenchmarkRunner(budgets, repeat=1, warmup=0)
+
+        report, violations = runner.run_size(60)
+
+        self.assertEqual(violations, [])
+        self.assertTrue(any(result["name"] == "tickets:ticket-list-create[moderator]" for result in report["results"]))
@@ -0,0 +1,89 @@
+import contextlib
+import io
+import json
+import logging
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.logging_filters import RequestIDLogFilter, SamplingFilter
+from core.logging_handlers import AsyncStreamHandler, JSONFormatter
+from core.models import User
+from core.request_context import reset_request_id, set_request_id
+
+
+def _record(name="helpdesk", level=logging.INFO, msg="mensagem"):
+    return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+
+class AsyncStreamHandlerTests(SimpleTestCase):
+    def test_records_are_written_by_the_listener_as_json(self):
+        stream = io.StringIO()
+        handler = AsyncStreamHandler(stream=stream)
+        handler.setFormatter(JSONFormatter())
+        handler.addFilter(RequestIDLogFilter())
+
+        token = set_request_id("req-json")
+        handler.handle(_record(msg="Ticket %s criado"))
+        reset_request_id(token)
+        handler.stop()
+
+        payload = json.loads(stream.getvalue())
+        self.assertEqual(payload["message"], "Ticket %s criado")
+        self.assertEqual(payload["request_id"], "req-json")
+        self.assertEqual(payload["level"], "INFO")
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = AsyncStreamHandler(stream=io.StringIO(), queue_size=1)
+        handler.stop()
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            for _ in range(3):
+                handler.handle(_record())
+
+        self.assertEqual(handler.dropped, 2)
+        self.assertEqual(stderr.getvalue(), "Log queue full: 1 records dropped so far\n")
+
+
+class SamplingFilterTests(SimpleTestCase):
+    def test_info_is_sampled_per_logger_and_warnings_always_pass(self):
+        sampling = SamplingFilter({"helpdesk": 0.0, "helpdesk.audit": 1.0})
+
+        self.assertFalse(sampling.filter(_record()))
+        self.assertTrue(sampling.filter(_record(level=logging.WARNING)))
+        self.assertTrue(sampling.filter(_record(name="helpdesk.audit")))
+        self.assertTrue(sampling.filter(_record(name="django")))
+
+    def test_sampling_is_consistent_within_a_request(self):
+        sampling = SamplingFilter({"helpdesk": 0.5})
+        token = set_request_id("req-sampled")
+        try:
+            decisions = {sampling.filter(_record()) for _ in range(20)}
+        finally:
+            reset_request_id(token)
+        self.assertEqual(len(decisions), 1)
+
+
+@override_settings(SLOW_REQUEST_MS=0)
+class RequestLogContextTests(APITestCase):
+    def test_request_summary_carries_user_route_and_duration(self):
+        user = User.objects.create_user(email="user@example.com", password="StrongPass123!")
+        stream = io.StringIO()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(JSONFormatter())
+        handler.addFilter(RequestIDLogFilter())
+        logger = logging.getLogger("helpdesk")
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+
+        self.client.force_authenticate(user=user)
+        self.client.get(reverse("core:me"), HTTP_X_REQUEST_ID="req-ctx")
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        summary = next(line for line in lines if line["message"].startswith("Slow request"))
+        self.assertEqual(summary["request_id"], "req-ctx")
+        self.assertEqual(summary["user_id"], str(user.id))
+        self.assertEqual(summary["route"], "core:me")
+        self.assertIn("duration_ms", summary)
@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY, CollectorRegistry, generate_latest
+from prometheus_client.mmap_dict import MmapedDict, mmap_key
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.throttling import SimpleRateThrottle
+
+from core.metrics import MultiProcessDirsCollector
+from core.models import User, UserRole
+from notifications.tasks import send_ticket_email_task
+from tickets.models import Ticket, TicketStatus
+
+
+def _sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsEndpointTests(APITestCase):
+    def setUp(self):
+        self.moderator = User.objects.create_user(
+            email="mod@example.com", password="StrongPass123!", role=UserRole.MODERATOR
+        )
+        user = User.objects.create_user(email="user@example.com", password="StrongPass123!")
+        Ticket.objects.create(title="A", description="A", created_by=user)
+        Ticket.objects.create(title="B", description="B", created_by=user, status=TicketStatus.RESOLVED)
+
+    def test_request_latency_and_business_gauges_are_exported(self):
+        labels = {"route": "tickets:ticket-list-create", "method": "GET", "status": "200"}
+        before = _sample("helpdesk_http_request_duration_seconds_count", labels)
+
+        self.client.force_authenticate(user=self.moderator)
+        self.client.get(reverse("tickets:ticket-list-create"))
+        with override_settings(DEBUG=True):
+            response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(_sample("helpdesk_http_request_duration_seconds_count", labels), before + 1)
+        body = response.content.decode()
+        self.assertIn('helpdesk_http_request_db_queries_bucket{le="1.0",route="tickets:ticket-list-create"}', body)
+        self.assertIn('helpdesk_tickets{status="OPEN"} 1.0', body)
+        self.assertIn('helpdesk_tickets{status="RESOLVED"} 1.0', body)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_metrics_token_is_enforced(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(METRICS_TOKEN="", DEBUG=False)
+    def test_metrics_without_token_are_private_outside_debug(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_per_service_directories_are_merged(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        key = mmap_key("helpdesk_jobs_total", "helpdesk_jobs_total", [], [], "Jobs.")
+        paths = []
+        for service, value in (("web", 2.0), ("celery", 3.0)):
+            # Same PID in both containers: the files only stay apart because the directories do.
+            paths.append(os.path.join(root, service))
+            os.makedirs(paths[-1])
+            values = MmapedDict(os.path.join(paths[-1], "counter_1.db"))
+            values.write_value(key, value, 0)
+            values.close()
+
+        registry = CollectorRegistry(auto_describe=False)
+        registry.register(MultiProcessDirsCollector(paths))
+        self.assertIn("helpdesk_jobs_total 5.0", generate_latest(registry).decode())
+
+    def test_throttle_rejections_are_counted(self):
+        labels = {"route": "core:me"}
+        before = _sample("helpdesk_throttle_rejections_total", labels)
+
+        self.client.force_authenticate(user=self.moderator)
+        with (
+            mock.patch.object(SimpleRateThrottle, "allow_request", return_value=False),
+            mock.patch.object(SimpleRateThrottle, "wait", return_value=30),
+        ):
+            response = self.client.get(reverse("core:me"))
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(_sample("helpdesk_throttle_rejections_total", labels), before + 1)
+
+    def test_celery_task_outcomes_are_counted(self):
+        labels = {"task": send_ticket_email_task.name, "outcome": "success"}
+        before = _sample("helpdesk_celery_task_results_total", labels)
+
+        send_ticket_email_task.apply(args=("Assunto", "Mensagem", []))
+
+        self.assertEqual(_sample("helpdesk_celery_task_results_total", labels), before + 1)
+        self.assertGreater(
+            _sample("helpdesk_celery_task_duration_seconds_count", {"task": send_ticket_email_task.name}), 0
+        )
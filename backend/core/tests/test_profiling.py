@@ -0,0 +1,121 @@
+import pstats
+import shutil
+import tempfile
+import tracemalloc
+
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import User, UserRole
+from core.profiling import profile_block, profile_path
+
+
+def _profiled_functions(path):
+    return {name for _, _, name in pstats.Stats(str(path)).stats}
+
+
+class ProfilingTests(APITestCase):
+    def setUp(self):
+        self.profile_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profile_root, ignore_errors=True)
+        override = override_settings(PROFILE_ROOT=self.profile_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.admin = User.objects.create_user(
+            email="admin@example.com", password="StrongPass123!", role=UserRole.ADMIN
+        )
+        self.moderator = User.objects.create_user(
+            email="mod@example.com", password="StrongPass123!", role=UserRole.MODERATOR
+        )
+        # Issued here: creating a token writes to the database (sync only).
+        self.admin_headers = {"Authorization": f"Bearer {RefreshToken.for_user(self.admin).access_token}"}
+
+    def test_admin_request_is_profiled_and_downloadable(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(
+            reverse("analytics:average-response-time"),
+            HTTP_X_PROFILE="all",
+            HTTP_X_REQUEST_ID="profile-me",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Profile-ID"], "profile-me")
+
+        listing = self.client.get(reverse("core:profile-list"))
+        self.assertEqual(listing.data[0]["id"], "profile-me")
+        self.assertEqual(listing.data[0]["outputs"], ["pstats", "collapsed", "allocations"])
+
+        url = reverse("core:profile-detail", kwargs={"profile_id": "profile-me"})
+        download = self.client.get(url, {"output": "pstats"})
+        self.assertEqual(download.status_code, status.HTTP_200_OK)
+        path = f"{self.profile_root}/downloaded.prof"
+        with open(path, "wb") as fh:
+            fh.write(b"".join(download.streaming_content))
+        self.assertTrue(pstats.Stats(path).total_calls)
+        # Async handler: the event loop and sync_to_async threads are profiled too.
+        self.assertLessEqual({"durations", "aggregate"}, _profiled_functions(path))
+
+        collapsed = b"".join(self.client.get(url, {"output": "collapsed"}).streaming_content).decode()
+        self.assertIn("wrapper (conditional.py:", collapsed)
+        self.assertRegex(collapsed.splitlines()[0], r"^\S.* \d+$")
+        allocations = b"".join(self.client.get(url, {"output": "allocations"}).streaming_content).decode()
+        self.assertIn("Pico de memoria rastreada", allocations)
+
+    async def test_download_is_streamed_asynchronously_under_asgi(self):
+        profile_path("stored", "collapsed").write_text("main;handler 3\n")
+        response = await AsyncClient().get(
+            reverse("core:profile-detail", kwargs={"profile_id": "stored"}),
+            {"output": "collapsed"},
+            headers=self.admin_headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        self.assertEqual(response["Content-Length"], "15")
+        self.assertEqual(b"".join([chunk async for chunk in response.streaming_content]), b"main;handler 3\n")
+
+    async def test_async_view_threads_are_profiled_under_asgi(self):
+        response = await AsyncClient().get(
+            reverse("analytics:average-response-time"),
+            headers={**self.admin_headers, "X-Profile": "cpu", "X-Request-ID": "profile-asgi"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        functions = _profiled_functions(profile_path("profile-asgi", "pstats"))
+        self.assertLessEqual({"durations", "aggregate", "authenticate"}, functions)
+
+    def test_overlapping_memory_profiles_share_tracemalloc(self):
+        metadata = {"method": "GET", "path": "/"}
+        first = profile_block("first", ("memory",), metadata)
+        second = profile_block("second", ("memory",), metadata)
+        first.__enter__()
+        second.__enter__()
+        first.__exit__(None, None, None)
+        self.assertTrue(tracemalloc.is_tracing())
+        second.__exit__(None, None, None)
+
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertTrue(profile_path("first", "allocations").exists())
+        self.assertTrue(profile_path("second", "allocations").exists())
+
+    def test_non_admin_header_is_ignored(self):
+        self.client.force_authenticate(user=self.moderator)
+        response = self.client.get(reverse("analytics:average-response-time"), HTTP_X_PROFILE="all")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("X-Profile-ID", response)
+
+    def test_unsafe_request_id_is_not_used_as_file_name(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(
+            reverse("core:me"), HTTP_X_PROFILE="cpu", HTTP_X_REQUEST_ID="../../etc/passwd"
+        )
+
+        self.assertNotIn("/", response["X-Profile-ID"])
+        self.assertEqual(
+            self.client.get(reverse("core:profile-detail", kwargs={"profile_id": "..passwd"})).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
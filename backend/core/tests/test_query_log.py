@@ -0,0 +1,69 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import User, UserRole
+from core.query_log import fingerprint, query_stats, reset_query_stats
+
+
+class FingerprintTests(SimpleTestCase):
+    def test_literals_and_placeholders_are_normalized(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t1 WHERE id = 42 AND name = 'O''Brien'   AND x IN (%s, %s, %s)"),
+            "SELECT * FROM t1 WHERE id = ? AND name = ? AND x IN (...)",
+        )
+        self.assertEqual(
+            fingerprint('INSERT INTO "t" ("a", "b") VALUES (%s, %s), (%s, %s), (%s, %s)'),
+            fingerprint('INSERT INTO "t" ("a", "b") VALUES (%s, %s)'),
+        )
+
+
+class SlowQueryLogTests(APITestCase):
+    def setUp(self):
+        reset_query_stats()
+        self.admin = User.objects.create_user(
+            email="admin@example.com", password="StrongPass123!", role=UserRole.ADMIN
+        )
+
+    @override_settings(SLOW_QUERY_MS=0)
+    def test_slow_statements_are_logged_with_request_id_and_aggregated(self):
+        self.client.force_authenticate(user=self.admin)
+        with self.assertLogs("helpdesk", level="WARNING") as logs:
+            self.client.get(reverse("core:user-list"), HTTP_X_REQUEST_ID="req-slow")
+
+        self.assertTrue(any("Slow query" in line and "request=req-slow" in line for line in logs.output))
+        slow = [entry for entry in query_stats.snapshot().values() if entry["slow"]]
+        self.assertTrue(slow)
+        self.assertIn("req-slow", {entry["last_slow_request_id"] for entry in slow})
+
+    @override_settings(QUERY_STATS_PUBLISH_SECONDS=0)
+    def test_stats_are_published_after_the_request_not_per_query(self):
+        self.client.force_authenticate(user=self.admin)
+        with mock.patch.object(query_stats, "publish") as publish:
+            User.objects.count()
+            publish.assert_not_called()
+            self.client.get(reverse("core:me"))
+        publish.assert_called_once_with(timeout=0)
+
+    def test_admin_lists_top_offenders(self):
+        User.objects.filter(email="admin@example.com").count()
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.get(reverse("core:slow-queries"), {"ordering": "count", "limit": 5})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertLessEqual(len(response.data), 5)
+        self.assertTrue(any('FROM "core_user"' in row["fingerprint"] for row in response.data))
+        self.assertEqual(
+            self.client.get(reverse("core:slow-queries"), {"ordering": "x"}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    def test_non_admin_is_forbidden(self):
+        user = User.objects.create_user(email="user@example.com", password="StrongPass123!")
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse("core:slow-queries"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,51 @@
+import logging
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.cache_backends import InstrumentedCacheMixin
+from core.logging_filters import RequestIDLogFilter
+from core.models import User, UserRole
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    pass
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "core.tests.test_request_metrics.InstrumentedLocMemCache"}},
+    SLOW_REQUEST_MS=0,
+)
+class RequestMetricsMiddlewareTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="admin@example.com", password="StrongPass123!", role=UserRole.ADMIN
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def test_server_timing_header_reports_db_and_cache(self):
+        response = self.client.get(reverse("analytics:tickets-by-status"), HTTP_X_REQUEST_ID="req-1")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = response["Server-Timing"]
+        self.assertIn("app;dur=", timing)
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+        # The analytics ETag reads the tickets cache version.
+        self.assertRegex(timing, r'cache;desc="\d+ hits [1-9]\d* misses"')
+
+    def test_slow_request_log_carries_request_id_and_metrics(self):
+        log_filter = RequestIDLogFilter()
+        logger = logging.getLogger("helpdesk")
+        logger.addFilter(log_filter)
+        self.addCleanup(logger.removeFilter, log_filter)
+
+        with self.assertLogs("helpdesk", level="WARNING") as logs:
+            self.client.get(reverse("core:me"), HTTP_X_REQUEST_ID="req-2")
+
+        record = next(r for r in logs.records if r.getMessage().startswith("Slow request"))
+        self.assertEqual(record.request_id, "req-2")
+        self.assertGreaterEqual(record.db_queries, 0)
+        self.assertIn("GET /api/", record.getMessage())
@@ -0,0 +1,38 @@
+import logging
+import time
+
+from django.test import SimpleTestCase, override_settings
+
+from core.logging_filters import RequestIDLogFilter
+from core.request_context import get_request_id, reset_request_id, set_request_id
+from core.task_context import ENQUEUED_AT_HEADER, REQUEST_ID_HEADER, _before_task_publish
+from notifications.tasks import send_ticket_email_task
+
+
+@override_settings(EMAIL_HOST_PASSWORD="")
+class TaskContextPropagationTests(SimpleTestCase):
+    def setUp(self):
+        log_filter = RequestIDLogFilter()
+        logger = logging.getLogger("helpdesk")
+        logger.addFilter(log_filter)
+        self.addCleanup(logger.removeFilter, log_filter)
+
+    def test_request_id_and_enqueue_time_are_propagated(self):
+        token = set_request_id("req-origin")
+        headers = {}
+        _before_task_publish(headers=headers)
+        reset_request_id(token)
+
+        self.assertEqual(headers[REQUEST_ID_HEADER], "req-origin")
+        headers[ENQUEUED_AT_HEADER] = time.time() - 2  # simulated broker backlog
+
+        with self.assertLogs("helpdesk", level="INFO") as logs:
+            send_ticket_email_task.apply(args=("Assunto", "Mensagem", ["a@example.com"]), headers=headers)
+
+        warning = next(r for r in logs.records if "EMAIL_HOST_PASSWORD" in r.getMessage())
+        self.assertEqual(warning.request_id, "req-origin")
+        summary = next(r for r in logs.records if r.getMessage().startswith("Task "))
+        self.assertEqual(summary.request_id, "req-origin")
+        wait_ms = float(summary.getMessage().split("fila ")[1].split("ms")[0])
+        self.assertGreaterEqual(wait_ms, 2000)
+        self.assertEqual(get_request_id(), "-")
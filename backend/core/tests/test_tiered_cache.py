@@ -0,0 +1,155 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core import authentication
+from core.models import User, UserRole
+from core.tiered_cache import _MISSING, LocalLRU, TieredCache, subscriber
+from core.user_cache import get_cached_user, users
+from tickets.services import create_ticket
+
+
+class LocalLRUTests(SimpleTestCase):
+    def test_evicts_least_recently_used_and_expired_entries(self):
+        lru = LocalLRU(max_entries=2, ttl=60)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+        self.assertEqual(lru.get("a"), 1)
+        self.assertEqual(lru.get("c"), 3)
+        self.assertIs(lru.get("b"), _MISSING)
+
+        with mock.patch("core.tiered_cache.time.monotonic", return_value=10**9):
+            self.assertIs(lru.get("a"), _MISSING)
+
+
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.tiered = TieredCache("test-tiered", local_ttl=60, shared_ttl=60, max_entries=10)
+        self.addCleanup(cache.delete_many, ["tiered:test-tiered:k", "tiered-version:test-tiered:k"])
+
+    def test_tiers_invalidation_and_stats(self):
+        loader = mock.Mock(return_value={"v": 1})
+        self.assertEqual(self.tiered.get_or_load("k", loader), {"v": 1})
+        self.assertEqual(self.tiered.get_or_load("k", loader), {"v": 1})
+        # Another process: empty local tier, shared tier filled.
+        self.tiered.local.clear()
+        self.assertEqual(self.tiered.get_or_load("k", loader), {"v": 1})
+        self.assertEqual(loader.call_count, 1)
+        self.assertEqual(
+            self.tiered.stats(),
+            {
+                "cache": "test-tiered",
+                "local_hits": 1,
+                "shared_hits": 1,
+                "misses": 1,
+                "hit_ratio": 0.6667,
+                "local_entries": 1,
+            },
+        )
+
+        self.tiered.invalidate("k")
+        loader.return_value = {"v": 2}
+        self.assertEqual(self.tiered.get_or_load("k", loader), {"v": 2})
+
+    def test_loader_racing_an_invalidation_is_not_cached(self):
+        def stale_loader():
+            # The row changes (and is invalidated) while the loader runs.
+            self.tiered.invalidate("k")
+            return "stale"
+
+        self.assertEqual(self.tiered.get_or_load("k", stale_loader), "stale")
+        self.assertEqual(len(self.tiered.local), 0)
+        self.assertIsNone(cache.get("tiered:test-tiered:k"))
+        self.assertEqual(self.tiered.get_or_load("k", lambda: "fresh"), "fresh")
+
+    def test_shared_entry_written_under_an_old_version_is_ignored(self):
+        self.tiered.get_or_load("k", lambda: "stale")
+        stale_entry = cache.get("tiered:test-tiered:k")
+        self.tiered.invalidate("k")
+        # A slow writer lands the old entry after the invalidation.
+        cache.set("tiered:test-tiered:k", stale_entry)
+
+        self.assertEqual(self.tiered.get_or_load("k", lambda: "fresh"), "fresh")
+
+    def test_invalidation_message_drops_local_entry(self):
+        self.tiered.local.set("k", "stale")
+        subscriber._handle(json.dumps({"cache": "test-tiered", "key": "k"}))
+        self.assertEqual(len(self.tiered.local), 0)
+
+
+class CachedUserTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@example.com", password="StrongPass123!")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(self.user).access_token}")
+
+    def test_jwt_user_is_cached_and_invalidated_on_role_change(self):
+        self.client.get(reverse("core:me"))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("core:me"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 0)
+
+        self.assertEqual(self.client.get(reverse("core:user-list")).status_code, status.HTTP_403_FORBIDDEN)
+        self.user.role = UserRole.ADMIN
+        self.user.save()
+        self.assertEqual(self.client.get(reverse("core:user-list")).status_code, status.HTTP_200_OK)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse("core:me")).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_hash_is_not_cached(self):
+        user = get_cached_user(self.user.id)
+        self.assertEqual((user.email, user.role), ("user@example.com", UserRole.USER))
+        self.assertIn("password", user.get_deferred_fields())
+        for cached in (users.local.get(str(self.user.id)), cache.get(users._shared_key(str(self.user.id)))):
+            self.assertNotIn(self.user.password, repr(cached))
+
+        # A save from the partial instance leaves the password alone.
+        user.first_name = "Novo"
+        user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, "Novo")
+        self.assertTrue(self.user.check_password("StrongPass123!"))
+
+    @mock.patch.object(authentication.api_settings, "CHECK_REVOKE_TOKEN", True)
+    def test_password_change_revokes_tokens(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(self.user).access_token}")
+        self.assertEqual(self.client.get(reverse("core:me")).status_code, status.HTTP_200_OK)
+        self.user.set_password("OtherPass123!")
+        self.user.save()
+        self.assertEqual(self.client.get(reverse("core:me")).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_assignment_uses_cached_assignees(self):
+        moderator = User.objects.create_user(
+            email="mod@example.com", password="StrongPass123!", role=UserRole.MODERATOR
+        )
+        ticket = create_ticket(
+            user=self.user, title="Chamado", description="Descricao", priority="LOW", category="GENERAL"
+        )
+        client = APIClient()
+        client.force_authenticate(user=moderator)
+        url = reverse("tickets:ticket-assign", kwargs={"id": ticket.id})
+
+        response = client.post(url, {"assigned_to": str(moderator.id)}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["assigned_to"]["email"], "mod@example.com")
+
+        response = client.post(url, {"assigned_to": str(self.user.id)}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        moderator.is_active = False
+        moderator.save()
+        response = client.post(url, {"assigned_to": str(moderator.id)}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,224 @@
+"""
+Two-tier cache for hot, rarely changing reference data.
+
+Reads go to a per-process LRU (short TTL), then to the shared cache (Redis),
+then to the loader. `invalidate` replaces the key's version token, deletes
+the shared entry and publishes the key on a Redis channel; a subscriber thread in every process drops its local
+copy. If the subscription is lost, local entries still expire after
+`TIERED_CACHE_LOCAL_TTL` and the local tier is cleared on reconnect. A
+loader that raced an invalidation caches nothing: shared entries carry the
+version token read before loading and only match the current one.
+
+Local values are shared by every request of the process: treat them as
+read-only.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .metrics import TIERED_CACHE_REQUESTS
+
+logger = logging.getLogger("helpdesk")
+
+CHANNEL = "helpdesk:tiered-cache:invalidate"
+
+_MISSING = object()
+_registry = {}
+
+
+class LocalLRU:
+    """Thread-safe LRU with a per-entry TTL."""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TieredCache:
+    def __init__(self, name, local_ttl=None, shared_ttl=None, max_entries=None):
+        self.name = name
+        self.shared_ttl = shared_ttl or settings.TIERED_CACHE_SHARED_TTL
+        self.local = LocalLRU(
+            max_entries or settings.TIERED_CACHE_MAX_ENTRIES,
+            local_ttl or settings.TIERED_CACHE_LOCAL_TTL,
+        )
+        self._counts = {"local": 0, "shared": 0, "miss": 0}
+        _registry[name] = self
+
+    def _shared_key(self, key):
+        return f"tiered:{self.name}:{key}"
+
+    def _version_key(self, key):
+        return f"tiered-version:{self.name}:{key}"
+
+    def _record(self, tier):
+        self._counts[tier] += 1
+        TIERED_CACHE_REQUESTS.labels(self.name, tier).inc()
+
+    def get_or_load(self, key, loader):
+        """Return the value for `key`, calling `loader()` on a miss in both tiers."""
+        value = self.local.get(key)
+        if value is not _MISSING:
+            self._record("local")
+            return value
+
+        subscriber.ensure_started()
+        shared_key, version_key = self._shared_key(key), self._version_key(key)
+        found = cache.get_many([shared_key, version_key])
+        version = found.get(version_key)
+        # (value, version): a cached None is told apart from a miss, and 1-tuples
+        # written by older releases never match.
+        wrapped = found.get(shared_key)
+        if wrapped is not None and wrapped[1:] == (version,):
+            value, tier = wrapped[0], "shared"
+        else:
+            value, tier = loader(), "miss"
+            if cache.get(version_key) != version:
+                # Invalidated while loading: the value may predate the change.
+                self._record(tier)
+                return value
+            cache.set(shared_key, (value, version), self.shared_ttl)
+        self.local.set(key, value)
+        self._record(tier)
+        return value
+
+    def invalidate(self, key):
+        """Drop `key` from the shared tier and from every process' local tier."""
+        self.local.delete(key)
+        try:
+            # Outlives every entry written under the previous token.
+            cache.set(self._version_key(key), uuid.uuid4().hex, self.shared_ttl)
+            cache.delete(self._shared_key(key))
+        except Exception as exc:
+            logger.warning(f"Failed to invalidate {self.name}:{key}: {exc}")
+        subscriber.publish(self.name, key)
+
+    def stats(self):
+        """Hit counts of this process and the ratio of reads served from cache."""
+        total = sum(self._counts.values())
+        hits = self._counts["local"] + self._counts["shared"]
+        return {
+            "cache": self.name,
+            "local_hits": self._counts["local"],
+            "shared_hits": self._counts["shared"],
+            "misses": self._counts["miss"],
+            "hit_ratio": round(hits / total, 4) if total else None,
+            "local_entries": len(self.local),
+        }
+
+
+def tiered_cache_stats():
+    return [tiered.stats() for tiered in _registry.values()]
+
+
+def clear_local_tiers():
+    for tiered in _registry.values():
+        tiered.local.clear()
+
+
+class InvalidationSubscriber:
+    """
+    Background thread listening on `CHANNEL`, one per process (restarted
+    after a fork). Disabled when the cache backend is not django-redis.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+
+    @staticmethod
+    def _redis():
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+
+    @staticmethod
+    def supported():
+        return hasattr(cache, "client")
+
+    def ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            if self.supported():
+                threading.Thread(target=self._run, name="tiered-cache-invalidation", daemon=True).start()
+
+    def publish(self, name, key):
+        if not self.supported():
+            return
+        try:
+            self._redis().publish(CHANNEL, json.dumps({"cache": name, "key": key}))
+        except Exception as exc:
+            logger.warning(f"Failed to publish invalidation {name}:{key}: {exc}")
+
+    def _run(self):
+        backoff = 1
+        while True:
+            try:
+                pubsub = self._redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CHANNEL)
+                # Invalidations published while disconnected were lost.
+                clear_local_tiers()
+                backoff = 1
+                for message in pubsub.listen():
+                    self._handle(message["data"])
+            except Exception as exc:
+                logger.warning(f"Tiered cache subscriber disconnected, retrying in {backoff}s: {exc}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    @staticmethod
+    def _handle(data):
+        try:
+            payload = json.loads(data)
+            tiered = _registry.get(payload["cache"])
+        except (TypeError, ValueError, KeyError):
+            return
+        if tiered is not None:
+            tiered.local.delete(payload["key"])
+
+
+subscriber = InvalidationSubscriber()
@@ -31,4 +31,8 @@ urlpatterns = [
     # Admin user management
     path("users/", views.AdminUserListCreateView.as_view(), name="user-list"),
     path("users/<uuid:id>/", views.AdminUserDetailView.as_view(), name="user-detail"),
+    # Admin observability
+    path("slow-queries/", views.SlowQueryStatsView.as_view(), name="slow-queries"),
+    path("profiles/", views.ProfileListView.as_view(), name="profile-list"),
+    path("profiles/<str:profile_id>/", views.ProfileDownloadView.as_view(), name="profile-detail"),
 ]
@@ -0,0 +1,99 @@
+"""
+Two-tier cached user reference data:
+
+- users by id, read by JWT authentication on every request: only the
+  `CACHED_USER_FIELDS` plus the md5 of the password hash that revocable
+  tokens carry (never the hash itself), rebuilt as a partial `User` whose
+  other fields load on access;
+- the ids of active moderators/admins, accepted as ticket assignees;
+- `UserMinimalSerializer` payloads (ticket creators, assignees, authors).
+
+Every user write invalidates the user's entries and the assignee set, right
+away and again after commit (so a reader cannot repopulate the cache with
+the pre-commit row).
+"""
+
+from django.db import transaction
+from django.db.models import DEFERRED
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .models import User, UserRole
+from .tiered_cache import TieredCache
+
+ASSIGNEES_KEY = "active"
+# Everything the API reads from `request.user`; `password` and `last_login` stay in the database.
+CACHED_USER_FIELDS = (
+    "id",
+    "email",
+    "first_name",
+    "last_name",
+    "role",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "created_at",
+    "updated_at",
+)
+
+# Named after the row format: entries written by older releases (pickled users) are never read back.
+users = TieredCache("auth-users")
+user_payloads = TieredCache("user-payloads")
+assignees = TieredCache("assignees")
+
+
+def _load_user(user_id):
+    row = User.objects.filter(pk=user_id).values_list(*CACHED_USER_FIELDS, "password").first()
+    if row is None:
+        return None
+    return (*row[:-1], get_md5_hash_password(row[-1]))
+
+
+def get_cached_user(user_id):
+    """
+    The user with `user_id` (a new instance, safe to modify) or None. Fields
+    outside `CACHED_USER_FIELDS` are deferred; `password_md5` holds the
+    token revocation claim.
+    """
+    row = users.get_or_load(str(user_id), lambda: _load_user(user_id))
+    if row is None:
+        return None
+    values = dict(zip(CACHED_USER_FIELDS, row))
+    fields = [field.attname for field in User._meta.concrete_fields]
+    user = User.from_db("default", fields, [values.get(name, DEFERRED) for name in fields])
+    user.password_md5 = row[-1]
+    return user
+
+
+def active_assignee_ids():
+    """Ids (str) of the active moderators and admins."""
+    return assignees.get_or_load(
+        ASSIGNEES_KEY,
+        lambda: frozenset(
+            str(user_id)
+            for user_id in User.objects.filter(
+                role__in=(UserRole.MODERATOR, UserRole.ADMIN), is_active=True
+            ).values_list("id", flat=True)
+        ),
+    )
+
+
+def minimal_user_payload(user, build):
+    """Cached `build(user)` (a serializer payload), keyed by the user id."""
+    return dict(user_payloads.get_or_load(str(user.pk), lambda: build(user)))
+
+
+def _invalidate(user_id):
+    key = str(user_id)
+    users.invalidate(key)
+    user_payloads.invalidate(key)
+    assignees.invalidate(ASSIGNEES_KEY)
+
+
+def invalidate_user(user_id):
+    _invalidate(user_id)
+    transaction.on_commit(lambda: _invalidate(user_id))
+
+
+def on_user_changed(sender, instance, **kwargs):
+    """post_save / post_delete receiver for `User`."""
+    invalidate_user(instance.pk)
@@ -3,11 +3,13 @@ Views for authentication and user management.
 """
 
 import logging
+import secrets
 from urllib.parse import quote
 
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
 from django.db import models
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseForbidden
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 from rest_framework import generics, status
@@ -18,8 +20,12 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from .async_views import aiterate, is_asgi
+from .metrics import render_metrics
 from .models import User
 from .permissions import IsAdmin
+from .profiling import PROFILE_OUTPUTS, list_profiles, profile_path, safe_profile_id
+from .query_log import TOP_ORDERINGS, reset_query_stats, top_queries
 from .serializers import (
     AdminUserCreateSerializer,
     ChangePasswordSerializer,
@@ -291,3 +297,99 @@ class AdminUserDetailView(generics.RetrieveUpdateDestroyAPIView):
         instance.is_active = False
         instance.save(update_fields=["is_active"])
         logger.info(f"Usuario desativado por admin: {instance.email}")
+
+
+# =============================================================================
+# OBSERVABILITY
+# =============================================================================
+
+
+class SlowQueryStatsView(APIView):
+    """
+    GET /api/v1/auth/slow-queries/?ordering=total_ms&limit=20
+    DELETE /api/v1/auth/slow-queries/
+
+    Statements agregados por fingerprint em todos os processos.
+    """
+
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        ordering = request.query_params.get("ordering", "total_ms")
+        if ordering not in TOP_ORDERINGS:
+            return Response(
+                {"detail": f"Ordenacao invalida. Use: {', '.join(TOP_ORDERINGS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = min(max(int(request.query_params.get("limit", 20)), 1), 200)
+        except ValueError:
+            return Response({"detail": "limit invalido."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(top_queries(limit=limit, order_by=ordering))
+
+    def delete(self, request):
+        reset_query_stats()
+        logger.info(f"Estatisticas de queries zeradas por {request.user.email}")
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfileListView(APIView):
+    """
+    GET /api/v1/auth/profiles/
+
+    Perfis gravados via header `X-Profile` (mais recentes primeiro).
+    """
+
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return Response(list_profiles())
+
+
+class ProfileDownloadView(APIView):
+    """
+    GET /api/v1/auth/profiles/<id>/?output=pstats|collapsed|allocations
+    """
+
+    permission_classes = [IsAdmin]
+
+    def get(self, request, profile_id):
+        output = request.query_params.get("output", "pstats")
+        if output not in PROFILE_OUTPUTS:
+            return Response(
+                {"detail": f"Formato invalido. Use: {', '.join(PROFILE_OUTPUTS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if safe_profile_id(profile_id) != profile_id:
+            raise Http404
+        path = profile_path(profile_id, output)
+        if not path.is_file():
+            raise Http404
+        _, content_type = PROFILE_OUTPUTS[output]
+        response = FileResponse(
+            open(path, "rb"),
+            as_attachment=True,
+            filename=path.name,
+            content_type=content_type,
+        )
+        if is_asgi(request):
+            # Headers (length, filename) are already set; the file is still closed with the response.
+            response.streaming_content = aiterate(response.streaming_content)
+        return response
+
+
+def metrics_view(request):
+    """
+    GET /metrics
+
+    Prometheus exporter. Requires `Authorization: Bearer <METRICS_TOKEN>`;
+    without a configured token it is only served with DEBUG=True.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponseForbidden()
+    elif not secrets.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponseForbidden()
+    payload, content_type = render_metrics()
+    return HttpResponse(payload, content_type=content_type)
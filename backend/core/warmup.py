@@ -0,0 +1,35 @@
+"""
+Process warm-up, run once at ASGI application load (before gunicorn forks
+its workers when `preload_app` is on).
+
+Imports the URLconf and every view / serializer it references and fills the
+resolver caches, so the first requests of each worker do not pay for them.
+"""
+
+import logging
+from importlib import import_module
+from time import perf_counter
+
+from django.apps import apps
+from django.urls import get_resolver
+
+logger = logging.getLogger("helpdesk")
+
+_WARM_MODULES = ("views", "serializers", "services")
+
+
+def warm_up():
+    started = perf_counter()
+    for app_config in apps.get_app_configs():
+        if not app_config.name.startswith("django."):
+            for name in _WARM_MODULES:
+                try:
+                    import_module(f"{app_config.name}.{name}")
+                except ModuleNotFoundError as exc:
+                    if exc.name != f"{app_config.name}.{name}":
+                        raise
+
+    resolver = get_resolver()
+    # Accessing the reverse dict populates the resolver (patterns, namespaces).
+    resolver.reverse_dict
+    logger.info(f"Warm-up concluido em {(perf_counter() - started) * 1000:.0f}ms")
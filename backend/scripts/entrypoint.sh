@@ -0,0 +1,12 @@
+#!/bin/sh
+# Container entrypoint: clears this service's Prometheus multiprocess directory
+# before starting it, so *.db files left by processes of a previous run do not
+# keep inflating the counters exported by /metrics.
+set -e
+
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
+exec "$@"
@@ -2,7 +2,7 @@
 
 from django.contrib import admin
 
-from .models import Ticket, TicketEvent, TicketMessage
+from .models import ArchivedTicket, ImportJob, SlaPolicy, Ticket, TicketEvent, TicketMessage
 
 
 @admin.register(Ticket)
@@ -50,3 +50,46 @@ class TicketEventAdmin(admin.ModelAdmin):
     def has_delete_permission(self, request, obj=None):
         """Events são imutáveis."""
         return False
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ("resource", "status", "rows_processed", "rows_per_second", "created_by", "created_at")
+    list_filter = ("status", "resource")
+    readonly_fields = (
+        "id",
+        "resource",
+        "input_format",
+        "file_path",
+        "create_users",
+        "rows_processed",
+        "rows_per_second",
+        "error",
+        "started_at",
+        "finished_at",
+        "created_at",
+    )
+    raw_id_fields = ("created_by",)
+
+
+@admin.register(ArchivedTicket)
+class ArchivedTicketAdmin(admin.ModelAdmin):
+    list_display = ("id", "status", "created_by_id", "created_at", "closed_at", "archived_at")
+    list_filter = ("status",)
+    search_fields = ("=id", "=created_by_id")
+    exclude = ("payload",)
+    readonly_fields = ("id", "status", "created_by_id", "created_at", "closed_at", "archived_at")
+
+    def has_add_permission(self, request):
+        """Arquivados apenas pelo job de arquivamento."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """Arquivo é imutável."""
+        return False
+
+
+@admin.register(SlaPolicy)
+class SlaPolicyAdmin(admin.ModelAdmin):
+    list_display = ("priority", "category", "first_response_minutes", "resolution_minutes")
+    list_filter = ("priority",)
@@ -5,3 +5,12 @@ class TicketsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tickets"
     verbose_name = "Tickets (Chamados)"
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from .models import SlaPolicy
+        from .sla import on_policy_changed
+
+        post_save.connect(on_policy_changed, sender=SlaPolicy, dispatch_uid="helpdesk-sla-policy-save")
+        post_delete.connect(on_policy_changed, sender=SlaPolicy, dispatch_uid="helpdesk-sla-policy-delete")
@@ -0,0 +1,220 @@
+"""
+Cold storage for closed tickets.
+
+Resolved and canceled tickets not updated for `ARCHIVE_AFTER_DAYS` are moved
+in batches to `ArchivedTicket`: one row per ticket holding the ticket, its
+messages and its events as zlib-compressed NDJSON (the API representation).
+In the same transaction their analytics measures are added to
+`analytics.TicketDailyRollup` (and the live rollup rows of their creation
+days recomputed) and the live rows are deleted, so the hot tables and their
+indexes only hold recent history.
+
+`TicketDetailView` falls back to the archive for ids missing from `Ticket`;
+the analytics endpoints add the archived rollups to the live aggregates.
+"""
+
+import json
+import logging
+import uuid
+import zlib
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from analytics.rollups import add_to_rollups, rebuild_live_days, replace_archived_rollups, rollup_increments
+from core.models import User, UserRole
+
+from .models import ArchivedTicket, Ticket, TicketEvent, TicketMessage, TicketStatus
+from .serializers import TicketEventSerializer, TicketMessageSerializer, TicketSerializer
+from .services import invalidate_ticket_caches
+
+logger = logging.getLogger("helpdesk")
+
+ARCHIVABLE_STATUSES = (TicketStatus.RESOLVED, TicketStatus.CANCELED)
+
+
+def archive_cutoff(days=None):
+    return timezone.now() - timedelta(days=days or settings.ARCHIVE_AFTER_DAYS)
+
+
+def archivable_tickets(cutoff):
+    return Ticket.objects.filter(status__in=ARCHIVABLE_STATUSES, updated_at__lt=cutoff)
+
+
+def encode_payload(ticket_data, messages, events):
+    lines = [{"kind": "ticket", "data": ticket_data}]
+    lines += [{"kind": "message", "data": data} for data in messages]
+    lines += [{"kind": "event", "data": data} for data in events]
+    ndjson = "".join(json.dumps(line, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n" for line in lines)
+    return zlib.compress(ndjson.encode("utf-8"))
+
+
+def decode_payload(payload):
+    """`(ticket, messages, events)` API payloads stored in an archive row."""
+    ticket, children = None, {"message": [], "event": []}
+    for line in zlib.decompress(bytes(payload)).decode("utf-8").splitlines():
+        record = json.loads(line)
+        if record["kind"] == "ticket":
+            ticket = record["data"]
+        else:
+            children[record["kind"]].append(record["data"])
+    return ticket, children["message"], children["event"]
+
+
+def archived_ticket_data(archived, user):
+    """Detail payload of an archived ticket; internal messages only for staff."""
+    ticket, messages, events = decode_payload(archived.payload)
+    if not user.is_moderator_or_admin:
+        messages = [message for message in messages if not message["is_internal"]]
+    return {**ticket, "archived": True, "archived_at": archived.archived_at, "messages": messages, "events": events}
+
+
+def _first_responses(ticket_ids):
+    rows = (
+        TicketMessage.objects.filter(
+            ticket_id__in=ticket_ids,
+            author__role__in=(UserRole.MODERATOR, UserRole.ADMIN),
+        )
+        .values("ticket_id")
+        .annotate(first_response_at=Min("created_at"))
+        .order_by()
+    )
+    return {row["ticket_id"]: row["first_response_at"] for row in rows}
+
+
+def _rollup_rows(tickets, first_responses):
+    for ticket in tickets:
+        yield (
+            ticket.created_at,
+            ticket.status,
+            ticket.priority,
+            ticket.category,
+            ticket.assigned_to_id,
+            ticket.created_by_id,
+            ticket.closed_at,
+            first_responses.get(ticket.id),
+        )
+
+
+def _payload_rows(archived_tickets):
+    """`rollup_increments` rows decoded from archive rows; deleted users become None."""
+    decoded = []
+    for archived in archived_tickets:
+        ticket, messages, _ = decode_payload(archived.payload)
+        responses = [
+            parse_datetime(message["created_at"])
+            for message in messages
+            if message["author"]["role"] in (UserRole.MODERATOR, UserRole.ADMIN)
+        ]
+        assigned_to = ticket["assigned_to"]
+        decoded.append(
+            [
+                parse_datetime(ticket["created_at"]),
+                ticket["status"],
+                ticket["priority"],
+                ticket["category"],
+                uuid.UUID(str(assigned_to["id"])) if assigned_to else None,
+                archived.created_by_id,
+                parse_datetime(ticket["closed_at"]) if ticket["closed_at"] else None,
+                min(responses) if responses else None,
+            ]
+        )
+    users = {user_id for row in decoded for user_id in row[4:6]} - {None}
+    existing = set(User.objects.filter(id__in=users).values_list("id", flat=True))
+    for row in decoded:
+        row[4:6] = [user_id if user_id in existing else None for user_id in row[4:6]]
+        yield tuple(row)
+
+
+def _archived_rollup_rows(chunk_size):
+    archived = ArchivedTicket.objects.only("created_by_id", "payload").order_by("pk")
+    last = None
+    while chunk := list((archived if last is None else archived.filter(pk__gt=last))[:chunk_size]):
+        last = chunk[-1].pk
+        yield from _payload_rows(chunk)
+
+
+def rebuild_archived_rollups(chunk_size=500):
+    """
+    Recompute the archived rollup rows from the archive payloads (e.g. after
+    upgrading from a release whose rows lacked a dimension or measure).
+    Archiving must be stopped meanwhile. Returns the rollup keys written.
+    """
+    with transaction.atomic():
+        return replace_archived_rollups(rollup_increments(_archived_rollup_rows(chunk_size)))
+
+
+def archive_batch(ticket_ids, cutoff):
+    """
+    Archive the given tickets that are still archivable (rows locked by
+    another transaction are skipped). Returns the number archived.
+    """
+    with transaction.atomic():
+        tickets = list(
+            archivable_tickets(cutoff)
+            .filter(id__in=ticket_ids)
+            .select_related("created_by", "assigned_to")
+            .select_for_update(skip_locked=True, of=("self",))
+        )
+        if not tickets:
+            return 0
+        ids = [ticket.id for ticket in tickets]
+
+        messages, events = defaultdict(list), defaultdict(list)
+        for message in TicketMessage.objects.filter(ticket_id__in=ids).select_related("author"):
+            messages[message.ticket_id].append(message)
+        for event in TicketEvent.objects.filter(ticket_id__in=ids).select_related("triggered_by"):
+            events[event.ticket_id].append(event)
+
+        archived = [
+            ArchivedTicket(
+                id=ticket.id,
+                created_by_id=ticket.created_by_id,
+                status=ticket.status,
+                created_at=ticket.created_at,
+                closed_at=ticket.closed_at or ticket.canceled_at,
+                payload=encode_payload(
+                    TicketSerializer(ticket).data,
+                    TicketMessageSerializer(sorted(messages[ticket.id], key=lambda m: m.created_at), many=True).data,
+                    TicketEventSerializer(sorted(events[ticket.id], key=lambda e: e.created_at), many=True).data,
+                ),
+            )
+            for ticket in tickets
+        ]
+        add_to_rollups(rollup_increments(_rollup_rows(tickets, _first_responses(ids))))
+        ArchivedTicket.objects.bulk_create(archived)
+
+        TicketEvent.objects.filter(ticket_id__in=ids).delete()
+        TicketMessage.objects.filter(ticket_id__in=ids).delete()
+        Ticket.objects.filter(id__in=ids).delete()
+        rebuild_live_days({timezone.localtime(ticket.created_at).date() for ticket in tickets})
+        invalidate_ticket_caches()
+    return len(tickets)
+
+
+def archive_closed_tickets(days=None, batch_size=None, limit=None):
+    """
+    Archive closed tickets older than `days` in batches of `batch_size`, up
+    to `limit` tickets. Each batch is its own transaction: the job can be
+    stopped and resumed at any point.
+    """
+    cutoff = archive_cutoff(days)
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    total = 0
+    while limit is None or total < limit:
+        size = batch_size if limit is None else min(batch_size, limit - total)
+        ids = list(archivable_tickets(cutoff).order_by("updated_at").values_list("id", flat=True)[:size])
+        if not ids:
+            break
+        archived = archive_batch(ids, cutoff)
+        if not archived:
+            break
+        total += archived
+        logger.info(f"Archived {archived} tickets ({total} so far)")
+    return total
@@ -0,0 +1,416 @@
+"""
+Deterministic synthetic dataset generator for performance work.
+
+Builds users, tickets, messages and the matching `TicketEvent` trail with
+realistic distributions, straight into the tables: PostgreSQL `COPY` when
+available, raw bulk inserts otherwise. The same seed and end date always
+produce the same rows.
+"""
+
+import io
+import itertools
+import logging
+import math
+import multiprocessing
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from datetime import time as dt_time
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from analytics.snapshot import invalidate_snapshot
+from core.cache_versions import bump_cache_version
+from core.models import User, UserRole
+
+from .imports import insert_preserving_timestamps
+from .models import (
+    Ticket,
+    TicketCategory,
+    TicketEvent,
+    TicketEventType,
+    TicketMessage,
+    TicketPriority,
+    TicketStatus,
+)
+from .services import TICKETS_CACHE_NAMESPACE
+
+logger = logging.getLogger("helpdesk")
+
+DATASET_SIZES = {
+    "small": 10_000,
+    "medium": 1_000_000,
+    "large": 10_000_000,
+}
+
+STATUS_WEIGHTS = {
+    TicketStatus.OPEN: 0.10,
+    TicketStatus.IN_PROGRESS: 0.12,
+    TicketStatus.WAITING_USER: 0.08,
+    TicketStatus.RESOLVED: 0.63,
+    TicketStatus.CANCELED: 0.07,
+}
+PRIORITY_WEIGHTS = {
+    TicketPriority.LOW: 0.30,
+    TicketPriority.MEDIUM: 0.45,
+    TicketPriority.HIGH: 0.20,
+    TicketPriority.CRITICAL: 0.05,
+}
+CATEGORY_WEIGHTS = {
+    TicketCategory.GENERAL: 0.25,
+    TicketCategory.TECHNICAL: 0.25,
+    TicketCategory.BILLING: 0.12,
+    TicketCategory.ACCESS: 0.15,
+    TicketCategory.BUG: 0.13,
+    TicketCategory.FEATURE: 0.06,
+    TicketCategory.OTHER: 0.04,
+}
+# Median hours (log-normal) until first moderator response / resolution.
+FIRST_RESPONSE_MEDIAN_HOURS = {
+    TicketPriority.CRITICAL: 0.5,
+    TicketPriority.HIGH: 2,
+    TicketPriority.MEDIUM: 6,
+    TicketPriority.LOW: 12,
+}
+RESOLUTION_MEDIAN_HOURS = {
+    TicketPriority.CRITICAL: 6,
+    TicketPriority.HIGH: 24,
+    TicketPriority.MEDIUM: 48,
+    TicketPriority.LOW: 96,
+}
+# Tickets are mostly opened during business hours on weekdays.
+HOUR_WEIGHTS = [1, 1, 1, 1, 1, 2, 4, 8, 14, 16, 16, 14, 10, 14, 16, 15, 13, 10, 7, 5, 4, 3, 2, 1]
+WEEKDAY_WEIGHTS = [1.0, 1.0, 1.0, 1.0, 0.9, 0.3, 0.2]
+INTERNAL_NOTE_RATE = 0.15
+
+
+@dataclass
+class DatasetConfig:
+    tickets: int
+    seed: int = 42
+    days: int = 365
+    end_date: date | None = None
+    users: int | None = None
+    moderators: int | None = None
+    batch_size: int = 10_000
+    prefix: str = "dataset"
+
+    def __post_init__(self):
+        self.users = self.users or max(10, self.tickets // 20)
+        self.moderators = self.moderators or max(3, min(500, self.tickets // 20_000))
+
+
+class _Writer:
+    """Writes row tuples with COPY (PostgreSQL) or raw bulk inserts (others), timestamps as generated."""
+
+    def __init__(self, use_copy):
+        self.use_copy = use_copy
+
+    def write(self, model, fields, rows):
+        if not rows:
+            return
+        if self.use_copy:
+            self._copy(model, fields, rows)
+        else:
+            insert_preserving_timestamps(model, [model(**dict(zip(fields, row))) for row in rows], batch_size=5000)
+
+    def _copy(self, model, fields, rows):
+        columns = ", ".join(model._meta.get_field(name).column for name in fields)
+        sql = f"COPY {model._meta.db_table} ({columns}) FROM STDIN"
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(r"\N" if value is None else str(value) for value in row))
+            buffer.write("\n")
+        buffer.seek(0)
+        with connection.cursor() as cursor:
+            if hasattr(cursor, "copy_expert"):
+                cursor.copy_expert(sql, buffer)
+            else:
+                with cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+
+TICKET_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "category",
+    "created_by_id",
+    "assigned_to_id",
+    "canceled_at",
+    "closed_at",
+    "created_at",
+    "updated_at",
+    "first_response_at",
+    # No database default: COPY would write NULL.
+    "sla_paused_seconds",
+)
+MESSAGE_FIELDS = ("id", "ticket_id", "author_id", "message", "is_internal", "created_at")
+EVENT_FIELDS = ("id", "ticket_id", "event_type", "from_value", "to_value", "triggered_by_id", "created_at")
+
+
+def _cumulative(weights):
+    return tuple(weights), list(itertools.accumulate(weights.values()))
+
+
+class DatasetGenerator:
+    """
+    Builds row tuples. Every batch has its own RNG derived from
+    `(seed, batch_index)`, so output does not depend on the number of
+    worker processes or on batch execution order.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        end_date = config.end_date or timezone.localdate()
+        self.end = timezone.make_aware(datetime.combine(end_date, dt_time.min))
+        self.start = self.end - timedelta(days=config.days)
+        # Cumulative weights keep rng.choices() at O(log n) per draw.
+        self._statuses, self._status_cum = _cumulative(STATUS_WEIGHTS)
+        self._priorities, self._priority_cum = _cumulative(PRIORITY_WEIGHTS)
+        self._categories, self._category_cum = _cumulative(CATEGORY_WEIGHTS)
+        self._hours, self._hour_cum = _cumulative(dict(enumerate(HOUR_WEIGHTS)))
+        days = [self.start + timedelta(days=offset) for offset in range(config.days)]
+        self._days, self._day_cum = _cumulative({day: WEEKDAY_WEIGHTS[day.weekday()] for day in days})
+
+    @staticmethod
+    def _uuid(rng):
+        return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+    @staticmethod
+    def _lognormal_hours(rng, median_hours):
+        return timedelta(hours=rng.lognormvariate(math.log(median_hours), 0.9))
+
+    def _clamp(self, moment):
+        return min(moment, self.end)
+
+    def build_users(self):
+        """
+        Return user rows, regular user ids, moderator ids and the cumulative
+        moderator workload weights (Pareto: a few moderators take most tickets).
+        """
+        rng = random.Random(f"{self.config.seed}-users")
+        password = make_password(None)
+        prefix = self.config.prefix
+        roles = [UserRole.USER] * self.config.users + [UserRole.MODERATOR] * self.config.moderators
+        rows, user_ids, moderator_ids = [], [], []
+        for index, role in enumerate(roles):
+            user_id = self._uuid(rng)
+            kind = "user" if role == UserRole.USER else "mod"
+            rows.append(
+                (
+                    user_id,
+                    f"{prefix}-{kind}{index}@helpdesk.local",
+                    password,
+                    f"{kind.title()} {index}",
+                    prefix,
+                    role,
+                    True,
+                    False,
+                    False,
+                    self.start,
+                    self.start,
+                )
+            )
+            (user_ids if role == UserRole.USER else moderator_ids).append(user_id)
+        moderator_cum = list(itertools.accumulate(rng.paretovariate(1.5) for _ in moderator_ids))
+        return rows, user_ids, moderator_ids, moderator_cum
+
+    def build_batch(self, batch_index, size, user_ids, moderator_ids, moderator_cum):
+        rng = random.Random(f"{self.config.seed}-{batch_index}")
+        tickets, messages, events = [], [], []
+        first_number = batch_index * self.config.batch_size + 1
+        for number in range(first_number, first_number + size):
+            day = rng.choices(self._days, cum_weights=self._day_cum)[0]
+            created_at = day + timedelta(
+                hours=rng.choices(self._hours, cum_weights=self._hour_cum)[0],
+                seconds=rng.randrange(3600),
+            )
+            status = rng.choices(self._statuses, cum_weights=self._status_cum)[0]
+            priority = rng.choices(self._priorities, cum_weights=self._priority_cum)[0]
+            category = rng.choices(self._categories, cum_weights=self._category_cum)[0]
+            creator = rng.choice(user_ids)
+            assignee = None
+            if status not in (TicketStatus.OPEN, TicketStatus.CANCELED) or rng.random() < 0.3:
+                assignee = rng.choices(moderator_ids, cum_weights=moderator_cum)[0]
+
+            ticket_id = self._uuid(rng)
+            first_response = self._clamp(
+                created_at + self._lognormal_hours(rng, FIRST_RESPONSE_MEDIAN_HOURS[priority])
+            )
+            closed_at = canceled_at = None
+            if status == TicketStatus.RESOLVED:
+                closed_at = self._clamp(
+                    first_response + self._lognormal_hours(rng, RESOLUTION_MEDIAN_HOURS[priority])
+                )
+                finished_at = closed_at
+            elif status == TicketStatus.CANCELED:
+                canceled_at = self._clamp(created_at + self._lognormal_hours(rng, 3))
+                finished_at = canceled_at
+            else:
+                finished_at = self._clamp(first_response + timedelta(minutes=rng.randrange(1, 600)))
+
+            def event(event_type, actor, at, from_value="", to_value=""):
+                events.append((self._uuid(rng), ticket_id, event_type, from_value, to_value, actor, at))
+
+            def message(author, at, text, is_internal=False):
+                messages.append((self._uuid(rng), ticket_id, author, text, is_internal, at))
+                event(
+                    TicketEventType.MESSAGE_ADDED,
+                    author,
+                    at,
+                    to_value="INTERNAL" if is_internal else "PUBLIC",
+                )
+
+            event(TicketEventType.CREATED, creator, created_at, to_value=TicketStatus.OPEN)
+            if assignee:
+                event(TicketEventType.ASSIGNED, assignee, first_response, to_value=str(assignee))
+
+            message(creator, created_at + timedelta(minutes=1), "Detalhes adicionais do chamado.")
+            answered = assignee and status != TicketStatus.OPEN
+            if answered:
+                message(assignee, first_response, "Analisando o chamado.")
+                at = first_response
+                # Geometric number of follow-up rounds (mean ~1).
+                while rng.random() < 0.5 and at < finished_at:
+                    at = self._clamp(at + self._lognormal_hours(rng, 4))
+                    message(creator, at, "Retorno do usuario.")
+                    at = self._clamp(at + self._lognormal_hours(rng, 2))
+                    message(assignee, at, "Retorno do suporte.")
+                if rng.random() < INTERNAL_NOTE_RATE:
+                    message(assignee, first_response + timedelta(minutes=5), "Nota interna.", True)
+
+            actor = assignee or creator
+            if status == TicketStatus.RESOLVED:
+                event(TicketEventType.RESOLVED, actor, closed_at, TicketStatus.OPEN, status)
+            elif status == TicketStatus.CANCELED:
+                event(TicketEventType.CANCELED, creator, canceled_at, TicketStatus.OPEN, status)
+            elif status != TicketStatus.OPEN:
+                event(TicketEventType.STATUS_CHANGED, actor, first_response, TicketStatus.OPEN, status)
+
+            tickets.append(
+                (
+                    ticket_id,
+                    f"Chamado sintetico {category.lower()} #{number}",
+                    "Gerado para testes de carga.",
+                    status,
+                    priority,
+                    category,
+                    creator,
+                    assignee,
+                    canceled_at,
+                    closed_at,
+                    created_at,
+                    max(finished_at, created_at),
+                    first_response if answered else None,
+                    0,
+                )
+            )
+        return tickets, messages, events
+
+
+USER_FIELDS = (
+    "id",
+    "email",
+    "password",
+    "first_name",
+    "last_name",
+    "role",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "created_at",
+    "updated_at",
+)
+
+# Per-process state for worker pools (set once by the pool initializer).
+_worker_state = {}
+
+
+def _init_worker(generator, use_copy, user_ids, moderator_ids, moderator_cum):
+    _worker_state.update(
+        generator=generator,
+        writer=_Writer(use_copy),
+        users=(user_ids, moderator_ids, moderator_cum),
+    )
+
+
+def _write_batch(batch_index, size):
+    """Generate and write one batch in its own transaction. Returns row counts."""
+    generator = _worker_state["generator"]
+    writer = _worker_state["writer"]
+    tickets, messages, events = generator.build_batch(batch_index, size, *_worker_state["users"])
+    with transaction.atomic():
+        writer.write(Ticket, TICKET_FIELDS, tickets)
+        writer.write(TicketMessage, MESSAGE_FIELDS, messages)
+        writer.write(TicketEvent, EVENT_FIELDS, events)
+    return len(tickets), len(messages), len(events)
+
+
+def _write_batch_star(args):
+    return _write_batch(*args)
+
+
+def generate_dataset(config, use_copy=None, workers=1, progress=None):
+    """
+    Generate a dataset described by `config`. Returns a stats dict.
+
+    With `workers > 1` batches are generated and written by a pool of forked
+    processes, each with its own database connection. `progress` is called
+    with (tickets_done, rows_per_second) after each batch.
+    """
+    if use_copy is None:
+        use_copy = connection.vendor == "postgresql"
+    if User.objects.filter(email__startswith=f"{config.prefix}-").exists():
+        raise ValueError(f"Ja existem usuarios com prefixo '{config.prefix}'. Use outro --prefix.")
+
+    generator = DatasetGenerator(config)
+    started = time.monotonic()
+    user_rows, *users = generator.build_users()
+    with transaction.atomic():
+        _Writer(use_copy).write(User, USER_FIELDS, user_rows)
+
+    totals = {"users": len(user_rows), "tickets": 0, "messages": 0, "events": 0}
+    batches = [
+        (index, min(config.batch_size, config.tickets - offset))
+        for index, offset in enumerate(range(0, config.tickets, config.batch_size))
+    ]
+
+    if workers > 1:
+        # Children must not inherit the parent's open connection.
+        connections.close_all()
+        pool = multiprocessing.get_context("fork").Pool(
+            workers,
+            initializer=_init_worker,
+            initargs=(generator, use_copy, *users),
+        )
+        results = pool.imap_unordered(_write_batch_star, batches)
+    else:
+        pool = None
+        _init_worker(generator, use_copy, *users)
+        results = (_write_batch(*batch) for batch in batches)
+
+    try:
+        for tickets, messages, events in results:
+            totals["tickets"] += tickets
+            totals["messages"] += messages
+            totals["events"] += events
+            if progress:
+                rows = totals["tickets"] + totals["messages"] + totals["events"]
+                progress(totals["tickets"], rows / max(time.monotonic() - started, 1e-6))
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    bump_cache_version(TICKETS_CACHE_NAMESPACE)
+    invalidate_snapshot()
+    totals["seconds"] = round(time.monotonic() - started, 1)
+    logger.info(f"Dataset gerado: {totals}")
+    return totals
@@ -0,0 +1,33 @@
+"""
+Filters shared by ticket listings and exports.
+"""
+
+import django_filters
+
+from .models import Ticket
+
+TICKET_FILTER_FIELDS = ("status", "priority", "category", "assigned_to", "created_by")
+
+
+class TicketFilterSet(django_filters.FilterSet):
+    class Meta:
+        model = Ticket
+        fields = TICKET_FILTER_FIELDS
+
+
+def filter_tickets(queryset, params):
+    """
+    Apply the ticket list filters to `queryset`.
+
+    Mirrors `TicketListCreateView`: `assigned_to=null` selects unassigned
+    tickets. Raises `ValueError` with the form errors on invalid params.
+    """
+    params = {key: value for key, value in params.items() if key in TICKET_FILTER_FIELDS and value}
+    if params.get("assigned_to") == "null":
+        params.pop("assigned_to")
+        queryset = queryset.filter(assigned_to__isnull=True)
+
+    filterset = TicketFilterSet(data=params, queryset=queryset)
+    if not filterset.is_valid():
+        raise ValueError(dict(filterset.errors))
+    return filterset.qs
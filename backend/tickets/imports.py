@@ -0,0 +1,339 @@
+"""
+Bulk import of tickets and messages from CSV / NDJSON files.
+
+Records are read lazily and written in chunks with raw bulk inserts. Each chunk
+is committed together with the job checkpoint (`ImportJob.rows_processed`),
+so a failed job can be resumed from the last committed chunk. The service
+layer is bypassed on purpose: original timestamps are preserved, the
+`TicketEvent` audit trail is synthesized and no notification is sent. SLA
+deadlines are computed from the source `created_at`, and imported staff
+replies stop the first response clock, so `sla_scan` sees imported tickets.
+"""
+
+import csv
+import itertools
+import json
+import logging
+import time
+import uuid
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from analytics.snapshot import invalidate_snapshot
+from core.cache_versions import bump_cache_version
+from core.models import User, UserRole
+
+from .models import (
+    ImportJob,
+    ImportJobStatus,
+    Ticket,
+    TicketCategory,
+    TicketEvent,
+    TicketEventType,
+    TicketMessage,
+    TicketPriority,
+    TicketStatus,
+)
+from .services import TICKETS_CACHE_NAMESPACE
+from .sla import apply_sla, first_staff_response
+
+logger = logging.getLogger("helpdesk")
+
+IMPORT_RESOURCES = ("tickets", "messages")
+IMPORT_FORMATS = ("csv", "ndjson")
+DEFAULT_CHUNK_SIZE = 5000
+
+_TRUE_VALUES = {"1", "true", "t", "yes", "sim"}
+
+
+class ImportRowError(ValueError):
+    def __init__(self, line, message):
+        super().__init__(f"Registro {line}: {message}")
+
+
+def insert_preserving_timestamps(model, objects, batch_size):
+    """
+    INSERT `objects` with the `auto_now` / `auto_now_add` values they carry
+    (source timestamps). Like fixture loading, a raw insert skips
+    `Field.pre_save` for these rows only; the shared field state is left
+    alone, so concurrent saves in the same process keep their timestamps.
+    Primary keys and timestamps must be set on every object.
+    """
+    queryset = model._base_manager.all()
+    fields = [field for field in model._meta.concrete_fields if not field.generated]
+    for start in range(0, len(objects), batch_size):
+        queryset._insert(objects[start:start + batch_size], fields=fields, raw=True)
+
+
+def read_records(path, input_format, skip=0):
+    """Yield records (dicts) from `path`, skipping the first `skip` ones."""
+    with open(path, newline="", encoding="utf-8") as fh:
+        if input_format == "csv":
+            records = csv.DictReader(fh)
+        else:
+            records = (json.loads(line) for line in fh if line.strip())
+        yield from itertools.islice(records, skip, None)
+
+
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+class UserResolver:
+    """
+    Maps source emails to user ids, one query per chunk of unknown emails.
+    Missing users are created (unusable password) when `create_missing`.
+    """
+
+    def __init__(self, create_missing=False):
+        self.create_missing = create_missing
+        self._ids = {}
+
+    def prime(self, emails):
+        missing = {email for email in emails if email and email not in self._ids}
+        if not missing:
+            return
+        for user_id, email in User.objects.filter(email__in=missing).values_list("id", "email"):
+            self._ids[email] = user_id
+        missing -= self._ids.keys()
+        if missing and self.create_missing:
+            unusable = make_password(None)
+            users = [
+                User(email=email, password=unusable, role=UserRole.USER, is_active=True)
+                for email in sorted(missing)
+            ]
+            User.objects.bulk_create(users, batch_size=1000)
+            self._ids.update({user.email: user.id for user in users})
+
+    def get(self, email, line, required=True):
+        if not email:
+            if required:
+                raise ImportRowError(line, "email obrigatorio.")
+            return None
+        try:
+            return self._ids[email]
+        except KeyError:
+            raise ImportRowError(line, f"usuario {email} nao encontrado.")
+
+
+def _email(value):
+    return (value or "").strip().lower()
+
+
+def _datetime(value, line, default=None):
+    if not value:
+        return default
+    parsed = parse_datetime(str(value))
+    if parsed is None:
+        raise ImportRowError(line, f"data invalida: {value}.")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _choice(value, choices, default, line):
+    value = (value or default).strip().upper()
+    if value not in choices.values:
+        raise ImportRowError(line, f"valor invalido: {value}.")
+    return value
+
+
+def _uuid(value, line):
+    if not value:
+        return uuid.uuid4()
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        raise ImportRowError(line, f"id invalido: {value}.")
+
+
+def _ticket_events(ticket):
+    """Synthesize the audit trail a ticket would have produced via services."""
+    actor_id = ticket.assigned_to_id or ticket.created_by_id
+    events = [
+        TicketEvent(
+            ticket_id=ticket.id,
+            event_type=TicketEventType.CREATED,
+            to_value=TicketStatus.OPEN,
+            triggered_by_id=ticket.created_by_id,
+            created_at=ticket.created_at,
+        )
+    ]
+    if ticket.assigned_to_id:
+        events.append(
+            TicketEvent(
+                ticket_id=ticket.id,
+                event_type=TicketEventType.ASSIGNED,
+                to_value=str(ticket.assigned_to_id),
+                triggered_by_id=ticket.assigned_to_id,
+                created_at=ticket.created_at,
+            )
+        )
+    if ticket.status == TicketStatus.OPEN:
+        return events
+    if ticket.status == TicketStatus.RESOLVED:
+        event_type, at = TicketEventType.RESOLVED, ticket.closed_at
+    elif ticket.status == TicketStatus.CANCELED:
+        event_type, at = TicketEventType.CANCELED, ticket.canceled_at
+        actor_id = ticket.created_by_id
+    else:
+        event_type, at = TicketEventType.STATUS_CHANGED, ticket.updated_at
+    events.append(
+        TicketEvent(
+            ticket_id=ticket.id,
+            event_type=event_type,
+            from_value=TicketStatus.OPEN,
+            to_value=ticket.status,
+            triggered_by_id=actor_id,
+            created_at=at or ticket.updated_at,
+        )
+    )
+    return events
+
+
+def build_ticket_chunk(records, resolver, first_line):
+    resolver.prime(
+        _email(record.get(key))
+        for record in records
+        for key in ("created_by_email", "assigned_to_email")
+    )
+    now = timezone.now()
+    tickets, events = [], []
+    for line, record in enumerate(records, start=first_line):
+        created_at = _datetime(record.get("created_at"), line, default=now)
+        status = _choice(record.get("status"), TicketStatus, TicketStatus.OPEN, line)
+        if not record.get("title"):
+            raise ImportRowError(line, "title obrigatorio.")
+        ticket = Ticket(
+            id=_uuid(record.get("id"), line),
+            title=record["title"][:255],
+            description=record.get("description") or "",
+            status=status,
+            priority=_choice(record.get("priority"), TicketPriority, TicketPriority.MEDIUM, line),
+            category=_choice(record.get("category"), TicketCategory, TicketCategory.GENERAL, line),
+            created_by_id=resolver.get(_email(record.get("created_by_email")), line),
+            assigned_to_id=resolver.get(_email(record.get("assigned_to_email")), line, required=False),
+            created_at=created_at,
+            updated_at=_datetime(record.get("updated_at"), line, default=created_at),
+            closed_at=_datetime(record.get("closed_at"), line),
+            canceled_at=_datetime(record.get("canceled_at"), line),
+        )
+        apply_sla(ticket)
+        tickets.append(ticket)
+        events.extend(_ticket_events(ticket))
+    return Ticket, tickets, events
+
+
+def build_message_chunk(records, resolver, first_line):
+    resolver.prime(_email(record.get("author_email")) for record in records)
+    now = timezone.now()
+    messages, events = [], []
+    for line, record in enumerate(records, start=first_line):
+        if not record.get("ticket_id"):
+            raise ImportRowError(line, "ticket_id obrigatorio.")
+        is_internal = str(record.get("is_internal", "")).strip().lower() in _TRUE_VALUES
+        message = TicketMessage(
+            id=_uuid(record.get("id"), line),
+            ticket_id=_uuid(record["ticket_id"], line),
+            author_id=resolver.get(_email(record.get("author_email")), line),
+            message=record.get("message") or "",
+            is_internal=is_internal,
+            created_at=_datetime(record.get("created_at"), line, default=now),
+        )
+        messages.append(message)
+        events.append(
+            TicketEvent(
+                ticket_id=message.ticket_id,
+                event_type=TicketEventType.MESSAGE_ADDED,
+                to_value="INTERNAL" if is_internal else "PUBLIC",
+                triggered_by_id=message.author_id,
+                created_at=message.created_at,
+            )
+        )
+    return TicketMessage, messages, events
+
+
+def record_first_responses(messages):
+    """Stop the first response clock of tickets answered by a public staff message of `messages`."""
+    public = [message for message in messages if not message.is_internal]
+    staff_ids = set(
+        User.objects.filter(
+            id__in={message.author_id for message in public},
+            role__in=(UserRole.MODERATOR, UserRole.ADMIN),
+        ).values_list("id", flat=True)
+    )
+    ticket_ids = {message.ticket_id for message in public if message.author_id in staff_ids}
+    if ticket_ids:
+        # The source timestamps are kept: updated_at is left alone.
+        Ticket.objects.filter(id__in=ticket_ids, first_response_at__isnull=True).update(
+            first_response_at=first_staff_response()
+        )
+
+
+_BUILDERS = {
+    "tickets": build_ticket_chunk,
+    "messages": build_message_chunk,
+}
+# Run in the chunk transaction, after the inserts.
+_AFTER_INSERT = {
+    "messages": record_first_responses,
+}
+
+
+def run_import(job, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Run (or resume) `job` from its checkpoint. Returns the updated job;
+    failures are recorded on the job instead of being raised.
+    """
+    job.status = ImportJobStatus.RUNNING
+    job.error = ""
+    job.started_at = job.started_at or timezone.now()
+    job.save(update_fields=["status", "error", "started_at"])
+
+    build_chunk = _BUILDERS[job.resource]
+    after_insert = _AFTER_INSERT.get(job.resource)
+    resolver = UserResolver(create_missing=job.create_users)
+    processed = job.rows_processed
+    imported_now = 0
+    started = time.monotonic()
+    logger.info(f"Import {job.id} ({job.resource}) iniciado a partir do registro {processed + 1}")
+
+    try:
+        records = read_records(job.file_path, job.input_format, skip=processed)
+        for chunk in _chunked(records, chunk_size):
+            model, objects, events = build_chunk(chunk, resolver, first_line=processed + 1)
+            with transaction.atomic():
+                insert_preserving_timestamps(model, objects, batch_size=chunk_size)
+                insert_preserving_timestamps(TicketEvent, events, batch_size=chunk_size)
+                if after_insert:
+                    after_insert(objects)
+                processed += len(chunk)
+                imported_now += len(chunk)
+                job.rows_processed = processed
+                job.rows_per_second = imported_now / max(time.monotonic() - started, 1e-6)
+                job.save(update_fields=["rows_processed", "rows_per_second"])
+            # Source timestamps are older than the snapshot position: its delta would miss these rows.
+            invalidate_snapshot()
+            logger.info(
+                f"Import {job.id}: {processed} linhas ({job.rows_per_second:.0f} linhas/s)"
+            )
+    except Exception as exc:
+        job.status = ImportJobStatus.FAILED
+        job.error = str(exc)
+        job.save(update_fields=["status", "error"])
+        logger.exception(f"Import {job.id} falhou no registro {processed + 1}")
+        return job
+    finally:
+        if imported_now:
+            bump_cache_version(TICKETS_CACHE_NAMESPACE)
+
+    job.status = ImportJobStatus.COMPLETED
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "finished_at"])
+    logger.info(f"Import {job.id} concluido: {processed} linhas ({job.rows_per_second or 0:.0f} linhas/s)")
+    return job
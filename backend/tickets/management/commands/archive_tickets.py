@@ -0,0 +1,37 @@
+"""
+Move resolved / canceled tickets to cold storage (`ArchivedTicket`).
+
+Exemplo:
+    python manage.py archive_tickets
+    python manage.py archive_tickets --older-than-days 180 --batch-size 200 --limit 10000
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.archive import archive_closed_tickets
+
+
+class Command(BaseCommand):
+    help = "Arquiva tickets resolvidos/cancelados antigos (tabela de arquivo + rollups de analytics)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+        parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+        parser.add_argument("--limit", type=int, help="Maximo de tickets nesta execucao.")
+
+    def handle(self, *args, **options):
+        if options["older_than_days"] <= 0 or options["batch_size"] <= 0:
+            raise CommandError("--older-than-days e --batch-size devem ser positivos.")
+
+        started = time.monotonic()
+        total = archive_closed_tickets(
+            days=options["older_than_days"],
+            batch_size=options["batch_size"],
+            limit=options["limit"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"{total} tickets arquivados em {time.monotonic() - started:.1f}s.")
+        )
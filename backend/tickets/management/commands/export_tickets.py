@@ -0,0 +1,62 @@
+"""
+Stream tickets, messages or events to a CSV / NDJSON file.
+
+Exemplo:
+    python manage.py export_tickets events --output ndjson --gzip --file events.ndjson.gz
+    python manage.py export_tickets tickets --status RESOLVED > resolved.csv
+"""
+
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.exports import DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, EXPORT_RESOURCES, stream_export
+from tickets.filters import TICKET_FILTER_FIELDS
+
+
+class Command(BaseCommand):
+    help = "Exporta tickets, mensagens ou eventos em CSV/NDJSON (streaming)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("resource", choices=sorted(EXPORT_RESOURCES))
+        parser.add_argument("--output", choices=EXPORT_FORMATS, default="csv")
+        parser.add_argument("--file", help="Arquivo de destino (padrao: stdout).")
+        parser.add_argument("--gzip", action="store_true", help="Comprime a saida com gzip.")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        for field in TICKET_FILTER_FIELDS:
+            parser.add_argument(f"--{field.replace('_', '-')}", dest=field)
+
+    def handle(self, *args, **options):
+        if options["gzip"] and not options["file"]:
+            raise CommandError("--gzip exige --file.")
+
+        params = {field: options[field] for field in TICKET_FILTER_FIELDS if options.get(field)}
+        try:
+            chunks = stream_export(
+                options["resource"],
+                output=options["output"],
+                params=params,
+                chunk_size=options["chunk_size"],
+                compress=options["gzip"],
+            )
+        except ValueError as exc:
+            raise CommandError(exc.args[0])
+
+        started = time.monotonic()
+        written = 0
+        if options["file"]:
+            mode = "wb" if options["gzip"] else "w"
+            encoding = None if options["gzip"] else "utf-8"
+            with open(options["file"], mode, encoding=encoding, newline="" if encoding else None) as fh:
+                for chunk in chunks:
+                    fh.write(chunk)
+                    written += len(chunk)
+        else:
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+                written += len(chunk)
+            sys.stdout.flush()
+
+        elapsed = time.monotonic() - started
+        self.stderr.write(f"Exportado {options['resource']}: {written} bytes em {elapsed:.1f}s")
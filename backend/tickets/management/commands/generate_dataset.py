@@ -0,0 +1,63 @@
+"""
+Generate a deterministic synthetic dataset for benchmarks.
+
+Exemplo:
+    python manage.py generate_dataset --size medium --seed 42
+    python manage.py generate_dataset --tickets 50000 --days 730 --prefix bench
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from tickets.datagen import DATASET_SIZES, DatasetConfig, generate_dataset
+
+
+class Command(BaseCommand):
+    help = "Gera usuarios, tickets, mensagens e eventos sinteticos (COPY / bulk_create)."
+
+    def add_arguments(self, parser):
+        size = parser.add_mutually_exclusive_group(required=True)
+        size.add_argument("--size", choices=DATASET_SIZES, help="small=10k, medium=1M, large=10M tickets.")
+        size.add_argument("--tickets", type=int)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--days", type=int, default=365, help="Janela de criacao dos tickets.")
+        parser.add_argument("--end-date", help="YYYY-MM-DD (padrao: hoje). Fixe para reprodutibilidade.")
+        parser.add_argument("--users", type=int)
+        parser.add_argument("--moderators", type=int)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--prefix", default="dataset", help="Prefixo dos emails gerados.")
+        parser.add_argument("--workers", type=int, default=1, help="Processos paralelos (PostgreSQL).")
+        parser.add_argument("--no-copy", action="store_true", help="Usa bulk_create mesmo no PostgreSQL.")
+
+    def handle(self, *args, **options):
+        end_date = None
+        if options["end_date"]:
+            end_date = parse_date(options["end_date"])
+            if not end_date:
+                raise CommandError("--end-date invalida. Use YYYY-MM-DD.")
+
+        config = DatasetConfig(
+            tickets=options["tickets"] or DATASET_SIZES[options["size"]],
+            seed=options["seed"],
+            days=options["days"],
+            end_date=end_date,
+            users=options["users"],
+            moderators=options["moderators"],
+            batch_size=options["batch_size"],
+            prefix=options["prefix"],
+        )
+
+        def progress(done, rate):
+            self.stdout.write(f"{done}/{config.tickets} tickets ({rate:.0f} linhas/s)")
+
+        try:
+            totals = generate_dataset(
+                config,
+                use_copy=False if options["no_copy"] else None,
+                workers=options["workers"],
+                progress=progress,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(f"Dataset gerado: {totals}"))
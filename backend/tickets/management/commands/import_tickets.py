@@ -0,0 +1,63 @@
+"""
+Bulk import tickets or messages from a CSV / NDJSON file.
+
+Exemplo:
+    python manage.py import_tickets tickets legado/tickets.ndjson --create-users
+    python manage.py import_tickets messages legado/mensagens.csv
+    python manage.py import_tickets --resume <job_id>
+"""
+
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.imports import DEFAULT_CHUNK_SIZE, IMPORT_FORMATS, IMPORT_RESOURCES, run_import
+from tickets.models import ImportJob, ImportJobStatus
+
+
+class Command(BaseCommand):
+    help = "Importa tickets/mensagens em lote (bulk_create), sem notificacoes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("resource", nargs="?", choices=IMPORT_RESOURCES)
+        parser.add_argument("file", nargs="?")
+        parser.add_argument("--input", choices=IMPORT_FORMATS, help="Padrao: extensao do arquivo.")
+        parser.add_argument("--create-users", action="store_true")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--resume", metavar="JOB_ID", help="Retoma um job a partir do checkpoint.")
+
+    def handle(self, *args, **options):
+        if options["resume"]:
+            job = ImportJob.objects.filter(id=options["resume"]).first()
+            if not job:
+                raise CommandError("Job de importacao nao encontrado.")
+            if job.status == ImportJobStatus.COMPLETED:
+                raise CommandError("Job ja concluido.")
+        else:
+            job = self._create_job(options)
+
+        self.stdout.write(f"Job {job.id}: iniciando no registro {job.rows_processed + 1}")
+        job = run_import(job, chunk_size=options["chunk_size"])
+
+        summary = f"{job.rows_processed} registros ({job.rows_per_second or 0:.0f} registros/s)"
+        if job.status == ImportJobStatus.FAILED:
+            raise CommandError(
+                f"{job.error}\n{summary}. Retome com: manage.py import_tickets --resume {job.id}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Importacao concluida: {summary}"))
+
+    def _create_job(self, options):
+        if not options["resource"] or not options["file"]:
+            raise CommandError("Informe recurso e arquivo (ou --resume).")
+        path = Path(options["file"]).resolve()
+        if not path.is_file():
+            raise CommandError(f"Arquivo nao encontrado: {path}")
+        input_format = options["input"] or path.suffix.lstrip(".").lower()
+        if input_format not in IMPORT_FORMATS:
+            raise CommandError("Informe --input csv|ndjson.")
+        return ImportJob.objects.create(
+            resource=options["resource"],
+            input_format=input_format,
+            file_path=str(path),
+            create_users=options["create_users"],
+        )
@@ -0,0 +1,85 @@
+"""
+Create upcoming monthly partitions of ticket events / messages and detach
+old ones (PostgreSQL). Run it at least once a month (cron).
+
+Exemplo:
+    python manage.py manage_partitions
+    python manage.py manage_partitions --months-ahead 6 --detach-older-than 24 --drop
+    python manage.py manage_partitions --list
+"""
+
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from tickets.partitions import (
+    PARTITIONED_TABLES,
+    add_months,
+    detach_partition,
+    ensure_partitions,
+    is_partitioned,
+    list_partitions,
+    month_start,
+    oldest_default_row,
+)
+
+
+class Command(BaseCommand):
+    help = "Cria as particoes mensais futuras de eventos/mensagens e desanexa meses antigos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD)
+        parser.add_argument(
+            "--detach-older-than",
+            type=int,
+            default=settings.PARTITION_RETENTION_MONTHS,
+            metavar="MONTHS",
+            help="Desanexa particoes com mais de MONTHS meses (0 desativa).",
+        )
+        parser.add_argument("--drop", action="store_true", help="Apaga as particoes desanexadas.")
+        parser.add_argument("--list", action="store_true", help="Apenas lista as particoes.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Particionamento exige PostgreSQL.")
+        for table in PARTITIONED_TABLES:
+            if not is_partitioned(connection, table):
+                raise CommandError(f"Tabela {table} nao particionada; rode migrate.")
+
+        this_month = month_start(datetime.now(timezone.utc))
+        for table in PARTITIONED_TABLES:
+            if not options["list"]:
+                self._maintain(table, this_month, options)
+            self._report(table)
+
+    def _maintain(self, table, this_month, options):
+        # Rows imported with past dates land in the default partition: their
+        # months are created too (moving the rows out of it).
+        oldest = oldest_default_row(connection, table)
+        first = min(this_month, month_start(oldest.astimezone(timezone.utc))) if oldest else this_month
+        with transaction.atomic():
+            created = ensure_partitions(connection, table, first, add_months(this_month, options["months_ahead"]))
+        for name in created:
+            self.stdout.write(self.style.SUCCESS(f"Criada {name}"))
+
+        retention = options["detach_older_than"]
+        if retention <= 0:
+            return
+        cutoff = add_months(this_month, -retention)
+        for name, month, _ in list_partitions(connection, table):
+            if month is None or month >= cutoff:
+                continue
+            with transaction.atomic():
+                detach_partition(connection, table, name, drop=options["drop"])
+            action = "Apagada" if options["drop"] else "Desanexada"
+            self.stdout.write(self.style.WARNING(f"{action} {name}"))
+
+    def _report(self, table):
+        for name, month, rows in list_partitions(connection, table):
+            self.stdout.write(f"{name} ~{rows} linhas")
+            if month is None and rows:
+                self.stdout.write(
+                    self.style.WARNING(f"{name} tem linhas alem de --months-ahead; aumente o valor.")
+                )
@@ -0,0 +1,35 @@
+"""
+Run the SLA breach scanner once (normally run by celery beat).
+
+Exemplo:
+    python manage.py sla_scan
+    python manage.py sla_scan --backfill
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from tickets.sla import backfill_deadlines, scan_breaches
+
+
+class Command(BaseCommand):
+    help = "Marca e notifica violacoes de SLA; --backfill calcula prazos de tickets antigos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="Calcula os prazos de tickets abertos sem prazo antes de varrer.",
+        )
+
+    def handle(self, *args, **options):
+        if options["backfill"]:
+            updated = backfill_deadlines()
+            self.stdout.write(f"{updated} tickets receberam prazos de SLA.")
+
+        started = time.monotonic()
+        found = scan_breaches(batch_size=options["batch_size"])
+        summary = ", ".join(f"{kind}={total}" for kind, total in found.items())
+        self.stdout.write(self.style.SUCCESS(f"Violacoes: {summary} ({time.monotonic() - started:.2f}s)."))
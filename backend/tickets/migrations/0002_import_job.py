@@ -0,0 +1,40 @@
+# Generated by Django 5.1.5 on 2026-10-19 08:13
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('resource', models.CharField(max_length=20, verbose_name='recurso')),
+                ('input_format', models.CharField(max_length=10, verbose_name='formato')),
+                ('file_path', models.CharField(max_length=500, verbose_name='arquivo')),
+                ('create_users', models.BooleanField(default=False, verbose_name='criar usuários ausentes')),
+                ('status', models.CharField(choices=[('PENDING', 'Pendente'), ('RUNNING', 'Em Execução'), ('COMPLETED', 'Concluído'), ('FAILED', 'Falhou')], default='PENDING', max_length=20, verbose_name='status')),
+                ('rows_processed', models.PositiveBigIntegerField(default=0, verbose_name='linhas processadas')),
+                ('rows_per_second', models.FloatField(blank=True, null=True, verbose_name='linhas por segundo')),
+                ('error', models.TextField(blank=True, default='', verbose_name='erro')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='iniciado em')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='finalizado em')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='criado em')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='import_jobs', to=settings.AUTH_USER_MODEL, verbose_name='criado por')),
+            ],
+            options={
+                'verbose_name': 'Importação',
+                'verbose_name_plural': 'Importações',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
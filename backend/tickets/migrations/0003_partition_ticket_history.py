@@ -0,0 +1,115 @@
+from datetime import date, datetime, timezone
+
+from django.db import migrations
+
+# Frozen copy of the DDL in `tickets.partitions` at the time of this
+# migration: a migration must not run live application code. Months past
+# MONTHS_AHEAD are created by `manage.py manage_partitions`.
+PARTITIONED_TABLES = ("tickets_ticketevent", "tickets_ticketmessage")
+PARTITION_KEY = "created_at"
+MONTHS_AHEAD = 3
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def bound(month):
+    return f"'{datetime(month.year, month.month, 1, tzinfo=timezone.utc).isoformat()}'"
+
+
+def is_partitioned(cursor, table):
+    cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [table])
+    return cursor.fetchone() is not None
+
+
+def rebuild(connection, table, partitioned):
+    """
+    Recreate `table` (partitioned or plain) with the same columns, foreign
+    keys and indexes, and copy its rows.
+    """
+    qn = connection.ops.quote_name
+    old = f"{table}_rebuild"
+    with connection.cursor() as cursor:
+        if is_partitioned(cursor, table) == partitioned:
+            return
+        cursor.execute(
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'f')",
+            [table],
+        )
+        constraints = cursor.fetchall()
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s",
+            [table],
+        )
+        constraint_names = {name for name, _, _ in constraints}
+        indexes = [(name, sql) for name, sql in cursor.fetchall() if name not in constraint_names]
+
+        # Free the constraint and index names for the new table.
+        cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(old)}")
+        for name, _, _ in constraints:
+            cursor.execute(f"ALTER TABLE {qn(old)} DROP CONSTRAINT {qn(name)}")
+        for name, _ in indexes:
+            cursor.execute(f"DROP INDEX {qn(name)}")
+
+        partition_by = f" PARTITION BY RANGE ({PARTITION_KEY})" if partitioned else ""
+        cursor.execute(
+            f"CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS){partition_by}"
+        )
+        for name, contype, definition in constraints:
+            if contype == "p":
+                columns = f"id, {PARTITION_KEY}" if partitioned else "id"
+                definition = f"PRIMARY KEY ({columns})"
+            cursor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}")
+        for _, sql in indexes:
+            cursor.execute(sql)
+
+        if partitioned:
+            # One partition per month (`<table>_pYYYYMM`, UTC bounds) plus a default one.
+            cursor.execute(f"CREATE TABLE {qn(f'{table}_default')} PARTITION OF {qn(table)} DEFAULT")
+            cursor.execute(f"SELECT MIN({PARTITION_KEY}) FROM {qn(old)}")
+            oldest = cursor.fetchone()[0]
+            this_month = month_start(datetime.now(timezone.utc))
+            month = min(this_month, month_start(oldest.astimezone(timezone.utc))) if oldest else this_month
+            while month <= add_months(this_month, MONTHS_AHEAD):
+                cursor.execute(
+                    f"CREATE TABLE {qn(f'{table}_p{month:%Y%m}')} PARTITION OF {qn(table)} "
+                    f"FOR VALUES FROM ({bound(month)}) TO ({bound(add_months(month, 1))})"
+                )
+                month = add_months(month, 1)
+
+        cursor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(old)}")
+        cursor.execute(f"DROP TABLE {qn(old)} CASCADE")
+
+
+def partition(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    for table in PARTITIONED_TABLES:
+        rebuild(connection, table, partitioned=True)
+
+
+def unpartition(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    for table in PARTITIONED_TABLES:
+        rebuild(connection, table, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0002_import_job'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.5 on 2026-10-19 08:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0003_partition_ticket_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTicket',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('created_by_id', models.UUIDField(db_index=True, verbose_name='criado por')),
+                ('status', models.CharField(choices=[('OPEN', 'Aberto'), ('IN_PROGRESS', 'Em Andamento'), ('WAITING_USER', 'Aguardando Usuário'), ('RESOLVED', 'Resolvido'), ('CANCELED', 'Cancelado')], max_length=20, verbose_name='status')),
+                ('created_at', models.DateTimeField(verbose_name='criado em')),
+                ('closed_at', models.DateTimeField(blank=True, null=True, verbose_name='fechado em')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='arquivado em')),
+                ('payload', models.BinaryField(verbose_name='conteúdo')),
+            ],
+            options={
+                'verbose_name': 'Chamado Arquivado',
+                'verbose_name_plural': 'Chamados Arquivados',
+                'ordering': ['-archived_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0004_archivedticket'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='priority_rank',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(priority='LOW', then=models.Value(1)), models.When(priority='MEDIUM', then=models.Value(2)), models.When(priority='HIGH', then=models.Value(3)), models.When(priority='CRITICAL', then=models.Value(4)), default=models.Value(0)), output_field=models.SmallIntegerField(), verbose_name='ordem da prioridade'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='status_rank',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(status='OPEN', then=models.Value(1)), models.When(status='IN_PROGRESS', then=models.Value(2)), models.When(status='WAITING_USER', then=models.Value(3)), models.When(status='RESOLVED', then=models.Value(4)), models.When(status='CANCELED', then=models.Value(5)), default=models.Value(0)), output_field=models.SmallIntegerField(), verbose_name='ordem do status'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['-priority_rank', 'created_at'], name='idx_ticket_priority_queue'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['status', '-priority_rank', 'created_at'], name='idx_ticket_status_priority'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['status_rank', 'created_at'], name='idx_ticket_status_rank'),
+        ),
+    ]
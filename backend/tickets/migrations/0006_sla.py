@@ -0,0 +1,108 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Default targets (minutes) per priority; editable in the admin.
+DEFAULT_POLICIES = {
+    "CRITICAL": (30, 240),
+    "HIGH": (120, 1440),
+    "MEDIUM": (480, 4320),
+    "LOW": (1440, 10080),
+}
+
+
+def create_default_policies(apps, schema_editor):
+    SlaPolicy = apps.get_model("tickets", "SlaPolicy")
+    for priority, (first_response, resolution) in DEFAULT_POLICIES.items():
+        SlaPolicy.objects.get_or_create(
+            priority=priority,
+            category="",
+            defaults={"first_response_minutes": first_response, "resolution_minutes": resolution},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0005_ticket_rank_columns'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlaPolicy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('priority', models.CharField(choices=[('LOW', 'Baixa'), ('MEDIUM', 'Média'), ('HIGH', 'Alta'), ('CRITICAL', 'Crítica')], max_length=20, verbose_name='prioridade')),
+                ('category', models.CharField(blank=True, choices=[('GENERAL', 'Geral'), ('TECHNICAL', 'Técnico'), ('BILLING', 'Financeiro'), ('ACCESS', 'Acesso'), ('BUG', 'Bug / Erro'), ('FEATURE', 'Solicitação de Feature'), ('OTHER', 'Outro')], default='', help_text='Vazio: vale para todas as categorias.', max_length=20, verbose_name='categoria')),
+                ('first_response_minutes', models.PositiveIntegerField(verbose_name='primeira resposta (min)')),
+                ('resolution_minutes', models.PositiveIntegerField(verbose_name='resolução (min)')),
+            ],
+            options={
+                'verbose_name': 'Política de SLA',
+                'verbose_name_plural': 'Políticas de SLA',
+                'ordering': ['priority', 'category'],
+            },
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='first_response_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='primeira resposta em'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='first_response_breached_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='primeira resposta violada em'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='first_response_due_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='prazo da primeira resposta'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='resolution_breached_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='resolução violada em'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='resolution_due_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='prazo de resolução'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='sla_paused_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='SLA pausado em'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='sla_paused_seconds',
+            field=models.PositiveIntegerField(default=0, verbose_name='tempo pausado (s)'),
+        ),
+        migrations.AlterField(
+            model_name='ticketevent',
+            name='event_type',
+            field=models.CharField(choices=[('CREATED', 'Chamado Criado'), ('STATUS_CHANGED', 'Status Alterado'), ('ASSIGNED', 'Responsável Atribuído'), ('UNASSIGNED', 'Responsável Removido'), ('PRIORITY_CHANGED', 'Prioridade Alterada'), ('CANCELED', 'Chamado Cancelado'), ('RESOLVED', 'Chamado Resolvido'), ('REOPENED', 'Chamado Reaberto'), ('MESSAGE_ADDED', 'Mensagem Adicionada'), ('SLA_BREACHED', 'SLA Violado')], db_index=True, max_length=30, verbose_name='tipo do evento'),
+        ),
+        migrations.AlterField(
+            model_name='ticketevent',
+            name='triggered_by',
+            field=models.ForeignKey(blank=True, help_text='Vazio em eventos do sistema (ex.: violação de SLA).', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='ticket_events_triggered', to=settings.AUTH_USER_MODEL, verbose_name='disparado por'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(condition=models.Q(('first_response_at__isnull', True), ('first_response_breached_at__isnull', True), ('status__in', ['OPEN', 'IN_PROGRESS'])), fields=['first_response_due_at'], name='idx_ticket_sla_first_response'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(condition=models.Q(('resolution_breached_at__isnull', True), ('status__in', ['OPEN', 'IN_PROGRESS'])), fields=['resolution_due_at'], name='idx_ticket_sla_resolution'),
+        ),
+        migrations.AddConstraint(
+            model_name='slapolicy',
+            constraint=models.UniqueConstraint(fields=('priority', 'category'), name='uniq_sla_policy_scope'),
+        ),
+        migrations.RunPython(create_default_policies, migrations.RunPython.noop),
+    ]
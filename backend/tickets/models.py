@@ -5,6 +5,9 @@ Models:
 - Ticket: Chamado principal
 - TicketMessage: Histórico de mensagens / conversa
 - TicketEvent: Auditoria imutável de eventos
+- ImportJob: Importação em lote (migração de helpdesk legado)
+- ArchivedTicket: Chamados fechados movidos para armazenamento frio
+- SlaPolicy: Prazos de SLA por prioridade / categoria
 """
 
 import uuid
@@ -56,6 +59,49 @@ class TicketEventType(models.TextChoices):
     RESOLVED = "RESOLVED", "Chamado Resolvido"
     REOPENED = "REOPENED", "Chamado Reaberto"
     MESSAGE_ADDED = "MESSAGE_ADDED", "Mensagem Adicionada"
+    SLA_BREACHED = "SLA_BREACHED", "SLA Violado"
+
+
+class SlaKind(models.TextChoices):
+    """Prazos de SLA de um chamado."""
+    FIRST_RESPONSE = "FIRST_RESPONSE", "Primeira Resposta"
+    RESOLUTION = "RESOLUTION", "Resolução"
+
+
+class ImportJobStatus(models.TextChoices):
+    """Estados de um job de importação em lote."""
+    PENDING = "PENDING", "Pendente"
+    RUNNING = "RUNNING", "Em Execução"
+    COMPLETED = "COMPLETED", "Concluído"
+    FAILED = "FAILED", "Falhou"
+
+
+# Ordem de negócio para ordenação no banco (colunas geradas *_rank).
+PRIORITY_RANKS = {
+    TicketPriority.LOW: 1,
+    TicketPriority.MEDIUM: 2,
+    TicketPriority.HIGH: 3,
+    TicketPriority.CRITICAL: 4,
+}
+STATUS_RANKS = {
+    TicketStatus.OPEN: 1,
+    TicketStatus.IN_PROGRESS: 2,
+    TicketStatus.WAITING_USER: 3,
+    TicketStatus.RESOLVED: 4,
+    TicketStatus.CANCELED: 5,
+}
+
+
+def _rank_field(verbose_name, field, ranks):
+    return models.GeneratedField(
+        verbose_name=verbose_name,
+        expression=models.Case(
+            *(models.When(**{field: value}, then=models.Value(rank)) for value, rank in ranks.items()),
+            default=models.Value(0),
+        ),
+        output_field=models.SmallIntegerField(),
+        db_persist=True,
+    )
 
 
 # =============================================================================
@@ -72,6 +118,10 @@ class Ticket(models.Model):
     - Cancelamento só se status == OPEN
     - Ao resolver, preenche closed_at
     - Ao cancelar, preenche canceled_at
+    - priority_rank / status_rank: colunas geradas pelo banco para ordenar
+      por severidade / fluxo (as choices são texto)
+    - prazos de SLA calculados na criação (`tickets.sla`), pausados em
+      WAITING_USER; violações marcadas pelo scanner periódico
     """
 
     id = models.UUIDField(
@@ -120,6 +170,17 @@ class Ticket(models.Model):
     closed_at = models.DateTimeField("fechado em", null=True, blank=True)
     created_at = models.DateTimeField("criado em", auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField("atualizado em", auto_now=True)
+    priority_rank = _rank_field("ordem da prioridade", "priority", PRIORITY_RANKS)
+    status_rank = _rank_field("ordem do status", "status", STATUS_RANKS)
+
+    # SLA
+    first_response_at = models.DateTimeField("primeira resposta em", null=True, blank=True)
+    first_response_due_at = models.DateTimeField("prazo da primeira resposta", null=True, blank=True)
+    resolution_due_at = models.DateTimeField("prazo de resolução", null=True, blank=True)
+    first_response_breached_at = models.DateTimeField("primeira resposta violada em", null=True, blank=True)
+    resolution_breached_at = models.DateTimeField("resolução violada em", null=True, blank=True)
+    sla_paused_at = models.DateTimeField("SLA pausado em", null=True, blank=True)
+    sla_paused_seconds = models.PositiveIntegerField("tempo pausado (s)", default=0)
 
     class Meta:
         verbose_name = "Chamado"
@@ -138,6 +199,39 @@ class Ticket(models.Model):
                 fields=["created_by", "status"],
                 name="idx_ticket_owner_status",
             ),
+            # Fila: mais severos primeiro, depois os mais antigos.
+            models.Index(
+                fields=["-priority_rank", "created_at"],
+                name="idx_ticket_priority_queue",
+            ),
+            models.Index(
+                fields=["status", "-priority_rank", "created_at"],
+                name="idx_ticket_status_priority",
+            ),
+            models.Index(
+                fields=["status_rank", "created_at"],
+                name="idx_ticket_status_rank",
+            ),
+            # Tickets alterados desde o último refresh dos rollups (analytics.rollups).
+            models.Index(fields=["updated_at"], name="idx_ticket_updated"),
+            # Scanner de SLA: só chamados ativos ainda não violados.
+            models.Index(
+                fields=["first_response_due_at"],
+                name="idx_ticket_sla_first_response",
+                condition=models.Q(
+                    status__in=[TicketStatus.OPEN, TicketStatus.IN_PROGRESS],
+                    first_response_at__isnull=True,
+                    first_response_breached_at__isnull=True,
+                ),
+            ),
+            models.Index(
+                fields=["resolution_due_at"],
+                name="idx_ticket_sla_resolution",
+                condition=models.Q(
+                    status__in=[TicketStatus.OPEN, TicketStatus.IN_PROGRESS],
+                    resolution_breached_at__isnull=True,
+                ),
+            ),
         ]
 
     def __str__(self):
@@ -210,6 +304,7 @@ class TicketEvent(models.Model):
     - Atribuição de responsável
     - Cancelamento / resolução
     - Adição de mensagem
+    - Violação de SLA (sem triggered_by)
 
     Usado para: dashboards, SLA, compliance, timeline.
     """
@@ -248,6 +343,9 @@ class TicketEvent(models.Model):
         on_delete=models.PROTECT,
         related_name="ticket_events_triggered",
         verbose_name="disparado por",
+        null=True,
+        blank=True,
+        help_text="Vazio em eventos do sistema (ex.: violação de SLA).",
     )
     created_at = models.DateTimeField("criado em", auto_now_add=True, db_index=True)
 
@@ -258,3 +356,112 @@ class TicketEvent(models.Model):
 
     def __str__(self):
         return f"{self.get_event_type_display()} — {self.ticket_id}"
+
+
+class ImportJob(models.Model):
+    """
+    Job de importação em lote de tickets ou mensagens (CSV / NDJSON).
+
+    - rows_processed funciona como checkpoint: é atualizado na mesma
+      transação de cada lote, permitindo retomar após falha
+    - notificações não são disparadas (bulk_create ignora o service layer)
+    """
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+    )
+    resource = models.CharField("recurso", max_length=20)
+    input_format = models.CharField("formato", max_length=10)
+    file_path = models.CharField("arquivo", max_length=500)
+    create_users = models.BooleanField("criar usuários ausentes", default=False)
+    status = models.CharField(
+        "status",
+        max_length=20,
+        choices=ImportJobStatus.choices,
+        default=ImportJobStatus.PENDING,
+    )
+    rows_processed = models.PositiveBigIntegerField("linhas processadas", default=0)
+    rows_per_second = models.FloatField("linhas por segundo", null=True, blank=True)
+    error = models.TextField("erro", blank=True, default="")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="import_jobs",
+        verbose_name="criado por",
+        null=True,
+        blank=True,
+    )
+    started_at = models.DateTimeField("iniciado em", null=True, blank=True)
+    finished_at = models.DateTimeField("finalizado em", null=True, blank=True)
+    created_at = models.DateTimeField("criado em", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Importação"
+        verbose_name_plural = "Importações"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"[{self.get_status_display()}] {self.resource} ({self.rows_processed} linhas)"
+
+
+class ArchivedTicket(models.Model):
+    """
+    Chamado fechado arquivado (`tickets.archive`).
+
+    - payload: NDJSON comprimido (zlib) com o ticket, mensagens e eventos na
+      representação da API no momento do arquivamento
+    - sem FKs: usuários podem ser removidos depois do arquivamento
+    - imutável
+    """
+
+    id = models.UUIDField(primary_key=True, editable=False)
+    created_by_id = models.UUIDField("criado por", db_index=True)
+    status = models.CharField("status", max_length=20, choices=TicketStatus.choices)
+    created_at = models.DateTimeField("criado em")
+    closed_at = models.DateTimeField("fechado em", null=True, blank=True)
+    archived_at = models.DateTimeField("arquivado em", auto_now_add=True, db_index=True)
+    payload = models.BinaryField("conteúdo")
+
+    class Meta:
+        verbose_name = "Chamado Arquivado"
+        verbose_name_plural = "Chamados Arquivados"
+        ordering = ["-archived_at"]
+
+    def __str__(self):
+        return f"[{self.get_status_display()}] {self.id}"
+
+
+class SlaPolicy(models.Model):
+    """
+    Prazos de SLA em minutos.
+
+    - por prioridade (category vazia) ou prioridade + categoria; a regra
+      mais específica vence
+    - lidos do cache em dois níveis (`tickets.sla`)
+    """
+
+    priority = models.CharField("prioridade", max_length=20, choices=TicketPriority.choices)
+    category = models.CharField(
+        "categoria",
+        max_length=20,
+        choices=TicketCategory.choices,
+        blank=True,
+        default="",
+        help_text="Vazio: vale para todas as categorias.",
+    )
+    first_response_minutes = models.PositiveIntegerField("primeira resposta (min)")
+    resolution_minutes = models.PositiveIntegerField("resolução (min)")
+
+    class Meta:
+        verbose_name = "Política de SLA"
+        verbose_name_plural = "Políticas de SLA"
+        ordering = ["priority", "category"]
+        constraints = [
+            models.UniqueConstraint(fields=["priority", "category"], name="uniq_sla_policy_scope"),
+        ]
+
+    def __str__(self):
+        scope = self.category or "*"
+        return f"{self.priority}/{scope}: {self.first_response_minutes}/{self.resolution_minutes} min"
@@ -0,0 +1,125 @@
+"""
+Monthly range partitioning of the ticket history tables (PostgreSQL only).
+
+`tickets_ticketevent` and `tickets_ticketmessage` are partitioned by
+`created_at`: one partition per month (`<table>_pYYYYMM`, UTC bounds) plus a
+`<table>_default` partition catching rows of months not created yet, so
+inserts never fail. PostgreSQL requires the partition key in unique
+constraints, so the database primary key is `(id, created_at)`; the models
+keep `id` as primary key (random UUIDs, unique in practice).
+
+Queries bounded on `created_at` only scan the matching months. Old months
+are removed with `DETACH PARTITION` (a catalog change) instead of a long
+`DELETE`; the detached table keeps its name and can be archived or dropped.
+"""
+
+import re
+from datetime import date, datetime, timezone
+
+PARTITIONED_TABLES = ("tickets_ticketevent", "tickets_ticketmessage")
+PARTITION_KEY = "created_at"
+
+_PARTITION_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y%m}"
+
+
+def default_partition_name(table):
+    return f"{table}_default"
+
+
+def partition_month(table, name):
+    """Month of a partition named by `partition_name`, else None."""
+    match = _PARTITION_SUFFIX.search(name)
+    if not name.startswith(f"{table}_p") or not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def _bound(month):
+    return f"'{datetime(month.year, month.month, 1, tzinfo=timezone.utc).isoformat()}'"
+
+
+def is_partitioned(connection, table):
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [table])
+        return cursor.fetchone() is not None
+
+
+def list_partitions(connection, table):
+    """`(name, month, estimated_rows)` of the attached partitions; month is None for the default one."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname, GREATEST(child.reltuples, 0)::bigint
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(%s)
+            ORDER BY child.relname
+            """,
+            [table],
+        )
+        return [(name, partition_month(table, name), rows) for name, rows in cursor.fetchall()]
+
+
+def create_partition(connection, table, month):
+    """
+    Create and attach the partition of `month` if missing. Rows of that month
+    already sitting in the default partition are moved into it. Returns
+    whether a partition was created.
+    """
+    qn = connection.ops.quote_name
+    name = partition_name(table, month)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+        if cursor.fetchone()[0]:
+            return False
+        start, end = _bound(month), _bound(add_months(month, 1))
+        cursor.execute(f"CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {qn(default_partition_name(table))} "
+            f"WHERE {PARTITION_KEY} >= {start} AND {PARTITION_KEY} < {end} RETURNING *) "
+            f"INSERT INTO {qn(name)} SELECT * FROM moved"
+        )
+        cursor.execute(f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} FOR VALUES FROM ({start}) TO ({end})")
+    return True
+
+
+def ensure_partitions(connection, table, first_month, last_month):
+    """Create the missing partitions from `first_month` to `last_month` (inclusive)."""
+    created = []
+    month = month_start(first_month)
+    while month <= last_month:
+        if create_partition(connection, table, month):
+            created.append(partition_name(table, month))
+        month = add_months(month, 1)
+    return created
+
+
+def oldest_default_row(connection, table):
+    """`created_at` of the oldest row sitting in the default partition."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN({PARTITION_KEY}) FROM {connection.ops.quote_name(default_partition_name(table))}")
+        return cursor.fetchone()[0]
+
+
+def detach_partition(connection, table, name, drop=False):
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}")
+        if drop:
+            cursor.execute(f"DROP TABLE {qn(name)}")
+
@@ -2,12 +2,17 @@
 Serializers for ticket API.
 """
 
+from uuid import UUID
+
 from rest_framework import serializers
 
 from core.models import User, UserRole
 from core.serializers import UserMinimalSerializer
+from core.user_cache import active_assignee_ids, get_cached_user
 
+from .imports import IMPORT_FORMATS, IMPORT_RESOURCES
 from .models import (
+    ImportJob,
     Ticket,
     TicketEvent,
     TicketMessage,
@@ -15,6 +20,15 @@ from .models import (
 )
 
 
+SLA_FIELDS = (
+    "first_response_at",
+    "first_response_due_at",
+    "resolution_due_at",
+    "first_response_breached_at",
+    "resolution_breached_at",
+)
+
+
 class TicketSerializer(serializers.ModelSerializer):
     created_by = UserMinimalSerializer(read_only=True)
     assigned_to = UserMinimalSerializer(read_only=True)
@@ -34,6 +48,7 @@ class TicketSerializer(serializers.ModelSerializer):
             "closed_at",
             "created_at",
             "updated_at",
+            *SLA_FIELDS,
         )
         read_only_fields = (
             "id",
@@ -44,6 +59,7 @@ class TicketSerializer(serializers.ModelSerializer):
             "closed_at",
             "created_at",
             "updated_at",
+            *SLA_FIELDS,
         )
 
 
@@ -117,8 +133,25 @@ class TicketMessageCreateSerializer(serializers.ModelSerializer):
         return ticket
 
 
+class AssigneeField(serializers.PrimaryKeyRelatedField):
+    """
+    Active moderator/admin by id, checked against the cached assignee set
+    (`core.user_cache`) instead of a query per assignment.
+    """
+
+    def to_internal_value(self, data):
+        try:
+            user_id = str(UUID(str(data)))
+        except (TypeError, ValueError, AttributeError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        user = get_cached_user(user_id) if user_id in active_assignee_ids() else None
+        if user is None:
+            self.fail("does_not_exist", pk_value=data)
+        return user
+
+
 class TicketAssignSerializer(serializers.Serializer):
-    assigned_to = serializers.PrimaryKeyRelatedField(
+    assigned_to = AssigneeField(
         queryset=User.objects.filter(
             role__in=(UserRole.MODERATOR, UserRole.ADMIN),
             is_active=True,
@@ -130,3 +163,39 @@ class TicketAssignSerializer(serializers.Serializer):
 
 class TicketStatusChangeSerializer(serializers.Serializer):
     status = serializers.ChoiceField(choices=TicketStatus.choices)
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImportJob
+        fields = (
+            "id",
+            "resource",
+            "input_format",
+            "create_users",
+            "status",
+            "rows_processed",
+            "rows_per_second",
+            "error",
+            "started_at",
+            "finished_at",
+            "created_at",
+        )
+        read_only_fields = fields
+
+
+class ImportJobCreateSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    resource = serializers.ChoiceField(choices=IMPORT_RESOURCES)
+    input_format = serializers.ChoiceField(choices=IMPORT_FORMATS, required=False)
+    create_users = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if not attrs.get("input_format"):
+            extension = attrs["file"].name.rsplit(".", 1)[-1].lower()
+            if extension not in IMPORT_FORMATS:
+                raise serializers.ValidationError(
+                    {"input_format": "Informe o formato (csv ou ndjson)."}
+                )
+            attrs["input_format"] = extension
+        return attrs
@@ -7,12 +7,21 @@ import logging
 from django.db import transaction
 from django.utils import timezone
 
+from core.cache_versions import bump_cache_version
 from notifications.tasks import send_ticket_email_task
 
 from .models import Ticket, TicketEvent, TicketEventType, TicketMessage, TicketStatus
+from .sla import apply_sla, is_first_response, track_status_change
 
 logger = logging.getLogger("helpdesk")
 
+# Cache namespace bumped on every ticket mutation (analytics ETags, caches).
+TICKETS_CACHE_NAMESPACE = "tickets"
+
+
+def invalidate_ticket_caches():
+    transaction.on_commit(lambda: bump_cache_version(TICKETS_CACHE_NAMESPACE))
+
 
 def _enqueue_ticket_email(*, ticket, subject, message, recipients):
     recipients = sorted({email for email in recipients if email})
@@ -34,7 +43,7 @@ def _enqueue_ticket_email(*, ticket, subject, message, recipients):
 
 @transaction.atomic
 def create_ticket(*, user, title, description, priority, category):
-    ticket = Ticket.objects.create(
+    ticket = Ticket(
         title=title,
         description=description,
         priority=priority,
@@ -42,6 +51,8 @@ def create_ticket(*, user, title, description, priority, category):
         created_by=user,
         status=TicketStatus.OPEN,
     )
+    apply_sla(ticket, start=timezone.now())
+    ticket.save(force_insert=True)
     TicketEvent.objects.create(
         ticket=ticket,
         event_type=TicketEventType.CREATED,
@@ -49,6 +60,7 @@ def create_ticket(*, user, title, description, priority, category):
         to_value=TicketStatus.OPEN,
         triggered_by=user,
     )
+    invalidate_ticket_caches()
     _enqueue_ticket_email(
         ticket=ticket,
         subject=f"[HelpDesk] Novo chamado aberto: {ticket.title}",
@@ -85,6 +97,7 @@ def assign_ticket(*, ticket, assigned_to, triggered_by):
         to_value=to_value,
         triggered_by=triggered_by,
     )
+    invalidate_ticket_caches()
     _enqueue_ticket_email(
         ticket=ticket,
         subject=f"[HelpDesk] Chamado atualizado: atribuicao ({ticket.title})",
@@ -121,7 +134,8 @@ def change_status(*, ticket, new_status, triggered_by):
     elif previous == TicketStatus.RESOLVED and new_status != TicketStatus.RESOLVED:
         ticket.closed_at = None
 
-    ticket.save(update_fields=["status", "closed_at", "updated_at"])
+    sla_fields = track_status_change(ticket, previous, timezone.now())
+    ticket.save(update_fields=["status", "closed_at", "updated_at", *sla_fields])
 
     if new_status == TicketStatus.RESOLVED:
         event_type = TicketEventType.RESOLVED
@@ -137,6 +151,7 @@ def change_status(*, ticket, new_status, triggered_by):
         to_value=new_status,
         triggered_by=triggered_by,
     )
+    invalidate_ticket_caches()
     _enqueue_ticket_email(
         ticket=ticket,
         subject=f"[HelpDesk] Chamado atualizado: status ({ticket.title})",
@@ -169,6 +184,7 @@ def cancel_ticket(*, ticket, triggered_by):
         to_value=TicketStatus.CANCELED,
         triggered_by=triggered_by,
     )
+    invalidate_ticket_caches()
     _enqueue_ticket_email(
         ticket=ticket,
         subject=f"[HelpDesk] Chamado cancelado: {ticket.title}",
@@ -189,6 +205,12 @@ def add_message(*, ticket, author, message, is_internal=False):
         message=message,
         is_internal=is_internal,
     )
+    if is_first_response(ticket, msg):
+        # Stops the first response SLA clock.
+        ticket.first_response_at = ticket.updated_at = msg.created_at
+        Ticket.objects.filter(id=ticket.id, first_response_at__isnull=True).update(
+            first_response_at=msg.created_at, updated_at=msg.created_at
+        )
 
     TicketEvent.objects.create(
         ticket=ticket,
@@ -197,6 +219,7 @@ def add_message(*, ticket, author, message, is_internal=False):
         to_value="INTERNAL" if is_internal else "PUBLIC",
         triggered_by=author,
     )
+    invalidate_ticket_caches()
     _enqueue_ticket_email(
         ticket=ticket,
         subject=f"[HelpDesk] Nova mensagem no chamado: {ticket.title}",
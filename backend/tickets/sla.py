@@ -0,0 +1,261 @@
+"""
+SLA deadlines and breach scanning.
+
+`SlaPolicy` rows give the first response / resolution targets per priority
+(optionally per category). `apply_sla` sets the deadlines when a ticket is
+created or its priority/category changes; time spent in WAITING_USER pushes
+them back (`pause_sla` / `resume_sla`). The first public message of a
+moderator/admin stops the first response clock. SLA time is business time
+(`core.business_calendar`) unless `SLA_BUSINESS_HOURS` is off.
+
+`scan_breaches` runs periodically (Celery beat). It reads only tickets past
+a deadline, through partial indexes on active tickets not yet breached, so
+its cost follows the number of breaches, not the number of open tickets.
+Each breach is marked on the ticket, recorded as a `SLA_BREACHED` event
+(without `triggered_by`) and notified to the assignee, or to
+`SLA_ALERT_EMAILS` when unassigned.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min, OuterRef, Subquery
+from django.utils import timezone
+
+from core.business_calendar import add_business_seconds, business_seconds
+from core.metrics import SLA_BREACHES
+from core.models import UserRole
+from core.tiered_cache import TieredCache
+from notifications.tasks import send_ticket_email_task
+
+from .models import SlaKind, SlaPolicy, Ticket, TicketEvent, TicketEventType, TicketMessage, TicketStatus
+
+logger = logging.getLogger("helpdesk")
+
+SLA_ACTIVE_STATUSES = (TicketStatus.OPEN, TicketStatus.IN_PROGRESS)
+SLA_DEADLINE_FIELDS = ("first_response_due_at", "resolution_due_at")
+SLA_PAUSE_FIELDS = ("first_response_due_at", "resolution_due_at", "sla_paused_at", "sla_paused_seconds")
+
+_BREACH_FIELDS = {
+    SlaKind.FIRST_RESPONSE: ("first_response_due_at", "first_response_breached_at"),
+    SlaKind.RESOLUTION: ("resolution_due_at", "resolution_breached_at"),
+}
+
+POLICIES_KEY = "all"
+policies = TieredCache("sla-policies")
+
+
+def _load_policies():
+    return {
+        (policy.priority, policy.category): (policy.first_response_minutes, policy.resolution_minutes)
+        for policy in SlaPolicy.objects.all()
+    }
+
+
+def get_policy(priority, category):
+    """`(first_response_minutes, resolution_minutes)`, or None without a policy."""
+    rules = policies.get_or_load(POLICIES_KEY, _load_policies)
+    return rules.get((priority, category)) or rules.get((priority, ""))
+
+
+def on_policy_changed(sender, instance, **kwargs):
+    """post_save / post_delete receiver for `SlaPolicy`."""
+    policies.invalidate(POLICIES_KEY)
+    transaction.on_commit(lambda: policies.invalidate(POLICIES_KEY))
+
+
+def add_sla_time(start, seconds):
+    """Instant `seconds` of SLA time after `start`."""
+    if settings.SLA_BUSINESS_HOURS:
+        return add_business_seconds(start, seconds)
+    return start + timedelta(seconds=seconds)
+
+
+def sla_seconds(start, end):
+    """SLA time between two instants."""
+    if settings.SLA_BUSINESS_HOURS:
+        return business_seconds(start, end)
+    return max((end - start).total_seconds(), 0)
+
+
+def apply_sla(ticket, start=None):
+    """Set the deadlines of `ticket` from its policy (not saved)."""
+    policy = get_policy(ticket.priority, ticket.category)
+    if policy is None:
+        ticket.first_response_due_at = ticket.resolution_due_at = None
+        return
+    start = start or ticket.created_at
+    first_response_minutes, resolution_minutes = policy
+    ticket.first_response_due_at = add_sla_time(start, first_response_minutes * 60 + ticket.sla_paused_seconds)
+    ticket.resolution_due_at = add_sla_time(start, resolution_minutes * 60 + ticket.sla_paused_seconds)
+
+
+def refresh_sla(ticket):
+    """Recompute and save the deadlines (priority or category changed)."""
+    apply_sla(ticket)
+    ticket.save(update_fields=SLA_DEADLINE_FIELDS)
+
+
+def pause_sla(ticket, now):
+    if ticket.sla_paused_at is None:
+        ticket.sla_paused_at = now
+
+
+def resume_sla(ticket, now):
+    """Push the pending deadlines back by the SLA time spent paused."""
+    if ticket.sla_paused_at is None:
+        return
+    paused = int(sla_seconds(ticket.sla_paused_at, now))
+    ticket.sla_paused_seconds += paused
+    if ticket.first_response_due_at and ticket.first_response_at is None:
+        ticket.first_response_due_at = add_sla_time(ticket.first_response_due_at, paused)
+    if ticket.resolution_due_at:
+        ticket.resolution_due_at = add_sla_time(ticket.resolution_due_at, paused)
+    ticket.sla_paused_at = None
+
+
+def track_status_change(ticket, previous, now):
+    """Pause / resume on WAITING_USER. Returns the fields to save."""
+    if ticket.status == TicketStatus.WAITING_USER:
+        pause_sla(ticket, now)
+    elif previous == TicketStatus.WAITING_USER:
+        resume_sla(ticket, now)
+    return SLA_PAUSE_FIELDS
+
+
+def is_first_response(ticket, message):
+    return (
+        ticket.first_response_at is None
+        and not message.is_internal
+        and message.author.is_moderator_or_admin
+    )
+
+
+def first_staff_response():
+    """Subquery: `created_at` of the ticket's first public moderator/admin message."""
+    return Subquery(
+        TicketMessage.objects.filter(
+            ticket_id=OuterRef("pk"),
+            is_internal=False,
+            author__role__in=(UserRole.MODERATOR, UserRole.ADMIN),
+        )
+        .values("ticket_id")
+        .annotate(first=Min("created_at"))
+        .values("first")
+    )
+
+
+def breach_candidates(kind, now):
+    """Active tickets past the `kind` deadline and not yet marked (partial index)."""
+    due_field, breached_field = _BREACH_FIELDS[kind]
+    qs = Ticket.objects.filter(
+        status__in=SLA_ACTIVE_STATUSES,
+        **{f"{breached_field}__isnull": True, f"{due_field}__lte": now},
+    )
+    if kind == SlaKind.FIRST_RESPONSE:
+        qs = qs.filter(first_response_at__isnull=True)
+    return qs.order_by(due_field)
+
+
+def _notify(kind, tickets):
+    by_recipient = defaultdict(list)
+    for ticket in tickets:
+        recipients = [ticket.assigned_to.email] if ticket.assigned_to else settings.SLA_ALERT_EMAILS
+        for email in recipients:
+            by_recipient[email].append(ticket)
+    label = SlaKind(kind).label
+
+    def _send():
+        for email, items in by_recipient.items():
+            try:
+                send_ticket_email_task.delay(
+                    subject=f"[HelpDesk] SLA violado ({label}): {len(items)} chamado(s)",
+                    message="\n".join(f"{ticket.id} [{ticket.priority}] {ticket.title}" for ticket in items),
+                    recipient_list=[email],
+                )
+            except Exception as exc:
+                logger.warning(f"Falha ao enfileirar alerta de SLA para {email}: {exc}")
+
+    transaction.on_commit(_send)
+
+
+@transaction.atomic
+def _mark_batch(kind, now, batch_size):
+    due_field, breached_field = _BREACH_FIELDS[kind]
+    tickets = list(
+        breach_candidates(kind, now)
+        .select_related("assigned_to")
+        .select_for_update(skip_locked=True, of=("self",))[:batch_size]
+    )
+    if not tickets:
+        return 0
+
+    # updated_at drives the ticket detail ETag / Last-Modified (`now` may be a past or future scan instant).
+    Ticket.objects.filter(id__in=[ticket.id for ticket in tickets]).update(
+        **{breached_field: now}, updated_at=timezone.now()
+    )
+    TicketEvent.objects.bulk_create(
+        TicketEvent(
+            ticket=ticket,
+            event_type=TicketEventType.SLA_BREACHED,
+            from_value=getattr(ticket, due_field).isoformat(),
+            to_value=kind,
+        )
+        for ticket in tickets
+    )
+    SLA_BREACHES.labels(kind).inc(len(tickets))
+    _notify(kind, tickets)
+
+    from .services import invalidate_ticket_caches  # services imports this module
+
+    invalidate_ticket_caches()
+    return len(tickets)
+
+
+def scan_breaches(now=None, batch_size=None):
+    """Mark every deadline missed by `now`. Returns `{kind: breaches}`."""
+    now = now or timezone.now()
+    batch_size = batch_size or settings.SLA_SCAN_BATCH_SIZE
+    found = dict.fromkeys(SlaKind.values, 0)
+    for kind in SlaKind.values:
+        while True:
+            marked = _mark_batch(kind, now, batch_size)
+            found[kind] += marked
+            # Fewer rows than asked: done, or the rest is locked by another scan.
+            if marked < batch_size:
+                break
+    if any(found.values()):
+        logger.warning(f"SLA violado: {found}")
+    return found
+
+
+def backfill_deadlines(batch_size=None):
+    """
+    Set the deadlines of unresolved tickets created without them (before
+    the policies existed). Their `first_response_at` is taken from the first
+    public staff message.
+    """
+    pending = Ticket.objects.filter(
+        status__in=(*SLA_ACTIVE_STATUSES, TicketStatus.WAITING_USER),
+        resolution_due_at__isnull=True,
+    )
+    now = timezone.now()
+    pending.filter(first_response_at__isnull=True).update(first_response_at=first_staff_response(), updated_at=now)
+
+    batch_size = batch_size or settings.SLA_SCAN_BATCH_SIZE
+    tickets = pending.only("id", "priority", "category", "created_at", "sla_paused_seconds").order_by("id")
+    updated, batch = 0, []
+    for ticket in tickets.iterator(chunk_size=batch_size):
+        apply_sla(ticket)
+        if ticket.resolution_due_at is not None:
+            ticket.updated_at = now
+            batch.append(ticket)
+        if len(batch) >= batch_size:
+            updated += Ticket.objects.bulk_update(batch, (*SLA_DEADLINE_FIELDS, "updated_at"))
+            batch = []
+    if batch:
+        updated += Ticket.objects.bulk_update(batch, (*SLA_DEADLINE_FIELDS, "updated_at"))
+    return updated
@@ -0,0 +1,26 @@
+"""
+Asynchronous ticket tasks.
+"""
+
+from celery import shared_task
+
+from .imports import run_import
+from .models import ImportJob
+from .sla import scan_breaches
+
+
+@shared_task(ignore_result=True)
+def run_import_job_task(job_id: str):
+    """
+    Run or resume a bulk import job in a worker process.
+    """
+    job = ImportJob.objects.get(id=job_id)
+    run_import(job)
+
+
+@shared_task(ignore_result=True)
+def scan_sla_breaches_task():
+    """
+    Periodic (Celery beat): mark, record and notify missed SLA deadlines.
+    """
+    scan_breaches()
@@ -0,0 +1,122 @@
+import io
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analytics.models import TicketDailyRollup
+from core.models import User, UserRole
+from tickets.archive import archive_closed_tickets
+from tickets.models import ArchivedTicket, Ticket, TicketEvent, TicketMessage, TicketStatus
+from tickets.services import add_message, change_status, create_ticket
+
+
+class TicketArchiveTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@example.com", password="StrongPass123!")
+        self.other = User.objects.create_user(email="other@example.com", password="StrongPass123!")
+        self.moderator = User.objects.create_user(
+            email="moderator@example.com",
+            password="StrongPass123!",
+            role=UserRole.MODERATOR,
+        )
+        self.ticket = create_ticket(
+            user=self.user,
+            title="Chamado antigo",
+            description="Descricao",
+            priority="HIGH",
+            category="BILLING",
+        )
+        add_message(ticket=self.ticket, author=self.moderator, message="Resposta")
+        add_message(ticket=self.ticket, author=self.moderator, message="Nota", is_internal=True)
+        change_status(ticket=self.ticket, new_status=TicketStatus.RESOLVED, triggered_by=self.moderator)
+        self.open_ticket = create_ticket(
+            user=self.user,
+            title="Chamado aberto",
+            description="Descricao",
+            priority="LOW",
+            category="GENERAL",
+        )
+        Ticket.objects.update(updated_at=timezone.now() - timedelta(days=400))
+
+    def test_moves_closed_tickets_to_archive_and_rollups(self):
+        self.client.force_authenticate(user=self.moderator)
+        average_urls = [reverse("analytics:average-response-time"), reverse("analytics:average-resolution-time")]
+        averages = [self.client.get(url).data for url in average_urls]
+        self.assertEqual(archive_closed_tickets(days=365, batch_size=10), 1)
+
+        self.assertFalse(Ticket.objects.filter(id=self.ticket.id).exists())
+        self.assertFalse(TicketMessage.objects.filter(ticket_id=self.ticket.id).exists())
+        self.assertFalse(TicketEvent.objects.filter(ticket_id=self.ticket.id).exists())
+        self.assertTrue(Ticket.objects.filter(id=self.open_ticket.id).exists())
+        self.assertTrue(ArchivedTicket.objects.filter(id=self.ticket.id).exists())
+
+        rollup = TicketDailyRollup.objects.get()
+        self.assertEqual((rollup.status, rollup.priority, rollup.tickets), (TicketStatus.RESOLVED, "HIGH", 1))
+        self.assertEqual((rollup.resolution_count, rollup.first_response_count), (1, 1))
+
+        response = self.client.get(reverse("analytics:tickets-by-status"))
+        counts = {row["status"]: row["total"] for row in response.data["results"]}
+        self.assertEqual(counts[TicketStatus.RESOLVED], 1)
+        self.assertEqual(counts[TicketStatus.OPEN], 1)
+        # Wall-clock and business averages are unchanged by the archive.
+        self.assertEqual([self.client.get(url).data for url in average_urls], averages)
+        self.assertEqual(averages[1]["tickets_resolved"], 1)
+
+    def test_deleting_the_assignee_keeps_the_archived_rollups(self):
+        assignee = User.objects.create_user(
+            email="assignee@example.com", password="StrongPass123!", role=UserRole.MODERATOR
+        )
+        Ticket.objects.filter(id=self.ticket.id).update(assigned_to=assignee)
+        archive_closed_tickets(days=365)
+        self.assertEqual(TicketDailyRollup.objects.get().assigned_to_id, assignee.id)
+
+        assignee.delete()
+        rollup = TicketDailyRollup.objects.get()
+        self.assertIsNone(rollup.assigned_to_id)
+        self.assertEqual((rollup.tickets, rollup.resolution_count), (1, 1))
+
+    def test_deleting_the_creator_keeps_the_archived_rollups(self):
+        archive_closed_tickets(days=365)
+        self.open_ticket.delete()
+        self.user.delete()
+        rollup = TicketDailyRollup.objects.get()
+        self.assertIsNone(rollup.created_by_id)
+        self.assertEqual((rollup.tickets, rollup.first_response_count), (1, 1))
+
+    def test_archived_rollups_are_rebuilt_from_the_archive(self):
+        assignee = User.objects.create_user(
+            email="assignee@example.com", password="StrongPass123!", role=UserRole.MODERATOR
+        )
+        Ticket.objects.filter(id=self.ticket.id).update(assigned_to=assignee)
+        archive_closed_tickets(days=365)
+        fields = ("day", "status", "created_by_id", "tickets", "resolution_business_seconds", "resolution_histogram")
+        archived = list(TicketDailyRollup.objects.values(*fields))
+        # Payload still names the deleted assignee: rebuilt as unassigned.
+        assignee.delete()
+        TicketDailyRollup.objects.update(created_by=None, resolution_business_seconds=0, resolution_histogram={})
+
+        call_command("refresh_ticket_rollups", "--archived", stdout=io.StringIO())
+        self.assertEqual(list(TicketDailyRollup.objects.values(*fields)), archived)
+        self.assertIsNone(TicketDailyRollup.objects.get().assigned_to_id)
+
+    def test_detail_serves_archived_ticket(self):
+        archive_closed_tickets(days=365)
+        url = reverse("tickets:ticket-detail", kwargs={"id": self.ticket.id})
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["archived"])
+        self.assertEqual(response.data["title"], "Chamado antigo")
+        self.assertEqual([m["message"] for m in response.data["messages"]], ["Resposta"])
+        self.assertGreaterEqual(len(response.data["events"]), 3)
+
+        self.client.force_authenticate(user=self.moderator)
+        self.assertEqual(len(self.client.get(url).data["messages"]), 2)
+
+        self.client.force_authenticate(user=self.other)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
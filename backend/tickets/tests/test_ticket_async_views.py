@@ -0,0 +1,56 @@
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import User
+from tickets.services import create_ticket
+
+
+def _auth_headers(user):
+    return {"Authorization": f"Bearer {RefreshToken.for_user(user).access_token}"}
+
+
+class TicketAsyncViewsTests(TestCase):
+    """Read endpoints served through the async middleware chain (ASGI)."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@example.com", password="StrongPass123!")
+        self.other = User.objects.create_user(email="other@example.com", password="StrongPass123!")
+        self.ticket = create_ticket(
+            user=self.user,
+            title="Chamado",
+            description="Descricao",
+            priority="LOW",
+            category="GENERAL",
+        )
+        # Issued here: creating a token writes to the database (sync only).
+        self.user_headers = _auth_headers(self.user)
+        self.other_headers = _auth_headers(self.other)
+        self.async_client = AsyncClient()
+
+    async def test_detail_and_messages(self):
+        detail_url = reverse("tickets:ticket-detail", kwargs={"id": self.ticket.pk})
+        response = await self.async_client.get(detail_url, headers=self.user_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["title"], "Chamado")
+        self.assertIn('desc="', response["Server-Timing"])
+
+        response = await self.async_client.get(
+            detail_url, headers={**self.user_headers, "If-None-Match": response["ETag"]}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = await self.async_client.get(
+            reverse("tickets:ticket-message-list-create"),
+            {"ticket": str(self.ticket.pk)},
+            headers=self.user_headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    async def test_other_users_ticket_is_forbidden(self):
+        response = await self.async_client.get(
+            reverse("tickets:ticket-detail", kwargs={"id": self.ticket.pk}),
+            headers=self.other_headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
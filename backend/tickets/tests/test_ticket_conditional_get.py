@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import User, UserRole
+from tickets.models import TicketStatus
+from tickets.services import add_message, change_status, create_ticket
+from tickets.sla import scan_breaches
+
+
+class TicketConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email="owner@example.com", password="StrongPass123!")
+        self.other_user = User.objects.create_user(email="other@example.com", password="StrongPass123!")
+        self.moderator = User.objects.create_user(
+            email="mod@example.com",
+            password="StrongPass123!",
+            role=UserRole.MODERATOR,
+        )
+        self.ticket = create_ticket(
+            user=self.owner,
+            title="Falha no sistema",
+            description="Erro ao abrir pagina",
+            priority="MEDIUM",
+            category="TECHNICAL",
+        )
+
+    def test_ticket_detail_returns_304_when_unchanged(self):
+        self.client.force_authenticate(user=self.owner)
+        url = reverse("tickets:ticket-detail", kwargs={"id": self.ticket.id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        change_status(ticket=self.ticket, new_status=TicketStatus.IN_PROGRESS, triggered_by=self.moderator)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_ticket_detail_etag_changes_with_sla_updates(self):
+        self.client.force_authenticate(user=self.owner)
+        url = reverse("tickets:ticket-detail", kwargs={"id": self.ticket.id})
+        etag = self.client.get(url)["ETag"]
+
+        scan_breaches(now=timezone.now() + timedelta(days=30))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(response.data["first_response_breached_at"])
+        etag = response["ETag"]
+
+        add_message(ticket=self.ticket, author=self.moderator, message="Primeira resposta")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(response.data["first_response_at"])
+
+    def test_ticket_detail_precondition_does_not_bypass_permissions(self):
+        self.client.force_authenticate(user=self.owner)
+        url = reverse("tickets:ticket-detail", kwargs={"id": self.ticket.id})
+        etag = self.client.get(url)["ETag"]
+
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_message_list_etag_changes_with_new_message(self):
+        self.client.force_authenticate(user=self.owner)
+        url = reverse("tickets:ticket-message-list-create")
+        params = {"ticket": str(self.ticket.id)}
+        etag = self.client.get(url, params)["ETag"]
+
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        add_message(ticket=self.ticket, author=self.owner, message="Ainda com erro")
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
@@ -0,0 +1,39 @@
+from datetime import date
+
+from django.test import TestCase
+
+from core.models import User
+from tickets.datagen import DatasetConfig, DatasetGenerator, generate_dataset
+from tickets.models import Ticket, TicketEvent, TicketEventType, TicketMessage
+
+
+class DatasetGeneratorTests(TestCase):
+    def _config(self, **extra):
+        return DatasetConfig(tickets=50, seed=7, end_date=date(2026, 1, 1), batch_size=20, **extra)
+
+    def test_batches_are_deterministic(self):
+        first = DatasetGenerator(self._config())
+        second = DatasetGenerator(self._config())
+        _, *users = first.build_users()
+        self.assertEqual(users, list(second.build_users()[1:]))
+        self.assertEqual(first.build_batch(1, 20, *users), second.build_batch(1, 20, *users))
+
+    def test_generate_dataset_writes_consistent_rows(self):
+        totals = generate_dataset(self._config())
+
+        self.assertEqual(Ticket.objects.count(), 50)
+        self.assertEqual(totals["messages"], TicketMessage.objects.count())
+        self.assertEqual(
+            TicketEvent.objects.filter(event_type=TicketEventType.CREATED).count(),
+            50,
+        )
+        self.assertEqual(
+            TicketEvent.objects.filter(event_type=TicketEventType.MESSAGE_ADDED).count(),
+            totals["messages"],
+        )
+        answered = Ticket.objects.filter(first_response_at__isnull=False)
+        self.assertTrue(answered.exists())
+        self.assertFalse(answered.filter(status="OPEN").exists())
+        self.assertTrue(User.objects.filter(email="dataset-user0@helpdesk.local").exists())
+        with self.assertRaises(ValueError):
+            generate_dataset(self._config())
@@ -0,0 +1,83 @@
+import csv
+import gzip
+import io
+import json
+
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import User, UserRole
+from tickets.services import add_message, create_ticket
+
+
+class TicketExportTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email="owner@example.com", password="StrongPass123!")
+        self.moderator = User.objects.create_user(
+            email="mod@example.com",
+            password="StrongPass123!",
+            role=UserRole.MODERATOR,
+        )
+        self.ticket = create_ticket(
+            user=self.owner,
+            title="Falha no sistema",
+            description="Erro ao abrir pagina",
+            priority="HIGH",
+            category="TECHNICAL",
+        )
+        create_ticket(
+            user=self.owner,
+            title="Duvida",
+            description="Como acessar",
+            priority="LOW",
+            category="GENERAL",
+        )
+        add_message(ticket=self.ticket, author=self.owner, message="Detalhes")
+        self.moderator_headers = {"Authorization": f"Bearer {RefreshToken.for_user(self.moderator).access_token}"}
+
+    def _content(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_user_cannot_export(self):
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.get(reverse("tickets:ticket-export", kwargs={"resource": "tickets"}))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_tickets_csv_applies_list_filters(self):
+        self.client.force_authenticate(user=self.moderator)
+        response = self.client.get(
+            reverse("tickets:ticket-export", kwargs={"resource": "tickets"}),
+            {"priority": "HIGH"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = list(csv.DictReader(io.StringIO(self._content(response).decode())))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["id"], str(self.ticket.id))
+
+    def test_export_events_ndjson_gzip(self):
+        self.client.force_authenticate(user=self.moderator)
+        response = self.client.get(
+            reverse("tickets:ticket-export", kwargs={"resource": "events"}),
+            {"output": "ndjson", "gzip": "true", "priority": "HIGH"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = gzip.decompress(self._content(response)).decode().splitlines()
+        events = [json.loads(line) for line in lines]
+        self.assertEqual({event["event_type"] for event in events}, {"CREATED", "MESSAGE_ADDED"})
+        self.assertTrue(all(event["ticket_id"] == str(self.ticket.id) for event in events))
+
+    async def test_export_is_streamed_asynchronously_under_asgi(self):
+        response = await AsyncClient().get(
+            reverse("tickets:ticket-export", kwargs={"resource": "tickets"}),
+            {"priority": "HIGH"},
+            headers=self.moderator_headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # An async body: Django would otherwise buffer the whole export before sending it.
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        rows = list(csv.DictReader(io.StringIO(content.decode())))
+        self.assertEqual([row["id"] for row in rows], [str(self.ticket.id)])
@@ -0,0 +1,148 @@
+import json
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import User, UserRole
+from tickets import imports
+from tickets.imports import run_import
+from tickets.models import (
+    ImportJob,
+    ImportJobStatus,
+    SlaKind,
+    Ticket,
+    TicketEvent,
+    TicketEventType,
+    TicketStatus,
+)
+from tickets.services import create_ticket
+from tickets.sla import add_sla_time, get_policy, scan_breaches
+
+
+class TicketImportTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email="owner@example.com", password="StrongPass123!")
+        self.moderator = User.objects.create_user(
+            email="mod@example.com",
+            password="StrongPass123!",
+            role=UserRole.MODERATOR,
+        )
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _write(self, records):
+        path = Path(self.tmpdir.name) / "tickets.ndjson"
+        path.write_text("\n".join(json.dumps(record) for record in records))
+        return path
+
+    def _record(self, index, **extra):
+        record = {
+            "title": f"Legado {index}",
+            "description": "Importado",
+            "created_by_email": "owner@example.com",
+            "created_at": "2024-01-10T09:00:00-03:00",
+        }
+        record.update(extra)
+        return record
+
+    def test_import_preserves_timestamps_and_synthesizes_events(self):
+        path = self._write(
+            [
+                self._record(
+                    1,
+                    status="RESOLVED",
+                    assigned_to_email="MOD@example.com",
+                    closed_at="2024-01-11T10:00:00-03:00",
+                ),
+            ]
+        )
+        job = ImportJob.objects.create(resource="tickets", input_format="ndjson", file_path=str(path))
+
+        job = run_import(job)
+
+        self.assertEqual(job.status, ImportJobStatus.COMPLETED)
+        ticket = Ticket.objects.get()
+        self.assertEqual(ticket.created_at.isoformat(), "2024-01-10T12:00:00+00:00")
+        self.assertEqual(ticket.assigned_to, self.moderator)
+        self.assertEqual(ticket.status, TicketStatus.RESOLVED)
+        self.assertEqual(
+            list(TicketEvent.objects.filter(ticket=ticket).values_list("event_type", flat=True)),
+            [TicketEventType.CREATED, TicketEventType.ASSIGNED, TicketEventType.RESOLVED],
+        )
+
+    def test_saves_during_an_import_keep_their_timestamps(self):
+        path = self._write([self._record(1), self._record(2)])
+        job = ImportJob.objects.create(resource="tickets", input_format="ndjson", file_path=str(path))
+        saved = []
+
+        def build_and_save(records, resolver, first_line):
+            # Another task of the same worker process saving through the service layer.
+            saved.append(
+                create_ticket(
+                    user=self.owner, title="Ao vivo", description="Descricao", priority="LOW", category="GENERAL"
+                )
+            )
+            return imports.build_ticket_chunk(records, resolver, first_line)
+
+        with mock.patch.dict(imports._BUILDERS, tickets=build_and_save):
+            job = run_import(job, chunk_size=1)
+
+        self.assertEqual(job.status, ImportJobStatus.COMPLETED)
+        self.assertEqual(len(saved), 2)
+        for ticket in saved:
+            ticket.refresh_from_db()
+            self.assertAlmostEqual(ticket.created_at, timezone.now(), delta=timedelta(minutes=1))
+        self.assertEqual(Ticket.objects.filter(title__startswith="Legado", created_at__year=2024).count(), 2)
+
+    def test_failed_import_resumes_from_checkpoint(self):
+        records = [self._record(1), self._record(2), self._record(3, created_by_email="ghost@example.com")]
+        path = self._write(records)
+        job = ImportJob.objects.create(resource="tickets", input_format="ndjson", file_path=str(path))
+
+        job = run_import(job, chunk_size=2)
+
+        self.assertEqual(job.status, ImportJobStatus.FAILED)
+        self.assertEqual(job.rows_processed, 2)
+        self.assertEqual(Ticket.objects.count(), 2)
+
+        job.create_users = True
+        job.save(update_fields=["create_users"])
+        job = run_import(job, chunk_size=2)
+
+        self.assertEqual(job.status, ImportJobStatus.COMPLETED)
+        self.assertEqual(job.rows_processed, 3)
+        self.assertEqual(Ticket.objects.count(), 3)
+        self.assertTrue(User.objects.filter(email="ghost@example.com").exists())
+
+    def test_imported_tickets_get_sla_deadlines_and_first_responses(self):
+        answered_id, pending_id = "11111111-1111-1111-1111-111111111111", "22222222-2222-2222-2222-222222222222"
+        path = self._write([self._record(1, id=answered_id, priority="HIGH"), self._record(2, id=pending_id)])
+        run_import(ImportJob.objects.create(resource="tickets", input_format="ndjson", file_path=str(path)))
+
+        answered = Ticket.objects.get(id=answered_id)
+        first_response_minutes, resolution_minutes = get_policy("HIGH", "GENERAL")
+        self.assertEqual(answered.first_response_due_at, add_sla_time(answered.created_at, first_response_minutes * 60))
+        self.assertEqual(answered.resolution_due_at, add_sla_time(answered.created_at, resolution_minutes * 60))
+
+        reply = {
+            "ticket_id": answered_id,
+            "author_email": "mod@example.com",
+            "message": "Resposta",
+            "created_at": "2024-01-10T09:30:00-03:00",
+        }
+        note = {**reply, "ticket_id": pending_id, "is_internal": "true"}
+        path = self._write([reply, note])
+        job = run_import(ImportJob.objects.create(resource="messages", input_format="ndjson", file_path=str(path)))
+        self.assertEqual(job.status, ImportJobStatus.COMPLETED)
+
+        answered.refresh_from_db()
+        self.assertEqual(answered.first_response_at.isoformat(), "2024-01-10T12:30:00+00:00")
+        self.assertEqual(answered.updated_at, answered.created_at)
+        self.assertIsNone(Ticket.objects.get(id=pending_id).first_response_at)
+
+        self.assertEqual(scan_breaches(), {SlaKind.FIRST_RESPONSE: 1, SlaKind.RESOLUTION: 2})
+        self.assertIsNotNone(Ticket.objects.get(id=pending_id).first_response_breached_at)
@@ -0,0 +1,45 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.models import User, UserRole
+from tickets.models import Ticket, TicketStatus
+from tickets.services import create_ticket
+
+
+class TicketRankOrderingTests(APITestCase):
+    def setUp(self):
+        self.moderator = User.objects.create_user(
+            email="moderator@example.com",
+            password="StrongPass123!",
+            role=UserRole.MODERATOR,
+        )
+        self.tickets = {}
+        for priority in ("MEDIUM", "CRITICAL", "LOW", "HIGH", "CRITICAL"):
+            ticket = create_ticket(
+                user=self.moderator,
+                title=priority,
+                description="Descricao",
+                priority=priority,
+                category="GENERAL",
+            )
+            self.tickets.setdefault(priority, []).append(ticket)
+        Ticket.objects.filter(id=self.tickets["LOW"][0].id).update(status=TicketStatus.IN_PROGRESS)
+        self.client.force_authenticate(user=self.moderator)
+
+    def _ids(self, **params):
+        response = self.client.get(reverse("tickets:ticket-list-create"), params)
+        return [row["id"] for row in response.data["results"]]
+
+    def test_priority_orders_by_severity_then_oldest(self):
+        expected = [
+            str(ticket.id)
+            for priority in ("CRITICAL", "HIGH", "MEDIUM", "LOW")
+            for ticket in self.tickets[priority]
+        ]
+        self.assertEqual(self._ids(ordering="-priority"), expected)
+        self.assertEqual(self._ids(ordering="priority")[0], str(self.tickets["LOW"][0].id))
+
+    def test_status_orders_by_workflow(self):
+        ids = self._ids(ordering="-status")
+        self.assertEqual(ids[0], str(self.tickets["LOW"][0].id))
+        self.assertEqual(len(ids), 5)
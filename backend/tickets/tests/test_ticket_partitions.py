@@ -0,0 +1,152 @@
+from datetime import date, datetime, timedelta, timezone
+from io import StringIO
+from unittest import skipIf, skipUnless
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+from core.models import User
+from tickets.models import TicketEvent, TicketEventType
+from tickets.partitions import (
+    PARTITIONED_TABLES,
+    add_months,
+    default_partition_name,
+    is_partitioned,
+    list_partitions,
+    month_start,
+    partition_month,
+    partition_name,
+)
+from tickets.services import create_ticket
+
+BEFORE_PARTITIONING = [("tickets", "0002_import_job")]
+
+
+def table_schema(table):
+    """Columns, constraints and indexes of `table`, for comparing two versions of it."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT column_name, data_type, is_nullable, column_default FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = %s ORDER BY column_name",
+            [table],
+        )
+        columns = cursor.fetchall()
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = to_regclass(%s) "
+            "ORDER BY conname",
+            [table],
+        )
+        constraints = cursor.fetchall()
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s "
+            "ORDER BY indexname",
+            [table],
+        )
+        indexes = cursor.fetchall()
+    return columns, constraints, indexes
+
+
+def row_count(table):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+        return cursor.fetchone()[0]
+
+
+class PartitionNamingTests(SimpleTestCase):
+    def test_add_months_crosses_years(self):
+        self.assertEqual(add_months(date(2026, 11, 1), 3), date(2027, 2, 1))
+        self.assertEqual(add_months(date(2026, 1, 1), -1), date(2025, 12, 1))
+
+    def test_partition_month_round_trip(self):
+        table = "tickets_ticketevent"
+        name = partition_name(table, date(2026, 3, 1))
+        self.assertEqual(name, "tickets_ticketevent_p202603")
+        self.assertEqual(partition_month(table, name), date(2026, 3, 1))
+        self.assertIsNone(partition_month(table, "tickets_ticketevent_default"))
+        self.assertIsNone(partition_month(table, "tickets_ticketmessage_p202603"))
+
+
+class ManagePartitionsCommandTests(TestCase):
+    @skipUnless(connection.vendor == "postgresql", "particionamento exige PostgreSQL")
+    def test_creates_upcoming_months(self):
+        out = StringIO()
+        call_command("manage_partitions", "--months-ahead", "2", stdout=out)
+        for table in PARTITIONED_TABLES:
+            self.assertTrue(is_partitioned(connection, table))
+            self.assertIn(f"{table}_default", out.getvalue())
+
+    @skipUnless(connection.vendor == "postgresql", "particionamento exige PostgreSQL")
+    def test_moves_backdated_rows_out_of_the_default_partition(self):
+        user = User.objects.create_user(email="user@example.com", password="StrongPass123!")
+        ticket = create_ticket(user=user, title="Legado", description="Descricao", priority="LOW", category="GENERAL")
+        this_month = month_start(datetime.now(timezone.utc))
+        old_month, far_month = add_months(this_month, -30), add_months(this_month, 30)
+        for month in (old_month, far_month):
+            event = TicketEvent.objects.create(
+                ticket=ticket, event_type=TicketEventType.STATUS_CHANGED, triggered_by=user
+            )
+            # Moved by PostgreSQL into the default partition.
+            TicketEvent.objects.filter(id=event.id).update(
+                created_at=datetime(month.year, month.month, 15, tzinfo=timezone.utc)
+            )
+        default = default_partition_name("tickets_ticketevent")
+        self.assertEqual(row_count(default), 2)
+
+        out = StringIO()
+        call_command("manage_partitions", "--months-ahead", "1", "--detach-older-than", "0", stdout=out)
+        months = {month for _, month, _ in list_partitions(connection, "tickets_ticketevent")}
+        self.assertIn(old_month, months)
+        self.assertNotIn(far_month, months)
+        self.assertEqual(row_count(partition_name("tickets_ticketevent", old_month)), 1)
+        # Beyond --months-ahead: stays in the default partition, reported by the command.
+        self.assertEqual(row_count(default), 1)
+        self.assertEqual(TicketEvent.objects.filter(ticket=ticket).count(), 3)
+
+    @skipIf(connection.vendor == "postgresql", "somente sem PostgreSQL")
+    def test_requires_postgresql(self):
+        with self.assertRaisesMessage(CommandError, "PostgreSQL"):
+            call_command("manage_partitions")
+
+
+@skipUnless(connection.vendor == "postgresql", "particionamento exige PostgreSQL")
+class PartitionMigrationTests(TransactionTestCase):
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor
+
+    def setUp(self):
+        self.latest = MigrationExecutor(connection).loader.graph.leaf_nodes()
+        self.addCleanup(self.migrate, self.latest)
+
+    def test_reverse_restores_the_original_tables_and_rows(self):
+        user = User.objects.create_user(email="user@example.com", password="StrongPass123!")
+        create_ticket(user=user, title="Chamado", description="Descricao", priority="LOW", category="GENERAL")
+        self.assertEqual(row_count("tickets_ticketevent"), 1)
+
+        executor = self.migrate(BEFORE_PARTITIONING)
+        reversed_schemas = {}
+        for table in PARTITIONED_TABLES:
+            self.assertFalse(is_partitioned(connection, table))
+            self.assertFalse(list_partitions(connection, table))
+            reversed_schemas[table] = table_schema(table)
+        self.assertEqual(row_count("tickets_ticketevent"), 1)
+
+        # Tables as Django creates them at this migration, without ever being partitioned.
+        state = executor.loader.project_state(BEFORE_PARTITIONING[0])
+        with connection.schema_editor() as editor:
+            for table in PARTITIONED_TABLES:
+                editor.execute(f"DROP TABLE {connection.ops.quote_name(table)}")
+            for model in ("ticketevent", "ticketmessage"):
+                editor.create_model(state.apps.get_model("tickets", model))
+        for table in PARTITIONED_TABLES:
+            self.assertEqual(table_schema(table), reversed_schemas[table])
+
+        self.migrate([("tickets", "0003_partition_ticket_history")])
+        for table in PARTITIONED_TABLES:
+            self.assertTrue(is_partitioned(connection, table))
+            months = [month for _, month, _ in list_partitions(connection, table)]
+            self.assertIn(None, months)
+            self.assertIn(month_start(datetime.now(timezone.utc) + timedelta(days=1)), months)
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import User, UserRole
+from tickets.models import SlaKind, SlaPolicy, Ticket, TicketEvent, TicketEventType, TicketStatus
+from tickets.services import add_message, change_status, create_ticket
+from tickets.sla import backfill_deadlines, scan_breaches
+
+
+@override_settings(SLA_BUSINESS_HOURS=False)
+class SlaTests(TestCase):
+    """Default policies come from the 0006 migration (CRITICAL: 30 / 240 min)."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@example.com", password="StrongPass123!")
+        self.moderator = User.objects.create_user(
+            email="moderator@example.com",
+            password="StrongPass123!",
+            role=UserRole.MODERATOR,
+        )
+        self.ticket = create_ticket(
+            user=self.user,
+            title="Servidor fora do ar",
+            description="Descricao",
+            priority="CRITICAL",
+            category="TECHNICAL",
+        )
+
+    def assertDeadline(self, due, ticket, minutes):
+        # Deadlines are computed just before the insert sets created_at.
+        self.assertAlmostEqual(due, ticket.created_at + timedelta(minutes=minutes), delta=timedelta(seconds=1))
+
+    def test_deadlines_from_policy_and_category_override(self):
+        self.assertDeadline(self.ticket.first_response_due_at, self.ticket, 30)
+        self.assertDeadline(self.ticket.resolution_due_at, self.ticket, 240)
+
+        SlaPolicy.objects.create(
+            priority="CRITICAL", category="BILLING", first_response_minutes=10, resolution_minutes=60
+        )
+        billing = create_ticket(
+            user=self.user, title="Cobranca", description="Descricao", priority="CRITICAL", category="BILLING"
+        )
+        self.assertDeadline(billing.resolution_due_at, billing, 60)
+
+    def test_waiting_user_pauses_deadlines(self):
+        due = self.ticket.resolution_due_at
+        start = timezone.now()
+        with mock.patch("tickets.services.timezone.now", return_value=start):
+            change_status(ticket=self.ticket, new_status=TicketStatus.WAITING_USER, triggered_by=self.moderator)
+        with mock.patch("tickets.services.timezone.now", return_value=start + timedelta(hours=2)):
+            change_status(ticket=self.ticket, new_status=TicketStatus.IN_PROGRESS, triggered_by=self.moderator)
+
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.resolution_due_at, due + timedelta(hours=2))
+        self.assertEqual(self.ticket.sla_paused_seconds, 7200)
+        self.assertIsNone(self.ticket.sla_paused_at)
+
+    def test_scanner_records_breaches_once(self):
+        add_message(ticket=self.ticket, author=self.moderator, message="Nota", is_internal=True)
+        other = create_ticket(user=self.user, title="Ok", description="Descricao", priority="LOW", category="GENERAL")
+        add_message(ticket=other, author=self.moderator, message="Ola")
+        other.refresh_from_db()
+        self.assertIsNotNone(other.first_response_at)
+
+        later = timezone.now() + timedelta(hours=5)
+        found = scan_breaches(now=later, batch_size=1)
+        self.assertEqual(found, {SlaKind.FIRST_RESPONSE: 1, SlaKind.RESOLUTION: 1})
+        self.assertEqual(scan_breaches(now=later), {SlaKind.FIRST_RESPONSE: 0, SlaKind.RESOLUTION: 0})
+
+        self.ticket.refresh_from_db()
+        self.assertIsNotNone(self.ticket.first_response_breached_at)
+        breaches = TicketEvent.objects.filter(event_type=TicketEventType.SLA_BREACHED)
+        self.assertEqual(sorted(breaches.values_list("to_value", flat=True)), ["FIRST_RESPONSE", "RESOLUTION"])
+        self.assertIsNone(breaches.first().triggered_by)
+
+    def test_backfill_sets_missing_deadlines(self):
+        message = add_message(ticket=self.ticket, author=self.moderator, message="Ola")
+        Ticket.objects.update(first_response_at=None, first_response_due_at=None, resolution_due_at=None)
+        self.assertEqual(backfill_deadlines(), 1)
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.first_response_at, message.created_at)
+        self.assertEqual(self.ticket.resolution_due_at - self.ticket.created_at, timedelta(minutes=240))
+
+
+@override_settings(
+    SLA_BUSINESS_HOURS=True,
+    BUSINESS_HOURS_START="09:00",
+    BUSINESS_HOURS_END="18:00",
+    BUSINESS_DAYS=[0, 1, 2, 3, 4],
+    BUSINESS_HOLIDAYS=["2026-10-19"],
+)
+class BusinessHoursSlaTests(TestCase):
+    def test_deadlines_and_pauses_count_business_time(self):
+        user = User.objects.create_user(email="user@example.com", password="StrongPass123!")
+        tz = timezone.get_current_timezone()
+        friday_evening = timezone.make_aware(datetime(2026, 10, 16, 17, 50), tz)
+        with mock.patch("tickets.services.timezone.now", return_value=friday_evening):
+            ticket = create_ticket(
+                user=user, title="Fim de semana", description="Descricao", priority="CRITICAL", category="GENERAL"
+            )
+        # 10 min on Friday, Monday is a holiday: 20 min on Tuesday morning.
+        self.assertEqual(ticket.first_response_due_at, timezone.make_aware(datetime(2026, 10, 20, 9, 20), tz))
+
+        tuesday = timezone.make_aware(datetime(2026, 10, 20, 17, 0), tz)
+        with mock.patch("tickets.services.timezone.now", return_value=tuesday):
+            change_status(ticket=ticket, new_status=TicketStatus.WAITING_USER, triggered_by=user)
+        with mock.patch("tickets.services.timezone.now", return_value=tuesday + timedelta(hours=16, minutes=30)):
+            change_status(ticket=ticket, new_status=TicketStatus.IN_PROGRESS, triggered_by=user)
+        ticket.refresh_from_db()
+        # Paused from 17:00 to 09:30 next day: 1h30 of business time.
+        self.assertEqual(ticket.sla_paused_seconds, 5400)
+        self.assertEqual(ticket.first_response_due_at, timezone.make_aware(datetime(2026, 10, 20, 10, 50), tz))
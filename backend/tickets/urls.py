@@ -6,6 +6,14 @@ app_name = "tickets"
 
 urlpatterns = [
     path("", views.TicketListCreateView.as_view(), name="ticket-list-create"),
+    path("export/<str:resource>/", views.TicketExportView.as_view(), name="ticket-export"),
+    path("import/", views.TicketImportView.as_view(), name="ticket-import"),
+    path("import/<uuid:id>/", views.ImportJobDetailView.as_view(), name="ticket-import-detail"),
+    path(
+        "import/<uuid:id>/resume/",
+        views.ImportJobResumeView.as_view(),
+        name="ticket-import-resume",
+    ),
     path("<uuid:id>/", views.TicketDetailView.as_view(), name="ticket-detail"),
     path("<uuid:id>/assign/", views.TicketAssignView.as_view(), name="ticket-assign"),
     path(
@@ -5,6 +5,10 @@ Views for tickets and ticket messages.
 import logging
 from uuid import UUID
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, status
 from rest_framework.exceptions import ValidationError
@@ -12,14 +16,32 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core.async_views import AsyncAPIViewMixin, streaming_body
+from core.conditional import conditional_get, make_etag
+from core.db_router import ReplicaReadMixin, read_alias
 from core.permissions import (
+    IsAdmin,
     IsMessageAuthorOrTicketOwnerOrModeratorOrAdmin,
     IsModeratorOrAdmin,
     IsTicketOwnerOrModeratorOrAdmin,
 )
 
-from .models import Ticket, TicketCategory, TicketEvent, TicketMessage, TicketPriority
+from .archive import archived_ticket_data
+from .exports import CONTENT_TYPES, EXPORT_FORMATS, EXPORT_RESOURCES, export_filename, stream_export
+from .filters import TICKET_FILTER_FIELDS
+from .models import (
+    ArchivedTicket,
+    ImportJob,
+    ImportJobStatus,
+    Ticket,
+    TicketCategory,
+    TicketEvent,
+    TicketMessage,
+    TicketPriority,
+)
 from .serializers import (
+    ImportJobCreateSerializer,
+    ImportJobSerializer,
     TicketAssignSerializer,
     TicketCreateSerializer,
     TicketEventSerializer,
@@ -28,12 +50,25 @@ from .serializers import (
     TicketSerializer,
     TicketStatusChangeSerializer,
 )
-from .services import add_message, assign_ticket, cancel_ticket, change_status, create_ticket
+from .services import (
+    add_message,
+    assign_ticket,
+    cancel_ticket,
+    change_status,
+    create_ticket,
+    invalidate_ticket_caches,
+)
+from .sla import refresh_sla
+from .tasks import run_import_job_task
 
 logger = logging.getLogger("helpdesk")
 
 
-class TicketListCreateView(generics.ListCreateAPIView):
+def _can_read_ticket(user, created_by_id):
+    return user.is_moderator_or_admin or created_by_id == user.id
+
+
+class TicketListCreateView(ReplicaReadMixin, generics.ListCreateAPIView):
     """
     GET  /api/v1/tickets/
     POST /api/v1/tickets/
@@ -41,9 +76,13 @@ class TicketListCreateView(generics.ListCreateAPIView):
 
     permission_classes = [IsAuthenticated]
     queryset = Ticket.objects.select_related("created_by", "assigned_to")
-    filterset_fields = ("status", "priority", "category", "assigned_to", "created_by")
+    filterset_fields = TICKET_FILTER_FIELDS
     search_fields = ("title", "description")
     ordering_fields = ("created_at", "updated_at", "priority", "status")
+    # Severity / workflow order, backed by the *_rank indexes:
+    # ?status=OPEN&ordering=-priority is the queue (critical first, then oldest).
+    ordering_aliases = {"priority": "priority_rank", "status": "status_rank"}
+    ordering_tiebreak = ("created_at", "id")
     ordering = ("-created_at",)
 
     def get_queryset(self):
@@ -78,7 +117,7 @@ class TicketListCreateView(generics.ListCreateAPIView):
         logger.info(f"Ticket criado: {ticket.id} por {self.request.user.email}")
 
 
-class TicketDetailView(generics.RetrieveUpdateAPIView):
+class TicketDetailView(AsyncAPIViewMixin, generics.RetrieveUpdateAPIView):
     """
     GET   /api/v1/tickets/<id>/
     PATCH /api/v1/tickets/<id>/
@@ -96,6 +135,44 @@ class TicketDetailView(generics.RetrieveUpdateAPIView):
             return [IsAuthenticated(), IsModeratorOrAdmin()]
         return [IsAuthenticated(), IsTicketOwnerOrModeratorOrAdmin()]
 
+    async def aget_validators(self, request, *args, **kwargs):
+        row = await Ticket.objects.filter(id=kwargs["id"]).values("created_by_id", "updated_at").afirst()
+        extra = ()
+        if row is None:
+            row = await (
+                ArchivedTicket.objects.filter(id=kwargs["id"])
+                .values("created_by_id", updated_at=F("archived_at"))
+                .afirst()
+            )
+            # Archived payloads include messages, filtered by role.
+            extra = ("archived", request.user.is_moderator_or_admin)
+        if not row or not _can_read_ticket(request.user, row["created_by_id"]):
+            return None, None
+        return make_etag(kwargs["id"], row["updated_at"].isoformat(), *extra), row["updated_at"]
+
+    @conditional_get
+    async def get(self, request, *args, **kwargs):
+        try:
+            ticket = await self.aget_object()
+        except Http404:
+            return await self._aget_archived(request, kwargs["id"])
+        return Response(self.get_serializer(ticket).data)
+
+    async def _aget_archived(self, request, ticket_id):
+        """Tickets moved to cold storage (`tickets.archive`) are served read-only."""
+        archived = await ArchivedTicket.objects.filter(id=ticket_id).afirst()
+        if archived is None:
+            raise Http404
+        if not _can_read_ticket(request.user, archived.created_by_id):
+            self.permission_denied(request)
+        return Response(archived_ticket_data(archived, request.user))
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        if {"priority", "category"} & serializer.validated_data.keys():
+            refresh_sla(serializer.instance)
+        invalidate_ticket_caches()
+
 
 class TicketAssignView(APIView):
     """
@@ -171,6 +248,19 @@ class TicketEventsView(APIView):
 
     permission_classes = [IsAuthenticated, IsTicketOwnerOrModeratorOrAdmin]
 
+    def get_validators(self, request, id):
+        row = (
+            Ticket.objects.filter(id=id)
+            .annotate(latest_event_at=Max("events__created_at"), total_events=Count("events"))
+            .values("created_by_id", "latest_event_at", "total_events")
+            .first()
+        )
+        if not row or not _can_read_ticket(request.user, row["created_by_id"]):
+            return None, None
+        latest = row["latest_event_at"]
+        return make_etag(id, latest.isoformat() if latest else "", row["total_events"]), latest
+
+    @conditional_get
     def get(self, request, id):
         ticket = get_object_or_404(
             Ticket.objects.select_related("created_by", "assigned_to"),
@@ -182,7 +272,120 @@ class TicketEventsView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class TicketMessageListCreateView(generics.ListCreateAPIView):
+class TicketExportView(ReplicaReadMixin, APIView):
+    """
+    GET /api/v1/tickets/export/<resource>/?output=csv|ndjson&gzip=true
+    resource: tickets | messages | events
+    Aceita os mesmos filtros da listagem de tickets.
+    """
+
+    permission_classes = [IsAuthenticated, IsModeratorOrAdmin]
+
+    def get(self, request, resource):
+        if resource not in EXPORT_RESOURCES:
+            return Response({"detail": "Recurso invalido."}, status=status.HTTP_404_NOT_FOUND)
+        output = request.query_params.get("output", "csv")
+        if output not in EXPORT_FORMATS:
+            return Response(
+                {"detail": f"Formato invalido. Use: {', '.join(EXPORT_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        compress = request.query_params.get("gzip", "").lower() in ("1", "true")
+
+        try:
+            chunks = stream_export(
+                resource,
+                output=output,
+                params=request.query_params,
+                compress=compress,
+                using=read_alias(),
+            )
+        except ValueError as exc:
+            raise ValidationError(exc.args[0])
+
+        response = StreamingHttpResponse(
+            streaming_body(request, chunks),
+            content_type="application/gzip" if compress else CONTENT_TYPES[output],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{export_filename(resource, output, compress)}"'
+        )
+        logger.info(f"Export {resource}.{output} iniciado por {request.user.email}")
+        return response
+
+
+def _enqueue_import_job(job):
+    transaction.on_commit(lambda: run_import_job_task.delay(str(job.id)))
+
+
+class TicketImportView(APIView):
+    """
+    POST /api/v1/tickets/import/
+    Upload multipart (file, resource, input_format, create_users).
+    A importacao roda em background (Celery); acompanhe em /import/<id>/.
+    """
+
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def post(self, request):
+        serializer = ImportJobCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        job = ImportJob(
+            resource=data["resource"],
+            input_format=data["input_format"],
+            create_users=data["create_users"],
+            created_by=request.user,
+        )
+        import_root = settings.IMPORT_ROOT
+        import_root.mkdir(parents=True, exist_ok=True)
+        path = import_root / f"{job.id}.{job.input_format}"
+        with open(path, "wb") as fh:
+            for chunk in data["file"].chunks():
+                fh.write(chunk)
+        job.file_path = str(path)
+        job.save()
+        _enqueue_import_job(job)
+
+        logger.info(f"Import {job.id} ({job.resource}) enfileirado por {request.user.email}")
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class ImportJobDetailView(generics.RetrieveAPIView):
+    """
+    GET /api/v1/tickets/import/<id>/
+    """
+
+    permission_classes = [IsAuthenticated, IsAdmin]
+    queryset = ImportJob.objects.all()
+    serializer_class = ImportJobSerializer
+    lookup_field = "id"
+    lookup_url_kwarg = "id"
+
+
+class ImportJobResumeView(APIView):
+    """
+    POST /api/v1/tickets/import/<id>/resume/
+    Retoma um job que falhou a partir do ultimo lote confirmado.
+    """
+
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def post(self, request, id):
+        job = get_object_or_404(ImportJob, id=id)
+        if job.status != ImportJobStatus.FAILED:
+            return Response(
+                {"detail": "Somente importacoes com falha podem ser retomadas."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        job.status = ImportJobStatus.PENDING
+        job.save(update_fields=["status"])
+        _enqueue_import_job(job)
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class TicketMessageListCreateView(AsyncAPIViewMixin, generics.ListCreateAPIView):
     """
     GET  /api/v1/tickets/messages/?ticket=<ticket_id>
     POST /api/v1/tickets/messages/
@@ -210,6 +413,26 @@ class TicketMessageListCreateView(generics.ListCreateAPIView):
 
         return base_qs
 
+    async def aget_validators(self, request, *args, **kwargs):
+        stats = await (
+            self.get_queryset()
+            .select_related(None)
+            .order_by()
+            .aaggregate(latest=Max("created_at"), total=Count("id"))
+        )
+        latest = stats["latest"]
+        etag = make_etag(
+            request.user.id,
+            request.get_full_path(),
+            latest.isoformat() if latest else "",
+            stats["total"],
+        )
+        return etag, latest
+
+    @conditional_get
+    async def get(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
     def get_serializer_class(self):
         if self.request.method == "POST":
             return TicketMessageCreateSerializer
@@ -227,7 +450,7 @@ class TicketMessageListCreateView(generics.ListCreateAPIView):
         logger.info(f"Mensagem adicionada em ticket {ticket.id} por {self.request.user.email}")
 
 
-class TicketMessageDetailView(generics.RetrieveAPIView):
+class TicketMessageDetailView(AsyncAPIViewMixin, generics.RetrieveAPIView):
     """
     GET /api/v1/tickets/messages/<id>/
     """
@@ -237,3 +460,7 @@ class TicketMessageDetailView(generics.RetrieveAPIView):
     serializer_class = TicketMessageSerializer
     lookup_field = "id"
     lookup_url_kwarg = "id"
+
+    async def get(self, request, *args, **kwargs):
+        message = await self.aget_object()
+        return Response(self.get_serializer(message).data)
@@ -67,7 +67,7 @@ export default function AdminDashboardPage() {
 
   const periodQuery = useQuery({
     queryKey: ["analytics", "tickets-by-period", "admin", startDate, endDate],
-    queryFn: () => getTicketsByPeriod({ startDate, endDate }),
+    queryFn: () => getTicketsByPeriod({ startDate, endDate, granularity: "auto" }),
   });
 
   const statusQuery = useQuery({
@@ -99,7 +99,7 @@ export default function AdminDashboardPage() {
     value: item.total,
   }));
   const periodChartData = (periodQuery.data?.results || []).map((item) => ({
-    date: item.date.slice(5),
+    date: periodQuery.data?.granularity === "month" ? item.date.slice(0, 7) : item.date.slice(5),
     total: item.total,
   }));
   const moderatorChartData = topModerators.map((item) => ({
@@ -131,8 +131,8 @@ export default function AdminDashboardPage() {
       bg: "bg-green-500/10",
     },
     {
-      title: "Tempo medio resolucao",
-      value: formatHours(resolutionQuery.data?.average_resolution_hours ?? null),
+      title: "Tempo medio resolucao (horas uteis)",
+      value: formatHours(resolutionQuery.data?.average_resolution_business_hours ?? null),
       icon: Clock,
       color: "text-amber-600",
       bg: "bg-amber-500/10",
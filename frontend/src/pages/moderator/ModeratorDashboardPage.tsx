@@ -89,7 +89,7 @@ export default function ModeratorDashboardPage() {
 
   const openCount = findStatusTotal(statusQuery.data?.results || [], "OPEN");
   const assignedToMeCount = assignedToMeQuery.data?.count || 0;
-  const avgResponseHours = responseTimeQuery.data?.average_response_hours;
+  const avgResponseHours = responseTimeQuery.data?.average_response_business_hours;
   const slaRiskCount = (slaRiskQuery.data?.results || []).filter((ticket) => {
     const created = new Date(ticket.created_at).getTime();
     const ageHours = (Date.now() - created) / (1000 * 60 * 60);
@@ -142,7 +142,7 @@ export default function ModeratorDashboardPage() {
       bg: "bg-amber-500/10",
     },
     {
-      title: "Tempo medio de resposta",
+      title: "Tempo medio de resposta (horas uteis)",
       value: avgResponseHours != null ? `${avgResponseHours.toFixed(1)}h` : "-",
       icon: Clock,
       color: "text-green-600",
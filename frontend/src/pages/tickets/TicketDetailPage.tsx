@@ -454,7 +454,10 @@ export default function TicketDetailPage() {
                         {item.payload.event_type}
                       </p>
                       <p className="text-xs text-muted-foreground">
-                        Por {item.payload.triggered_by.full_name || item.payload.triggered_by.email}
+                        Por{" "}
+                        {item.payload.triggered_by
+                          ? item.payload.triggered_by.full_name || item.payload.triggered_by.email
+                          : "Sistema"}
                       </p>
                       <p className="text-xs text-muted-foreground">
                         {formatDate(item.created_at)}
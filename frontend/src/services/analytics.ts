@@ -1,6 +1,7 @@
 import { api } from "@/services/api";
 import type {
   AverageResolutionTimeResponse,
+  Granularity,
   AverageResponseTimeResponse,
   TicketsByModeratorResponse,
   TicketsByPeriodResponse,
@@ -32,9 +33,16 @@ export async function getAverageResponseTime(): Promise<AverageResponseTimeRespo
   return response.data;
 }
 
-export async function getTicketsByPeriod(params?: DateRangeParams): Promise<TicketsByPeriodResponse> {
+type PeriodParams = DateRangeParams & {
+  granularity?: Granularity | "auto";
+};
+
+export async function getTicketsByPeriod(params?: PeriodParams): Promise<TicketsByPeriodResponse> {
   const response = await api.get<TicketsByPeriodResponse>("/analytics/tickets-by-period/", {
-    params: toQueryParams(params),
+    params: {
+      ...toQueryParams(params),
+      ...(params?.granularity ? { granularity: params.granularity } : {}),
+    },
   });
   return response.data;
 }
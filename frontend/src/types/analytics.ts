@@ -16,8 +16,12 @@ export interface AverageResponseTimeResponse {
   tickets_with_first_response: number;
   average_response_seconds: number | null;
   average_response_hours: number | null;
+  average_response_business_seconds: number | null;
+  average_response_business_hours: number | null;
 }
 
+export type Granularity = "day" | "week" | "month";
+
 export interface TicketsByPeriodItem {
   date: string;
   total: number;
@@ -26,6 +30,7 @@ export interface TicketsByPeriodItem {
 export interface TicketsByPeriodResponse {
   start_date: string;
   end_date: string;
+  granularity: Granularity;
   total_tickets: number;
   results: TicketsByPeriodItem[];
 }
@@ -50,4 +55,6 @@ export interface AverageResolutionTimeResponse {
   tickets_resolved: number;
   average_resolution_seconds: number | null;
   average_resolution_hours: number | null;
+  average_resolution_business_seconds: number | null;
+  average_resolution_business_hours: number | null;
 }
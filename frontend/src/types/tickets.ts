@@ -31,7 +31,7 @@ export interface TicketEvent {
   event_type: string;
   from_value: string;
   to_value: string;
-  triggered_by: AuthUser;
+  triggered_by: AuthUser | null;
   created_at: string;
 }
 